@@ -35,6 +35,8 @@ class Settings(BaseSettings):
     # Redis Settings
     redis_url: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
     redis_max_connections: int = Field(default=10, env="REDIS_MAX_CONNECTIONS")
+    # Multiple backend workers: relay sockets, frames and ACKs through Redis
+    cluster_mode: bool = Field(default=False, env="CLUSTER_MODE")
 
     # Server
     host: str = Field(default="0.0.0.0", env="HOST")
@@ -88,6 +90,22 @@ class Settings(BaseSettings):
         default="anthropic/claude-sonnet-4", env="COMPACTION_MODEL"
     )
     video_agent_default: bool = Field(default=True, env="VIDEO_AGENT_DEFAULT")
+    # VideoAgent monitor mode: perceptual change gate (app/services/frame_change_gate.py)
+    video_monitor_min_interval: float = Field(
+        default=2.0, env="VIDEO_MONITOR_MIN_INTERVAL"
+    )
+    video_monitor_max_interval: float = Field(
+        default=30.0, env="VIDEO_MONITOR_MAX_INTERVAL"
+    )
+    video_monitor_change_threshold: float = Field(
+        default=0.02, env="VIDEO_MONITOR_CHANGE_THRESHOLD"
+    )  # fraction of changed blocks worth an analysis
+    video_monitor_major_threshold: float = Field(
+        default=0.25, env="VIDEO_MONITOR_MAJOR_THRESHOLD"
+    )  # fraction of changed blocks that resets the cadence
+    video_monitor_masks: str = Field(
+        default="0.9,0.94,0.1,0.06", env="VIDEO_MONITOR_MASKS"
+    )  # "x,y,w,h;..." relative to the frame, never counted (taskbar clock)
 
     # OCR Settings
     ocr_languages: List[str] = Field(
@@ -0,0 +1,111 @@
+"""Event loop lag monitor.
+
+Schedules a short sleep on the event loop and measures how late it wakes up.
+The difference is the time the loop was blocked by synchronous work (a
+screenshot, OCR, ``subprocess.run`` ...) during which no request, WebSocket
+message or background task could make progress.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """Measures event loop blocking and logs stalls above a threshold."""
+
+    def __init__(
+        self,
+        interval_s: float = 0.1,
+        warn_ms: float = 100.0,
+        window: int = 600,
+    ):
+        self.interval_s = interval_s
+        self.warn_ms = warn_ms
+        self._lags_ms: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+        self.samples = 0
+        self.stalls = 0
+        self.max_lag_ms = 0.0
+        self.total_blocked_ms = 0.0
+        self.last_stall: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="event-loop-lag-monitor")
+        logger.info(
+            f"Event loop lag monitor started (interval={self.interval_s * 1000:.0f}ms, "
+            f"warn={self.warn_ms:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self.record(max(0.0, (time.perf_counter() - expected) * 1000))
+
+    def record(self, lag_ms: float) -> None:
+        """Record one lag sample (ms the loop woke up late)."""
+        self.samples += 1
+        self._lags_ms.append(lag_ms)
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        if lag_ms >= self.warn_ms:
+            self.stalls += 1
+            self.total_blocked_ms += lag_ms
+            self.last_stall = {"lag_ms": round(lag_ms, 1), "at": time.time()}
+            logger.warning(f"Event loop blocked for {lag_ms:.0f}ms")
+
+    def get_stats(self) -> Dict[str, Any]:
+        lags = sorted(self._lags_ms)
+
+        def pct(p: float) -> float:
+            if not lags:
+                return 0.0
+            return round(lags[min(len(lags) - 1, int(p * len(lags)))], 1)
+
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval_s * 1000, 1),
+            "warn_ms": self.warn_ms,
+            "samples": self.samples,
+            "current_lag_ms": round(self._lags_ms[-1], 1) if self._lags_ms else 0.0,
+            "lag_p50_ms": pct(0.5),
+            "lag_p95_ms": pct(0.95),
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "stalls": self.stalls,
+            "total_blocked_ms": round(self.total_blocked_ms, 1),
+            "last_stall": self.last_stall,
+        }
+
+
+# Global instance
+_loop_monitor: Optional[EventLoopLagMonitor] = None
+
+
+def get_loop_monitor() -> EventLoopLagMonitor:
+    """Get or create the event loop lag monitor."""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = EventLoopLagMonitor()
+    return _loop_monitor
@@ -10,6 +10,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_settings
+from .core.loop_monitor import get_loop_monitor
 from .database import close_db, init_db
 from .logger_config import get_logger
 from .routers import (api_v1_router, client_manager_router, desktop_router,
@@ -35,6 +36,9 @@ async def lifespan(app: FastAPI):
     logger.info("Starting TRAE Backend services...")
     settings = get_settings()
 
+    # Report how long synchronous work blocks the event loop
+    get_loop_monitor().start()
+
     try:
         # Initialize database
         logger.info("Initializing database connection...")
@@ -82,9 +86,20 @@ async def lifespan(app: FastAPI):
         # Wire ActionRouter with WebSocket manager
         from .routers.websocket import manager as ws_manager
         from .services.action_router import action_router
+        from .services.command_delivery import command_delivery
 
         action_router.set_ws_manager(ws_manager)
+        command_delivery.set_ws_manager(ws_manager)
         action_router.configure(settings)
+
+        # Cluster mode: several workers share clients, frames and ACKs via Redis
+        if settings.cluster_mode:
+            from .routers.websocket import setup_cluster_relay
+
+            if await setup_cluster_relay(settings.redis_url):
+                logger.info("Cluster relay initialized successfully")
+            else:
+                logger.warning("Cluster relay unavailable - running single-worker")
         if settings.execution_mode == "remote":
             logger.info(
                 "ActionRouter: REMOTE mode - desktop actions delegated to client"
@@ -111,6 +126,7 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logger.info("Shutting down TRAE Backend services...")
+        await get_loop_monitor().stop()
 
         # Cleanup Client Manager (stop Python desktop client)
         try:
@@ -124,6 +140,14 @@ async def lifespan(app: FastAPI):
         if hasattr(app.state, "service_manager"):
             await app.state.service_manager.cleanup()
 
+        # Cleanup Cluster Relay
+        try:
+            from .services.cluster_relay import cluster_relay
+
+            await cluster_relay.stop()
+        except Exception as e:
+            logger.error(f"Cluster relay cleanup failed: {e}")
+
         # Cleanup Redis PubSub
         try:
             await redis_pubsub.close()
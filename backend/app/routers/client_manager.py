@@ -6,6 +6,7 @@ Stellt API-Endpoints zur Steuerung des Desktop Capture Clients bereit:
 - POST /stop - Stoppt den Client
 - GET /status - Gibt aktuellen Status zurück
 - POST /heartbeat - Empfängt Heartbeat vom Client
+- POST /commands - Reiht einen Befehl ein (Push über WebSocket)
 
 Author: TRAE Development Team
 Version: 1.0.0
@@ -73,6 +74,19 @@ class HeartbeatRequest(BaseModel):
         return v
 
 
+class EnqueueCommandRequest(BaseModel):
+    """Request-Model für einen Befehl an einen Desktop-Client"""
+
+    client_id: str = Field(..., description="Ziel-Client")
+    command_type: str = Field(..., description="Befehlstyp (z.B. 'start_capture')")
+    command_data: Dict[str, Any] = Field(
+        default_factory=dict, description="Befehlsparameter"
+    )
+    idempotency_key: Optional[str] = Field(
+        default=None, description="Schlüssel gegen doppelte Ausführung"
+    )
+
+
 class ClientStatusResponse(BaseModel):
     """Response-Model für Client-Status"""
 
@@ -219,6 +233,33 @@ async def receive_heartbeat(request: HeartbeatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/commands")
+async def enqueue_command(request: EnqueueCommandRequest):
+    """
+    Reiht einen Befehl für einen Desktop-Client ein.
+
+    Der Befehl wird persistiert und sofort über die WebSocket-Verbindung
+    gepusht, falls der Client verbunden ist; sonst beim nächsten Connect.
+
+    Returns:
+        Befehl inkl. ``delivered`` (sofort zugestellt)
+    """
+    from ..services.command_delivery import command_delivery
+
+    try:
+        command = await command_delivery.enqueue(
+            request.client_id,
+            request.command_type,
+            request.command_data,
+            request.idempotency_key,
+        )
+        return JSONResponse(content={"success": True, **command}, status_code=200)
+
+    except Exception as e:
+        logger.error(f"[API] Fehler beim Einreihen des Befehls: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/restart")
 async def restart_client():
     """
@@ -9,6 +9,7 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 
+from ..core.loop_monitor import get_loop_monitor
 from ..exceptions import ServiceError
 from ..logger_config import get_logger, log_api_request
 from ..services import get_service_manager
@@ -50,6 +51,12 @@ async def health_check(request: Request):
         raise HTTPException(status_code=500, detail="Health check system unavailable")
 
 
+@router.get("/health/loop")
+async def event_loop_health():
+    """Event loop lag: how long synchronous work blocked the loop"""
+    return get_loop_monitor().get_stats()
+
+
 @router.get("/health/detailed")
 @log_api_request(logger)
 async def detailed_health_check(request: Request):
@@ -16,10 +16,12 @@ import os
 import sys
 import time
 from pathlib import Path
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import aiohttp
+from app.services.conversation_store import (ConversationCompactor,
+                                             get_conversation_store)
 from app.services.ui_memory import (build_ascii_layout, cache_element,
                                     confirm_element, deny_element,
                                     get_cache_stats, get_screen_resolution,
@@ -78,6 +80,32 @@ def _quick_screen_hash() -> Optional[str]:
         return None
 
 
+_settler = None
+
+
+def _screen_settler():
+    """ScreenSettler on the executing desktop (stream frames in remote mode)."""
+    global _settler
+    if _settler is None:
+        try:
+            from app.config import get_settings
+            from validation.screen_settle import (ScreenSettler,
+                                                  get_screen_settler,
+                                                  stream_source)
+
+            if get_settings().execution_mode == "remote":
+                # Streamed frames arrive at a few fps: poll slower, settle on 2
+                _settler = ScreenSettler(
+                    source=stream_source(monitor_id=0), interval=0.1, stable_frames=2
+                )
+            else:
+                _settler = get_screen_settler()
+        except Exception as e:
+            logger.debug(f"Screen settle not available: {e}")
+            return None
+    return _settler
+
+
 # ============================================
 # Session Task Storage (in-memory, per conversation)
 # ============================================
@@ -153,6 +181,8 @@ except Exception as _e:
     _logging.getLogger(__name__).warning(f"mcp_server_handoff not available: {_e}")
     _handoff_mod = None
 
+from core.llm_transport import LLMTransportError, get_llm_transport
+
 # ============================================
 # Config
 # ============================================
@@ -189,10 +219,9 @@ def _get_compaction_model() -> str:
 # When recent grows beyond COMPACT_THRESHOLD, older entries get compressed
 # into the summary by the LLM. This allows infinite-length sessions.
 #
-# Persisted to disk as JSON so conversations survive server restarts.
-
-MEMORY_DIR = Path(__file__).parent.parent.parent / "conversation_memory"
-MEMORY_DIR.mkdir(exist_ok=True)
+# Persisted in SQLite (app/services/conversation_store.py): one row per
+# message, active conversations cached in memory, compaction runs debounced
+# in the background and never drops turns that arrive meanwhile.
 
 RECENT_KEEP = 6  # Keep last 6 exchanges verbatim (user+assistant pairs)
 COMPACT_THRESHOLD = 10  # Trigger compaction when recent exceeds this
@@ -200,54 +229,43 @@ MAX_SUMMARY_CHARS = 4000  # Max chars for the rolling summary
 MAX_RECENT_CHARS = 6000  # Max chars for recent messages block
 
 
-def _memory_path(conversation_id: str) -> Path:
-    """Get the file path for a conversation's memory."""
-    safe_id = "".join(c if c.isalnum() or c in "_-" else "_" for c in conversation_id)
-    return MEMORY_DIR / f"{safe_id}.json"
-
-
 def load_conversation(conversation_id: str) -> Dict[str, Any]:
-    """Load conversation from disk. Returns {summary: str, recent: list}."""
-    path = _memory_path(conversation_id)
-    if path.exists():
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            return {
-                "summary": data.get("summary", ""),
-                "recent": data.get("recent", []),
-                "turn_count": data.get("turn_count", 0),
-            }
-        except (json.JSONDecodeError, OSError):
-            pass
-    return {"summary": "", "recent": [], "turn_count": 0}
+    """Load conversation. Returns {summary: str, recent: list, turn_count: int}."""
+    return get_conversation_store().load(conversation_id)
 
 
-def save_conversation(conversation_id: str, data: Dict[str, Any]) -> None:
-    """Save conversation to disk."""
-    path = _memory_path(conversation_id)
-    try:
-        path.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
-    except OSError as e:
-        logger.error(f"Failed to save conversation {conversation_id}: {e}")
+async def record_turn(conversation_id: str, text: str, answer: str) -> Dict[str, Any]:
+    """Append one user/assistant exchange and schedule compaction if needed.
+
+    The SQLite insert + commit runs in a worker thread, off the event loop.
+    """
+    conv = await asyncio.to_thread(
+        get_conversation_store().append_turn,
+        conversation_id,
+        [
+            {"role": "user", "content": text},
+            {"role": "assistant", "content": answer},
+        ],
+    )
+    if len(conv["recent"]) > COMPACT_THRESHOLD:
+        _compactor.schedule(conversation_id)
+    return conv
 
 
 async def compact_conversation(conversation_id: str) -> None:
     """Compress older recent messages into the rolling summary using the LLM.
     This is the key to infinite-length sessions."""
-    data = load_conversation(conversation_id)
-    recent = data["recent"]
-
-    if len(recent) <= COMPACT_THRESHOLD:
+    store = get_conversation_store()
+    window = await asyncio.to_thread(
+        store.compaction_window, conversation_id, RECENT_KEEP
+    )
+    if window is None:
         return  # Nothing to compact
 
-    # Split: older messages to compress, recent to keep
-    to_compress = recent[:-RECENT_KEEP]
-    to_keep = recent[-RECENT_KEEP:]
+    to_compress = window["entries"]
 
     # Build the text to summarize
-    old_summary = data["summary"]
+    old_summary = window["summary"]
     compress_lines = []
     for entry in to_compress:
         compress_lines.append(f"[{entry['role'].upper()}]: {entry['content']}")
@@ -269,6 +287,7 @@ ZUSAMMENFASSUNG:"""
             tools=[],
             model=_get_compaction_model(),  # Configurable via COMPACTION_MODEL
             max_tokens=1024,
+            cache_site="compaction",  # unchanged history → cached summary
         )
         new_summary = (
             response.get("choices", [{}])[0].get("message", {}).get("content", "")
@@ -277,13 +296,12 @@ ZUSAMMENFASSUNG:"""
             # Truncate if needed
             if len(new_summary) > MAX_SUMMARY_CHARS:
                 new_summary = new_summary[:MAX_SUMMARY_CHARS] + "..."
-            data["summary"] = new_summary
-            data["recent"] = to_keep
-            save_conversation(conversation_id, data)
+            await asyncio.to_thread(
+                store.apply_compaction, conversation_id, window["upto_seq"], new_summary
+            )
             logger.info(
                 f"[Memory] Compacted conversation {conversation_id}: "
-                f"{len(to_compress)} entries -> summary ({len(new_summary)} chars), "
-                f"{len(to_keep)} recent kept"
+                f"{len(to_compress)} entries -> summary ({len(new_summary)} chars)"
             )
     except Exception as e:
         logger.error(f"[Memory] Compaction failed for {conversation_id}: {e}")
@@ -293,9 +311,12 @@ ZUSAMMENFASSUNG:"""
             line = f"- {entry['role']}: {entry['content'][:100]}"
             if len(fallback_summary) + len(line) < MAX_SUMMARY_CHARS:
                 fallback_summary += "\n" + line
-        data["summary"] = fallback_summary
-        data["recent"] = to_keep
-        save_conversation(conversation_id, data)
+        await asyncio.to_thread(
+            store.apply_compaction, conversation_id, window["upto_seq"], fallback_summary
+        )
+
+
+_compactor = ConversationCompactor(compact_conversation)
 
 
 SYSTEM_PROMPT = """Du bist ein Desktop-Automations-Agent auf einem Windows-PC.
@@ -634,13 +655,13 @@ TOOLS = [
         "type": "function",
         "function": {
             "name": "wait",
-            "description": "Wait/sleep for a specified duration before next action.",
+            "description": "Wait until the screen has settled (e.g. a page or dialog finished loading) before next action. Returns early once the screen is stable.",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "seconds": {
                         "type": "number",
-                        "description": "Duration to wait in seconds",
+                        "description": "Maximum duration to wait in seconds",
                     }
                 },
                 "required": ["seconds"],
@@ -1034,6 +1055,105 @@ TOOLS = [
     },
 ]
 
+# Side-effect class per tool. Consecutive read-only calls of one LLM turn
+# run concurrently; every other call runs strictly in order.
+TOOL_READ_ONLY = "read_only"  # observes screen / data, no side effects
+TOOL_DESKTOP = "desktop"  # changes the desktop (input, focus, windows, shell)
+TOOL_EXTERNAL = "external"  # sends something to the outside world
+TOOL_AGENT_STATE = "agent_state"  # mutates per-conversation agent state
+
+TOOL_SIDE_EFFECTS: Dict[str, str] = {
+    "screen_read": TOOL_READ_ONLY,
+    "screen_find": TOOL_READ_ONLY,
+    "screen_layout": TOOL_READ_ONLY,
+    "get_focus": TOOL_READ_ONLY,
+    "list_windows": TOOL_READ_ONLY,
+    "search_contacts": TOOL_READ_ONLY,
+    "get_contact_info": TOOL_READ_ONLY,
+    "browser_read_page": TOOL_READ_ONLY,
+    "vision_analyze": TOOL_READ_ONLY,
+    "plan_task": TOOL_READ_ONLY,
+    "memory_stats": TOOL_READ_ONLY,
+    "action_click": TOOL_DESKTOP,
+    "action_type": TOOL_DESKTOP,
+    "action_press": TOOL_DESKTOP,
+    "action_hotkey": TOOL_DESKTOP,
+    "action_scroll": TOOL_DESKTOP,
+    "mouse_move": TOOL_DESKTOP,
+    "set_focus": TOOL_DESKTOP,
+    "shell_exec": TOOL_DESKTOP,
+    "wait": TOOL_DESKTOP,
+    "browser_open": TOOL_DESKTOP,
+    "browser_search": TOOL_DESKTOP,
+    "execute_plan": TOOL_DESKTOP,
+    "full_task": TOOL_DESKTOP,
+    "send_message": TOOL_EXTERNAL,
+    "report_findings": TOOL_EXTERNAL,
+    "recall_element": TOOL_AGENT_STATE,  # arms the click confirmation
+    "update_tasks": TOOL_AGENT_STATE,
+}
+
+READ_ONLY_TOOL_CONCURRENCY = int(os.getenv("LLM_READ_ONLY_TOOL_CONCURRENCY", "4"))
+
+
+def tool_side_effect(name: str) -> str:
+    """Side-effect class of a tool (unknown tools count as desktop-mutating)."""
+    return TOOL_SIDE_EFFECTS.get(name, TOOL_DESKTOP)
+
+
+def _parse_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+) -> List[Tuple[str, Dict[str, Any], str]]:
+    """(name, args, tool_call_id) per tool call of one LLM turn."""
+    parsed = []
+    for tc in tool_calls:
+        func = tc.get("function", {})
+        try:
+            tool_args = json.loads(func.get("arguments", "{}"))
+        except json.JSONDecodeError:
+            tool_args = {}
+        parsed.append(
+            (func.get("name", ""), tool_args, tc.get("id", f"call_{uuid4().hex[:8]}"))
+        )
+    return parsed
+
+
+def _prefetch_read_only_run(
+    calls: List[Tuple[str, Dict[str, Any], str]], start: int
+) -> Dict[int, asyncio.Task]:
+    """Start the run of consecutive read-only calls beginning at ``start``.
+
+    Returns {call index: task}; empty if the run has fewer than two calls.
+    The caller awaits the tasks in call order, so results (and the message
+    transcript) keep the order the LLM emitted them in.
+    """
+    end = start
+    while end < len(calls) and tool_side_effect(calls[end][0]) == TOOL_READ_ONLY:
+        end += 1
+    if end - start < 2:
+        return {}
+
+    slots = asyncio.Semaphore(READ_ONLY_TOOL_CONCURRENCY)
+
+    async def _run(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        async with slots:
+            return await execute_tool(name, args)
+
+    logger.info(
+        f"[LLM Intent] Running {end - start} read-only tools concurrently: "
+        f"{[calls[i][0] for i in range(start, end)]}"
+    )
+    return {
+        i: asyncio.create_task(_run(calls[i][0], calls[i][1]))
+        for i in range(start, end)
+    }
+
+
+def _cancel_prefetched(prefetched: Dict[int, asyncio.Task]) -> None:
+    for task in prefetched.values():
+        task.cancel()
+    prefetched.clear()
+
 
 # ============================================
 # Clawdbot Tool Execution (Messaging + Browser)
@@ -1728,9 +1848,20 @@ async def execute_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
 
         elif name == "wait":
             seconds = arguments.get("seconds", 1)
-            actual = float(seconds) * 0.25  # reduced to 0.5s for 2s waits
-            await asyncio.sleep(actual)
-            return {"success": True, "waited": seconds, "actual": actual}
+            max_wait = float(seconds) * 0.25  # reduced to 0.5s for 2s waits
+            settler = _screen_settler()
+            if settler is None:
+                await asyncio.sleep(max_wait)
+                return {"success": True, "waited": seconds, "actual": max_wait}
+            # Return as soon as the screen is stable, never later than before
+            settle = await settler.wait_for_settle(max_wait=max_wait)
+            return {
+                "success": True,
+                "waited": seconds,
+                "actual": round(settle.elapsed, 3),
+                "settled": settle.settled,
+                "reason": settle.reason,
+            }
 
         # Clawdbot Messaging Tools
         elif name == "send_message":
@@ -2083,15 +2214,16 @@ async def call_openrouter(
     tools: List[Dict[str, Any]],
     model: str = None,
     max_tokens: int = 4096,
+    cache_site: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Call OpenRouter API with tool support."""
+    """Call OpenRouter API with tool support.
+
+    cache_site opts the call into the shared LLM response cache."""
     model = model or _get_llm_model()
     if not OPENROUTER_API_KEY:
         raise ValueError("OPENROUTER_API_KEY not configured")
 
     headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
         "HTTP-Referer": "https://automation-ui.local",
         "X-Title": "Automation UI Intent Processor",
     }
@@ -2104,21 +2236,20 @@ async def call_openrouter(
         "temperature": 0.2,
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            f"{OPENROUTER_BASE_URL}/chat/completions",
+    # Shared pooled transport (keep-alive, per-model limit, retry on 429/5xx)
+    try:
+        return await get_llm_transport().chat_completions(
+            payload,
+            api_key=OPENROUTER_API_KEY,
             headers=headers,
-            json=payload,
-            timeout=aiohttp.ClientTimeout(total=500),
-        ) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                logger.error(f"OpenRouter error {response.status}: {error_text}")
-                raise Exception(
-                    f"OpenRouter API error {response.status}: {error_text[:200]}"
-                )
-
-            return await response.json()
+            timeout=500,
+            base_url=OPENROUTER_BASE_URL,
+            cache_site=cache_site,
+        )
+    except LLMTransportError as e:
+        raise Exception(
+            f"OpenRouter API error {e.status}: {e.body[:200]}"
+        ) from e
 
 
 # ============================================
@@ -2246,23 +2377,21 @@ async def run_agentic_loop(
             # Append assistant message with tool calls
             messages.append(message)
 
-            # Execute each tool call
-            for tc in tool_calls:
-                func = tc.get("function", {})
-                tool_name = func.get("name", "")
-                try:
-                    tool_args = json.loads(func.get("arguments", "{}"))
-                except json.JSONDecodeError:
-                    tool_args = {}
-
-                tc_id = tc.get("id", f"call_{uuid4().hex[:8]}")
-
+            # Execute each tool call (runs of read-only calls concurrently)
+            calls = _parse_tool_calls(tool_calls)
+            prefetched: Dict[int, asyncio.Task] = {}
+            for idx, (tool_name, tool_args, tc_id) in enumerate(calls):
                 logger.info(
                     f"[LLM Intent] Tool: {tool_name}({json.dumps(tool_args, ensure_ascii=False)[:100]})"
                 )
 
                 # Execute the tool
-                result = await execute_tool(tool_name, tool_args)
+                if idx not in prefetched:
+                    prefetched.update(_prefetch_read_only_run(calls, idx))
+                if idx in prefetched:
+                    result = await prefetched.pop(idx)
+                else:
+                    result = await execute_tool(tool_name, tool_args)
 
                 # Handle approval-required tools in remote mode
                 if result.get("_approval_required"):
@@ -2297,17 +2426,7 @@ async def run_agentic_loop(
 
             # Save to persistent conversation memory + trigger compaction
             if conversation_id:
-                conv = load_conversation(conversation_id)
-                conv["recent"].append({"role": "user", "content": text})
-                summary_condensed = summary[:500] if len(summary) > 500 else summary
-                conv["recent"].append(
-                    {"role": "assistant", "content": summary_condensed}
-                )
-                conv["turn_count"] = conv.get("turn_count", 0) + 1
-                save_conversation(conversation_id, conv)
-                # Compact in background if needed
-                if len(conv["recent"]) > COMPACT_THRESHOLD:
-                    asyncio.create_task(compact_conversation(conversation_id))
+                conv = await record_turn(conversation_id, text, summary[:500])
 
             return IntentResponse(
                 success=all_success,
@@ -2319,13 +2438,7 @@ async def run_agentic_loop(
 
     # Max iterations reached
     if conversation_id:
-        conv = load_conversation(conversation_id)
-        conv["recent"].append({"role": "user", "content": text})
-        conv["recent"].append(
-            {"role": "assistant", "content": "Aufgabe unvollstaendig (max iterations)"}
-        )
-        conv["turn_count"] = conv.get("turn_count", 0) + 1
-        save_conversation(conversation_id, conv)
+        await record_turn(conversation_id, text, "Aufgabe unvollstaendig (max iterations)")
 
     return IntentResponse(
         success=False,
@@ -2430,16 +2543,9 @@ async def run_agentic_loop_stream(
         if tool_calls:
             messages.append(message)
 
-            for tc in tool_calls:
-                func = tc.get("function", {})
-                tool_name = func.get("name", "")
-                try:
-                    tool_args = json.loads(func.get("arguments", "{}"))
-                except json.JSONDecodeError:
-                    tool_args = {}
-
-                tc_id = tc.get("id", f"call_{uuid4().hex[:8]}")
-
+            calls = _parse_tool_calls(tool_calls)
+            prefetched: Dict[int, asyncio.Task] = {}
+            for idx, (tool_name, tool_args, tc_id) in enumerate(calls):
                 # Inject conversation_id for tools that need it
                 if tool_name in ("update_tasks", "recall_element") and conversation_id:
                     tool_args["_conversation_id"] = conversation_id
@@ -2452,6 +2558,7 @@ async def run_agentic_loop_stream(
                         cancelled = True
                         break
                 if cancelled:
+                    _cancel_prefetched(prefetched)
                     yield _sse(
                         {
                             "type": "done",
@@ -2559,7 +2666,14 @@ async def run_agentic_loop_stream(
                     for k in done_keys:
                         _ff_background_tasks.pop(k, None)
                 else:
-                    result = await execute_tool(tool_name, tool_args)
+                    # Runs of read-only calls start together, results are
+                    # consumed here in call order
+                    if idx not in prefetched:
+                        prefetched.update(_prefetch_read_only_run(calls, idx))
+                    if idx in prefetched:
+                        result = await prefetched.pop(idx)
+                    else:
+                        result = await execute_tool(tool_name, tool_args)
 
                 # Handle approval-required tools in remote mode
                 if result.get("_approval_required"):
@@ -2594,6 +2708,7 @@ async def run_agentic_loop_stream(
                             if intervention["action"] == "approve_tool":
                                 approved = True
                             elif intervention["action"] == "cancel":
+                                _cancel_prefetched(prefetched)
                                 yield _sse(
                                     {
                                         "type": "cancelled",
@@ -2717,6 +2832,7 @@ async def run_agentic_loop_stream(
                                         }
                                     )
                                 elif intervention["action"] == "cancel":
+                                    _cancel_prefetched(prefetched)
                                     yield _sse(
                                         {
                                             "type": "cancelled",
@@ -2920,17 +3036,7 @@ async def run_agentic_loop_stream(
 
             # Save to persistent conversation memory + trigger compaction
             if conversation_id:
-                conv = load_conversation(conversation_id)
-                conv["recent"].append({"role": "user", "content": text})
-                summary_condensed = summary[:500] if len(summary) > 500 else summary
-                conv["recent"].append(
-                    {"role": "assistant", "content": summary_condensed}
-                )
-                conv["turn_count"] = conv.get("turn_count", 0) + 1
-                save_conversation(conversation_id, conv)
-                # Compact in background if needed
-                if len(conv["recent"]) > COMPACT_THRESHOLD:
-                    asyncio.create_task(compact_conversation(conversation_id))
+                conv = await record_turn(conversation_id, text, summary[:500])
 
             yield _sse(
                 {"type": "summary", "content": summary, "iteration": iteration + 1}
@@ -2965,13 +3071,7 @@ async def run_agentic_loop_stream(
 
     # Max iterations reached - still save partial context
     if conversation_id:
-        conv = load_conversation(conversation_id)
-        conv["recent"].append({"role": "user", "content": text})
-        conv["recent"].append(
-            {"role": "assistant", "content": "Aufgabe unvollstaendig (max iterations)"}
-        )
-        conv["turn_count"] = conv.get("turn_count", 0) + 1
-        save_conversation(conversation_id, conv)
+        await record_turn(conversation_id, text, "Aufgabe unvollstaendig (max iterations)")
 
     yield _sse(
         {
@@ -3086,6 +3186,11 @@ async def intent_health():
         "max_iterations": MAX_ITERATIONS,
         "video_agent": video_agent.enabled,
         "video_agent_model": "configured via VISION_MODEL",
+        "llm_transport": get_llm_transport().get_stats(),
+        "conversation_memory": {
+            **get_conversation_store().get_stats(),
+            "compaction": _compactor.get_stats(),
+        },
     }
 
 
@@ -19,6 +19,7 @@ from pydantic import BaseModel, Field, validator
 
 from ..logger_config import get_logger, log_api_request
 from ..services import get_service_manager
+from ..services.shell_service import run_subprocess
 
 logger = get_logger("shell")
 
@@ -211,30 +212,24 @@ async def get_shell_status(request: Request):
 
         # Test PowerShell
         try:
-            result = subprocess.run(
-                ["powershell", "-Command", 'echo "test"'],
-                capture_output=True,
-                timeout=5,
+            returncode, _, _ = await run_subprocess(
+                ["powershell", "-Command", 'echo "test"'], 5
             )
-            shell_availability["powershell"] = result.returncode == 0
+            shell_availability["powershell"] = returncode == 0
         except:
             shell_availability["powershell"] = False
 
         # Test CMD
         try:
-            result = subprocess.run(
-                ["cmd", "/c", "echo test"], capture_output=True, timeout=5
-            )
-            shell_availability["cmd"] = result.returncode == 0
+            returncode, _, _ = await run_subprocess(["cmd", "/c", "echo test"], 5)
+            shell_availability["cmd"] = returncode == 0
         except:
             shell_availability["cmd"] = False
 
         # Test Bash (WSL or Git Bash)
         try:
-            result = subprocess.run(
-                ["bash", "-c", "echo test"], capture_output=True, timeout=5
-            )
-            shell_availability["bash"] = result.returncode == 0
+            returncode, _, _ = await run_subprocess(["bash", "-c", "echo test"], 5)
+            shell_availability["bash"] = returncode == 0
         except:
             shell_availability["bash"] = False
 
@@ -287,19 +282,17 @@ async def execute_powershell_command(request: ShellCommandRequest):
 
         # Execute command
         start_time = datetime.now()
-        result = subprocess.run(
+        returncode, stdout, stderr = await run_subprocess(
             ["powershell", "-Command", request.command],
-            capture_output=True,
-            text=True,
-            timeout=request.timeout,
+            request.timeout,
             cwd=cwd,
             env=env,
         )
         execution_time = (datetime.now() - start_time).total_seconds()
 
         # Truncate output if too long
-        stdout = result.stdout[:MAX_OUTPUT_LENGTH] if result.stdout else ""
-        stderr = result.stderr[:MAX_OUTPUT_LENGTH] if result.stderr else ""
+        stdout = stdout[:MAX_OUTPUT_LENGTH]
+        stderr = stderr[:MAX_OUTPUT_LENGTH]
 
         # Update session if provided
         if request.session_id and request.session_id in active_sessions:
@@ -309,15 +302,15 @@ async def execute_powershell_command(request: ShellCommandRequest):
                 {
                     "command": request.command,
                     "timestamp": start_time.isoformat(),
-                    "exit_code": result.returncode,
+                    "exit_code": returncode,
                     "execution_time": execution_time,
                 }
             )
 
         return JSONResponse(
             content={
-                "success": result.returncode == 0,
-                "exit_code": result.returncode,
+                "success": returncode == 0,
+                "exit_code": returncode,
                 "stdout": stdout,
                 "stderr": stderr,
                 "execution_time": execution_time,
@@ -365,19 +358,17 @@ async def execute_cmd_command(request: ShellCommandRequest):
 
         # Execute command
         start_time = datetime.now()
-        result = subprocess.run(
+        returncode, stdout, stderr = await run_subprocess(
             ["cmd", "/c", request.command],
-            capture_output=True,
-            text=True,
-            timeout=request.timeout,
+            request.timeout,
             cwd=cwd,
             env=env,
         )
         execution_time = (datetime.now() - start_time).total_seconds()
 
         # Truncate output if too long
-        stdout = result.stdout[:MAX_OUTPUT_LENGTH] if result.stdout else ""
-        stderr = result.stderr[:MAX_OUTPUT_LENGTH] if result.stderr else ""
+        stdout = stdout[:MAX_OUTPUT_LENGTH]
+        stderr = stderr[:MAX_OUTPUT_LENGTH]
 
         # Update session if provided
         if request.session_id and request.session_id in active_sessions:
@@ -387,15 +378,15 @@ async def execute_cmd_command(request: ShellCommandRequest):
                 {
                     "command": request.command,
                     "timestamp": start_time.isoformat(),
-                    "exit_code": result.returncode,
+                    "exit_code": returncode,
                     "execution_time": execution_time,
                 }
             )
 
         return JSONResponse(
             content={
-                "success": result.returncode == 0,
-                "exit_code": result.returncode,
+                "success": returncode == 0,
+                "exit_code": returncode,
                 "stdout": stdout,
                 "stderr": stderr,
                 "execution_time": execution_time,
@@ -443,19 +434,17 @@ async def execute_bash_command(request: ShellCommandRequest):
 
         # Execute command
         start_time = datetime.now()
-        result = subprocess.run(
+        returncode, stdout, stderr = await run_subprocess(
             ["bash", "-c", request.command],
-            capture_output=True,
-            text=True,
-            timeout=request.timeout,
+            request.timeout,
             cwd=cwd,
             env=env,
         )
         execution_time = (datetime.now() - start_time).total_seconds()
 
         # Truncate output if too long
-        stdout = result.stdout[:MAX_OUTPUT_LENGTH] if result.stdout else ""
-        stderr = result.stderr[:MAX_OUTPUT_LENGTH] if result.stderr else ""
+        stdout = stdout[:MAX_OUTPUT_LENGTH]
+        stderr = stderr[:MAX_OUTPUT_LENGTH]
 
         # Update session if provided
         if request.session_id and request.session_id in active_sessions:
@@ -465,15 +454,15 @@ async def execute_bash_command(request: ShellCommandRequest):
                 {
                     "command": request.command,
                     "timestamp": start_time.isoformat(),
-                    "exit_code": result.returncode,
+                    "exit_code": returncode,
                     "execution_time": execution_time,
                 }
             )
 
         return JSONResponse(
             content={
-                "success": result.returncode == 0,
-                "exit_code": result.returncode,
+                "success": returncode == 0,
+                "exit_code": returncode,
                 "stdout": stdout,
                 "stderr": stderr,
                 "execution_time": execution_time,
@@ -13,6 +13,7 @@ from typing import Any, Dict, Set
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from ..logger_config import get_logger
+from ..services.cluster_relay import DESKTOP_CLIENT_TYPES, cluster_relay
 
 logger = get_logger("websocket_router")
 
@@ -51,14 +52,21 @@ class ConnectionManager:
             del self.client_info[client_id]
         logger.info(f"🔌 Client disconnected: {client_id}")
 
-    async def send_personal_message(self, message: str, client_id: str):
-        """Send message to specific client"""
+    async def send_personal_message(self, message: str, client_id: str) -> bool:
+        """Send message to specific client
+
+        Clients connected to another worker are reached through the cluster
+        relay (cluster mode). Returns False if the client is not reachable.
+        """
         if client_id in self.active_connections:
             try:
                 await self.active_connections[client_id].send_text(message)
+                return True
             except Exception as e:
                 logger.error(f"❌ Failed to send message to {client_id}: {e}")
                 self.disconnect(client_id)
+                return False
+        return await cluster_relay.send_to_client(client_id, message)
 
     async def send_binary_message(self, data: bytes, client_id: str):
         """Send binary data to specific client"""
@@ -172,6 +180,14 @@ async def websocket_live_desktop(websocket: WebSocket):
         await websocket.send_text(json.dumps(handshake_response))
         logger.info(f"✅ Handshake completed for {client_id} ({client_type})")
 
+        # Cluster mode: tell the other workers where this client lives
+        await cluster_relay.claim(client_id, client_type, client_info_data)
+
+        # Deliver commands that were queued while the client was offline
+        from ..services.command_delivery import command_delivery
+
+        await command_delivery.replay(client_id)
+
         # Handle messages
         while True:
             try:
@@ -204,6 +220,10 @@ async def websocket_live_desktop(websocket: WebSocket):
                 except Exception as e:
                     logger.error(f"❌ Error stopping streaming for {client_id}: {e}")
             manager.disconnect(client_id)
+            try:
+                await cluster_relay.release(client_id)
+            except Exception as e:
+                logger.debug(f"Cluster presence release failed for {client_id}: {e}")
 
 
 async def handle_websocket_message(
@@ -300,6 +320,12 @@ async def handle_websocket_message(
                 )
             )
 
+        elif message_type == "command_ack":
+            # ACK from desktop client for a pushed queue command
+            from ..services.command_delivery import command_delivery
+
+            await command_delivery.handle_ack(client_id, message)
+
         elif message_type == "action_ack":
             # ACK from desktop client for a delegated action (remote mode)
             from ..services.action_router import action_router
@@ -310,7 +336,11 @@ async def handle_websocket_message(
                 "result": message.get("result", {}),
                 "executionTimeMs": message.get("executionTimeMs", 0),
             }
-            resolved = action_router.handle_ack(command_id, ack_result)
+            # Cluster mode: the action may have been sent by another worker
+            if await cluster_relay.route_action_ack(command_id, ack_result):
+                resolved = True
+            else:
+                resolved = action_router.handle_ack(command_id, ack_result)
             if resolved:
                 logger.info(
                     f"Action ACK resolved: {command_id} (success={ack_result['success']})"
@@ -344,6 +374,7 @@ async def handle_frame_data(
     Receives frame data from the desktop client and broadcasts it to:
     1. Frontend viewers who subscribed to this desktop stream
     2. AutoGen agents who need the frames for analysis
+    3. Viewers connected to other workers (cluster mode, via Redis)
     """
     frame_data = message.get("frameData")
     frame_number = message.get("frameNumber", 0)
@@ -353,7 +384,33 @@ async def handle_frame_data(
     if not frame_data:
         return
 
-    # Store frame in StreamFrameCache for MCP tools (vision_analyze, handoff_read_screen)
+    _cache_frame(monitor_id, frame_data, metadata)
+
+    # Track that this client is a desktop source
+    if client_id not in desktop_stream_subscribers:
+        desktop_stream_subscribers[client_id] = set()
+        logger.info(f"📺 New desktop stream source registered: {client_id}")
+
+    await _broadcast_frame(client_id, frame_data, frame_number, monitor_id, metadata)
+
+    # Cluster mode: viewers on other workers (binary, only while subscribed)
+    if cluster_relay.enabled:
+        try:
+            await cluster_relay.publish_frame(
+                client_id,
+                {
+                    "frameNumber": frame_number,
+                    "monitorId": monitor_id,
+                    "metadata": metadata,
+                },
+                frame_data,
+            )
+        except Exception as e:
+            logger.debug(f"Cluster frame publish failed for {client_id}: {e}")
+
+
+def _cache_frame(monitor_id: Any, frame_data: str, metadata: Dict) -> None:
+    """Store frame in StreamFrameCache for MCP tools (vision_analyze, handoff_read_screen)"""
     try:
         import os
         import sys
@@ -378,6 +435,11 @@ async def handle_frame_data(
     except Exception as cache_error:
         logger.debug(f"⚠️ Cache update failed: {cache_error}")
 
+
+async def _broadcast_frame(
+    client_id: str, frame_data: str, frame_number: int, monitor_id: Any, metadata: Dict
+) -> None:
+    """Send a desktop frame to the local viewers and autogen agents"""
     # Create frame message for subscribers - use 'frame_data' type to match frontend expectation
     frame_message = json.dumps(
         {
@@ -392,11 +454,6 @@ async def handle_frame_data(
         }
     )
 
-    # Track that this client is a desktop source
-    if client_id not in desktop_stream_subscribers:
-        desktop_stream_subscribers[client_id] = set()
-        logger.info(f"📺 New desktop stream source registered: {client_id}")
-
     # Broadcast to all subscribers of this desktop client
     subscribers = desktop_stream_subscribers.get(client_id, set())
     disconnected = []
@@ -413,7 +470,7 @@ async def handle_frame_data(
 
     # Clean up disconnected viewers
     for viewer_id in disconnected:
-        desktop_stream_subscribers[client_id].discard(viewer_id)
+        subscribers.discard(viewer_id)
 
     # Also broadcast to autogen_agent clients
     for other_client_id, info in manager.client_info.items():
@@ -428,17 +485,22 @@ async def handle_frame_data(
 
 
 async def handle_get_commands(websocket: WebSocket, client_id: str, message: Dict):
-    """Handle command poll from Desktop Client
+    """Handle command poll from older Desktop Clients
 
-    Desktop clients periodically poll for pending commands.
-    Returns empty list for now - commands are sent proactively.
+    Commands are pushed by CommandDelivery as soon as they are enqueued;
+    polling clients get the still unacknowledged ones.
     """
-    # TODO: Implement command queue if needed
+    from ..services.command_delivery import command_delivery
+
+    try:
+        commands = await command_delivery.pending_payloads(client_id)
+    except RuntimeError:
+        commands = []  # database not initialized
     await websocket.send_text(
         json.dumps(
             {
                 "type": "commands",
-                "commands": [],
+                "commands": commands,
                 "timestamp": datetime.now().isoformat(),
             }
         )
@@ -495,6 +557,7 @@ async def handle_subscribe_desktop_stream(
             desktop_stream_subscribers[desktop_client_id] = set()
 
         desktop_stream_subscribers[desktop_client_id].add(client_id)
+        await _watch_remote_desktop(desktop_client_id)
 
         await websocket.send_text(
             json.dumps(
@@ -566,6 +629,7 @@ async def handle_start_stream(websocket: WebSocket, client_id: str, message: Dic
         desktop_stream_subscribers[desktop_client_id] = set()
 
     desktop_stream_subscribers[desktop_client_id].add(client_id)
+    await _watch_remote_desktop(desktop_client_id)
 
     # Send confirmation
     await websocket.send_text(
@@ -583,22 +647,50 @@ async def handle_start_stream(websocket: WebSocket, client_id: str, message: Dic
         f"🎬 Web client {client_id} subscribed to stream from desktop client {desktop_client_id}"
     )
 
-    # If the desktop client is connected, notify it to start capturing (if not already)
-    if desktop_client_id in manager.active_connections:
-        try:
-            await manager.active_connections[desktop_client_id].send_text(
-                json.dumps(
-                    {
-                        "type": "start_capture",
-                        "monitor_id": monitor_id,
-                        "requestedBy": client_id,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
-            )
+    # If the desktop client is connected (here or on another worker), notify it
+    # to start capturing (if not already)
+    try:
+        sent = await manager.send_personal_message(
+            json.dumps(
+                {
+                    "type": "start_capture",
+                    "monitor_id": monitor_id,
+                    "requestedBy": client_id,
+                    "timestamp": datetime.now().isoformat(),
+                }
+            ),
+            desktop_client_id,
+        )
+        if sent:
             logger.info(f"📤 Sent start_capture to desktop client {desktop_client_id}")
+    except Exception as e:
+        logger.error(f"❌ Failed to send start_capture to {desktop_client_id}: {e}")
+
+
+async def _watch_remote_desktop(desktop_client_id: str) -> None:
+    """Cluster mode: receive frames of a desktop connected to another worker"""
+    if cluster_relay.enabled and desktop_client_id not in manager.active_connections:
+        try:
+            await cluster_relay.watch_frames(desktop_client_id)
         except Exception as e:
-            logger.error(f"❌ Failed to send start_capture to {desktop_client_id}: {e}")
+            logger.warning(f"⚠️ Cluster frame subscription failed: {e}")
+
+
+def _desktop_client_entry(client_id: str, client_type: str, info: Dict) -> Dict:
+    """Entry of the desktop clients list for a client's handshake info"""
+    monitors = info.get("monitors", [])
+    return {
+        "id": client_id,
+        "clientId": client_id,
+        "name": info.get("hostname", f"Desktop {client_id[:8]}"),
+        "status": "connected",
+        "connected": True,
+        "clientType": client_type,
+        "monitors": monitors,
+        "availableMonitors": monitors,
+        "version": info.get("version", "unknown"),
+        "hostname": info.get("hostname", "unknown"),
+    }
 
 
 async def handle_get_desktop_clients(
@@ -612,30 +704,29 @@ async def handle_get_desktop_clients(
         for other_client_id, info in manager.client_info.items():
             client_type = info.get("clientType", "")
             # Include desktop capture clients (dual_screen_desktop, desktop_capture, multi_monitor_desktop_capture)
-            if client_type in [
-                "dual_screen_desktop",
-                "desktop_capture",
-                "multi_monitor_desktop_capture",
-                "desktop",
-            ]:
-                monitors = info.get("monitors", [])
-                # Create client entry with monitor info
-                client_entry = {
-                    "id": other_client_id,
-                    "clientId": other_client_id,
-                    "name": info.get("hostname", f"Desktop {other_client_id[:8]}"),
-                    "status": "connected",
-                    "connected": True,
-                    "clientType": client_type,
-                    "monitors": monitors,
-                    "availableMonitors": monitors,
-                    "version": info.get("version", "unknown"),
-                    "hostname": info.get("hostname", "unknown"),
-                }
+            if client_type in DESKTOP_CLIENT_TYPES:
+                client_entry = _desktop_client_entry(other_client_id, client_type, info)
                 desktop_clients.append(client_entry)
                 logger.info(
-                    f"📺 Found connected desktop client: {other_client_id} with {len(monitors)} monitors"
+                    f"📺 Found connected desktop client: {other_client_id} with {len(client_entry['monitors'])} monitors"
+                )
+
+        # Cluster mode: desktop clients connected to other workers
+        if cluster_relay.enabled:
+            local_ids = {entry["id"] for entry in desktop_clients}
+            try:
+                remote = await cluster_relay.remote_desktop_clients()
+            except Exception as e:
+                logger.warning(f"⚠️ Cluster presence lookup failed: {e}")
+                remote = []
+            for other_client_id, presence in remote:
+                if other_client_id in local_ids:
+                    continue
+                client_entry = _desktop_client_entry(
+                    other_client_id, presence["type"], presence.get("info") or {}
                 )
+                client_entry["worker"] = presence["worker"]
+                desktop_clients.append(client_entry)
 
         # If no connected desktop clients, fallback to local monitors (for testing)
         if not desktop_clients and desktop_service:
@@ -978,11 +1069,15 @@ async def handle_mcp_call(websocket: WebSocket, client_id: str, message: Dict):
 @router.get("/health")
 async def websocket_health():
     """WebSocket router health check"""
+    from ..services.command_delivery import command_delivery
+
     return {
         "status": "ok",
         "router": "websocket",
         "active_connections": manager.get_connection_count(),
         "clients": manager.get_client_list(),
+        "command_delivery": command_delivery.get_stats(),
+        "cluster": cluster_relay.get_stats(),
         "endpoints": ["/ws/live-desktop", "/ws/echo", "/ws/health"],
     }
 
@@ -1269,6 +1364,57 @@ async def setup_task_queue_bridge():
         return False
 
 
+async def _deliver_relayed_message(client_id: str, message: str) -> bool:
+    """Cluster relay → local socket of ``client_id``"""
+    if client_id not in manager.active_connections:
+        return False
+    return await manager.send_personal_message(message, client_id)
+
+
+async def _broadcast_relayed_frame(
+    desktop_client_id: str, header: Dict[str, Any], frame_data: str
+) -> None:
+    """Cluster relay → local viewers of a desktop on another worker"""
+    metadata = header.get("metadata", {})
+    monitor_id = header.get("monitorId", "monitor_0")
+    _cache_frame(monitor_id, frame_data, metadata)
+    await _broadcast_frame(
+        desktop_client_id, frame_data, header.get("frameNumber", 0), monitor_id, metadata
+    )
+
+
+def _relayed_action_ack(command_id: str, result: Dict[str, Any]) -> bool:
+    from ..services.action_router import action_router
+
+    return action_router.handle_ack(command_id, result)
+
+
+def _has_local_viewers(desktop_client_id: str) -> bool:
+    return any(
+        viewer_id in manager.active_connections
+        for viewer_id in desktop_stream_subscribers.get(desktop_client_id, ())
+    )
+
+
+async def setup_cluster_relay(redis_url: str) -> bool:
+    """Start the cluster relay (multi-worker mode).
+
+    Call this during app startup when CLUSTER_MODE is enabled.
+    """
+    try:
+        await cluster_relay.start(
+            redis_url,
+            on_client_message=_deliver_relayed_message,
+            on_frame=_broadcast_relayed_frame,
+            on_action_ack=_relayed_action_ack,
+            has_local_viewers=_has_local_viewers,
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Cluster relay setup failed (Redis may not be running): {e}")
+        return False
+
+
 async def get_task_queue_status() -> Dict[str, Any]:
     """Get task queue bridge status"""
     try:
@@ -377,6 +377,55 @@ async def execute_workflow(workflow_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{workflow_id}/execute/from/{node_id}")
+async def rerun_workflow_from_node(workflow_id: str, node_id: str):
+    """Re-run a workflow from one node, reusing the previous run's upstream results"""
+    try:
+        logger.info(f"API Request: rerun_workflow_from_node - {workflow_id}/{node_id}")
+
+        if workflow_id not in workflows_storage:
+            raise HTTPException(
+                status_code=404, detail=f"Workflow {workflow_id} not found"
+            )
+
+        workflow = workflows_storage[workflow_id]
+        if not any(node.id == node_id for node in workflow.nodes):
+            raise HTTPException(
+                status_code=404,
+                detail=f"Node {node_id} not found in workflow {workflow_id}",
+            )
+
+        # Get graph execution service with dependencies
+        try:
+            graph_service = await _get_graph_execution_service_with_deps()
+        except Exception as e:
+            logger.error(f"Failed to create graph execution service: {e}")
+            raise HTTPException(
+                status_code=503, detail="Graph execution service not available"
+            )
+
+        graph_id = await graph_service.rerun_from_node(workflow, node_id)
+        state = graph_service.get_execution_status(graph_id) or {}
+
+        logger.info(f"API Response: rerun_workflow_from_node completed - {workflow_id}")
+
+        return {
+            "success": True,
+            "workflow_id": workflow_id,
+            "from_node": node_id,
+            "result": graph_id,
+            "status": state.get("status"),
+            "node_results": state.get("node_results", {}),
+            "message": f"Workflow '{workflow.name}' re-run from node {node_id}",
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Rerun workflow error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/{workflow_id}/execute/advanced")
 async def execute_workflow_advanced(
     workflow_id: str,
@@ -12,6 +12,7 @@ import time
 from typing import Any, Dict, Optional
 from uuid import uuid4
 
+from app.services.cluster_relay import cluster_relay
 from app.services.tool_safety import ToolRisk, get_tool_risk
 
 logger = logging.getLogger(__name__)
@@ -86,6 +87,9 @@ class ActionRouter:
             return {"success": False, "error": "WebSocket manager not configured"}
 
         target = self._resolve_target_client()
+        if not target and cluster_relay.enabled:
+            # Cluster mode: the desktop client may be connected to another worker
+            target = await cluster_relay.find_desktop_client(self._target_client_id)
         if not target:
             return {
                 "success": False,
@@ -107,13 +111,20 @@ class ActionRouter:
 
         try:
             ws = self._ws_manager.active_connections.get(target)
-            if not ws:
-                return {
-                    "success": False,
-                    "error": f"Desktop client '{target}' not connected",
-                }
-
-            await ws.send_text(json.dumps(command_msg))
+            if ws:
+                await ws.send_text(json.dumps(command_msg))
+            else:
+                # The owning worker routes the client's ACK back to us
+                relayed = await cluster_relay.send_to_client(
+                    target, json.dumps(command_msg), ack_to=command_id
+                )
+                if not relayed:
+                    return {
+                        "success": False,
+                        "error": f"Desktop client '{target}' not connected",
+                    }
+                # Keep this worker's StreamFrameCache fed for the video agent
+                await cluster_relay.watch_frames(target, pin=True)
             logger.info(
                 f"[ActionRouter] Sent {tool_name} to {target} (cmd={command_id})"
             )
@@ -0,0 +1,469 @@
+"""
+Cluster Relay - run several backend workers behind one Redis.
+
+Every worker owns the WebSockets it accepted (ConnectionManager stays
+process-local). The relay connects the workers:
+
+- Presence: ``relay:presence`` (HASH client_id -> {"worker", "type",
+  "info"}) says which worker holds a client's socket; ``info`` carries
+  the handshake fields of the desktop client list (hostname, monitors).
+  Each worker refreshes ``relay:alive:<worker>`` (TTL) so entries of
+  crashed workers are ignored.
+- Directed messages: every worker listens on ``relay:inbox:<worker>``.
+  A message for a client on another worker (commands, start_capture,
+  execute_action) is published to the owner's inbox and sent there.
+- ACKs: when an ``execute_action`` is relayed, the owner remembers the
+  origin worker per commandId and routes the client's ``action_ack`` back.
+- Frames: the worker receiving a desktop's frames publishes them as
+  binary (JSON header + raw image bytes, no base64) on
+  ``relay:frames:<desktop_client_id>``. Workers with viewers of that
+  desktop subscribe; without subscribers the owner stops publishing.
+
+Enable with ``CLUSTER_MODE=true``. Local test with two workers:
+
+    redis-server &
+    CLUSTER_MODE=true uvicorn app.main:app --port 8007 &
+    CLUSTER_MODE=true uvicorn app.main:app --port 8008 &
+    # desktop client -> ws://localhost:8007/ws/live-desktop
+    # viewer         -> ws://localhost:8008/ws/live-desktop (start_stream)
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_KEY = "relay:presence"
+ALIVE_PREFIX = "relay:alive:"
+INBOX_PREFIX = "relay:inbox:"
+FRAMES_PREFIX = "relay:frames:"
+
+DESKTOP_CLIENT_TYPES = {
+    "dual_screen_desktop",
+    "desktop_capture",
+    "multi_monitor_desktop_capture",
+    "desktop",
+}
+# Handshake fields copied into presence entries
+PRESENCE_INFO_FIELDS = ("hostname", "monitors", "version")
+
+# Callbacks registered by the WebSocket router
+ClientMessageHandler = Callable[[str, str], Awaitable[bool]]
+FrameHandler = Callable[[str, Dict[str, Any], str], Awaitable[None]]
+AckHandler = Callable[[str, Dict[str, Any]], Any]
+ViewerCheck = Callable[[str], bool]
+
+
+def encode_frame(header: Dict[str, Any], frame_base64: str) -> bytes:
+    """Binary frame envelope: JSON header, newline, raw image bytes."""
+    prefix = ""
+    if frame_base64.startswith("data:"):
+        prefix, frame_base64 = frame_base64.split(",", 1)
+        prefix += ","
+    head = json.dumps({**header, "prefix": prefix}, separators=(",", ":"))
+    return head.encode("utf-8") + b"\n" + base64.b64decode(frame_base64)
+
+
+def decode_frame(payload: bytes) -> Tuple[Dict[str, Any], str]:
+    """Inverse of ``encode_frame`` → (header, base64 frame as received)."""
+    head, raw = payload.split(b"\n", 1)
+    header = json.loads(head)
+    prefix = header.pop("prefix", "")
+    return header, prefix + base64.b64encode(raw).decode("ascii")
+
+
+class ClusterRelay:
+    """Routes messages, ACKs and frames between backend workers via Redis."""
+
+    def __init__(
+        self,
+        heartbeat_s: float = 5.0,
+        alive_ttl_s: int = 15,
+        presence_cache_s: float = 2.0,
+        frame_backoff_s: float = 1.0,
+        ack_route_ttl_s: float = 300.0,
+    ):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.heartbeat_s = heartbeat_s
+        self.alive_ttl_s = alive_ttl_s
+        self.presence_cache_s = presence_cache_s
+        self.frame_backoff_s = frame_backoff_s
+        self.ack_route_ttl_s = ack_route_ttl_s
+
+        self._redis: Optional[redis.Redis] = None
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+        self._local_clients: Dict[str, str] = {}  # client_id -> clientType
+        self._local_info: Dict[str, Dict[str, Any]] = {}  # client_id -> presence info
+        self._watched: Set[str] = set()  # desktop ids whose frames we receive
+        self._pinned: Set[str] = set()  # watched regardless of local viewers
+        self._presence_cache: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self._frame_backoff: Dict[str, float] = {}  # desktop id -> resume time
+        self._ack_routes: Dict[str, Tuple[str, float]] = {}  # commandId -> (worker, ts)
+
+        self._on_client_message: Optional[ClientMessageHandler] = None
+        self._on_frame: Optional[FrameHandler] = None
+        self._on_action_ack: Optional[AckHandler] = None
+        self._has_local_viewers: Optional[ViewerCheck] = None
+
+        self.stats = {
+            "messages_relayed": 0,
+            "messages_received": 0,
+            "frames_published": 0,
+            "frames_skipped": 0,
+            "frames_received": 0,
+            "frame_bytes_published": 0,
+            "acks_routed": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    @property
+    def inbox(self) -> str:
+        return f"{INBOX_PREFIX}{self.worker_id}"
+
+    # ─── Lifecycle ──────────────────────────────────────────────────────────
+
+    async def start(
+        self,
+        redis_url: str,
+        on_client_message: ClientMessageHandler,
+        on_frame: FrameHandler,
+        on_action_ack: AckHandler,
+        has_local_viewers: ViewerCheck,
+    ) -> None:
+        """Connect to Redis, announce this worker and start listening."""
+        if self.enabled:
+            return
+        client = redis.from_url(redis_url, decode_responses=False)
+        await client.ping()
+        self._redis = client
+        self._on_client_message = on_client_message
+        self._on_frame = on_frame
+        self._on_action_ack = on_action_ack
+        self._has_local_viewers = has_local_viewers
+
+        self._pubsub = client.pubsub()
+        await self._pubsub.subscribe(self.inbox)
+        await self._refresh_alive()
+        self._listener_task = asyncio.create_task(
+            self._listen(), name="cluster-relay-listen"
+        )
+        self._heartbeat_task = asyncio.create_task(
+            self._heartbeat(), name="cluster-relay-heartbeat"
+        )
+        logger.info(f"Cluster relay started: worker {self.worker_id} ({redis_url})")
+
+    async def stop(self) -> None:
+        if not self.enabled:
+            return
+        for task in (self._listener_task, self._heartbeat_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._listener_task = self._heartbeat_task = None
+        try:
+            for client_id in list(self._local_clients):
+                await self.release(client_id)
+            await self._redis.delete(f"{ALIVE_PREFIX}{self.worker_id}")
+            await self._pubsub.close()
+            await self._redis.close()
+        except Exception as e:
+            logger.debug(f"Cluster relay shutdown: {e}")
+        self._redis = None
+        self._pubsub = None
+        self._watched.clear()
+        self._pinned.clear()
+        logger.info(f"Cluster relay stopped: worker {self.worker_id}")
+
+    async def _refresh_alive(self) -> None:
+        await self._redis.set(
+            f"{ALIVE_PREFIX}{self.worker_id}", b"1", ex=self.alive_ttl_s
+        )
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_s)
+            try:
+                await self._refresh_alive()
+                # Re-claim local clients (presence may have been overwritten
+                # by a stale worker or flushed)
+                for client_id, client_type in list(self._local_clients.items()):
+                    await self._write_presence(client_id, client_type)
+                # Stop receiving frames nobody on this worker watches
+                for desktop_id in list(self._watched - self._pinned):
+                    if not self._has_local_viewers(desktop_id):
+                        await self.unwatch_frames(desktop_id)
+                cutoff = time.time() - self.ack_route_ttl_s
+                for command_id, (_, ts) in list(self._ack_routes.items()):
+                    if ts < cutoff:
+                        del self._ack_routes[command_id]
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cluster relay heartbeat failed: {e}")
+
+    # ─── Presence ───────────────────────────────────────────────────────────
+
+    async def _write_presence(self, client_id: str, client_type: str) -> None:
+        entry = {"worker": self.worker_id, "type": client_type}
+        info = self._local_info.get(client_id)
+        if info:
+            entry["info"] = info
+        await self._redis.hset(PRESENCE_KEY, client_id, json.dumps(entry))
+
+    async def claim(
+        self,
+        client_id: str,
+        client_type: str = "unknown",
+        client_info: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Announce that this worker holds ``client_id``'s socket.
+
+        Args:
+            client_info: Handshake ``clientInfo``; PRESENCE_INFO_FIELDS of it
+                are published with the presence entry
+        """
+        if not self.enabled:
+            return
+        self._local_clients[client_id] = client_type
+        self._local_info[client_id] = {
+            key: client_info[key]
+            for key in PRESENCE_INFO_FIELDS
+            if client_info and key in client_info
+        }
+        self._presence_cache.pop(client_id, None)
+        await self._write_presence(client_id, client_type)
+
+    async def release(self, client_id: str) -> None:
+        """Remove the presence entry if it still points to this worker."""
+        self._local_clients.pop(client_id, None)
+        self._local_info.pop(client_id, None)
+        if not self.enabled:
+            return
+        raw = await self._redis.hget(PRESENCE_KEY, client_id)
+        if raw and json.loads(raw).get("worker") == self.worker_id:
+            await self._redis.hdel(PRESENCE_KEY, client_id)
+
+    async def locate(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """Presence entry of a client on a live worker (cached briefly)."""
+        now = time.monotonic()
+        cached = self._presence_cache.get(client_id)
+        if cached is not None and now - cached[0] < self.presence_cache_s:
+            return cached[1]
+
+        info = None
+        raw = await self._redis.hget(PRESENCE_KEY, client_id)
+        if raw:
+            entry = json.loads(raw)
+            if await self._redis.exists(f"{ALIVE_PREFIX}{entry['worker']}"):
+                info = entry
+        self._presence_cache[client_id] = (now, info)
+        return info
+
+    async def find_desktop_client(
+        self, preferred: Optional[str] = None
+    ) -> Optional[str]:
+        """A desktop client connected to any live worker (``preferred`` first)."""
+        if not self.enabled:
+            return None
+        if preferred and await self.locate(preferred):
+            return preferred
+        entries = await self._redis.hgetall(PRESENCE_KEY)
+        for raw_id, raw in entries.items():
+            client_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+            if json.loads(raw).get(
+                "type"
+            ) in DESKTOP_CLIENT_TYPES and await self.locate(client_id):
+                return client_id
+        return None
+
+    async def remote_desktop_clients(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Desktop clients held by other live workers → [(client_id, entry)]."""
+        if not self.enabled:
+            return []
+        entries = await self._redis.hgetall(PRESENCE_KEY)
+        alive: Dict[str, bool] = {}
+        clients = []
+        for raw_id, raw in entries.items():
+            entry = json.loads(raw)
+            worker = entry.get("worker")
+            if (
+                entry.get("type") not in DESKTOP_CLIENT_TYPES
+                or worker == self.worker_id
+            ):
+                continue
+            if worker not in alive:
+                alive[worker] = bool(
+                    await self._redis.exists(f"{ALIVE_PREFIX}{worker}")
+                )
+            if alive[worker]:
+                client_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+                clients.append((client_id, entry))
+        return clients
+
+    # ─── Directed messages / ACKs ───────────────────────────────────────────
+
+    async def _publish_inbox(self, worker_id: str, envelope: Dict[str, Any]) -> bool:
+        receivers = await self._redis.publish(
+            f"{INBOX_PREFIX}{worker_id}", json.dumps(envelope)
+        )
+        return receivers > 0
+
+    async def send_to_client(
+        self, client_id: str, message: str, ack_to: Optional[str] = None
+    ) -> bool:
+        """Send a text message to a client connected to another worker.
+
+        Args:
+            ack_to: commandId whose ``action_ack`` must come back to this worker
+        """
+        if not self.enabled:
+            return False
+        info = await self.locate(client_id)
+        if info is None or info["worker"] == self.worker_id:
+            return False
+        sent = await self._publish_inbox(
+            info["worker"],
+            {
+                "kind": "client_message",
+                "client_id": client_id,
+                "message": message,
+                "ack_to": ack_to,
+                "origin": self.worker_id,
+            },
+        )
+        if sent:
+            self.stats["messages_relayed"] += 1
+        else:
+            self._presence_cache.pop(client_id, None)
+        return sent
+
+    async def route_action_ack(self, command_id: str, result: Dict[str, Any]) -> bool:
+        """Forward an ``action_ack`` to the worker that sent the action."""
+        route = self._ack_routes.pop(command_id, None)
+        if route is None or not self.enabled:
+            return False
+        self.stats["acks_routed"] += 1
+        return await self._publish_inbox(
+            route[0], {"kind": "action_ack", "command_id": command_id, "result": result}
+        )
+
+    # ─── Frames ─────────────────────────────────────────────────────────────
+
+    async def publish_frame(
+        self, desktop_client_id: str, header: Dict[str, Any], frame_base64: str
+    ) -> bool:
+        """Publish a frame for viewers on other workers.
+
+        If nobody is subscribed, publishing pauses for ``frame_backoff_s``
+        (a new viewer sees the stream within that delay).
+        """
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        if self._frame_backoff.get(desktop_client_id, 0.0) > now:
+            self.stats["frames_skipped"] += 1
+            return False
+        payload = encode_frame(header, frame_base64)
+        receivers = await self._redis.publish(
+            f"{FRAMES_PREFIX}{desktop_client_id}", payload
+        )
+        if receivers == 0:
+            self._frame_backoff[desktop_client_id] = now + self.frame_backoff_s
+            return False
+        self._frame_backoff.pop(desktop_client_id, None)
+        self.stats["frames_published"] += 1
+        self.stats["frame_bytes_published"] += len(payload)
+        return True
+
+    async def watch_frames(self, desktop_client_id: str, pin: bool = False) -> None:
+        """Receive a remote desktop's frames on this worker."""
+        if not self.enabled:
+            return
+        if pin:
+            self._pinned.add(desktop_client_id)
+        if desktop_client_id in self._watched:
+            return
+        self._watched.add(desktop_client_id)
+        await self._pubsub.subscribe(f"{FRAMES_PREFIX}{desktop_client_id}")
+        logger.info(f"Cluster relay: watching frames of {desktop_client_id}")
+
+    async def unwatch_frames(self, desktop_client_id: str) -> None:
+        self._pinned.discard(desktop_client_id)
+        if desktop_client_id not in self._watched:
+            return
+        self._watched.discard(desktop_client_id)
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(f"{FRAMES_PREFIX}{desktop_client_id}")
+        logger.info(f"Cluster relay: stopped watching frames of {desktop_client_id}")
+
+    # ─── Receiving ──────────────────────────────────────────────────────────
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message and message["type"] == "message":
+                    await self._dispatch(message["channel"].decode(), message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cluster relay listener error: {e}")
+                await asyncio.sleep(1)
+
+    async def _dispatch(self, channel: str, data: bytes) -> None:
+        if channel.startswith(FRAMES_PREFIX):
+            desktop_client_id = channel[len(FRAMES_PREFIX) :]
+            header, frame_base64 = decode_frame(data)
+            self.stats["frames_received"] += 1
+            await self._on_frame(desktop_client_id, header, frame_base64)
+            return
+
+        envelope = json.loads(data)
+        kind = envelope.get("kind")
+        self.stats["messages_received"] += 1
+        if kind == "client_message":
+            if envelope.get("ack_to"):
+                self._ack_routes[envelope["ack_to"]] = (envelope["origin"], time.time())
+            delivered = await self._on_client_message(
+                envelope["client_id"], envelope["message"]
+            )
+            if not delivered:
+                logger.warning(
+                    f"Cluster relay: {envelope['client_id']} is no longer connected here"
+                )
+        elif kind == "action_ack":
+            self._on_action_ack(envelope["command_id"], envelope["result"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "worker_id": self.worker_id,
+            "local_clients": len(self._local_clients),
+            "watched_desktops": sorted(self._watched),
+            "pending_ack_routes": len(self._ack_routes),
+            **self.stats,
+        }
+
+
+# Global singleton instance
+cluster_relay = ClusterRelay()
@@ -0,0 +1,158 @@
+"""
+Command Delivery - push CommandQueue commands over the live WebSocket.
+
+Desktop clients used to poll ``get_commands`` every 3 seconds. Now the
+queue is the durable record and the WebSocket is the delivery path:
+
+- ``enqueue()`` persists the command (CommandQueue, idempotency key) and
+  pushes it to the client immediately if it is connected.
+- On (re)connect all still pending commands are replayed in creation
+  order; the client drops commands whose idempotency key it has already
+  executed.
+- ``command_ack`` messages from the client mark the command completed or
+  failed. A command without ACK stays pending and is replayed.
+"""
+
+import json
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.database import db
+from app.models.db_models import DesktopCommand
+from app.services.command_queue import CommandQueue, command_queue
+
+logger = logging.getLogger(__name__)
+
+REPLAY_LIMIT = 100
+
+
+def command_payload(command: DesktopCommand) -> Dict[str, Any]:
+    """Wire format of a command (as understood by the desktop client)."""
+    return {
+        "id": str(command.id),
+        "command_type": command.command_type,
+        "command_data": command.command_data or {},
+        "idempotency_key": command.idempotency_key,
+        "created_at": command.created_at.isoformat() if command.created_at else None,
+    }
+
+
+class CommandDelivery:
+    """Pushes queued commands to connected desktop clients and tracks ACKs."""
+
+    def __init__(self, queue: Optional[CommandQueue] = None):
+        self._queue = queue or command_queue
+        self._ws_manager = None
+        self.stats = {
+            "enqueued": 0,
+            "pushed": 0,
+            "replayed": 0,
+            "acked": 0,
+            "failed": 0,
+            "deferred": 0,
+        }
+
+    def set_ws_manager(self, manager) -> None:
+        """Set the WebSocket ConnectionManager reference."""
+        self._ws_manager = manager
+
+    async def _push(self, client_id: str, commands: List[Dict[str, Any]]) -> bool:
+        if not commands or self._ws_manager is None:
+            return False
+        # Local socket, or the owning worker in cluster mode
+        return await self._ws_manager.send_personal_message(
+            json.dumps(
+                {"type": "commands", "commands": commands, "timestamp": time.time()}
+            ),
+            client_id,
+        )
+
+    async def enqueue(
+        self,
+        client_id: str,
+        command_type: str,
+        command_data: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Persist a command and deliver it right away if the client is online.
+
+        Returns:
+            The command payload plus ``delivered`` (pushed over the socket now)
+        """
+        async with db.session() as session:
+            command = await self._queue.enqueue_command(
+                session, client_id, command_type, command_data, idempotency_key
+            )
+        payload = command_payload(command)
+        self.stats["enqueued"] += 1
+
+        delivered = False
+        if command.status == "pending":
+            delivered = await self._push(client_id, [payload])
+            if delivered:
+                self.stats["pushed"] += 1
+            else:
+                self.stats["deferred"] += 1
+                logger.info(
+                    f"Command {command.id} for {client_id} queued until the client reconnects"
+                )
+        return {**payload, "status": command.status, "delivered": delivered}
+
+    async def pending_payloads(self, client_id: str) -> List[Dict[str, Any]]:
+        """Unacknowledged commands of a client, oldest first."""
+        async with db.session() as session:
+            commands = await self._queue.get_pending_commands(
+                session, client_id, limit=REPLAY_LIMIT
+            )
+        return [command_payload(c) for c in commands]
+
+    async def replay(self, client_id: str) -> int:
+        """Resend all pending commands (called when a client connects)."""
+        try:
+            commands = await self.pending_payloads(client_id)
+        except Exception as e:
+            # Database not initialized / unreachable: the socket stays usable
+            logger.warning(f"Command replay skipped for {client_id}: {e}")
+            return 0
+        if commands and await self._push(client_id, commands):
+            self.stats["replayed"] += len(commands)
+            logger.info(f"Replayed {len(commands)} pending command(s) to {client_id}")
+            return len(commands)
+        return 0
+
+    async def handle_ack(self, client_id: str, message: Dict[str, Any]) -> bool:
+        """Apply a ``command_ack`` from the client to the queue."""
+        try:
+            command_id = uuid.UUID(str(message.get("commandId", "")))
+        except ValueError:
+            # Commands not originating from the queue (legacy ids)
+            return False
+
+        status = message.get("status", "processed")
+        async with db.session() as session:
+            if status in ("failed", "error"):
+                updated = await self._queue.mark_failed(
+                    session,
+                    command_id,
+                    message.get("error") or "Client reported failure",
+                )
+                if updated:
+                    self.stats["failed"] += 1
+            else:
+                updated = await self._queue.mark_completed(
+                    session, command_id, message.get("result")
+                )
+                if updated:
+                    self.stats["acked"] += 1
+        if not updated:
+            logger.debug(f"ACK from {client_id} for unknown command {command_id}")
+        return updated
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+# Global singleton instance
+command_delivery = CommandDelivery()
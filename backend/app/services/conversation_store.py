@@ -0,0 +1,375 @@
+"""
+Conversation Store - SQLite-backed memory for llm_intent conversations
+
+Replaces the per-conversation JSON files (rewritten completely on every
+turn) with:
+
+1. SQLite store (conversation_memory/conversations.db, WAL mode):
+   one row per message plus one row per conversation holding the rolling
+   summary and a compaction watermark. A turn is an INSERT of two rows,
+   "recent" is a tail read of the rows above the watermark.
+
+2. Hot cache: active conversations stay in memory (LRU), so building the
+   prompt for the next turn does not touch the disk at all.
+
+3. Background compaction: ConversationCompactor debounces compaction
+   requests per conversation and runs them on a single worker task. The
+   summary only replaces the messages it actually covered, so turns that
+   arrive while the LLM summarizes are never lost.
+
+Legacy JSON files in the same directory are imported on first access.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+MEMORY_DIR = Path(__file__).parent.parent.parent / "conversation_memory"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL DEFAULT '',
+    turn_count INTEGER NOT NULL DEFAULT 0,
+    compacted_upto INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (conversation_id, seq)
+);
+"""
+
+
+def _safe_id(conversation_id: str) -> str:
+    return "".join(c if c.isalnum() or c in "_-" else "_" for c in conversation_id)
+
+
+class ConversationStore:
+    """Per-message conversation store with an in-memory hot cache.
+
+    Methods do blocking SQLite IO (thread-safe); async callers run the
+    writes via ``asyncio.to_thread``.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, hot_size: int = 64):
+        self.memory_dir = Path(db_path).parent if db_path else MEMORY_DIR
+        self.memory_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = Path(db_path) if db_path else MEMORY_DIR / "conversations.db"
+        self.hot_size = hot_size
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+        # conversation_id -> {summary, turn_count, compacted_upto, next_seq, recent}
+        # recent entries carry their seq so compaction can set the watermark
+        self._hot: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = {"hot_hits": 0, "db_loads": 0, "migrated": 0}
+
+    # ─── Loading ────────────────────────────────────────────────────────────
+
+    def _state(self, conversation_id: str) -> Dict[str, Any]:
+        """Hot-cache entry for a conversation (loaded from SQLite on a miss)."""
+        state = self._hot.get(conversation_id)
+        if state is not None:
+            self._hot.move_to_end(conversation_id)
+            self.stats["hot_hits"] += 1
+            return state
+
+        row = self._db.execute(
+            "SELECT summary, turn_count, compacted_upto FROM conversations WHERE id=?",
+            (conversation_id,),
+        ).fetchone()
+        if row is None:
+            self._migrate_json(conversation_id)
+            row = self._db.execute(
+                "SELECT summary, turn_count, compacted_upto FROM conversations WHERE id=?",
+                (conversation_id,),
+            ).fetchone()
+
+        summary, turn_count, compacted_upto = row or ("", 0, 0)
+        recent = [
+            {"seq": seq, "role": role, "content": content}
+            for seq, role, content in self._db.execute(
+                "SELECT seq, role, content FROM messages "
+                "WHERE conversation_id=? AND seq>? ORDER BY seq",
+                (conversation_id, compacted_upto),
+            )
+        ]
+        last = self._db.execute(
+            "SELECT MAX(seq) FROM messages WHERE conversation_id=?", (conversation_id,)
+        ).fetchone()[0]
+        state = {
+            "summary": summary,
+            "turn_count": turn_count,
+            "compacted_upto": compacted_upto,
+            "next_seq": (last or compacted_upto) + 1,
+            "recent": recent,
+        }
+        self.stats["db_loads"] += 1
+        self._hot[conversation_id] = state
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+        return state
+
+    def _migrate_json(self, conversation_id: str) -> None:
+        """Import a legacy conversation_memory/<id>.json file, if present."""
+        path = self.memory_dir / f"{_safe_id(conversation_id)}.json"
+        if not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"[Memory] Could not migrate {path.name}: {e}")
+            return
+        now = time.time()
+        recent = data.get("recent", [])
+        self._db.execute(
+            "INSERT OR IGNORE INTO conversations "
+            "(id, summary, turn_count, compacted_upto, updated_at) VALUES (?, ?, ?, 0, ?)",
+            (conversation_id, data.get("summary", ""), data.get("turn_count", 0), now),
+        )
+        self._db.executemany(
+            "INSERT OR IGNORE INTO messages "
+            "(conversation_id, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    conversation_id,
+                    i + 1,
+                    e.get("role", "user"),
+                    e.get("content", ""),
+                    now,
+                )
+                for i, e in enumerate(recent)
+            ],
+        )
+        self._db.commit()
+        self.stats["migrated"] += 1
+        logger.info(f"[Memory] Migrated {path.name} ({len(recent)} messages) to SQLite")
+
+    def load(self, conversation_id: str) -> Dict[str, Any]:
+        """Returns {summary: str, recent: [{role, content}], turn_count: int}."""
+        with self._lock:
+            state = self._state(conversation_id)
+            return {
+                "summary": state["summary"],
+                "recent": [
+                    {"role": e["role"], "content": e["content"]}
+                    for e in state["recent"]
+                ],
+                "turn_count": state["turn_count"],
+            }
+
+    # ─── Writing ────────────────────────────────────────────────────────────
+
+    def append_turn(
+        self, conversation_id: str, entries: List[Dict[str, str]]
+    ) -> Dict[str, Any]:
+        """Append the messages of one turn and count the turn.
+
+        Returns the updated conversation (same shape as ``load``).
+        """
+        now = time.time()
+        with self._lock:
+            state = self._state(conversation_id)
+            rows = []
+            for entry in entries:
+                seq = state["next_seq"]
+                state["next_seq"] += 1
+                state["recent"].append(
+                    {"seq": seq, "role": entry["role"], "content": entry["content"]}
+                )
+                rows.append(
+                    (conversation_id, seq, entry["role"], entry["content"], now)
+                )
+            state["turn_count"] += 1
+
+            self._db.executemany(
+                "INSERT INTO messages (conversation_id, seq, role, content, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute(
+                "INSERT INTO conversations (id, summary, turn_count, compacted_upto, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET turn_count=excluded.turn_count, "
+                "updated_at=excluded.updated_at",
+                (
+                    conversation_id,
+                    state["summary"],
+                    state["turn_count"],
+                    state["compacted_upto"],
+                    now,
+                ),
+            )
+            self._db.commit()
+        return self.load(conversation_id)
+
+    # ─── Compaction ─────────────────────────────────────────────────────────
+
+    def compaction_window(
+        self, conversation_id: str, keep: int
+    ) -> Optional[Dict[str, Any]]:
+        """Messages to fold into the summary (all but the last ``keep``).
+
+        Returns {summary, entries, upto_seq} or None if nothing to compact.
+        """
+        with self._lock:
+            state = self._state(conversation_id)
+            recent = state["recent"]
+            if len(recent) <= keep:
+                return None
+            to_compress = recent[: len(recent) - keep]
+            return {
+                "summary": state["summary"],
+                "entries": [
+                    {"role": e["role"], "content": e["content"]} for e in to_compress
+                ],
+                "upto_seq": to_compress[-1]["seq"],
+            }
+
+    def apply_compaction(
+        self, conversation_id: str, upto_seq: int, summary: str
+    ) -> None:
+        """Replace messages up to ``upto_seq`` by ``summary``.
+
+        Messages appended after the window was taken stay in "recent".
+        """
+        with self._lock:
+            state = self._state(conversation_id)
+            if upto_seq <= state["compacted_upto"]:
+                return  # an older compaction result, already superseded
+            state["summary"] = summary
+            state["compacted_upto"] = upto_seq
+            state["recent"] = [e for e in state["recent"] if e["seq"] > upto_seq]
+            self._db.execute(
+                "UPDATE conversations SET summary=?, compacted_upto=?, updated_at=? "
+                "WHERE id=?",
+                (summary, upto_seq, time.time(), conversation_id),
+            )
+            self._db.execute(
+                "DELETE FROM messages WHERE conversation_id=? AND seq<=?",
+                (conversation_id, upto_seq),
+            )
+            self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conversations = self._db.execute(
+                "SELECT COUNT(*) FROM conversations"
+            ).fetchone()[0]
+            messages = self._db.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        return {
+            **self.stats,
+            "hot_conversations": len(self._hot),
+            "conversations": conversations,
+            "messages": messages,
+        }
+
+
+class ConversationCompactor:
+    """Debounced background compaction, one worker task per event loop.
+
+    ``schedule(cid)`` (re)starts a debounce timer for the conversation; when
+    it fires, the conversation is queued once and compacted by the worker.
+    The request path never awaits the summarization.
+    """
+
+    def __init__(
+        self,
+        compact: Callable[[str], Awaitable[None]],
+        debounce_s: float = 2.0,
+    ):
+        self._compact = compact
+        self.debounce_s = debounce_s
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._queued: Set[str] = set()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"scheduled": 0, "debounced": 0, "compactions": 0, "errors": 0}
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._queued.clear()
+            self._timers.clear()
+            self._worker = loop.create_task(self._run())
+
+    def schedule(self, conversation_id: str) -> None:
+        """Request compaction of a conversation after the debounce delay."""
+        self._ensure_worker()
+        self.stats["scheduled"] += 1
+        timer = self._timers.pop(conversation_id, None)
+        if timer is not None:
+            timer.cancel()
+            self.stats["debounced"] += 1
+        self._timers[conversation_id] = self._loop.call_later(
+            self.debounce_s, self._enqueue, conversation_id
+        )
+
+    def _enqueue(self, conversation_id: str) -> None:
+        self._timers.pop(conversation_id, None)
+        if conversation_id not in self._queued:
+            self._queued.add(conversation_id)
+            self._queue.put_nowait(conversation_id)
+
+    async def _run(self) -> None:
+        while True:
+            conversation_id = await self._queue.get()
+            self._queued.discard(conversation_id)
+            try:
+                await self._compact(conversation_id)
+                self.stats["compactions"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(
+                    f"[Memory] Background compaction failed for {conversation_id}: {e}"
+                )
+            finally:
+                self._queue.task_done()
+
+    async def drain(self) -> None:
+        """Run all pending compactions now and wait for them (tests, shutdown)."""
+        if self._queue is None:
+            return
+        for conversation_id in list(self._timers):
+            self._timers.pop(conversation_id).cancel()
+            self._enqueue(conversation_id)
+        await self._queue.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending": len(self._timers) + (self._queue.qsize() if self._queue else 0),
+        }
+
+
+# Global instance
+_conversation_store: Optional[ConversationStore] = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get or create the conversation store."""
+    global _conversation_store
+    if _conversation_store is None:
+        _conversation_store = ConversationStore()
+    return _conversation_store
@@ -17,6 +17,7 @@ import subprocess
 import tempfile
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
@@ -48,6 +49,7 @@ from fastapi import WebSocket, WebSocketDisconnect
 from PIL import Image, ImageGrab
 
 from ..logger_config import LoggerMixin
+from .shell_service import run_subprocess
 
 
 class DesktopAutomationService(LoggerMixin):
@@ -71,32 +73,42 @@ class DesktopAutomationService(LoggerMixin):
         self.click_sequences = {}  # session_id -> click_sequence
         self.websocket_clients = set()
 
-        # OCR periodic processing
+        # OCR periodic processing: capture + OCR run on a dedicated worker
+        # thread, results reach WebSocket clients through a bounded queue
+        # (oldest result dropped when clients cannot keep up).
         self.ocr_task = None
+        self.ocr_notify_task = None
         self.ocr_stop_event = threading.Event()
+        self.ocr_queue_size = self.config.get("ocr_queue_size", 10)
+        self.ocr_queue: Optional[asyncio.Queue] = None
+        self.ocr_dropped = 0
+        self._ocr_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="desktop-ocr"
+        )
 
         self.log_info("DesktopAutomationService initialized")
 
     async def initialize(self):
         """Initialize the service"""
         try:
+            loop = asyncio.get_running_loop()
+
             # Test OCR capability
             try:
-                test_image = ImageGrab.grab(bbox=(0, 0, 100, 100))
-                test_text = pytesseract.image_to_string(test_image)
+                await loop.run_in_executor(
+                    self._ocr_executor, self._capture_and_ocr, (0, 0, 100, 100)
+                )
                 self.log_info("OCR capability verified")
             except Exception as e:
                 self.log_warning(f"OCR may not be available: {e}")
 
             # Test PowerShell capability
             try:
-                result = subprocess.run(
+                returncode, _, _ = await run_subprocess(
                     ["powershell", "-Command", "Get-Process | Select-Object -First 1"],
-                    capture_output=True,
-                    text=True,
                     timeout=5,
                 )
-                if result.returncode == 0:
+                if returncode == 0:
                     self.log_info("PowerShell capability verified")
                 else:
                     self.log_warning("PowerShell may not be available")
@@ -113,6 +125,7 @@ class DesktopAutomationService(LoggerMixin):
         """Cleanup the service"""
         # Stop OCR processing
         await self.stop_ocr_processing()
+        self._ocr_executor.shutdown(wait=False, cancel_futures=True)
 
         # Cleanup active sessions
         for session_id in list(self.active_sessions.keys()):
@@ -129,6 +142,8 @@ class DesktopAutomationService(LoggerMixin):
                 "max_sessions": self.max_sessions,
                 "ocr_enabled": self.ocr_enabled,
                 "ocr_interval": self.ocr_interval,
+                "ocr_queue_depth": self.ocr_queue.qsize() if self.ocr_queue else 0,
+                "ocr_dropped": self.ocr_dropped,
                 "click_tracking_enabled": self.click_tracking_enabled,
                 "recent_ocr_results": len(self.ocr_results),
                 "websocket_clients": len(self.websocket_clients),
@@ -204,10 +219,8 @@ class DesktopAutomationService(LoggerMixin):
 
             # Execute PowerShell command
             start_time = time.time()
-            result = subprocess.run(
+            returncode, stdout, stderr = await run_subprocess(
                 ["powershell", "-Command", command],
-                capture_output=True,
-                text=True,
                 timeout=30,
                 cwd=tempfile.gettempdir(),
             )
@@ -217,9 +230,9 @@ class DesktopAutomationService(LoggerMixin):
             command_result = {
                 "command": command,
                 "timestamp": datetime.now().isoformat(),
-                "exit_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
+                "exit_code": returncode,
+                "stdout": stdout,
+                "stderr": stderr,
                 "execution_time": execution_time,
             }
 
@@ -230,14 +243,14 @@ class DesktopAutomationService(LoggerMixin):
                 session["powershell_history"] = session["powershell_history"][-50:]
 
             self.log_info(
-                f"PowerShell command completed in {execution_time:.2f}s with exit code {result.returncode}"
+                f"PowerShell command completed in {execution_time:.2f}s with exit code {returncode}"
             )
 
             return {
-                "success": result.returncode == 0,
-                "exit_code": result.returncode,
-                "output": result.stdout,
-                "error": result.stderr,
+                "success": returncode == 0,
+                "exit_code": returncode,
+                "output": stdout,
+                "error": stderr,
                 "execution_time": execution_time,
                 "timestamp": command_result["timestamp"],
             }
@@ -408,8 +421,10 @@ class DesktopAutomationService(LoggerMixin):
             self.ocr_enabled = True
             self.ocr_stop_event.clear()
 
-            # Start OCR task
+            # Start OCR producer + WebSocket notifier
+            self.ocr_queue = asyncio.Queue(maxsize=self.ocr_queue_size)
             self.ocr_task = asyncio.create_task(self._ocr_processing_loop())
+            self.ocr_notify_task = asyncio.create_task(self._ocr_notify_loop())
 
             self.log_info(f"Started OCR processing with {self.ocr_interval}s interval")
 
@@ -428,12 +443,15 @@ class DesktopAutomationService(LoggerMixin):
             self.ocr_enabled = False
             self.ocr_stop_event.set()
 
-            if self.ocr_task:
-                self.ocr_task.cancel()
-                try:
-                    await self.ocr_task
-                except asyncio.CancelledError:
-                    pass
+            for task in (self.ocr_task, self.ocr_notify_task):
+                if task:
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+            self.ocr_task = None
+            self.ocr_notify_task = None
 
             self.log_info("Stopped OCR processing")
 
@@ -443,16 +461,42 @@ class DesktopAutomationService(LoggerMixin):
             self.log_error(f"Error stopping OCR processing: {e}")
             raise
 
+    def _capture_and_ocr(self, bbox: Optional[tuple] = None) -> str:
+        """Screenshot + OCR (blocking, runs on the OCR worker thread)"""
+        screenshot = ImageGrab.grab(bbox=bbox)
+        return pytesseract.image_to_string(screenshot)
+
+    def _enqueue_ocr_result(self, ocr_result: Dict[str, Any]):
+        """Queue a result for WebSocket clients, dropping the oldest if full"""
+        if self.ocr_queue is None:
+            return
+        if self.ocr_queue.full():
+            self.ocr_queue.get_nowait()
+            self.ocr_dropped += 1
+        self.ocr_queue.put_nowait(ocr_result)
+
+    async def _ocr_notify_loop(self):
+        """Forward queued OCR results to WebSocket clients"""
+        try:
+            while True:
+                ocr_result = await self.ocr_queue.get()
+                await self._notify_websocket_clients(
+                    {"type": "ocr_result", "data": ocr_result}
+                )
+        except asyncio.CancelledError:
+            pass
+
     async def _ocr_processing_loop(self):
         """Main OCR processing loop"""
+        loop = asyncio.get_running_loop()
         try:
             while self.ocr_enabled and not self.ocr_stop_event.is_set():
                 try:
-                    # Take screenshot
-                    screenshot = ImageGrab.grab()
-
-                    # Perform OCR
-                    ocr_text = pytesseract.image_to_string(screenshot)
+                    # Screenshot + OCR on the worker thread; the event loop
+                    # keeps serving requests meanwhile
+                    ocr_text = await loop.run_in_executor(
+                        self._ocr_executor, self._capture_and_ocr
+                    )
 
                     if ocr_text.strip():
                         ocr_result = {
@@ -469,9 +513,7 @@ class DesktopAutomationService(LoggerMixin):
                             self.ocr_results = self.ocr_results[-100:]
 
                         # Notify WebSocket clients
-                        await self._notify_websocket_clients(
-                            {"type": "ocr_result", "data": ocr_result}
-                        )
+                        self._enqueue_ocr_result(ocr_result)
 
                         self.log_debug(
                             f"OCR detected {len(ocr_text.strip())} characters"
@@ -738,31 +780,34 @@ class DesktopAutomationService(LoggerMixin):
     async def _test_powershell(self) -> bool:
         """Test if PowerShell is available"""
         try:
-            result = subprocess.run(
-                ["powershell", "-Command", 'echo "test"'],
-                capture_output=True,
-                timeout=5,
+            returncode, _, _ = await run_subprocess(
+                ["powershell", "-Command", 'echo "test"'], timeout=5
             )
-            return result.returncode == 0
+            return returncode == 0
         except:
             return False
 
     async def _test_ocr(self) -> bool:
         """Test if OCR is available"""
         try:
-            test_image = ImageGrab.grab(bbox=(0, 0, 100, 100))
-            pytesseract.image_to_string(test_image)
+            await asyncio.get_running_loop().run_in_executor(
+                self._ocr_executor, self._capture_and_ocr, (0, 0, 100, 100)
+            )
             return True
         except:
             return False
 
     async def _test_desktop_access(self) -> bool:
         """Test if desktop access is available"""
-        try:
+
+        def _probe():
             pg = _ensure_pyautogui()
             if pg is not None:
                 pg.size()
             ImageGrab.grab(bbox=(0, 0, 100, 100))
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _probe)
             return True
         except:
             return False
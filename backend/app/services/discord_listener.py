@@ -16,6 +16,7 @@ import os
 import re
 
 import httpx
+from app.services.moire_llm import llm_transport
 
 try:
     import websockets
@@ -36,6 +37,9 @@ OPENROUTER_KEY = os.environ.get("OPENROUTER_API_KEY", "")
 API_URL = os.environ.get("CODING_ENGINE_API_URL", "http://api:8000")
 POLL_INTERVAL = 15  # seconds
 
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
 # ── Engine Settings cache (fetched from API) ──
 _engine_settings_cache = {}
 _engine_settings_ts = 0
@@ -666,26 +670,27 @@ class DiscordAnalyzerListener:
 
         prompt = "\n".join(prompt_parts)
 
+        llm = llm_transport()
         try:
-            async with httpx.AsyncClient(timeout=60) as client:
-                resp = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={"Authorization": "Bearer %s" % OPENROUTER_KEY},
-                    json={
-                        "model": os.environ.get("LLM_MODEL", "qwen/qwen3-coder:free"),
-                        "messages": [{"role": "user", "content": prompt}],
-                        "max_tokens": 2000,
-                    },
-                )
-                if resp.status_code == 429:
-                    await asyncio.sleep(15)
-                    return '{"error": "Rate limited, retry later"}'
-                data = resp.json()
-                return (
-                    data.get("choices", [{}])[0]
-                    .get("message", {})
-                    .get("content", '{"error": "No fix"}')
-                )
+            # The transport already backs off and retries on 429.
+            data = await llm.getllm_transport().chat_completions(
+                {
+                    "model": os.environ.get("LLM_MODEL", "qwen/qwen3-coder:free"),
+                    "messages": [{"role": "user", "content": prompt}],
+                    "max_tokens": 2000,
+                },
+                api_key=OPENROUTER_KEY,
+                timeout=60,
+            )
+            return (
+                data.get("choices", [{}])[0]
+                .get("message", {})
+                .get("content", '{"error": "No fix"}')
+            )
+        except llm.LLMTransportError as e:
+            if e.status == 429:
+                return '{"error": "Rate limited, retry later"}'
+            return '{"error": "Analysis error: %s"}' % str(e)[:100]
         except Exception as e:
             return '{"error": "Analysis error: %s"}' % str(e)[:100]
 
@@ -1061,32 +1066,31 @@ class DiscordAnalyzerListener:
                 "```html\n%s\n```"
             ) % page_content[:2000]
 
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={"Authorization": "Bearer %s" % OPENROUTER_KEY},
-                    json={
+            llm = llm_transport()
+            try:
+                data = await llm.getllm_transport().chat_completions(
+                    {
                         "model": vision_model,
                         "messages": [{"role": "user", "content": prompt}],
                         "max_tokens": 500,
                     },
+                    api_key=OPENROUTER_KEY,
+                    timeout=30,
                 )
-                if resp.status_code == 200:
-                    analysis = (
-                        resp.json()
-                        .get("choices", [{}])[0]
-                        .get("message", {})
-                        .get("content", "No analysis")
-                    )
-                    return "**Preview Analysis** (%s)\n%s" % (
-                        sandbox_url,
-                        analysis[:1500],
-                    )
-                else:
-                    return (
-                        "Preview reachable but analysis failed (%d)\nRaw HTML:\n```\n%s\n```"
-                        % (resp.status_code, page_content[:500])
-                    )
+            except llm.LLMTransportError as e:
+                return (
+                    "Preview reachable but analysis failed (%d)\nRaw HTML:\n```\n%s\n```"
+                    % (e.status, page_content[:500])
+                )
+            analysis = (
+                data.get("choices", [{}])[0]
+                .get("message", {})
+                .get("content", "No analysis")
+            )
+            return "**Preview Analysis** (%s)\n%s" % (
+                sandbox_url,
+                analysis[:1500],
+            )
 
         except Exception as e:
             return "Preview error: %s" % str(e)[:200]
@@ -1756,12 +1760,11 @@ class DiscordAnalyzerListener:
             "Output ONLY the complete fixed schema.prisma content. No markdown fences."
         ) % (error_output[:2000], current_schema[:6000])
 
+        llm = llm_transport()
         try:
-            async with httpx.AsyncClient(timeout=90) as gpt_client:
-                gpt_resp = await gpt_client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={"Authorization": "Bearer %s" % openai_key},
-                    json={
+            try:
+                gpt_data = await llm.getllm_transport().chat_completions(
+                    {
                         "model": "gpt-4.1",
                         "messages": [
                             {
@@ -1773,13 +1776,15 @@ class DiscordAnalyzerListener:
                         "max_tokens": 10000,
                         "temperature": 0.1,
                     },
+                    api_key=openai_key,
+                    timeout=90,
+                    base_url=OPENAI_BASE_URL,
                 )
-
-            if gpt_resp.status_code != 200:
-                logger.warning("GPT schema fix failed: %d", gpt_resp.status_code)
+            except llm.LLMTransportError as e:
+                logger.warning("GPT schema fix failed: %d", e.status)
                 return False
 
-            content = gpt_resp.json()["choices"][0]["message"]["content"]
+            content = gpt_data["choices"][0]["message"]["content"]
             # Strip markdown fences
             if content.startswith("```"):
                 content = "\n".join(content.split("\n")[1:])
@@ -22,6 +22,7 @@ import aiohttp
 from app.models.e2e_models import (E2ERunStatus, StepStatus, StepType,
                                    TestCase, TestReport, TestResult,
                                    TestStatus, TestStep, UserStory)
+from app.services.moire_llm import llm_transport
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,6 @@ PLAYWRIGHT_API = os.getenv("CODING_ENGINE_API_URL", "http://localhost:8000")
 
 # LLM for test plan generation
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 LLM_MODEL = os.getenv("E2E_LLM_MODEL", "anthropic/claude-sonnet-4")
 
 
@@ -257,44 +257,38 @@ Return ONLY the JSON array, no markdown."""
             return self._generate_fallback_tests(stories, app_url)
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    OPENROUTER_URL,
-                    headers={
-                        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
+            llm = llm_transport()
+            try:
+                data = await llm.getllm_transport().chat_completions(
+                    {
                         "model": LLM_MODEL,
                         "messages": [{"role": "user", "content": prompt}],
                         "temperature": 0.3,
                         "max_tokens": 4000,
                     },
-                    timeout=aiohttp.ClientTimeout(total=60),
-                ) as resp:
-                    if resp.status != 200:
-                        logger.warning(
-                            f"LLM returned {resp.status}, using fallback tests"
-                        )
-                        return self._generate_fallback_tests(stories, app_url)
-
-                    data = await resp.json()
-                    content = data["choices"][0]["message"]["content"]
-
-                    # Parse JSON from response (strip markdown if present)
-                    content = content.strip()
-                    if content.startswith("```"):
-                        content = content.split("\n", 1)[1].rsplit("```", 1)[0]
-
-                    raw_tests = json.loads(content)
-                    return [
-                        TestCase(
-                            story_id=t.get("story_id", "UNKNOWN"),
-                            name=t.get("name", "Test"),
-                            steps=[TestStep(**s) for s in t.get("steps", [])],
-                        )
-                        for t in raw_tests
-                    ]
+                    api_key=OPENROUTER_API_KEY,
+                    timeout=60,
+                )
+            except llm.LLMTransportError as e:
+                logger.warning(f"LLM returned {e.status}, using fallback tests")
+                return self._generate_fallback_tests(stories, app_url)
+
+            content = data["choices"][0]["message"]["content"]
+
+            # Parse JSON from response (strip markdown if present)
+            content = content.strip()
+            if content.startswith("```"):
+                content = content.split("\n", 1)[1].rsplit("```", 1)[0]
+
+            raw_tests = json.loads(content)
+            return [
+                TestCase(
+                    story_id=t.get("story_id", "UNKNOWN"),
+                    name=t.get("name", "Test"),
+                    steps=[TestStep(**s) for s in t.get("steps", [])],
+                )
+                for t in raw_tests
+            ]
         except Exception as e:
             logger.warning(f"LLM test generation failed: {e}, using fallback")
             return self._generate_fallback_tests(stories, app_url)
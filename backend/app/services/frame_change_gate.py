@@ -0,0 +1,294 @@
+"""
+Frame Change Gate - decides when a stream frame is worth a vision call.
+
+VideoAgent monitor mode used to hash the first 1000 base64 characters of
+each JPEG. Every re-encoded frame looks different that way, so a vision
+call went out every ``min_interval`` seconds whether or not anything
+happened on screen. The gate compares frames perceptually instead:
+
+  - frames are decoded once into a small grayscale thumbnail (JPEG draft
+    mode, so the full frame is never decoded)
+  - the thumbnail is split into blocks and compared with a per-block SSIM;
+    the change score is the fraction of blocks that changed structurally,
+    which encoder noise does not affect
+  - masked areas (taskbar clock, cursor) never count
+
+Cadence adapts to activity:
+
+  - no change against the last analyzed frame → no call at all
+  - a change is analyzed once the screen stopped moving (or after
+    ``max_defer`` seconds of continuous motion)
+  - consecutive "normal" analyses back the interval off up to
+    ``max_interval``; a major change or a dialog/unexpected result snaps
+    it back to ``min_interval``
+
+Usage:
+    gate = FrameChangeGate(masks=parse_masks("0.9,0.94,0.1,0.06"))
+    thumb = gate.thumbnail(frame.data)
+    decision = gate.decide(thumb)
+    if decision.analyze:
+        analysis = await agent.analyze_frame(frame.data, ...)
+        gate.mark_analyzed(thumb, event_type)
+"""
+
+import base64
+import logging
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Relative rectangle (x, y, width, height), each 0..1 of the frame size
+Mask = Tuple[float, float, float, float]
+
+# Windows taskbar clock, bottom right
+DEFAULT_MASKS = "0.9,0.94,0.1,0.06"
+
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+def parse_masks(spec: str) -> List[Mask]:
+    """Parse ``"x,y,w,h;x,y,w,h"`` (relative coordinates) into masks."""
+    masks: List[Mask] = []
+    for part in (spec or "").split(";"):
+        if not part.strip():
+            continue
+        try:
+            x, y, w, h = (float(v) for v in part.split(","))
+        except ValueError:
+            logger.warning(f"[FrameGate] Ignoring invalid mask: {part!r}")
+            continue
+        masks.append((x, y, w, h))
+    return masks
+
+
+def cursor_from_metadata(
+    metadata: Optional[Dict[str, Any]]
+) -> Optional[Tuple[int, int]]:
+    """Cursor position if the desktop client sends one (cursor / cursorX+cursorY)."""
+    if not metadata:
+        return None
+    cursor = metadata.get("cursor")
+    if isinstance(cursor, dict) and "x" in cursor and "y" in cursor:
+        return int(cursor["x"]), int(cursor["y"])
+    if "cursorX" in metadata and "cursorY" in metadata:
+        return int(metadata["cursorX"]), int(metadata["cursorY"])
+    return None
+
+
+@dataclass
+class GateDecision:
+    """Outcome of one frame."""
+
+    analyze: bool
+    score: float  # changed block fraction vs. the last analyzed frame
+    motion: float  # changed block fraction vs. the previous frame
+    reason: str  # first_frame | idle | cadence | settling | changed | major_change
+
+
+class FrameChangeGate:
+    """Perceptual change gate with adaptive analysis cadence."""
+
+    def __init__(
+        self,
+        thumb_width: int = 192,
+        block: int = 8,
+        ssim_threshold: float = 0.85,
+        change_threshold: float = 0.02,
+        major_threshold: float = 0.25,
+        settle_threshold: float = 0.01,
+        min_interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        max_defer: float = 3.0,
+        masks: Optional[List[Mask]] = None,
+        cursor_radius: int = 24,
+    ):
+        """
+        Args:
+            thumb_width: Width of the grayscale thumbnail frames are compared on
+            block: Block size (thumbnail pixels) of the structural comparison
+            ssim_threshold: Blocks below this SSIM count as changed
+            change_threshold: Changed block fraction that is worth an analysis
+            major_threshold: Changed block fraction that resets the cadence
+            settle_threshold: Frame-to-frame fraction below which the screen
+                              counts as settled
+            min_interval: Shortest time between analyses (rate limit)
+            max_interval: Longest backed-off time between analyses
+            backoff: Interval factor after an analysis found nothing notable
+            max_defer: Analyze after this long even if the screen keeps moving
+            masks: Relative rectangles that never count (clock, tickers)
+            cursor_radius: Masked radius around the cursor (frame pixels)
+        """
+        self.thumb_width = thumb_width
+        self.block = block
+        self.ssim_threshold = ssim_threshold
+        self.change_threshold = change_threshold
+        self.major_threshold = major_threshold
+        self.settle_threshold = settle_threshold
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self.max_defer = max_defer
+        self.masks = list(masks or [])
+        self.cursor_radius = cursor_radius
+
+        self.interval = min_interval
+        self._reference: Optional[np.ndarray] = None
+        self._previous: Optional[np.ndarray] = None
+        self._scale = 1.0  # thumbnail px per frame px
+        self._last_analysis = 0.0
+        self._pending_since: Optional[float] = None
+        self._mask_cache: Dict[Tuple[int, int], np.ndarray] = {}
+
+        self.stats: Dict[str, Any] = {
+            "decisions": 0,
+            "decode_errors": 0,
+            "idle": 0,
+            "cadence": 0,
+            "settling": 0,
+            "analyses": 0,
+        }
+
+    # ─── Frames ─────────────────────────────────────────────────────────────
+
+    def thumbnail(self, frame_base64: str) -> Optional[np.ndarray]:
+        """Decode a base64 frame into a small grayscale thumbnail."""
+        try:
+            from PIL import Image
+
+            data = frame_base64
+            if data.startswith("data:"):
+                data = data.split(",", 1)[1] if "," in data else data
+            image = Image.open(BytesIO(base64.b64decode(data)))
+            width, height = image.size
+            thumb_height = max(1, round(height * self.thumb_width / width))
+            # JPEG: let the decoder downscale (1/2 .. 1/8) instead of decoding it all
+            image.draft("L", (self.thumb_width * 2, thumb_height * 2))
+            thumb = image.convert("L").resize(
+                (self.thumb_width, thumb_height), Image.Resampling.BOX
+            )
+        except Exception as e:
+            self.stats["decode_errors"] += 1
+            logger.debug(f"[FrameGate] Frame decode failed: {e}")
+            return None
+        self._scale = self.thumb_width / width
+        return np.asarray(thumb, dtype=np.float32)
+
+    # ─── Scoring ────────────────────────────────────────────────────────────
+
+    def _blocks(self, arr: np.ndarray) -> np.ndarray:
+        b = self.block
+        hb, wb = arr.shape[0] // b, arr.shape[1] // b
+        arr = arr[: hb * b, : wb * b]
+        return arr.reshape(hb, b, wb, b).transpose(0, 2, 1, 3).reshape(hb, wb, b * b)
+
+    def _weights(
+        self, shape: Tuple[int, int], cursor: Optional[Tuple[int, int]]
+    ) -> np.ndarray:
+        """Per-block weights: 0 for blocks touched by a mask or the cursor."""
+        b = self.block
+        hb, wb = shape[0] // b, shape[1] // b
+        weights = self._mask_cache.get((hb, wb))
+        if weights is None:
+            weights = np.ones((hb, wb), dtype=bool)
+            for x, y, w, h in self.masks:
+                x0, y0 = int(x * wb), int(y * hb)
+                x1, y1 = int(np.ceil((x + w) * wb)), int(np.ceil((y + h) * hb))
+                weights[max(0, y0) : y1, max(0, x0) : x1] = False
+            self._mask_cache[(hb, wb)] = weights
+        if cursor is not None:
+            weights = weights.copy()
+            r = self.cursor_radius * self._scale
+            cx, cy = cursor[0] * self._scale, cursor[1] * self._scale
+            x0, x1 = int((cx - r) // b), int((cx + r) // b) + 1
+            y0, y1 = int((cy - r) // b), int((cy + r) // b) + 1
+            weights[max(0, y0) : y1, max(0, x0) : x1] = False
+        return weights
+
+    def change_score(
+        self,
+        before: np.ndarray,
+        after: np.ndarray,
+        cursor: Optional[Tuple[int, int]] = None,
+    ) -> float:
+        """Fraction of unmasked blocks whose structure changed (0..1)."""
+        if before.shape != after.shape:
+            return 1.0
+        a, b = self._blocks(before), self._blocks(after)
+        mu_a, mu_b = a.mean(axis=2), b.mean(axis=2)
+        var_a, var_b = a.var(axis=2), b.var(axis=2)
+        cov = (a * b).mean(axis=2) - mu_a * mu_b
+        ssim = ((2 * mu_a * mu_b + _C1) * (2 * cov + _C2)) / (
+            (mu_a**2 + mu_b**2 + _C1) * (var_a + var_b + _C2)
+        )
+        weights = self._weights(before.shape, cursor)
+        counted = int(np.count_nonzero(weights))
+        if counted == 0:
+            return 0.0
+        return int(np.count_nonzero((ssim < self.ssim_threshold) & weights)) / counted
+
+    # ─── Decisions ──────────────────────────────────────────────────────────
+
+    def decide(
+        self,
+        thumb: np.ndarray,
+        cursor: Optional[Tuple[int, int]] = None,
+        now: Optional[float] = None,
+    ) -> GateDecision:
+        """Decide whether this frame should go to the vision model."""
+        now = time.monotonic() if now is None else now
+        self.stats["decisions"] += 1
+        previous, self._previous = self._previous, thumb
+        if self._reference is None:
+            return GateDecision(True, 1.0, 1.0, "first_frame")
+
+        motion = (
+            self.change_score(previous, thumb, cursor) if previous is not None else 1.0
+        )
+        score = self.change_score(self._reference, thumb, cursor)
+        if score < self.change_threshold:
+            self._pending_since = None
+            self.stats["idle"] += 1
+            return GateDecision(False, score, motion, "idle")
+
+        if self._pending_since is None:
+            self._pending_since = now
+        major = score >= self.major_threshold
+        if major:
+            self.interval = self.min_interval
+        if now - self._last_analysis < self.interval:
+            self.stats["cadence"] += 1
+            return GateDecision(False, score, motion, "cadence")
+        if (
+            motion > self.settle_threshold
+            and now - self._pending_since < self.max_defer
+        ):
+            # Still animating / typing: analyze the settled result, not a blur
+            self.stats["settling"] += 1
+            return GateDecision(False, score, motion, "settling")
+        return GateDecision(True, score, motion, "major_change" if major else "changed")
+
+    def mark_analyzed(
+        self, thumb: np.ndarray, event_type: str = "normal", now: Optional[float] = None
+    ) -> None:
+        """Record an analysis; later frames are scored against ``thumb``."""
+        self._reference = thumb
+        self._last_analysis = time.monotonic() if now is None else now
+        self._pending_since = None
+        self.stats["analyses"] += 1
+        if event_type == "normal":
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        else:
+            self.interval = self.min_interval
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["interval"] = round(self.interval, 2)
+        stats["skipped"] = stats["decisions"] - stats["analyses"]
+        return stats
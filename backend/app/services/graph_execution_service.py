@@ -5,10 +5,14 @@ node validation, and filesystem integration for desktop automation.
 """
 
 import asyncio
+import copy
+import hashlib
 import json
 import logging
+import os
 import time
-from dataclasses import asdict, dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -43,6 +47,77 @@ from .ocr_service import OCRService
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Dataflow scheduler limits: a node starts as soon as all of its inputs are
+# done, bounded by a global cap and an optional cap per node type.
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("GRAPH_MAX_CONCURRENCY", "8"))
+DEFAULT_NODE_TYPE_CONCURRENCY: Dict[str, int] = {
+    # Mouse / keyboard share one physical desktop - never interleave them
+    "click_action": 1,
+    "type_text_action": 1,
+    "ocr_extract": 2,
+    "http_request_action": 4,
+    "n8n_webhook": 4,
+}
+# Full-state websocket updates are coalesced to at most one per interval
+DEFAULT_UPDATE_INTERVAL_S = float(os.environ.get("GRAPH_UPDATE_INTERVAL_S", "0.25"))
+# Node output values larger than this are kept in the execution blob store
+DEFAULT_BLOB_THRESHOLD_BYTES = int(
+    os.environ.get("GRAPH_BLOB_THRESHOLD_BYTES", str(64 * 1024))
+)
+
+
+# Node types whose output is a pure function of (config, inputs) and may be
+# reused from the result memo. A node can override this with config "cache";
+# HTTP requests are only memoized on opt-in, see _is_cacheable.
+NODE_TYPE_CACHEABLE: Dict[str, bool] = {
+    "manual_trigger": False,
+    "webhook_trigger": False,
+    "websocket_config": True,
+    "live_desktop": False,  # writes stream_metadata.json
+    "click_action": False,
+    "type_text_action": False,
+    "http_request_action": False,  # live responses; config "cache" opts in
+    "if_condition": True,
+    "delay": False,
+    "ocr_region": True,
+    "ocr_extract": False,  # reads the live screen
+    "n8n_webhook": False,
+    "send_to_filesystem": False,
+    "workflow_result": False,
+}
+_IDEMPOTENT_HTTP_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Per-run fields in node outputs that must not change input hashes
+_VOLATILE_OUTPUT_KEYS = {
+    "triggered_at",
+    "configured_at",
+    "started_at",
+    "executed_at",
+    "evaluated_at",
+    "completed_at",
+    "defined_at",
+    "extracted_at",
+    "sent_at",
+    "saved_at",
+    "aggregated_at",
+    "timestamp",
+}
+
+
+def _connections(workflow: Any) -> List[Any]:
+    """Connections of a workflow model (``connections``) or editor definition (``edges``)"""
+    connections = getattr(workflow, "connections", None)
+    if connections is None:
+        connections = getattr(workflow, "edges", None) or []
+    return connections
+
+
+def _edge(conn: Any) -> Tuple[str, str]:
+    """(source, target) of a connection (workflow model or node-service model)"""
+    source = getattr(conn, "source_node_id", None) or getattr(conn, "source")
+    target = getattr(conn, "target_node_id", None) or getattr(conn, "target")
+    return source, target
+
 
 class NodeExecutionStatus(Enum):
     """Node execution status enumeration"""
@@ -75,6 +150,8 @@ class NodeExecutionResult:
     error_message: Optional[str] = None
     execution_time: Optional[float] = None
     timestamp: Optional[datetime] = None
+    # "memo" (result memo hit) or "reused" (taken over from the previous run)
+    cache_source: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -85,6 +162,180 @@ class NodeExecutionResult:
         return result
 
 
+@dataclass(frozen=True)
+class BlobRef:
+    """Reference to a large node output value held in an ExecutionBlobStore"""
+
+    blob_id: str
+    size: int
+    kind: str
+
+
+class ExecutionBlobStore:
+    """Execution-scoped store for large node outputs (OCR text, screenshots)
+
+    Node outputs keep a BlobRef in place of large string/bytes values, so
+    state updates and results aggregation only carry the reference. The
+    value is materialized when a consumer actually reads it. Blobs are
+    content-addressed, identical payloads are stored once.
+    """
+
+    def __init__(self, threshold_bytes: int = DEFAULT_BLOB_THRESHOLD_BYTES):
+        self.threshold_bytes = threshold_bytes
+        self._blobs: Dict[str, Any] = {}
+        self._bytes = 0
+
+    def put(self, value: Any) -> BlobRef:
+        raw = value if isinstance(value, bytes) else str(value).encode("utf-8")
+        blob_id = hashlib.sha256(raw).hexdigest()
+        if blob_id not in self._blobs:
+            self._blobs[blob_id] = value
+            self._bytes += len(raw)
+        return BlobRef(
+            blob_id=blob_id,
+            size=len(raw),
+            kind="bytes" if isinstance(value, bytes) else "str",
+        )
+
+    def get(self, ref: BlobRef) -> Any:
+        return self._blobs[ref.blob_id]
+
+    def externalize(self, value: Any) -> Any:
+        """Copy of ``value`` with large str/bytes leaves replaced by BlobRefs"""
+        if isinstance(value, (str, bytes)):
+            if len(value) >= self.threshold_bytes:
+                return self.put(value)
+            return value
+        if isinstance(value, dict):
+            return {k: self.externalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.externalize(v) for v in value]
+        return value
+
+    def materialize(self, value: Any) -> Any:
+        """Copy of ``value`` with every BlobRef replaced by its stored value"""
+        if isinstance(value, BlobRef):
+            return self.get(value)
+        if isinstance(value, dict):
+            return {k: self.materialize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.materialize(v) for v in value]
+        return value
+
+    def clear(self):
+        self._blobs.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"blobs": len(self._blobs), "bytes": self._bytes}
+
+
+def _wire_safe(value: Any) -> Any:
+    """Copy of a node output for websocket messages: BlobRefs become
+    ``{"blob": blob_id, "size": size}``, the value itself stays in the store"""
+    if isinstance(value, BlobRef):
+        return {"blob": value.blob_id, "size": value.size}
+    if isinstance(value, dict):
+        return {k: _wire_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_wire_safe(v) for v in value]
+    return value
+
+
+def _content_hash(value: Any) -> str:
+    """Stable hash of a node output, ignoring per-run timestamp fields"""
+
+    def canonical(v: Any) -> Any:
+        if isinstance(v, BlobRef):
+            return {"$blob": v.blob_id}
+        if isinstance(v, dict):
+            return {
+                str(k): canonical(x)
+                for k, x in v.items()
+                if k not in _VOLATILE_OUTPUT_KEYS
+            }
+        if isinstance(v, (list, tuple)):
+            return [canonical(x) for x in v]
+        if isinstance(v, bytes):
+            return {"$bytes": hashlib.sha256(v).hexdigest()}
+        return v
+
+    blob = json.dumps(canonical(value), sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _is_memoizable(output: Any) -> bool:
+    """Only successful outputs go into the memo; HTTP responses only if 2xx"""
+    if not isinstance(output, dict) or not output.get("success", True):
+        return False
+    status_code = output.get("status_code")
+    return status_code is None or 200 <= int(status_code) < 300
+
+
+class NodeResultMemo:
+    """Process-wide memo of node outputs for re-running edited workflows
+
+    - ``get``/``put``: outputs keyed by hash(node type, config, input hashes),
+      used for cacheable node types on every run.
+    - ``remember_run``/``last_run``: the completed outputs of the latest run
+      per workflow, which "re-run from node X" takes over for every node
+      that is not downstream of X.
+
+    Values are stored materialized (the blob store is per execution) and
+    deep-copied in and out, so handlers may mutate what they got.
+    """
+
+    def __init__(self, max_entries: int = 512, max_workflows: int = 32):
+        self.max_entries = max_entries
+        self.max_workflows = max_workflows
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._runs: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "reused": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._entries.get(key)
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: str, output: Dict[str, Any]):
+        self._entries[key] = copy.deepcopy(output)
+        self._entries.move_to_end(key)
+        self.stats["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def remember_run(self, workflow_id: str, outputs: Dict[str, Dict[str, Any]]):
+        self._runs[workflow_id] = outputs
+        self._runs.move_to_end(workflow_id)
+        while len(self._runs) > self.max_workflows:
+            self._runs.popitem(last=False)
+
+    def last_run(self, workflow_id: str) -> Dict[str, Dict[str, Any]]:
+        return copy.deepcopy(self._runs.get(workflow_id, {}))
+
+    def clear(self):
+        self._entries.clear()
+        self._runs.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries), "workflows": len(self._runs)}
+
+
+_node_result_memo: Optional[NodeResultMemo] = None
+
+
+def get_node_result_memo() -> NodeResultMemo:
+    """Get the process-wide node result memo"""
+    global _node_result_memo
+    if _node_result_memo is None:
+        _node_result_memo = NodeResultMemo()
+    return _node_result_memo
+
+
 @dataclass
 class GraphExecutionState:
     """Current state of graph execution"""
@@ -98,6 +349,17 @@ class GraphExecutionState:
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     error_message: Optional[str] = None
+    # Incoming edges per node: [{"source", "source_handle", "target_handle"}]
+    node_inputs: Dict[str, List[Dict[str, Optional[str]]]] = field(
+        default_factory=dict
+    )
+    blobs: ExecutionBlobStore = field(default_factory=ExecutionBlobStore)
+    # Content hash of each completed node's output (memo keys of successors)
+    output_hashes: Dict[str, str] = field(default_factory=dict)
+    # Re-run from node X: outputs taken over from the previous run
+    reuse_outputs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Nodes that must execute even if the memo has a result for them
+    force_nodes: Set[str] = field(default_factory=set)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -111,9 +373,46 @@ class GraphExecutionState:
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "error_message": self.error_message,
+            "blob_store": self.blobs.get_stats(),
         }
 
 
+class _ExecutionUpdateCoalescer:
+    """Sends at most one full-state update per interval while a graph runs"""
+
+    def __init__(self, send, execution_state: GraphExecutionState, interval_s: float):
+        self._send = send
+        self._state = execution_state
+        self._interval_s = interval_s
+        self._dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+
+    def mark_dirty(self):
+        self._dirty.set()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            await self._send(self._state)
+            self.sent += 1
+            await asyncio.sleep(self._interval_s)
+
+    async def stop(self):
+        """Stop the timer; pending changes go out with the caller's final update"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
 class GraphExecutionService:
     """Service for executing workflow graphs with real-time updates"""
 
@@ -124,6 +423,10 @@ class GraphExecutionService:
         click_service: ClickAutomationService,
         desktop_service: DesktopAutomationService,
         ocr_service: OCRService,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        node_type_concurrency: Optional[Dict[str, int]] = None,
+        update_interval_s: float = DEFAULT_UPDATE_INTERVAL_S,
+        result_memo: Optional[NodeResultMemo] = None,
     ):
         """Initialize the graph execution service"""
         self.node_service = node_service
@@ -132,9 +435,21 @@ class GraphExecutionService:
         self.desktop_service = desktop_service
         self.ocr_service = ocr_service
 
+        # Scheduler limits
+        self.max_concurrency = max(1, max_concurrency)
+        self.node_type_concurrency = dict(
+            DEFAULT_NODE_TYPE_CONCURRENCY
+            if node_type_concurrency is None
+            else node_type_concurrency
+        )
+        self.update_interval_s = update_interval_s
+        self.result_memo = result_memo or get_node_result_memo()
+
         # Execution state management
         self.execution_states: Dict[str, GraphExecutionState] = {}
         self.execution_history: List[GraphExecutionState] = []
+        # Set whenever pause/resume/cancel changes a running graph
+        self._control_events: Dict[str, asyncio.Event] = {}
 
         # Filesystem integration
         self.workflow_data_path = Path("./workflow-data")
@@ -221,8 +536,19 @@ class GraphExecutionService:
             directory.mkdir(parents=True, exist_ok=True)
             logger.debug(f"Ensured directory exists: {directory}")
 
-    async def execute_graph(self, workflow: Workflow, debug_mode: bool = False) -> str:
-        """Execute a workflow graph with real-time updates"""
+    async def execute_graph(
+        self,
+        workflow: Workflow,
+        debug_mode: bool = False,
+        reuse_outputs: Optional[Dict[str, Dict[str, Any]]] = None,
+        force_nodes: Optional[Set[str]] = None,
+    ) -> str:
+        """Execute a workflow graph with real-time updates
+
+        Args:
+            reuse_outputs: Node outputs taken over without executing the node
+            force_nodes: Nodes executed even when the result memo has a hit
+        """
         graph_id = f"graph_{workflow.id}_{int(time.time())}"
 
         # Initialize execution state
@@ -234,6 +560,8 @@ class GraphExecutionService:
             failed_nodes=set(),
             node_results={},
             start_time=datetime.now(),
+            reuse_outputs=dict(reuse_outputs or {}),
+            force_nodes=set(force_nodes or ()),
         )
 
         self.execution_states[graph_id] = execution_state
@@ -262,56 +590,14 @@ class GraphExecutionService:
             # Send initial execution update
             await self._send_execution_update(execution_state)
 
-            # Perform topological sort to determine execution order
-            execution_order = self._topological_sort(
-                workflow.nodes, workflow.connections
-            )
-
-            # Execute nodes in order
-            for node_batch in execution_order:
-                if execution_state.status != GraphExecutionStatus.RUNNING:
-                    break
-
-                # Execute nodes in parallel within each batch
-                tasks = []
-                for node in node_batch:
-                    execution_state.current_nodes.add(node.id)
-                    task = asyncio.create_task(
-                        self._execute_node(node, execution_state, debug_mode)
-                    )
-                    tasks.append(task)
-
-                # Wait for all nodes in batch to complete
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Process results
-                for i, result in enumerate(results):
-                    node = node_batch[i]
-                    execution_state.current_nodes.discard(node.id)
+            # Run nodes as their inputs become ready
+            await self._run_dataflow(workflow, execution_state, debug_mode)
 
-                    if isinstance(result, Exception):
-                        execution_state.failed_nodes.add(node.id)
-                        execution_state.node_results[node.id] = NodeExecutionResult(
-                            node_id=node.id,
-                            status=NodeExecutionStatus.FAILED,
-                            error_message=str(result),
-                            timestamp=datetime.now(),
-                        )
-                        logger.error(f"Node {node.id} failed: {result}")
-                    else:
-                        execution_state.completed_nodes.add(node.id)
-                        execution_state.node_results[node.id] = result
-
-                # Send progress update
-                await self._send_execution_update(execution_state)
-
-                # Check if any critical nodes failed
-                if execution_state.failed_nodes:
-                    execution_state.status = GraphExecutionStatus.FAILED
-                    break
-
-            # Finalize execution
-            if execution_state.status == GraphExecutionStatus.RUNNING:
+            # Finalize execution (a graph paused after its last node is done)
+            if execution_state.status in (
+                GraphExecutionStatus.RUNNING,
+                GraphExecutionStatus.PAUSED,
+            ):
                 execution_state.status = GraphExecutionStatus.COMPLETED
 
             execution_state.end_time = datetime.now()
@@ -320,7 +606,7 @@ class GraphExecutionService:
             await broadcast_execution_status_update(
                 graph_id,
                 {
-                    "status": "completed",
+                    "status": execution_state.status.value,
                     "start_time": execution_state.start_time.isoformat(),
                     "end_time": execution_state.end_time.isoformat(),
                     "graph_id": graph_id,
@@ -353,19 +639,224 @@ class GraphExecutionService:
 
         # Send final update
         await self._send_execution_update(execution_state)
+        self._control_events.pop(graph_id, None)
+        self._remember_run(workflow, execution_state)
 
         # Archive execution state
         self.execution_history.append(execution_state)
         if len(self.execution_history) > 100:  # Keep last 100 executions
-            self.execution_history.pop(0)
+            expired = self.execution_history.pop(0)
+            expired.blobs.clear()
 
         return graph_id
 
+    async def _run_dataflow(
+        self,
+        workflow: Workflow,
+        execution_state: GraphExecutionState,
+        debug_mode: bool,
+    ) -> None:
+        """Dataflow scheduler: start each node once all its predecessors completed
+
+        Unlike level-by-level execution, a slow node only delays its own
+        successors, so wall time follows the critical path. A failed node
+        stops scheduling; nodes already running are allowed to finish.
+        """
+        node_map = {node.id: node for node in workflow.nodes}
+        successors: Dict[str, List[str]] = {node.id: [] for node in workflow.nodes}
+        pending_inputs = {node.id: 0 for node in workflow.nodes}
+        for conn in _connections(workflow):
+            source, target = _edge(conn)
+            successors[source].append(target)
+            pending_inputs[target] += 1
+            execution_state.node_inputs.setdefault(target, []).append(
+                {
+                    "source": source,
+                    "source_handle": getattr(conn, "source_handle", None),
+                    "target_handle": getattr(conn, "target_handle", None),
+                }
+            )
+
+        ready = [node_id for node_id, count in pending_inputs.items() if count == 0]
+        running: Dict[asyncio.Task, str] = {}
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        type_slots = {
+            node_type: asyncio.Semaphore(max(1, limit))
+            for node_type, limit in self.node_type_concurrency.items()
+        }
+        control = self._control_events.setdefault(
+            execution_state.graph_id, asyncio.Event()
+        )
+        updates = _ExecutionUpdateCoalescer(
+            self._send_execution_update, execution_state, self.update_interval_s
+        )
+        updates.start()
+
+        async def run_node(node: WorkflowNode) -> NodeExecutionResult:
+            type_slot = type_slots.get(node.type)
+            if type_slot is not None:
+                await type_slot.acquire()
+            try:
+                async with global_slots:
+                    if execution_state.status in (
+                        GraphExecutionStatus.FAILED,
+                        GraphExecutionStatus.CANCELLED,
+                    ):
+                        return NodeExecutionResult(
+                            node_id=node.id,
+                            status=NodeExecutionStatus.SKIPPED,
+                            timestamp=datetime.now(),
+                        )
+                    execution_state.current_nodes.add(node.id)
+                    updates.mark_dirty()
+                    return await self._execute_node(node, execution_state, debug_mode)
+            finally:
+                if type_slot is not None:
+                    type_slot.release()
+
+        try:
+            while ready or running:
+                if execution_state.status == GraphExecutionStatus.RUNNING:
+                    for node_id in ready:
+                        task = asyncio.create_task(run_node(node_map[node_id]))
+                        running[task] = node_id
+                    ready = []
+                elif execution_state.status != GraphExecutionStatus.PAUSED:
+                    # Failed / cancelled: drain what is already running
+                    ready = []
+                    if not running:
+                        break
+
+                waiters = set(running)
+                control_wait = None
+                if execution_state.status == GraphExecutionStatus.PAUSED:
+                    control.clear()
+                    control_wait = asyncio.create_task(control.wait())
+                    waiters.add(control_wait)
+
+                done, _ = await asyncio.wait(
+                    waiters, return_when=asyncio.FIRST_COMPLETED
+                )
+                if control_wait is not None and not control_wait.done():
+                    control_wait.cancel()
+
+                for task in done:
+                    node_id = running.pop(task, None)
+                    if node_id is None:
+                        continue
+                    execution_state.current_nodes.discard(node_id)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = NodeExecutionResult(
+                            node_id=node_id,
+                            status=NodeExecutionStatus.FAILED,
+                            error_message=str(e),
+                            timestamp=datetime.now(),
+                        )
+                    execution_state.node_results[node_id] = result
+
+                    if result.status == NodeExecutionStatus.COMPLETED:
+                        execution_state.completed_nodes.add(node_id)
+                        for successor in successors[node_id]:
+                            pending_inputs[successor] -= 1
+                            if pending_inputs[successor] == 0:
+                                ready.append(successor)
+                    elif result.status == NodeExecutionStatus.FAILED:
+                        execution_state.failed_nodes.add(node_id)
+                        logger.error(f"Node {node_id} failed: {result.error_message}")
+                        if execution_state.status == GraphExecutionStatus.RUNNING:
+                            execution_state.status = GraphExecutionStatus.FAILED
+                    updates.mark_dirty()
+        finally:
+            for task in running:
+                task.cancel()
+            await updates.stop()
+
+    async def rerun_from_node(
+        self, workflow: Workflow, node_id: str, debug_mode: bool = False
+    ) -> str:
+        """Re-run ``node_id`` and everything downstream of it
+
+        All other nodes take over their output from the previous run of the
+        workflow (if it completed there); ``node_id`` itself always executes.
+        """
+        downstream = self._downstream_nodes(workflow, node_id)
+        previous = self.result_memo.last_run(str(workflow.id))
+        reuse = {
+            nid: output for nid, output in previous.items() if nid not in downstream
+        }
+        logger.info(
+            f"Re-run of {workflow.id} from {node_id}: "
+            f"{len(reuse)} reused, {len(downstream)} to execute"
+        )
+        return await self.execute_graph(
+            workflow, debug_mode=debug_mode, reuse_outputs=reuse, force_nodes={node_id}
+        )
+
+    def _downstream_nodes(self, workflow: Workflow, node_id: str) -> Set[str]:
+        """``node_id`` and all nodes reachable from it"""
+        successors: Dict[str, List[str]] = {}
+        for conn in _connections(workflow):
+            source, target = _edge(conn)
+            successors.setdefault(source, []).append(target)
+        seen = {node_id}
+        stack = [node_id]
+        while stack:
+            for nxt in successors.get(stack.pop(), []):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    def _remember_run(self, workflow: Workflow, execution_state: GraphExecutionState):
+        outputs = {
+            node_id: execution_state.blobs.materialize(result.output_data)
+            for node_id, result in execution_state.node_results.items()
+            if result.status == NodeExecutionStatus.COMPLETED
+            and result.output_data is not None
+        }
+        if outputs:
+            self.result_memo.remember_run(str(workflow.id), outputs)
+
+    def _is_cacheable(self, node: WorkflowNode) -> bool:
+        config = node.config or {}
+        if node.type == "http_request_action":
+            # Opt-in only, and never for methods with side effects
+            return (
+                bool(config.get("cache"))
+                and str(config.get("method", "POST")).upper() in _IDEMPOTENT_HTTP_METHODS
+            )
+        if "cache" in config:
+            return bool(config["cache"])
+        return NODE_TYPE_CACHEABLE.get(node.type, False)
+
+    def _memo_key(self, node: WorkflowNode, execution_state: GraphExecutionState) -> str:
+        inputs = sorted(
+            (
+                edge["target_handle"] or "",
+                edge["source_handle"] or "",
+                execution_state.output_hashes.get(edge["source"], ""),
+            )
+            for edge in execution_state.node_inputs.get(node.id, [])
+        )
+        blob = json.dumps(
+            {"type": node.type, "config": node.config or {}, "inputs": inputs},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _notify_control(self, graph_id: str):
+        event = self._control_events.get(graph_id)
+        if event is not None:
+            event.set()
+
     async def _validate_graph(self, workflow: Workflow) -> Dict[str, Any]:
         """Validate graph before execution"""
         try:
             # Check for cycles
-            if self._has_cycles(workflow.nodes, workflow.connections):
+            if self._has_cycles(workflow.nodes, _connections(workflow)):
                 return {"valid": False, "error": "Graph contains cycles"}
 
             # Validate node configurations
@@ -377,7 +868,7 @@ class GraphExecutionService:
                     }
 
             # Check connectivity
-            if not self._validate_connectivity(workflow.nodes, workflow.connections):
+            if not self._validate_connectivity(workflow.nodes, _connections(workflow)):
                 return {"valid": False, "error": "Graph has connectivity issues"}
 
             return {"valid": True}
@@ -424,8 +915,9 @@ class GraphExecutionService:
         in_degree = {node.id: 0 for node in nodes}
 
         for conn in connections:
-            adjacency[conn.source_node_id].append(conn.target_node_id)
-            in_degree[conn.target_node_id] += 1
+            source, target = _edge(conn)
+            adjacency[source].append(target)
+            in_degree[target] += 1
 
         # Find nodes with no incoming edges (starting nodes)
         queue = [node_id for node_id, degree in in_degree.items() if degree == 0]
@@ -454,7 +946,8 @@ class GraphExecutionService:
         """Check if graph has cycles using DFS"""
         adjacency = {node.id: [] for node in nodes}
         for conn in connections:
-            adjacency[conn.source_node_id].append(conn.target_node_id)
+            source, target = _edge(conn)
+            adjacency[source].append(target)
 
         visited = set()
         rec_stack = set()
@@ -488,10 +981,8 @@ class GraphExecutionService:
         node_ids = {node.id for node in nodes}
 
         for conn in connections:
-            if (
-                conn.source_node_id not in node_ids
-                or conn.target_node_id not in node_ids
-            ):
+            source, target = _edge(conn)
+            if source not in node_ids or target not in node_ids:
                 return False
 
         return True
@@ -521,8 +1012,29 @@ class GraphExecutionService:
             if not handler:
                 raise ValueError(f"No handler found for node type: {node.type}")
 
-            # Execute node with handler
-            output_data = await handler(node, execution_state, debug_mode)
+            # Previous-run output / memo hit / handler; large values stay in
+            # the blob store
+            cache_source = None
+            memo_key = None
+            raw_output = None
+            if node.id in execution_state.reuse_outputs:
+                raw_output = execution_state.reuse_outputs[node.id]
+                cache_source = "reused"
+                self.result_memo.stats["reused"] += 1
+            elif self._is_cacheable(node):
+                memo_key = self._memo_key(node, execution_state)
+                if node.id not in execution_state.force_nodes:
+                    raw_output = self.result_memo.get(memo_key)
+                    if raw_output is not None:
+                        cache_source = "memo"
+
+            if cache_source is None:
+                raw_output = await handler(node, execution_state, debug_mode)
+                if memo_key is not None and _is_memoizable(raw_output):
+                    self.result_memo.put(memo_key, raw_output)
+
+            output_data = execution_state.blobs.externalize(raw_output)
+            execution_state.output_hashes[node.id] = _content_hash(output_data)
 
             execution_time = time.time() - start_time
 
@@ -532,6 +1044,7 @@ class GraphExecutionService:
                 output_data=output_data,
                 execution_time=execution_time,
                 timestamp=datetime.now(),
+                cache_source=cache_source,
             )
 
             # Broadcast node execution completion
@@ -539,7 +1052,8 @@ class GraphExecutionService:
                 "status": "completed",
                 "start_time": node_data["start_time"],
                 "end_time": datetime.now().isoformat(),
-                "result": output_data,
+                "result": _wire_safe(output_data),
+                "cache_source": cache_source,
                 "node_type": node.type,
                 "node_data": node.data if hasattr(node, "data") else {},
             }
@@ -606,6 +1120,7 @@ class GraphExecutionService:
         execution_state = self.execution_states.get(graph_id)
         if execution_state and execution_state.status == GraphExecutionStatus.RUNNING:
             execution_state.status = GraphExecutionStatus.PAUSED
+            self._notify_control(graph_id)
             await self._send_execution_update(execution_state)
             return True
         return False
@@ -615,6 +1130,7 @@ class GraphExecutionService:
         execution_state = self.execution_states.get(graph_id)
         if execution_state and execution_state.status == GraphExecutionStatus.PAUSED:
             execution_state.status = GraphExecutionStatus.RUNNING
+            self._notify_control(graph_id)
             await self._send_execution_update(execution_state)
             return True
         return False
@@ -628,6 +1144,7 @@ class GraphExecutionService:
         ]:
             execution_state.status = GraphExecutionStatus.CANCELLED
             execution_state.end_time = datetime.now()
+            self._notify_control(graph_id)
             await self._send_execution_update(execution_state)
             return True
         return False
@@ -982,8 +1499,10 @@ class GraphExecutionService:
         webhook_url = config.get("webhook_url", "")
 
         try:
-            # Get input data from previous nodes
-            input_data = self._get_node_input_data(node, execution_state)
+            # Get input data from connected upstream nodes
+            input_data = execution_state.blobs.materialize(
+                self._get_node_input_data(node, execution_state)
+            )
 
             async with aiohttp.ClientSession() as session:
                 async with session.post(webhook_url, json=input_data) as response:
@@ -1013,8 +1532,10 @@ class GraphExecutionService:
         """Execute send to filesystem node"""
         config = node.config or {}
 
-        # Get input data from previous nodes
-        input_data = self._get_node_input_data(node, execution_state)
+        # Get input data from connected upstream nodes
+        input_data = execution_state.blobs.materialize(
+            self._get_node_input_data(node, execution_state)
+        )
 
         output_dir = Path(config.get("output_directory", "./workflow-data/output"))
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -1084,18 +1605,21 @@ class GraphExecutionService:
                 export_path / f"workflow_results_{execution_state.graph_id}.json"
             )
             with open(result_file, "w") as f:
-                json.dump(aggregated_results, f, indent=2)
+                json.dump(
+                    execution_state.blobs.materialize(aggregated_results), f, indent=2
+                )
 
         return aggregated_results
 
     def _get_node_input_data(
         self, node: WorkflowNode, execution_state: GraphExecutionState
     ) -> Dict[str, Any]:
-        """Get input data for a node from previous node results"""
-        # This is a simplified implementation
-        # In a real implementation, you would trace back through connections
-        # to get the actual output data from connected nodes
+        """Get input data for a node from the nodes connected to its inputs
 
+        Only outputs routed along incoming connections are included. Large
+        values remain BlobRefs; callers that serialize the data materialize
+        it via ``execution_state.blobs.materialize``.
+        """
         input_data = {
             "node_id": node.id,
             "node_type": node.type,
@@ -1103,12 +1627,22 @@ class GraphExecutionService:
             "previous_results": [],
         }
 
-        # Add results from completed nodes
-        for node_id, result in execution_state.node_results.items():
-            if result.status == NodeExecutionStatus.COMPLETED and result.output_data:
-                input_data["previous_results"].append(
-                    {"source_node_id": node_id, "data": result.output_data}
-                )
+        for edge in execution_state.node_inputs.get(node.id, []):
+            result = execution_state.node_results.get(edge["source"])
+            if (
+                result is None
+                or result.status != NodeExecutionStatus.COMPLETED
+                or not result.output_data
+            ):
+                continue
+            input_data["previous_results"].append(
+                {
+                    "source_node_id": edge["source"],
+                    "source_handle": edge["source_handle"],
+                    "target_handle": edge["target_handle"],
+                    "data": result.output_data,
+                }
+            )
 
         return input_data
 
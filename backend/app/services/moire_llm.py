@@ -0,0 +1,20 @@
+"""Shared moire_agents LLM transport for backend services
+
+The llm_intent router imports ``core.llm_transport`` with moire_agents on
+sys.path. Services import it the same way through ``llm_transport()`` so the
+whole process uses one pooled, retrying transport singleton.
+"""
+
+import sys
+from pathlib import Path
+
+MOIRE_AGENTS_PATH = str(Path(__file__).parent.parent.parent / "moire_agents")
+
+
+def llm_transport():
+    """The ``core.llm_transport`` module (moire_agents added to sys.path)"""
+    if MOIRE_AGENTS_PATH not in sys.path:
+        sys.path.insert(0, MOIRE_AGENTS_PATH)
+    from core import llm_transport as transport_module
+
+    return transport_module
@@ -3,6 +3,7 @@
 Provides shell command execution, session management, and security features.
 """
 
+import asyncio
 import os
 import re
 import subprocess
@@ -18,6 +19,73 @@ from ..logger_config import get_logger
 logger = get_logger("shell_service")
 
 
+async def run_subprocess(
+    cmd: List[str],
+    timeout: float,
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple[int, str, str]:
+    """Run a command without blocking the event loop
+
+    Returns (returncode, stdout, stderr). On timeout or cancellation the
+    process is killed; a timeout raises ``subprocess.TimeoutExpired`` like
+    ``subprocess.run`` does.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+        )
+    except NotImplementedError:
+        # Selector event loops cannot spawn subprocesses (uvicorn installs
+        # one on Windows with reload=True): wait in a worker thread instead
+        return await _run_subprocess_in_thread(cmd, timeout, cwd, env)
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            raise subprocess.TimeoutExpired(cmd, timeout) from None
+        raise
+    return (
+        proc.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+
+
+async def _run_subprocess_in_thread(
+    cmd: List[str],
+    timeout: float,
+    cwd: Optional[str],
+    env: Optional[Dict[str, str]],
+) -> Tuple[int, str, str]:
+    """run_subprocess for event loops without subprocess support"""
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd, env=env
+    )
+    try:
+        stdout, stderr = await asyncio.to_thread(proc.communicate, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        await asyncio.to_thread(proc.communicate)
+        raise subprocess.TimeoutExpired(cmd, timeout) from None
+    except asyncio.CancelledError:
+        # The worker thread's communicate() returns once the process is gone
+        proc.kill()
+        raise
+    return (
+        proc.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+
+
 class ShellService:
     """Service for managing shell operations and sessions"""
 
@@ -14,17 +14,19 @@ import base64
 import json
 import logging
 import os
-import time
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from app.services.frame_change_gate import (DEFAULT_MASKS, FrameChangeGate,
+                                            cursor_from_metadata, parse_masks)
+from app.services.moire_llm import llm_transport
+
 logger = logging.getLogger(__name__)
 
 # Config
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 
 def _get_vision_model() -> str:
@@ -36,6 +38,40 @@ def _get_vision_model() -> str:
         return "nvidia/nemotron-nano-12b-v2-vl:free"
 
 
+def _stream_frame_cache():
+    """StreamFrameCache as the websocket router fills it.
+
+    The router imports ``stream_frame_cache`` with moire_agents on sys.path;
+    importing it as ``moire_agents.stream_frame_cache`` would create a second,
+    always empty cache (and listeners that never fire).
+    """
+    import sys
+
+    moire_agents_path = str(Path(__file__).parent.parent.parent / "moire_agents")
+    if moire_agents_path not in sys.path:
+        sys.path.insert(0, moire_agents_path)
+    from stream_frame_cache import StreamFrameCache
+
+    return StreamFrameCache
+
+
+def _create_monitor_gate():
+    """FrameChangeGate configured from settings (defaults without config)."""
+    try:
+        from app.config import get_settings
+
+        settings = get_settings()
+        return FrameChangeGate(
+            change_threshold=settings.video_monitor_change_threshold,
+            major_threshold=settings.video_monitor_major_threshold,
+            min_interval=settings.video_monitor_min_interval,
+            max_interval=settings.video_monitor_max_interval,
+            masks=parse_masks(settings.video_monitor_masks),
+        )
+    except Exception:
+        return FrameChangeGate(masks=parse_masks(DEFAULT_MASKS))
+
+
 # Training data directory
 TRAINING_DIR = Path(__file__).parent.parent.parent / "training_data"
 TRAINING_DIR.mkdir(exist_ok=True)
@@ -58,7 +94,7 @@ async def capture_current_frame(
         from app.config import get_settings
 
         if get_settings().execution_mode == "remote":
-            from moire_agents.stream_frame_cache import StreamFrameCache
+            StreamFrameCache = _stream_frame_cache()
 
             # Use short TTL (500ms) for video agent — fresh frames are critical
             frame = StreamFrameCache.get_fresh_frame(monitor_id=0, max_age_ms=500)
@@ -118,6 +154,10 @@ class VideoAgent:
         self._tool_executor = None
         self._monitor_task: Optional[asyncio.Task] = None
         self._monitor_callback_id = None
+        self._monitor_id = 0
+        self._frame_event: Optional[asyncio.Event] = None
+        self._monitor_event_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._gate = None  # FrameChangeGate while monitoring
 
         if not self._enabled:
             logger.warning("[VideoAgent] No OPENROUTER_API_KEY - video agent disabled")
@@ -177,21 +217,16 @@ class VideoAgent:
         }
 
         headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
             "HTTP-Referer": "https://moire-desktop-automation.local",
             "X-Title": "Moire Video Agent",
         }
 
         try:
-            import httpx
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(OPENROUTER_URL, json=payload, headers=headers)
-                resp.raise_for_status()
-                data = resp.json()
-                content = data["choices"][0]["message"]["content"]
-                analysis = json.loads(content)
+            data = await llm_transport().getllm_transport().chat_completions(
+                payload, api_key=OPENROUTER_API_KEY, headers=headers, timeout=30.0
+            )
+            content = data["choices"][0]["message"]["content"]
+            analysis = json.loads(content)
         except json.JSONDecodeError:
             logger.warning(f"[VideoAgent] Non-JSON response: {content[:200]}")
             analysis = {
@@ -432,8 +467,11 @@ class VideoAgent:
 
         # Register listener on StreamFrameCache
         try:
-            from moire_agents.stream_frame_cache import StreamFrameCache
+            StreamFrameCache = _stream_frame_cache()
 
+            self._frame_event = asyncio.Event()
+            self._monitor_event_loop = asyncio.get_running_loop()
+            self._gate = _create_monitor_gate()
             self._monitor_callback_id = f"video_agent_{conversation_id}"
             StreamFrameCache.add_listener(
                 self._monitor_callback_id, self._on_frame_update
@@ -457,9 +495,7 @@ class VideoAgent:
         # Unregister listener
         if self._monitor_callback_id:
             try:
-                from moire_agents.stream_frame_cache import StreamFrameCache
-
-                StreamFrameCache.remove_listener(self._monitor_callback_id)
+                _stream_frame_cache().remove_listener(self._monitor_callback_id)
                 self._monitor_callback_id = None
                 logger.info("[VideoAgent] Listener unregistered")
             except ImportError:
@@ -478,52 +514,71 @@ class VideoAgent:
     def _on_frame_update(self, monitor_id: int, frame: "FrameData"):
         """Callback when new frame arrives (called by StreamFrameCache).
 
-        Don't block - actual analysis happens in _monitor_loop.
+        Don't block - only wakes _monitor_loop, which scores the frame.
         """
-        pass  # Frame analysis handled in background loop
+        if monitor_id != self._monitor_id or self._frame_event is None:
+            return
+        loop = self._monitor_event_loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._frame_event.set)
 
     async def _monitor_loop(self, conversation_id: str):
-        """Background monitoring loop with intelligent sampling."""
-        last_analysis_time = 0
-        min_interval = 2.0  # Minimum 2 seconds between analyses (avoid rate limits)
-        last_frame_hash = None
+        """Background monitoring loop driven by the frame stream.
+
+        Every new frame is scored by the FrameChangeGate; the vision model
+        is only called for perceptual changes, at an adaptive cadence.
+        """
+        gate = self._gate or _create_monitor_gate()
+        frame_event = self._frame_event or asyncio.Event()
+        last_frame = None
+        last_thumb = None
         error_count = 0
         max_errors = 3
 
         logger.info("[Monitor] Background loop started")
 
         try:
-            while True:
-                await asyncio.sleep(0.5)  # Check every 500ms
-
-                # Rate limiting
-                if time.time() - last_analysis_time < min_interval:
-                    continue
+            StreamFrameCache = _stream_frame_cache()
+        except ImportError:
+            logger.error("[Monitor] StreamFrameCache not available")
+            return
 
-                # Get fresh frame
+        try:
+            while True:
+                # Wake on the next frame; re-check a pending change without
+                # new frames (a static screen counts as settled)
                 try:
-                    from moire_agents.stream_frame_cache import \
-                        StreamFrameCache
+                    await asyncio.wait_for(frame_event.wait(), timeout=1.0)
+                    frame_event.clear()
+                except asyncio.TimeoutError:
+                    pass
 
-                    frame = StreamFrameCache.get_fresh_frame(
-                        monitor_id=0, max_age_ms=1000
-                    )
-                except ImportError:
-                    logger.error("[Monitor] StreamFrameCache not available")
-                    break
-
-                if not frame:
+                frame = StreamFrameCache.get_fresh_frame(
+                    monitor_id=self._monitor_id, max_age_ms=1000
+                )
+                if frame and (last_frame is None or frame.timestamp != last_frame.timestamp):
+                    thumb = await asyncio.to_thread(gate.thumbnail, frame.data)
+                    if thumb is None:
+                        continue
+                    last_frame, last_thumb = frame, thumb
+                elif last_thumb is not None and last_frame.age_ms < 10000:
+                    # No new frame (clients may only send on change): the
+                    # screen is static, the last frame is still current
+                    frame, thumb = last_frame, last_thumb
+                else:
                     continue
 
-                # Change detection (simple hash)
-                frame_hash = hash(frame.data[:1000])  # Hash first 1000 chars
-                if frame_hash == last_frame_hash:
-                    continue  # No change
-
-                last_frame_hash = frame_hash
+                cursor = cursor_from_metadata(frame.metadata)
+                decision = gate.decide(thumb, cursor=cursor)
+                if not decision.analyze:
+                    continue
 
                 # Analyze
-                logger.info("[Monitor] Screen changed - analyzing...")
+                logger.info(
+                    f"[Monitor] Screen changed ({decision.reason}, "
+                    f"score={decision.score:.2f}) - analyzing..."
+                )
                 context = {
                     "tool": "monitor",
                     "params": {},
@@ -534,11 +589,11 @@ class VideoAgent:
                     analysis = await self.analyze_frame(
                         frame.data, context, conversation_id
                     )
-                    last_analysis_time = time.time()
                     error_count = 0  # Reset on success
 
                     # Classify event
                     event_type = self._classify_screen_event(analysis)
+                    gate.mark_analyzed(thumb, event_type)
 
                     if event_type == "dialog":
                         # Auto-handle dialog
@@ -572,7 +627,13 @@ class VideoAgent:
         except Exception as e:
             logger.error(f"[Monitor] Fatal error: {e}")
 
-        logger.info("[Monitor] Background loop stopped")
+        logger.info(f"[Monitor] Background loop stopped - gate stats: {gate.get_stats()}")
+
+    def get_monitor_stats(self) -> Dict[str, Any]:
+        """Frame gate statistics of the running (or last) monitor."""
+        if self._gate is None:
+            return {}
+        return self._gate.get_stats()
 
     def _classify_screen_event(self, analysis: Dict) -> str:
         """Classify screen change event.
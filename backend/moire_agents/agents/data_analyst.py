@@ -25,6 +25,14 @@ if TYPE_CHECKING:
     from ..bridge.websocket_client import (CaptureResult, MoireWebSocketClient,
                                            UIContext)
 
+# Geteilter Bildschirmzustand (optional)
+try:
+    from services.screen_state import get_screen_state_service
+
+    HAS_SCREEN_STATE = True
+except ImportError:
+    HAS_SCREEN_STATE = False
+
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -178,11 +186,20 @@ class DataAnalystAgent:
     - Vision-Fallback bei Hard Cases
     """
 
-    def __init__(self, detection_results_dir: str = "./detection_results"):
+    def __init__(
+        self, detection_results_dir: str = "./detection_results", screen_state=None
+    ):
         self.current_context: Optional[UIScreenContext] = None
         self.element_history: List[Dict[str, Any]] = []
         self.detection_results_dir = Path(detection_results_dir)
 
+        # Geteilter Bildschirmzustand: unveränderte Pixel -> letzte Analyse gilt
+        if screen_state is None and HAS_SCREEN_STATE:
+            screen_state = get_screen_state_service()
+        self.screen_state = screen_state
+        self._last_analysis: Optional[CompleteAnalysisResult] = None
+        self._last_analysis_version: Optional[int] = None
+
         # Vision fallback thresholds
         self.min_ocr_quality = 0.3  # Min 30% Elemente mit Text
         self.min_confidence = 0.4  # Min durchschnittliche Konfidenz
@@ -436,6 +453,7 @@ class DataAnalystAgent:
         client: "MoireWebSocketClient",
         timeout: float = 60.0,
         retry_on_low_quality: bool = True,
+        reuse_if_unchanged: bool = True,
     ) -> CompleteAnalysisResult:
         """
         Wartet auf vollständigen Capture+OCR und analysiert dann.
@@ -446,12 +464,27 @@ class DataAnalystAgent:
             client: MoireWebSocketClient Instanz
             timeout: Maximale Wartezeit
             retry_on_low_quality: Bei schlechter OCR-Qualität retry
+            reuse_if_unchanged: Letzte Analyse zurückgeben, solange der
+                                Screen State Service keine neue Version hat
 
         Returns:
             CompleteAnalysisResult mit allen Daten
         """
         start_time = time.time()
 
+        screen_version = None
+        if self.screen_state is not None and await self.screen_state.refresh(
+            max_age=0.2
+        ):
+            screen_version = self.screen_state.version
+            if (
+                reuse_if_unchanged
+                and self._last_analysis is not None
+                and screen_version == self._last_analysis_version
+            ):
+                logger.debug(f"Screen unchanged (v{screen_version}), reusing analysis")
+                return self._last_analysis
+
         # Capture mit vollständiger OCR
         if retry_on_low_quality:
             capture_result = await client.capture_with_retry(
@@ -575,7 +608,7 @@ class DataAnalystAgent:
 
         processing_time = (time.time() - start_time) * 1000
 
-        return CompleteAnalysisResult(
+        result = CompleteAnalysisResult(
             ui_context=ui_context,
             merged_data=merged_data,
             raw_boxes=merged_data.boxes,
@@ -588,6 +621,9 @@ class DataAnalystAgent:
             needs_vision_fallback=needs_vision,
             vision_reason=vision_reason,
         )
+        self._last_analysis = result
+        self._last_analysis_version = screen_version
+        return result
 
     def should_use_vision(
         self,
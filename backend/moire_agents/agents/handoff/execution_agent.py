@@ -16,6 +16,15 @@ from .base_agent import AgentConfig, BaseHandoffAgent, Tool
 from .messages import HandoffRequest, UserTask
 from .tools import transfer_to_orchestrator, transfer_to_recovery
 
+# Frame-driven waiting instead of fixed sleeps
+try:
+    from validation.screen_settle import expects_change, get_screen_settler
+
+    HAS_SETTLE = True
+except ImportError:
+    HAS_SETTLE = False
+    get_screen_settler = None
+
 logger = logging.getLogger(__name__)
 
 # PyAutoGUI safety settings
@@ -54,6 +63,8 @@ class ExecutionAgent(BaseHandoffAgent):
         super().__init__(config)
 
         self.use_clipboard_for_text = use_clipboard_for_text
+        self.settler = get_screen_settler() if HAS_SETTLE else None
+        self._settle_baseline = None  # frame before the last screen-changing action
 
     def _register_default_tools(self):
         """Register delegate tools for this agent."""
@@ -120,6 +131,10 @@ class ExecutionAgent(BaseHandoffAgent):
         """Execute a single pyautogui action."""
         action_type = action.get("type", "")
 
+        # Baseline for a following sleep: it ends once this action's effect settled
+        if self.settler is not None and expects_change(action):
+            self._settle_baseline = await self.settler.snapshot()
+
         if action_type == "hotkey":
             return await self._execute_hotkey(action)
         elif action_type == "write":
@@ -209,13 +224,28 @@ class ExecutionAgent(BaseHandoffAgent):
         return {"action": "scroll", "clicks": clicks, "success": True}
 
     async def _execute_sleep(self, action: Dict) -> Dict[str, Any]:
-        """Wait for a duration."""
+        """Wait until the screen settled, at most the given duration."""
         seconds = action.get("seconds", 1.0)
 
-        logger.info(f"Sleeping: {seconds}s")
-        await asyncio.sleep(seconds)
+        if self.settler is None:
+            logger.info(f"Sleeping: {seconds}s")
+            await asyncio.sleep(seconds)
+            return {"action": "sleep", "seconds": seconds, "success": True}
 
-        return {"action": "sleep", "seconds": seconds, "success": True}
+        result = await self.settler.wait_for_settle(
+            max_wait=seconds,
+            baseline=self._settle_baseline,
+            expect_change=self._settle_baseline is not None,
+        )
+        logger.info(f"Waited: {result.elapsed:.2f}s of {seconds}s ({result.reason})")
+
+        return {
+            "action": "sleep",
+            "seconds": seconds,
+            "waited": round(result.elapsed, 3),
+            "settle": result.reason,
+            "success": True,
+        }
 
     async def _execute_move_to(self, action: Dict) -> Dict[str, Any]:
         """Move mouse to position."""
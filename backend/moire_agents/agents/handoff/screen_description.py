@@ -94,6 +94,28 @@ def _try_screen_regions():
         return None, None
 
 
+def _try_uia_snapshot_cache():
+    try:
+        from agents.handoff.uia_snapshot import \
+            get_uia_snapshot_cache  # type: ignore
+
+        return get_uia_snapshot_cache()
+    except Exception as e:
+        logger.debug(f"uia_snapshot cache unavailable: {e}")
+        return None
+
+
+def _try_screen_state_service():
+    try:
+        from services.screen_state import \
+            get_screen_state_service  # type: ignore
+
+        return get_screen_state_service()
+    except Exception as e:
+        logger.debug(f"screen state service unavailable: {e}")
+        return None
+
+
 # ─── Helpers ─────────────────────────────────────────────────────────────────
 
 
@@ -544,6 +566,11 @@ async def handle_get_window_tree() -> Dict[str, Any]:
 
         enriched.append(entry)
 
+    # Closed windows drop out of the shared UIA snapshot cache.
+    cache = _try_uia_snapshot_cache()
+    if cache is not None:
+        cache.retain(e["hwnd"] for e in enriched if e.get("hwnd"))
+
     return {
         "success": True,
         "count": len(enriched),
@@ -625,15 +652,31 @@ async def handle_get_cursor_context() -> Dict[str, Any]:
 
 
 # ─── Phase 4.3: Streaming description channel ───────────────────────────────
-
+#
+# One shared poller per process serves every subscription. It runs at the
+# fastest requested interval, computes `_screen_signature` once per tick and
+# fans the resulting event out to each subscriber's queue, so the UIA cost
+# stays constant in the number of subscribers. While the screen is idle the
+# poll interval backs off geometrically and snaps back on the next change.
+# Ticks on which the shared screen state has no new pixel version reuse the
+# last description instead of querying UIA again.
+
+import collections
 import hashlib
 import time
 import uuid
 
-# Map subscription_id → asyncio.Task. Singleton across the process.
-_subscriptions: Dict[str, "asyncio.Task"] = {}
+# Map subscription_id → per-subscriber state. Singleton across the process.
 _subscription_meta: Dict[str, Dict[str, Any]] = {}
 
+# Shared poller state.
+_poller_task: Optional["asyncio.Task"] = None
+_poller_wakeup: Optional[asyncio.Event] = None
+
+_RECENT_EVENTS_MAX = 25
+_IDLE_BACKOFF_FACTOR = 1.5
+_IDLE_BACKOFF_MAX_S = 5.0
+
 
 def _screen_signature(state: Dict[str, Any]) -> str:
     """Build a stable hash that changes when the screen meaningfully changes."""
@@ -651,17 +694,32 @@ def _screen_signature(state: Dict[str, Any]) -> str:
     ]
 
 
-async def _subscription_loop(subscription_id: str, interval_ms: int) -> None:
-    """Background task: poll handle_describe_screen and publish on change."""
-    last_sig: Optional[str] = None
-    interval = max(0.05, interval_ms / 1000.0)
+def _base_poll_interval() -> float:
+    """Fastest interval requested by any live subscriber, in seconds."""
+    if not _subscription_meta:
+        return 0.5
+    fastest_ms = min(m["interval_ms"] for m in _subscription_meta.values())
+    return max(0.05, fastest_ms / 1000.0)
+
+
+def _publish_to_subscriber(
+    subscription_id: str, meta: Dict[str, Any], event: Dict[str, Any]
+) -> None:
+    """Append an event to a subscriber's ring buffer and awaitable queue."""
+    meta["recent_events"].append(event)
+    queue: asyncio.Queue = meta["queue"]
+    if queue.full():
+        # Drop the oldest event — slow consumers must not stall the poller.
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    queue.put_nowait(event)
 
-    # Lazy import — runtime is in agents.handoff.runtime, no cycle here.
-    try:
-        from agents.handoff.runtime import AgentRuntime  # type: ignore
-    except Exception as e:
-        logger.warning(f"_subscription_loop: AgentRuntime unavailable ({e})")
-        return
+
+async def _shared_poller_loop() -> None:
+    """Background task: poll handle_describe_screen once for all subscribers."""
+    global _poller_task
 
     runtime: Optional[Any] = None
     try:
@@ -675,24 +733,48 @@ async def _subscription_loop(subscription_id: str, interval_ms: int) -> None:
     except Exception:
         runtime = None
 
-    while True:
-        try:
-            state = await handle_describe_screen(detail="summary")
-            sig = _screen_signature(state)
-
-            meta = _subscription_meta.get(subscription_id)
-            if meta is None:
-                # Subscription was cancelled while we were polling.
-                return
-            meta["last_seen_at"] = time.time()
-            meta["sig"] = sig
-
-            if sig != last_sig:
-                meta["change_count"] = meta.get("change_count", 0) + 1
-                last_sig = sig
-
-                event_payload = {
-                    "subscription_id": subscription_id,
+    last_sig: Optional[str] = None
+    interval = _base_poll_interval()
+    screen_state = _try_screen_state_service()
+    last_state: Optional[Dict[str, Any]] = None
+    last_version: Optional[int] = None
+    last_described_at = 0.0
+
+    try:
+        while _subscription_meta:
+            base = _base_poll_interval()
+            try:
+                now = time.time()
+                version = None
+                if screen_state is not None and await screen_state.refresh(
+                    max_age=base / 2
+                ):
+                    version = screen_state.version
+                if (
+                    last_state is not None
+                    and version is not None
+                    and version == last_version
+                    and now - last_described_at < _IDLE_BACKOFF_MAX_S
+                ):
+                    state = last_state
+                else:
+                    state = await handle_describe_screen(detail="summary")
+                    last_state, last_version = state, version
+                    last_described_at = now
+                sig = _screen_signature(state)
+                changed = sig != last_sig
+
+                if changed:
+                    last_sig = sig
+                    interval = base
+                else:
+                    # Idle screen — back off, but never beyond the cap.
+                    interval = min(
+                        max(interval, base) * _IDLE_BACKOFF_FACTOR,
+                        max(base, _IDLE_BACKOFF_MAX_S),
+                    )
+
+                shared_payload = {
                     "signature": sig,
                     "active_window_title": (state.get("active_window") or {}).get(
                         "title"
@@ -703,41 +785,98 @@ async def _subscription_loop(subscription_id: str, interval_ms: int) -> None:
                         if isinstance(state.get("focused_element"), dict)
                         else None
                     ),
-                    "ts": time.time(),
+                    "ts": now,
                 }
 
-                # In-process callback path (always recorded).
-                meta.setdefault("recent_events", []).append(event_payload)
-                meta["recent_events"] = meta["recent_events"][-25:]  # ring buffer
-
-                # Best-effort publish to Redis.
-                if runtime is not None and hasattr(runtime, "publish_step_event"):
+                # Fan out. Subscribers that joined after the last change
+                # receive the current signature as their first event.
+                notified: List[str] = []
+                for sub_id, meta in list(_subscription_meta.items()):
+                    meta["last_seen_at"] = now
+                    if meta.get("sig") == sig:
+                        continue
+                    meta["sig"] = sig
+                    meta["change_count"] = meta.get("change_count", 0) + 1
+                    event_payload = {"subscription_id": sub_id, **shared_payload}
+                    _publish_to_subscriber(sub_id, meta, event_payload)
+                    notified.append(sub_id)
+
+                # Best-effort publish to Redis — once per screen change, not
+                # once per subscriber (late joiners are not a change).
+                if (
+                    changed
+                    and notified
+                    and runtime is not None
+                    and hasattr(runtime, "publish_step_event")
+                ):
                     try:
-                        await runtime.publish_step_event("screen_change", event_payload)
+                        await runtime.publish_step_event(
+                            "screen_change",
+                            {"subscription_ids": notified, **shared_payload},
+                        )
                     except Exception as e:
                         logger.debug(f"subscription publish failed: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"screen-change poller error: {e}")
+                interval = base
+
+            # Sleep, but wake early when a faster subscriber joins.
+            wakeup = _poller_wakeup
+            if wakeup is None:
+                await asyncio.sleep(interval)
+                continue
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=interval)
+                wakeup.clear()
+                interval = _base_poll_interval()
+            except asyncio.TimeoutError:
+                pass
+    except asyncio.CancelledError:
+        logger.info("screen-change poller cancelled")
+    finally:
+        if _poller_task is asyncio.current_task():
+            _poller_task = None
+
+
+def _ensure_poller() -> None:
+    """Start the shared poller if needed, or nudge it to re-read intervals."""
+    global _poller_task, _poller_wakeup
+    if _poller_wakeup is None:
+        _poller_wakeup = asyncio.Event()
+    if _poller_task is None or _poller_task.done():
+        _poller_task = asyncio.create_task(_shared_poller_loop())
+    else:
+        _poller_wakeup.set()
 
-            await asyncio.sleep(interval)
-        except asyncio.CancelledError:
-            logger.info(f"subscription {subscription_id} cancelled")
-            return
-        except Exception as e:
-            logger.warning(f"subscription {subscription_id} loop error: {e}")
-            await asyncio.sleep(interval)
+
+async def _stop_poller_if_idle() -> None:
+    """Cancel the shared poller once the last subscriber has gone."""
+    global _poller_task
+    if _subscription_meta or _poller_task is None:
+        return
+    task, _poller_task = _poller_task, None
+    task.cancel()
+    try:
+        await asyncio.wait_for(task, timeout=2.0)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        pass
 
 
 async def handle_subscribe_screen_changes(
     interval_ms: int = 500,
     subscription_id: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Start a background task that publishes screen-change events.
+    """Register a subscriber with the shared screen-change poller.
 
     Returns the subscription_id; pass it to handle_unsubscribe_screen_changes
-    to stop the loop. Recent events are also exposed inline through
-    handle_get_screen_changes(subscription_id).
+    to stop receiving events. Recent events are also exposed inline through
+    handle_get_screen_changes(subscription_id), and in-process consumers can
+    await them with wait_for_screen_change(subscription_id).
     """
     sub_id = subscription_id or f"sub_{uuid.uuid4().hex[:10]}"
-    if sub_id in _subscriptions and not _subscriptions[sub_id].done():
+    if sub_id in _subscription_meta:
         return {
             "success": False,
             "error": f"subscription_id {sub_id} already active",
@@ -747,37 +886,35 @@ async def handle_subscribe_screen_changes(
         "started_at": time.time(),
         "interval_ms": interval_ms,
         "change_count": 0,
-        "recent_events": [],
+        "recent_events": collections.deque(maxlen=_RECENT_EVENTS_MAX),
+        "queue": asyncio.Queue(maxsize=_RECENT_EVENTS_MAX),
     }
-    task = asyncio.create_task(_subscription_loop(sub_id, interval_ms))
-    _subscriptions[sub_id] = task
+    _ensure_poller()
 
     return {
         "success": True,
         "subscription_id": sub_id,
         "interval_ms": interval_ms,
+        "poll_interval_ms": int(_base_poll_interval() * 1000),
+        "subscriber_count": len(_subscription_meta),
     }
 
 
 async def handle_unsubscribe_screen_changes(subscription_id: str) -> Dict[str, Any]:
-    """Stop a previously-started subscription."""
-    task = _subscriptions.pop(subscription_id, None)
+    """Remove a subscriber; the poller stops with the last one."""
     meta = _subscription_meta.pop(subscription_id, None)
-    if task is None:
+    if meta is None:
         return {
             "success": False,
             "error": f"unknown subscription_id: {subscription_id}",
         }
-    task.cancel()
-    try:
-        await asyncio.wait_for(task, timeout=2.0)
-    except (asyncio.CancelledError, asyncio.TimeoutError):
-        pass
+    logger.info(f"subscription {subscription_id} cancelled")
+    await _stop_poller_if_idle()
 
     return {
         "success": True,
         "subscription_id": subscription_id,
-        "change_count": (meta or {}).get("change_count", 0),
+        "change_count": meta.get("change_count", 0),
     }
 
 
@@ -798,44 +935,37 @@ async def handle_get_screen_changes(subscription_id: str) -> Dict[str, Any]:
     }
 
 
+async def wait_for_screen_change(
+    subscription_id: str, timeout: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Await the next event queued for a subscriber (None on timeout)."""
+    meta = _subscription_meta.get(subscription_id)
+    if meta is None:
+        return None
+    try:
+        return await asyncio.wait_for(meta["queue"].get(), timeout=timeout)
+    except asyncio.TimeoutError:
+        return None
+
+
 # ─── Phase 4.4: UIA text extraction (better than OCR for native apps) ───────
 
 
-def _uia_walk_text(
-    ctrl,
-    depth: int = 0,
-    max_depth: int = 12,
-    out: Optional[List[Dict[str, Any]]] = None,
-    visited: Optional[Any] = None,
-    limit: int = 4000,
-) -> List[Dict[str, Any]]:
-    """Walk a UIA control tree and collect every text-bearing node.
+def _uia_node_text(ctrl, depth: int) -> Optional[List[Dict[str, Any]]]:
+    """Collect the text-bearing entries of a single UIA node.
 
-    Returns a flat list of {depth, control_type, name|value|text} dicts.
-    Caps the traversal at `limit` entries to keep the cost bounded.
+    Returns None when the node cannot be read at all (so walkers can skip
+    its subtree), otherwise a possibly-empty list of
+    {depth, kind, text} dicts for Name, Value and Text patterns.
     """
-    if out is None:
-        out = []
-    if visited is None:
-        visited = set()
-    if len(out) >= limit or depth > max_depth:
-        return out
-    try:
-        rt_id = getattr(ctrl, "_runtimeId", None)
-        if rt_id is not None:
-            rt_id = tuple(rt_id)
-            if rt_id in visited:
-                return out
-            visited.add(rt_id)
-    except Exception:
-        pass
     try:
         name = (ctrl.Name or "").strip()
         ctype = ctrl.ControlTypeName
     except Exception:
-        return out
+        return None
+    entries: List[Dict[str, Any]] = []
     if name:
-        out.append({"depth": depth, "kind": ctype, "text": name[:240]})
+        entries.append({"depth": depth, "kind": ctype, "text": name[:240]})
 
     # Value pattern → EditControl content, ComboBox selection, etc.
     try:
@@ -843,7 +973,7 @@ def _uia_walk_text(
         if vp is not None:
             val = (vp.Value or "").strip()
             if val and val != name:
-                out.append(
+                entries.append(
                     {"depth": depth, "kind": f"{ctype}.Value", "text": val[:600]}
                 )
     except Exception:
@@ -858,13 +988,48 @@ def _uia_walk_text(
                 txt = doc_range.GetText(3000) if doc_range else ""
                 txt = (txt or "").strip()
                 if txt and txt != name:
-                    out.append(
+                    entries.append(
                         {"depth": depth, "kind": f"{ctype}.Text", "text": txt[:2000]}
                     )
             except Exception:
                 pass
     except Exception:
         pass
+    return entries
+
+
+def _uia_walk_text(
+    ctrl,
+    depth: int = 0,
+    max_depth: int = 12,
+    out: Optional[List[Dict[str, Any]]] = None,
+    visited: Optional[Any] = None,
+    limit: int = 4000,
+) -> List[Dict[str, Any]]:
+    """Walk a UIA control tree and collect every text-bearing node.
+
+    Returns a flat list of {depth, control_type, name|value|text} dicts.
+    Caps the traversal at `limit` entries to keep the cost bounded.
+    """
+    if out is None:
+        out = []
+    if visited is None:
+        visited = set()
+    if len(out) >= limit or depth > max_depth:
+        return out
+    try:
+        rt_id = ctrl.GetRuntimeId()
+        if rt_id:
+            rt_id = tuple(rt_id)
+            if rt_id in visited:
+                return out
+            visited.add(rt_id)
+    except Exception:
+        pass
+    entries = _uia_node_text(ctrl, depth)
+    if entries is None:
+        return out
+    out.extend(entries)
 
     try:
         children = ctrl.GetChildren()
@@ -965,16 +1130,26 @@ async def extract_uia_text_for_monitor(monitor_id: int = 0) -> Dict[str, Any]:
     # Sort by overlap area descending so the most visible window is first.
     windows_on_monitor.sort(key=lambda x: x["overlap_area"], reverse=True)
 
-    # Walk UIA tree for each window; cap per-window cost.
+    # Walk UIA tree for each window; cap per-window cost. Snapshots are
+    # shared with handle_list_actionable and only re-walked when stale.
+    cache = _try_uia_snapshot_cache()
+    if cache is not None:
+        cache.retain(w["hwnd"] for w in all_windows)
     per_window: List[Dict[str, Any]] = []
     total_chars = 0
     combined_body: List[str] = []
     for w in windows_on_monitor[:6]:  # top 6 windows only
         try:
-            ctrl = uia.ControlFromHandle(w["hwnd"])
-            if ctrl is None:
-                continue
-            entries = _uia_walk_text(ctrl, limit=800)
+            if cache is not None:
+                snap = cache.get(w["hwnd"])
+                if snap is None:
+                    continue
+                entries = snap.text_entries
+            else:
+                ctrl = uia.ControlFromHandle(w["hwnd"])
+                if ctrl is None:
+                    continue
+                entries = _uia_walk_text(ctrl, limit=800)
         except Exception as e:
             logger.debug(f"UIA walk for {w['title']!r} failed: {e}")
             continue
@@ -1013,6 +1188,29 @@ async def handle_list_actionable(
     if uia is None:
         return {"success": False, "error": "uiautomation unavailable"}
 
+    cache = _try_uia_snapshot_cache()
+    if cache is not None:
+        try:
+            if window_hwnd:
+                snap = cache.get(window_hwnd)
+            else:
+                snap = cache.get_foreground()
+        except Exception as e:
+            return {"success": False, "error": f"could not resolve window: {e}"}
+        if snap is None:
+            return {"success": False, "error": "no root control"}
+        found = snap.actionable[:max_elements]
+        return {
+            "success": True,
+            "count": len(found),
+            "visited": snap.visited,
+            "elements": found,
+            "snapshot_age_ms": int(snap.age() * 1000),
+        }
+
+    # Direct walk when the snapshot cache is unavailable, which includes
+    # uia_snapshot failing to import - so this keeps its own copy of
+    # uia_snapshot.ACTIONABLE_TYPES.
     actionable_types = {
         "ButtonControl",
         "HyperlinkControl",
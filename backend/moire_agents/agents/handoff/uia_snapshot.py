@@ -0,0 +1,375 @@
+"""Cached UIA tree snapshots for the screen description tools.
+
+`extract_uia_text_for_monitor` and `handle_list_actionable` both need a
+walk of a top-level window's UIA control tree, and a single agent step
+often calls them back to back. This module walks each window once and
+keeps the result — text entries *and* actionable controls — in a shared
+snapshot keyed by the window handle.
+
+Freshness
+=========
+
+A snapshot is reused while all of these hold:
+
+  - it is younger than the window's TTL (`default_ttl` or `set_ttl`)
+  - the window's cheap change signature (title, bounds, direct children)
+    still matches the one recorded at capture time
+  - keyboard focus has not moved since capture — a focus change
+    invalidates the snapshots of the previously and newly focused
+    top-level windows
+
+Only windows whose snapshot is stale are walked again, so refreshes are
+incremental per window.
+
+Provider
+========
+
+The cache talks to a "UIA provider": any object exposing the subset of the
+`uiautomation` module used here (`ControlFromHandle`, `GetFocusedControl`,
+`GetForegroundControl`). On Windows that is the module itself; tests pass a
+fake provider with fake controls, so the cache runs on Linux too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Control types that handle_list_actionable reports.
+ACTIONABLE_TYPES = frozenset(
+    {
+        "ButtonControl",
+        "HyperlinkControl",
+        "MenuItemControl",
+        "EditControl",
+        "ComboBoxControl",
+        "CheckBoxControl",
+        "RadioButtonControl",
+        "ListItemControl",
+        "TabItemControl",
+        "TreeItemControl",
+        "SliderControl",
+        "SpinnerControl",
+    }
+)
+
+
+@dataclass
+class UIAWindowSnapshot:
+    """One walk of a top-level window's UIA tree."""
+
+    hwnd: int
+    signature: str
+    captured_at: float
+    focus_token: Optional[Tuple[Any, ...]]
+    text_entries: List[Dict[str, Any]] = field(default_factory=list)
+    actionable: List[Dict[str, Any]] = field(default_factory=list)
+    visited: int = 0
+    walk_ms: float = 0.0
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.captured_at
+
+
+def _runtime_id(ctrl) -> Optional[Tuple[Any, ...]]:
+    """UIA runtime id — stable across the wrapper objects uiautomation returns."""
+    try:
+        rt_id = ctrl.GetRuntimeId()
+        return tuple(rt_id) if rt_id else None
+    except Exception:
+        return None
+
+
+def _window_handle(ctrl) -> Optional[int]:
+    try:
+        hwnd = ctrl.NativeWindowHandle
+        return int(hwnd) if hwnd else None
+    except Exception:
+        return None
+
+
+def _walk_window(
+    root,
+    describe: Callable[[Any], Dict[str, Any]],
+    node_text: Callable[[Any, int], Optional[List[Dict[str, Any]]]],
+    max_depth: int,
+    text_limit: int,
+    actionable_limit: int,
+    max_visit: int,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+    """Single pre-order walk collecting text entries and actionable controls.
+
+    `max_depth` bounds the text collection only. Deeper nodes are still
+    visited for actionable controls (browser and Electron trees nest them
+    well past 12 levels); `max_visit` bounds the walk as a whole.
+    """
+    text_entries: List[Dict[str, Any]] = []
+    actionable: List[Dict[str, Any]] = []
+    seen: set = set()
+    visited = 0
+    stack: List[Tuple[Any, int]] = [(root, 0)]
+
+    while stack and visited < max_visit:
+        node, depth = stack.pop()
+        rt_id = _runtime_id(node)
+        if rt_id is not None:
+            if rt_id in seen:
+                continue
+            seen.add(rt_id)
+        visited += 1
+
+        if depth <= max_depth:
+            entries = node_text(node, depth)
+            if entries is None:
+                continue
+            if len(text_entries) < text_limit:
+                text_entries.extend(entries[: text_limit - len(text_entries)])
+        if len(actionable) < actionable_limit:
+            try:
+                if node.ControlTypeName in ACTIONABLE_TYPES:
+                    actionable.append(describe(node))
+            except Exception:
+                pass
+        if len(text_entries) >= text_limit and len(actionable) >= actionable_limit:
+            break
+
+        try:
+            children = node.GetChildren()
+        except Exception:
+            children = []
+        # Reverse so the stack pops children in document order.
+        for c in reversed(children):
+            stack.append((c, depth + 1))
+
+    return text_entries, actionable, visited
+
+
+class UIASnapshotCache:
+    """Per-window UIA snapshots shared by every screen description tool."""
+
+    def __init__(
+        self,
+        provider: Any,
+        describe: Optional[Callable[[Any], Dict[str, Any]]] = None,
+        node_text: Optional[
+            Callable[[Any, int], Optional[List[Dict[str, Any]]]]
+        ] = None,
+        default_ttl: float = 2.0,
+        max_depth: int = 12,
+        text_limit: int = 800,
+        actionable_limit: int = 500,
+        max_visit: int = 2000,
+        max_windows: int = 32,
+        clock: Callable[[], float] = time.time,
+    ):
+        if describe is None or node_text is None:
+            from agents.handoff.screen_description import (
+                _uia_describe_control, _uia_node_text)
+
+            describe = describe or _uia_describe_control
+            node_text = node_text or _uia_node_text
+        self.provider = provider
+        self._describe = describe
+        self._node_text = node_text
+        self.default_ttl = default_ttl
+        self.max_depth = max_depth
+        self.text_limit = text_limit
+        self.actionable_limit = actionable_limit
+        self.max_visit = max_visit
+        self.max_windows = max_windows
+        self._clock = clock
+
+        self._snapshots: Dict[int, UIAWindowSnapshot] = {}
+        self._ttl_overrides: Dict[int, float] = {}
+        self._focus_token: Optional[Tuple[Any, ...]] = None
+        self._focus_hwnd: Optional[int] = None
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "ttl_expired": 0,
+            "signature_changed": 0,
+            "focus_invalidations": 0,
+        }
+
+    # ─── Configuration ──────────────────────────────────────────────────────
+
+    def set_ttl(self, hwnd: int, ttl: Optional[float]) -> None:
+        """Override the TTL for one window (None restores the default)."""
+        if ttl is None:
+            self._ttl_overrides.pop(hwnd, None)
+        else:
+            self._ttl_overrides[hwnd] = ttl
+
+    def ttl_for(self, hwnd: int) -> float:
+        return self._ttl_overrides.get(hwnd, self.default_ttl)
+
+    # ─── Invalidation ───────────────────────────────────────────────────────
+
+    def invalidate(self, hwnd: Optional[int] = None) -> None:
+        """Drop one window's snapshot, or all of them."""
+        if hwnd is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(hwnd, None)
+
+    def retain(self, hwnds: Iterable[int]) -> None:
+        """Evict snapshots of windows that are no longer visible."""
+        keep = set(hwnds)
+        for hwnd in list(self._snapshots):
+            if hwnd not in keep:
+                del self._snapshots[hwnd]
+
+    def check_focus(self) -> None:
+        """Invalidate affected windows if keyboard focus moved."""
+        try:
+            focused = self.provider.GetFocusedControl()
+        except Exception:
+            focused = None
+        token = _runtime_id(focused) if focused is not None else None
+        if token is None and focused is not None:
+            token = (id(focused),)
+        try:
+            fg = self.provider.GetForegroundControl()
+            fg_hwnd = _window_handle(fg) if fg is not None else None
+        except Exception:
+            fg_hwnd = None
+
+        if token == self._focus_token and fg_hwnd == self._focus_hwnd:
+            return
+        if self._focus_token is not None or self._focus_hwnd is not None:
+            self.stats["focus_invalidations"] += 1
+            for hwnd in {self._focus_hwnd, fg_hwnd}:
+                if hwnd is not None:
+                    self._snapshots.pop(hwnd, None)
+        self._focus_token = token
+        self._focus_hwnd = fg_hwnd
+
+    # ─── Lookup ─────────────────────────────────────────────────────────────
+
+    def signature(self, ctrl) -> str:
+        """Cheap change signature: title, bounds and direct children."""
+        parts: List[str] = []
+        try:
+            parts.append(str(ctrl.Name or ""))
+        except Exception:
+            parts.append("")
+        try:
+            r = ctrl.BoundingRectangle
+            parts.append(
+                f"{getattr(r, 'left', 0)},{getattr(r, 'top', 0)},"
+                f"{getattr(r, 'right', 0)},{getattr(r, 'bottom', 0)}"
+            )
+        except Exception:
+            parts.append("")
+        try:
+            for c in ctrl.GetChildren():
+                try:
+                    parts.append(f"{c.ControlTypeName}:{c.Name or ''}")
+                except Exception:
+                    parts.append("?")
+        except Exception:
+            pass
+        return hashlib.sha1(
+            "|".join(parts).encode("utf-8", errors="ignore")
+        ).hexdigest()[:16]
+
+    def get(self, hwnd: int, force: bool = False) -> Optional[UIAWindowSnapshot]:
+        """Return a fresh snapshot for `hwnd`, walking the tree only if stale."""
+        self.check_focus()
+        try:
+            root = self.provider.ControlFromHandle(hwnd)
+        except Exception as e:
+            logger.debug(f"UIA ControlFromHandle({hwnd}) failed: {e}")
+            return None
+        if root is None:
+            self._snapshots.pop(hwnd, None)
+            return None
+        return self._get_for_root(hwnd, root, force)
+
+    def get_foreground(self, force: bool = False) -> Optional[UIAWindowSnapshot]:
+        """Snapshot of the current foreground window."""
+        self.check_focus()
+        try:
+            root = self.provider.GetForegroundControl()
+        except Exception as e:
+            logger.debug(f"UIA GetForegroundControl failed: {e}")
+            return None
+        if root is None:
+            return None
+        hwnd = _window_handle(root)
+        if hwnd is None:
+            # No handle to key on — walk uncached.
+            return self._capture(0, root, self.signature(root))
+        return self._get_for_root(hwnd, root, force)
+
+    def _get_for_root(self, hwnd: int, root, force: bool) -> UIAWindowSnapshot:
+        now = self._clock()
+        sig = self.signature(root)
+        snap = self._snapshots.get(hwnd)
+        if snap is not None and not force:
+            if snap.age(now) >= self.ttl_for(hwnd):
+                self.stats["ttl_expired"] += 1
+            elif snap.signature != sig:
+                self.stats["signature_changed"] += 1
+            else:
+                self.stats["hits"] += 1
+                return snap
+
+        self.stats["misses"] += 1
+        snap = self._capture(hwnd, root, sig)
+        self._snapshots[hwnd] = snap
+        if len(self._snapshots) > self.max_windows:
+            oldest = min(self._snapshots.values(), key=lambda s: s.captured_at)
+            self._snapshots.pop(oldest.hwnd, None)
+        return snap
+
+    def _capture(self, hwnd: int, root, sig: str) -> UIAWindowSnapshot:
+        t0 = time.perf_counter()
+        text_entries, actionable, visited = _walk_window(
+            root,
+            self._describe,
+            self._node_text,
+            max_depth=self.max_depth,
+            text_limit=self.text_limit,
+            actionable_limit=self.actionable_limit,
+            max_visit=self.max_visit,
+        )
+        return UIAWindowSnapshot(
+            hwnd=hwnd,
+            signature=sig,
+            captured_at=self._clock(),
+            focus_token=self._focus_token,
+            text_entries=text_entries,
+            actionable=actionable,
+            visited=visited,
+            walk_ms=(time.perf_counter() - t0) * 1000,
+        )
+
+
+_cache: Optional[UIASnapshotCache] = None
+
+
+def get_uia_snapshot_cache(provider: Any = None) -> Optional[UIASnapshotCache]:
+    """Get the process-wide snapshot cache (None if UIA is unavailable)."""
+    global _cache
+    if _cache is None:
+        if provider is None:
+            from agents.handoff.screen_description import _try_uia
+
+            provider = _try_uia()
+            if provider is None:
+                return None
+        _cache = UIASnapshotCache(provider)
+    return _cache
+
+
+def reset_uia_snapshot_cache() -> None:
+    """Drop the process-wide cache (tests, provider changes)."""
+    global _cache
+    _cache = None
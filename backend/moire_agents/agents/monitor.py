@@ -16,6 +16,14 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional
 
+# Geteilter Bildschirmzustand (optional)
+try:
+    from services.screen_state import get_screen_state_service
+
+    HAS_SCREEN_STATE = True
+except ImportError:
+    HAS_SCREEN_STATE = False
+
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -72,6 +80,7 @@ class MonitorAgent:
         check_interval: float = 2.0,
         min_change_threshold: float = 0.1,
         auto_start: bool = False,
+        screen_state=None,
     ):
         """
         Initialisiert den Monitor Agent.
@@ -81,10 +90,16 @@ class MonitorAgent:
             check_interval: Zeit zwischen Checks (Sekunden)
             min_change_threshold: Minimale Änderungsstärke für Events
             auto_start: Automatisch starten?
+            screen_state: ScreenStateService (default: geteilter Service für
+                          Monitor 0); unveränderte Pixel sparen den Capture
         """
         self.moire_client = moire_client
         self.check_interval = check_interval
         self.min_change_threshold = min_change_threshold
+        if screen_state is None and HAS_SCREEN_STATE:
+            screen_state = get_screen_state_service()
+        self.screen_state = screen_state
+        self._screen_version: Optional[int] = None
 
         # State tracking
         self.current_state: Optional[MonitorState] = None
@@ -102,6 +117,7 @@ class MonitorAgent:
         # Statistics
         self.stats = {
             "checks_performed": 0,
+            "captures_skipped": 0,
             "changes_detected": 0,
             "significant_changes": 0,
             "last_check": None,
@@ -175,6 +191,19 @@ class MonitorAgent:
         self.stats["checks_performed"] += 1
         self.stats["last_check"] = datetime.now()
 
+        # Pixel unverändert seit dem letzten Check: kein Capture + OCR nötig
+        screen_version = None
+        if self.screen_state is not None and await self.screen_state.refresh(
+            max_age=self.check_interval / 2
+        ):
+            screen_version = self.screen_state.version
+            if (
+                self.current_state is not None
+                and screen_version == self._screen_version
+            ):
+                self.stats["captures_skipped"] += 1
+                return None
+
         # Capture anfordern
         await self.capture()
 
@@ -191,6 +220,7 @@ class MonitorAgent:
 
         # Erstelle neuen State
         new_state = self._create_state(ui_context)
+        self._screen_version = screen_version
 
         # Vergleiche mit vorherigem State
         if self.current_state:
@@ -318,54 +318,85 @@ class ReasoningAgent:
         if not self.vision_agent or not self.vision_agent.is_available():
             return actions_data
 
-        enriched = []
-
+        # Sammle alle Klick-Ziele ohne brauchbare Koordinaten
+        pending: List[Dict[str, Any]] = []
+        targets: List[str] = []
         for action in actions_data:
-            if action.get("action") == "click":
-                # Prüfe ob Koordinaten fehlen oder auf Default stehen
-                x = action.get("x")
-                y = action.get("y")
-                target = action.get("target", action.get("description", ""))
-
-                needs_vision = (
-                    x is None
-                    or y is None
-                    or (x == 0 and y == 0)
-                    or (x == 960 and y == 400)  # Bildschirmmitte = blind
-                )
+            if action.get("action") != "click":
+                continue
+            # Prüfe ob Koordinaten fehlen oder auf Default stehen
+            x = action.get("x")
+            y = action.get("y")
+            target = action.get("target", action.get("description", ""))
+
+            needs_vision = (
+                x is None
+                or y is None
+                or (x == 0 and y == 0)
+                or (x == 960 and y == 400)  # Bildschirmmitte = blind
+            )
 
-                if needs_vision and target:
-                    logger.info(f"Using Vision to find: {target}")
+            if needs_vision and target:
+                pending.append(action)
+                if target not in targets:
+                    targets.append(target)
 
-                    # Vision Agent für Element-Suche nutzen
-                    location = await self.vision_agent.find_element_from_screenshot(
-                        screenshot_bytes, target
-                    )
+        if not targets:
+            return actions_data
+
+        logger.info(f"Using Vision to find {len(targets)} target(s): {targets}")
+
+        # Ein Vision-Call für alle Ziele
+        locations = await self.vision_agent.find_elements_from_screenshot(
+            screenshot_bytes, targets
+        )
+        by_target = dict(zip(targets, locations))
+
+        # Nur verfehlte Ziele einzeln (parallel) nachfassen
+        missed = [
+            t
+            for t in targets
+            if not (by_target.get(t) and by_target[t].found and by_target[t].confidence > 0.5)
+        ]
+        if missed:
+            logger.info(f"Vision batch missed {len(missed)} target(s), retrying individually")
+            retries = await asyncio.gather(
+                *(
+                    self.vision_agent.find_element_from_screenshot(screenshot_bytes, t)
+                    for t in missed
+                ),
+                return_exceptions=True,
+            )
+            for t, location in zip(missed, retries):
+                if not isinstance(location, BaseException):
+                    by_target[t] = location
+
+        for action in pending:
+            target = action.get("target", action.get("description", ""))
+            location = by_target.get(target)
+
+            if location and location.found and location.confidence > 0.5:
+                action["x"] = location.x
+                action["y"] = location.y
+                action["vision_confidence"] = location.confidence
+                action["vision_description"] = location.description
+
+                # ROI berechnen basierend auf Element-Typ
+                element_type = location.element_type or "button"
+                action["roi"] = self._calculate_roi(
+                    origin_x=location.x,
+                    origin_y=location.y,
+                    element_type=element_type,
+                )
+                action["roi_description"] = location.description
+
+                logger.info(
+                    f"Vision found element at ({location.x}, {location.y}) with ROI zoom={action['roi']['zoom']}"
+                )
+            else:
+                logger.warning(f"Vision could not find: {target}")
 
-                    if location.found and location.confidence > 0.5:
-                        action["x"] = location.x
-                        action["y"] = location.y
-                        action["vision_confidence"] = location.confidence
-                        action["vision_description"] = location.description
-
-                        # ROI berechnen basierend auf Element-Typ
-                        element_type = location.element_type or "button"
-                        action["roi"] = self._calculate_roi(
-                            origin_x=location.x,
-                            origin_y=location.y,
-                            element_type=element_type,
-                        )
-                        action["roi_description"] = location.description
-
-                        logger.info(
-                            f"Vision found element at ({location.x}, {location.y}) with ROI zoom={action['roi']['zoom']}"
-                        )
-                    else:
-                        logger.warning(f"Vision could not find: {target}")
-
-            enriched.append(action)
-
-        return enriched
+        return actions_data
 
     async def find_element_for_click(
         self, screenshot_bytes: bytes, element_description: str
@@ -11,9 +11,12 @@ Verantwortlich für:
 
 import asyncio
 import base64
+import hashlib
 import logging
 import os
 import sys
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from io import BytesIO
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
@@ -121,6 +124,91 @@ class ElementLocation:
     error: Optional[str] = None
 
 
+def _not_found(error: str) -> ElementLocation:
+    """ElementLocation für ein nicht gefundenes Element."""
+    return ElementLocation(
+        found=False,
+        x=0,
+        y=0,
+        confidence=0,
+        description="",
+        element_type="unknown",
+        error=error,
+    )
+
+
+# Max. Kantenlänge für Vision-Uploads (Claude/gpt-4o Empfehlung)
+VISION_MAX_SIZE = 1568
+
+# Gleichzeitige Vision-Requests pro Agent
+VISION_MAX_CONCURRENCY = int(os.environ.get("VISION_MAX_CONCURRENCY", "4"))
+
+
+@dataclass
+class VisionPayload:
+    """Verkleinerter, PNG/base64-kodierter Screenshot für einen Vision-Call."""
+
+    base64_png: str
+    sent_size: Tuple[int, int]
+    original_size: Tuple[int, int]
+
+    def scale_to_original(self, x: float, y: float) -> Tuple[int, int]:
+        """Skaliert Koordinaten aus dem gesendeten Bild zurück aufs Original."""
+        if self.original_size == self.sent_size or not self.sent_size[0]:
+            return int(x), int(y)
+        scale = self.original_size[0] / self.sent_size[0]
+        return int(x * scale), int(y * scale)
+
+
+class VisionPayloadCache:
+    """
+    LRU-Cache für vorbereitete Vision-Payloads, Schlüssel = Bild-Hash.
+
+    Mehrere Vision-Fragen zum selben Frame (find_element, analyze_screenshot,
+    analyze_for_reflection, ...) teilen sich so Resize + PNG-Encoding.
+    Screenshot-Bytes werden direkt gehasht (kein Decode bei Treffer),
+    PIL-Images über Modus, Größe und Pixeldaten.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, VisionPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key_for_bytes(data: bytes) -> str:
+        return "b:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    @staticmethod
+    def key_for_image(image: "PILImage.Image") -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{image.mode}:{image.size[0]}x{image.size[1]}".encode())
+        h.update(image.tobytes())
+        return "i:" + h.hexdigest()
+
+    def get(self, key: str) -> Optional[VisionPayload]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return payload
+
+    def put(self, key: str, payload: VisionPayload) -> None:
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class VisionAnalystAgent:
     """
     Vision Agent für Multi-Modal Screenshot-Analyse.
@@ -132,16 +220,30 @@ class VisionAnalystAgent:
     - NEU: Lokalisierung von UI-Elementen anhand von Beschreibungen
     """
 
-    def __init__(self, model: str = "claude-sonnet-4-20250514", max_tokens: int = 2000):
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        max_tokens: int = 2000,
+        max_concurrency: int = VISION_MAX_CONCURRENCY,
+    ):
         self.model = model
         self.max_tokens = max_tokens
         self.client: Optional[anthropic.Anthropic] = None
+        self.async_client: Optional["anthropic.AsyncAnthropic"] = None
         self.openrouter_client: Optional[OpenRouterClient] = None
 
+        # Begrenzung paralleler Vision-Requests + Payload-Cache pro Frame
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.payload_cache = VisionPayloadCache()
+
         # Initialize Anthropic client (legacy)
         if HAS_ANTHROPIC:
             try:
                 self.client = anthropic.Anthropic()
+                # Async client: non-blocking, keeps its HTTP connection pool
+                self.async_client = anthropic.AsyncAnthropic()
                 logger.info("Vision Agent initialized with Anthropic Claude")
             except Exception as e:
                 logger.warning(f"Failed to initialize Anthropic: {e}")
@@ -178,30 +280,21 @@ class VisionAnalystAgent:
             ElementLocation mit Koordinaten oder Fehler
         """
         if not self.is_available():
-            return ElementLocation(
-                found=False,
-                x=0,
-                y=0,
-                confidence=0,
-                description="",
-                element_type="unknown",
-                error="Vision not available",
-            )
+            return _not_found("Vision not available")
 
         try:
-            # Resize image if needed
-            max_size = 1568
-            original_size = image.size
-            if max(image.size) > max_size:
-                ratio = max_size / max(image.size)
-                new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-                image = image.resize(new_size, PILImage.Resampling.LANCZOS)
-
-            # Convert to base64
-            buffer = BytesIO()
-            image.save(buffer, format="PNG")
-            base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
+            payload = await self._prepare_image(image)
+        except Exception as e:
+            logger.error(f"find_element failed: {e}")
+            return _not_found(str(e))
+        return await self._locate_element(payload, element_description, context)
 
+    async def _locate_element(
+        self, payload: VisionPayload, element_description: str, context: str
+    ) -> ElementLocation:
+        """Ein Vision-Call für ein Element auf einem vorbereiteten Frame."""
+        w, h = payload.sent_size
+        try:
             # Build prompt for element location (localized)
             if HAS_LOCALIZATION and L:
                 context_str = f"CONTEXT: {context}" if context else ""
@@ -209,8 +302,8 @@ class VisionAnalystAgent:
                     "vision_find_element",
                     element=element_description,
                     context=context_str,
-                    w=image.size[0],
-                    h=image.size[1],
+                    w=w,
+                    h=h,
                 )
             else:
                 # Fallback to English if localization not available
@@ -221,7 +314,7 @@ TARGET ELEMENT: {element_description}
 
 IMPORTANT: Return the EXACT pixel coordinates where a user should click to interact with this element.
 
-Image dimensions: {image.size[0]}x{image.size[1]} pixels
+Image dimensions: {w}x{h} pixels
 
 Respond ONLY in the following JSON format:
 {{
@@ -243,91 +336,217 @@ If the element is NOT found:
     "description": "Element not found: <reason>"
 }}"""
 
+            result = await self._request_vision_json(prompt, payload.base64_png)
+            if isinstance(result, dict):
+                return self._location_from_result(result, payload)
+
+            return _not_found("No valid response from vision model")
+
+        except Exception as e:
+            logger.error(f"find_element failed: {e}")
+            return _not_found(str(e))
+
+    async def find_elements(
+        self,
+        image: "PILImage.Image",
+        element_descriptions: List[str],
+        context: str = "",
+    ) -> List[ElementLocation]:
+        """
+        Findet mehrere UI-Elemente mit EINEM Vision-Call.
+
+        Alle Ziele werden im selben Prompt nummeriert abgefragt; das Modell
+        antwortet mit einem Eintrag pro Ziel. Ziele ohne gültigen Eintrag
+        kommen als found=False zurück (Aufrufer können gezielt nachfassen).
+
+        Args:
+            image: PIL Image des Screenshots
+            element_descriptions: Beschreibungen der gesuchten Elemente
+            context: Zusätzlicher Kontext
+
+        Returns:
+            Liste von ElementLocation in derselben Reihenfolge wie die Ziele
+        """
+        if not element_descriptions:
+            return []
+        if not self.is_available():
+            return [_not_found("Vision not available") for _ in element_descriptions]
+
+        try:
+            payload = await self._prepare_image(image)
+        except Exception as e:
+            logger.error(f"find_elements failed: {e}")
+            return [_not_found(str(e)) for _ in element_descriptions]
+        return await self._locate_elements(payload, element_descriptions, context)
+
+    async def _locate_elements(
+        self, payload: VisionPayload, element_descriptions: List[str], context: str
+    ) -> List[ElementLocation]:
+        """Ein Vision-Call für mehrere Elemente auf einem vorbereiteten Frame."""
+        w, h = payload.sent_size
+        try:
+            targets = "\n".join(
+                f"{i}. {desc}" for i, desc in enumerate(element_descriptions)
+            )
+            context_str = f"CONTEXT: {context}" if context else ""
+            if HAS_LOCALIZATION and L:
+                prompt = L.get(
+                    "vision_find_elements",
+                    targets=targets,
+                    context=context_str,
+                    w=w,
+                    h=h,
+                )
+            else:
+                prompt = f"""Analyze this screenshot and find ALL of the following UI elements:
+
+TARGET ELEMENTS:
+{targets}
+{context_str}
+
+Image dimensions: {w}x{h} pixels
+
+Respond ONLY as JSON: {{"elements": [{{"index": <n>, "found": true/false, "x": <x>, "y": <y>, "confidence": <0.0-1.0>, "element_type": "<type>", "description": "<text>"}}]}}"""
+
+            result = await self._request_vision_json(prompt, payload.base64_png)
+            entries = result.get("elements") if isinstance(result, dict) else result
+            if not isinstance(entries, list):
+                return [
+                    _not_found("No valid response from vision model")
+                    for _ in element_descriptions
+                ]
+
+            locations = [
+                _not_found("Target missing from vision response")
+                for _ in element_descriptions
+            ]
+            for pos, entry in enumerate(entries):
+                if not isinstance(entry, dict):
+                    continue
+                try:
+                    idx = int(entry.get("index", pos))
+                except (TypeError, ValueError):
+                    idx = pos
+                if 0 <= idx < len(locations):
+                    locations[idx] = self._location_from_result(entry, payload)
+            return locations
+
+        except Exception as e:
+            logger.error(f"find_elements failed: {e}")
+            return [_not_found(str(e)) for _ in element_descriptions]
+
+    # ─── Payload-Vorbereitung (Resize + Encode, gecacht) ─────────────────────
+
+    @staticmethod
+    def _encode_for_vision(image: "PILImage.Image") -> VisionPayload:
+        """Downscale (max VISION_MAX_SIZE) and PNG/base64-encode a screenshot."""
+        original_size = image.size
+        if max(image.size) > VISION_MAX_SIZE:
+            ratio = VISION_MAX_SIZE / max(image.size)
+            new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
+            image = image.resize(new_size, PILImage.Resampling.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return VisionPayload(
+            base64_png=base64_image,
+            sent_size=image.size,
+            original_size=original_size,
+        )
+
+    def _payload_for_image(self, image: "PILImage.Image") -> VisionPayload:
+        key = VisionPayloadCache.key_for_image(image)
+        payload = self.payload_cache.get(key)
+        if payload is None:
+            payload = self._encode_for_vision(image)
+            self.payload_cache.put(key, payload)
+        return payload
+
+    def _payload_for_screenshot(self, screenshot_bytes: bytes) -> VisionPayload:
+        key = VisionPayloadCache.key_for_bytes(screenshot_bytes)
+        payload = self.payload_cache.get(key)
+        if payload is None:
+            image = PILImage.open(BytesIO(screenshot_bytes))
+            payload = self._encode_for_vision(image)
+            self.payload_cache.put(key, payload)
+        return payload
+
+    async def _prepare_image(self, image: "PILImage.Image") -> VisionPayload:
+        """Vision-Payload für ein PIL Image (Hash/Resize/Encode im Thread)."""
+        return await asyncio.to_thread(self._payload_for_image, image)
+
+    async def _prepare_screenshot(self, screenshot_bytes: bytes) -> VisionPayload:
+        """Vision-Payload für Screenshot-Bytes (kein Decode bei Cache-Treffer)."""
+        return await asyncio.to_thread(self._payload_for_screenshot, screenshot_bytes)
+
+    def _location_from_result(
+        self, result: Dict[str, Any], payload: VisionPayload
+    ) -> ElementLocation:
+        """JSON-Antwort → ElementLocation, Koordinaten auf Originalgröße skaliert."""
+        # Scale coordinates back if image was resized
+        x, y = payload.scale_to_original(
+            result.get("x", 0) or 0, result.get("y", 0) or 0
+        )
+
+        return ElementLocation(
+            found=result.get("found", False),
+            x=x,
+            y=y,
+            confidence=result.get("confidence", 0),
+            description=result.get("description", ""),
+            element_type=result.get("element_type", "unknown"),
+        )
+
+    # ─── Vision-Requests (async, begrenzt) ───────────────────────────────────
+
+    def _vision_slot(self) -> asyncio.Semaphore:
+        """Semaphore für parallele Vision-Requests (lazy, pro Event-Loop)."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _vision_completion(
+        self, prompt: str, base64_image: str, json_mode: bool = False
+    ) -> Optional[str]:
+        """Sendet Prompt + Bild an OpenRouter (bevorzugt) oder Anthropic.
+
+        Returns:
+            Antworttext oder None
+        """
+        async with self._vision_slot():
             # Use OpenRouter with gpt-4o for vision
             if self.openrouter_client:
                 response = await self.openrouter_client.chat_with_vision(
-                    prompt=prompt, image_data=base64_image, json_mode=True
+                    prompt=prompt, image_data=base64_image, json_mode=json_mode
                 )
-
                 if response and response.content:
-                    import json
-
-                    try:
-                        result = json.loads(response.content)
-
-                        # Scale coordinates back if image was resized
-                        x = result.get("x", 0)
-                        y = result.get("y", 0)
-
-                        if max(original_size) > max_size:
-                            scale = original_size[0] / image.size[0]
-                            x = int(x * scale)
-                            y = int(y * scale)
-
-                        return ElementLocation(
-                            found=result.get("found", False),
-                            x=x,
-                            y=y,
-                            confidence=result.get("confidence", 0),
-                            description=result.get("description", ""),
-                            element_type=result.get("element_type", "unknown"),
-                        )
-                    except json.JSONDecodeError:
-                        logger.warning(
-                            f"Failed to parse vision response: {response.content[:200]}"
-                        )
+                    return response.content
 
             # Fallback to Anthropic if available
-            elif self.client:
-                response = await asyncio.to_thread(
-                    self._call_claude_vision, base64_image, prompt
-                )
+            if self.async_client or self.client:
+                return await self._acall_claude_vision(base64_image, prompt)
 
-                import json
+        return None
 
-                try:
-                    result = json.loads(response)
-
-                    x = result.get("x", 0)
-                    y = result.get("y", 0)
-
-                    if max(original_size) > max_size:
-                        scale = original_size[0] / image.size[0]
-                        x = int(x * scale)
-                        y = int(y * scale)
-
-                    return ElementLocation(
-                        found=result.get("found", False),
-                        x=x,
-                        y=y,
-                        confidence=result.get("confidence", 0),
-                        description=result.get("description", ""),
-                        element_type=result.get("element_type", "unknown"),
-                    )
-                except json.JSONDecodeError:
-                    pass
-
-            return ElementLocation(
-                found=False,
-                x=0,
-                y=0,
-                confidence=0,
-                description="",
-                element_type="unknown",
-                error="No valid response from vision model",
-            )
+    async def _request_vision_json(self, prompt: str, base64_image: str) -> Any:
+        """Wie _vision_completion, aber mit JSON-Antwort.
 
-        except Exception as e:
-            logger.error(f"find_element failed: {e}")
-            return ElementLocation(
-                found=False,
-                x=0,
-                y=0,
-                confidence=0,
-                description="",
-                element_type="unknown",
-                error=str(e),
-            )
+        Returns:
+            Geparstes JSON oder None
+        """
+        import json
+
+        content = await self._vision_completion(prompt, base64_image, json_mode=True)
+        if not content:
+            return None
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse vision response: {content[:200]}")
+            return None
 
     async def find_element_from_screenshot(
         self, screenshot_bytes: bytes, element_description: str, context: str = ""
@@ -344,29 +563,47 @@ If the element is NOT found:
             ElementLocation
         """
         if not HAS_PIL:
-            return ElementLocation(
-                found=False,
-                x=0,
-                y=0,
-                confidence=0,
-                description="",
-                element_type="unknown",
-                error="PIL not available",
-            )
+            return _not_found("PIL not available")
+        if not self.is_available():
+            return _not_found("Vision not available")
 
         try:
-            image = PILImage.open(BytesIO(screenshot_bytes))
-            return await self.find_element(image, element_description, context)
+            payload = await self._prepare_screenshot(screenshot_bytes)
         except Exception as e:
-            return ElementLocation(
-                found=False,
-                x=0,
-                y=0,
-                confidence=0,
-                description="",
-                element_type="unknown",
-                error=f"Failed to load image: {e}",
-            )
+            return _not_found(f"Failed to load image: {e}")
+        return await self._locate_element(payload, element_description, context)
+
+    async def find_elements_from_screenshot(
+        self,
+        screenshot_bytes: bytes,
+        element_descriptions: List[str],
+        context: str = "",
+    ) -> List[ElementLocation]:
+        """
+        Convenience-Methode: Findet mehrere Elemente aus Screenshot-Bytes.
+
+        Args:
+            screenshot_bytes: PNG-Bytes des Screenshots
+            element_descriptions: Was gesucht werden soll
+            context: Zusätzlicher Kontext
+
+        Returns:
+            Liste von ElementLocation (gleiche Reihenfolge)
+        """
+        if not element_descriptions:
+            return []
+        if not HAS_PIL:
+            return [_not_found("PIL not available") for _ in element_descriptions]
+        if not self.is_available():
+            return [_not_found("Vision not available") for _ in element_descriptions]
+
+        try:
+            payload = await self._prepare_screenshot(screenshot_bytes)
+        except Exception as e:
+            return [
+                _not_found(f"Failed to load image: {e}") for _ in element_descriptions
+            ]
+        return await self._locate_elements(payload, element_descriptions, context)
 
     async def analyze_screen_for_task(
         self, image: "PILImage.Image", task_description: str
@@ -390,25 +627,16 @@ If the element is NOT found:
             return {"error": "Vision not available"}
 
         try:
-            # Resize if needed
-            max_size = 1568
-            original_size = image.size
-            if max(image.size) > max_size:
-                ratio = max_size / max(image.size)
-                new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-                image = image.resize(new_size, PILImage.Resampling.LANCZOS)
-
-            buffer = BytesIO()
-            image.save(buffer, format="PNG")
-            base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
+            payload = await self._prepare_image(image)
+            w, h = payload.sent_size
 
             # Build prompt (localized)
             if HAS_LOCALIZATION and L:
                 prompt = L.get(
                     "vision_suggest_action",
                     task=task_description,
-                    w=image.size[0],
-                    h=image.size[1],
+                    w=w,
+                    h=h,
                 )
             else:
                 # Fallback to English
@@ -416,7 +644,7 @@ If the element is NOT found:
 
 TASK: {task_description}
 
-Image size: {image.size[0]}x{image.size[1]} pixels
+Image size: {w}x{h} pixels
 
 Respond as JSON:
 {{
@@ -444,34 +672,15 @@ Respond as JSON:
     "reason": "<Why task_completable is true/false>"
 }}"""
 
-            if self.openrouter_client:
-                response = await self.openrouter_client.chat_with_vision(
-                    prompt=prompt, image_data=base64_image, json_mode=True
-                )
-
-                if response and response.content:
-                    import json
-
-                    try:
-                        result = json.loads(response.content)
-
-                        # Scale coordinates back
-                        if (
-                            "suggested_action" in result
-                            and "x" in result["suggested_action"]
-                        ):
-                            if max(original_size) > max_size:
-                                scale = original_size[0] / image.size[0]
-                                result["suggested_action"]["x"] = int(
-                                    result["suggested_action"]["x"] * scale
-                                )
-                                result["suggested_action"]["y"] = int(
-                                    result["suggested_action"]["y"] * scale
-                                )
-
-                        return result
-                    except json.JSONDecodeError:
-                        pass
+            result = await self._request_vision_json(prompt, payload.base64_png)
+            if isinstance(result, dict):
+                # Scale coordinates back
+                suggested = result.get("suggested_action")
+                if isinstance(suggested, dict) and "x" in suggested:
+                    suggested["x"], suggested["y"] = payload.scale_to_original(
+                        suggested.get("x") or 0, suggested.get("y") or 0
+                    )
+                return result
 
             return {"error": "No valid response from vision model"}
 
@@ -517,34 +726,15 @@ Respond as JSON:
                     )
                 )
 
-            # Resize large images for efficiency
-            max_size = 1568  # Claude's max recommended size
-            if max(image.size) > max_size:
-                ratio = max_size / max(image.size)
-                new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-                image = image.resize(new_size, PILImage.Resampling.LANCZOS)
-
-            # Convert to base64
-            buffer = BytesIO()
-            image.save(buffer, format="PNG")
-            base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
+            # Resize + encode (shared per frame via the payload cache)
+            payload = await self._prepare_image(image)
 
             # Build prompt
             prompt = self._build_analysis_prompt(context)
 
-            # Prefer OpenRouter with gpt-4o
-            if self.openrouter_client:
-                response = await self.openrouter_client.chat_with_vision(
-                    prompt=prompt, image_data=base64_image
-                )
-                if response and response.content:
-                    return self._parse_vision_response(response.content)
-
-            # Fallback to Claude Vision
-            elif self.client:
-                response = await asyncio.to_thread(
-                    self._call_claude_vision, base64_image, prompt
-                )
+            # Prefer OpenRouter with gpt-4o, fallback to Claude Vision
+            response = await self._vision_completion(prompt, payload.base64_png)
+            if response:
                 return self._parse_vision_response(response)
 
             return VisionAnalysisResult(
@@ -596,12 +786,12 @@ Formatiere die Antwort strukturiert mit klaren Abschnitten."""
 
         return prompt
 
-    def _call_claude_vision(self, base64_image: str, prompt: str) -> str:
-        """Ruft Claude Vision API auf."""
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            messages=[
+    def _claude_vision_request(self, base64_image: str, prompt: str) -> Dict[str, Any]:
+        """Request-Parameter für Claude Vision (sync + async)."""
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [
                 {
                     "role": "user",
                     "content": [
@@ -617,10 +807,27 @@ Formatiere die Antwort strukturiert mit klaren Abschnitten."""
                     ],
                 }
             ],
+        }
+
+    def _call_claude_vision(self, base64_image: str, prompt: str) -> str:
+        """Ruft Claude Vision API auf."""
+        message = self.client.messages.create(
+            **self._claude_vision_request(base64_image, prompt)
         )
 
         return message.content[0].text
 
+    async def _acall_claude_vision(self, base64_image: str, prompt: str) -> str:
+        """Ruft Claude Vision asynchron auf (ohne den Event-Loop zu blockieren)."""
+        if self.async_client is None:
+            return await asyncio.to_thread(
+                self._call_claude_vision, base64_image, prompt
+            )
+        message = await self.async_client.messages.create(
+            **self._claude_vision_request(base64_image, prompt)
+        )
+        return message.content[0].text
+
     def _parse_vision_response(self, response: str) -> VisionAnalysisResult:
         """Parst die Vision-Antwort in strukturiertes Format."""
         # Extract elements from response
@@ -779,34 +986,12 @@ Formatiere die Antwort strukturiert mit klaren Abschnitten."""
             return "PIL nicht verfügbar"
 
         try:
-            # Load image from bytes
-            image = PILImage.open(BytesIO(screenshot))
-
-            # Resize if needed
-            max_size = 1568
-            if max(image.size) > max_size:
-                ratio = max_size / max(image.size)
-                new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-                image = image.resize(new_size, PILImage.Resampling.LANCZOS)
-
-            # Convert to base64
-            buffer = BytesIO()
-            image.save(buffer, format="PNG")
-            base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
-
-            # Try OpenRouter first
-            if self.openrouter_client:
-                response = await self.openrouter_client.chat_with_vision(
-                    prompt=prompt, image_data=base64_image
-                )
-                if response and response.content:
-                    return response.content
+            # Resize + encode (cached per screenshot)
+            payload = await self._prepare_screenshot(screenshot)
 
-            # Fallback to Claude
-            if self.client:
-                response = await asyncio.to_thread(
-                    self._call_claude_vision, base64_image, prompt
-                )
+            # OpenRouter first, fallback to Claude
+            response = await self._vision_completion(prompt, payload.base64_png)
+            if response:
                 return response
 
             return "Keine Vision-Backend verfügbar"
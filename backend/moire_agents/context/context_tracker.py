@@ -18,6 +18,14 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from .selection_manager import (SelectionManager, SelectionSnapshot,
                                 get_selection_manager)
 
+# Geteilter Bildschirmzustand (optional)
+try:
+    from services.screen_state import get_screen_state_service
+
+    HAS_SCREEN_STATE = True
+except ImportError:
+    HAS_SCREEN_STATE = False
+
 if TYPE_CHECKING:
     from ..agents.interaction import InteractionAgent
     from ..agents.vision_agent import VisionAnalystAgent
@@ -185,11 +193,19 @@ class ContextTracker:
         selection_manager: Optional[SelectionManager] = None,
         interaction_agent: Optional["InteractionAgent"] = None,
         vision_agent: Optional["VisionAnalystAgent"] = None,
+        screen_state=None,
     ):
         self.selection_manager = selection_manager or get_selection_manager()
         self.interaction_agent = interaction_agent
         self.vision_agent = vision_agent
 
+        # Geteilter Bildschirmzustand: Selektion nur neu erfassen, wenn sich
+        # Pixel geändert haben; Fenstertitel aus dem UIA-Snapshot
+        if screen_state is None and HAS_SCREEN_STATE:
+            screen_state = get_screen_state_service()
+        self.screen_state = screen_state
+        self._selection_screen_version: Optional[int] = None
+
         # State
         self._cursor = CursorPosition()
         self._selection = SelectionState()
@@ -318,10 +334,35 @@ class ContextTracker:
             )
             await self._capture_selection()
 
+        self._update_window_title()
+
         return self.get_state()
 
+    def _update_window_title(self) -> None:
+        """Übernimmt den Fenstertitel aus dem geteilten Bildschirmzustand."""
+        if self.screen_state is None or not self.screen_state.available:
+            return
+        title = self.screen_state.window_title()
+        if title and title != self._app.window_title:
+            self._app.window_title = title
+            self._app.timestamp = time.time()
+            for callback in self._on_app_change:
+                try:
+                    callback(self._app)
+                except Exception as e:
+                    logger.warning(f"App change callback error: {e}")
+
+    async def _screen_version(self) -> Optional[int]:
+        """Aktuelle Version des Bildschirmzustands (None ohne Frames)."""
+        if self.screen_state is None or not await self.screen_state.refresh(
+            max_age=0.2
+        ):
+            return None
+        return self.screen_state.version
+
     async def _capture_selection(self) -> Optional[SelectionSnapshot]:
         """Erfasst aktuelle Selektion via Clipboard."""
+        self._selection_screen_version = await self._screen_version()
         try:
             snapshot = await self.selection_manager.capture_selection(
                 interaction_agent=self.interaction_agent, source="context_tracker"
@@ -443,9 +484,14 @@ class ContextTracker:
 
         Erfasst frischen Text via Clipboard falls nötig.
         """
-        # Wenn Selektion älter als 2 Sekunden, neu erfassen
+        # Wenn Selektion älter als 2 Sekunden, neu erfassen - außer der
+        # Screen ist seit der letzten Erfassung unverändert
         if self._selection.timestamp < time.time() - 2:
-            await self._capture_selection()
+            version = await self._screen_version()
+            if version is not None and version == self._selection_screen_version:
+                self._selection.timestamp = time.time()
+            else:
+                await self._capture_selection()
 
         return self._selection.text if self._selection.is_active else None
 
@@ -501,6 +547,7 @@ class ContextTracker:
         self._app = AppContext()
         self._version = 0
         self._action_history = []
+        self._selection_screen_version = None
 
 
 # Singleton
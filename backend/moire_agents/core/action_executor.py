@@ -21,6 +21,8 @@ from typing import Any, Dict, List, Optional
 
 import pyautogui
 
+from validation.screen_settle import expects_change, get_screen_settler
+
 # Safety settings
 pyautogui.FAILSAFE = True  # Move mouse to corner to abort
 pyautogui.PAUSE = 0.1  # Small pause between actions
@@ -39,6 +41,8 @@ class ActionExecutor:
             dry_run: If True, only print actions without executing
         """
         self.dry_run = dry_run
+        self.settler = get_screen_settler()
+        self._settle_baseline = None  # frame before the last screen-changing action
         self._action_handlers = {
             "hotkey": self._execute_hotkey,
             "write": self._execute_write,
@@ -141,12 +145,31 @@ class ActionExecutor:
         return True
 
     async def _execute_sleep(self, action: Dict[str, Any]) -> bool:
-        """Wait for a specified duration."""
+        """Wait until the screen settled, at most the specified duration."""
         seconds = action.get("seconds", 1.0)
-        logger.debug(f"Sleeping for {seconds} seconds")
-        await asyncio.sleep(seconds)
+        logger.debug(f"Waiting up to {seconds} seconds for the screen to settle")
+        await self.settle(seconds)
         return True
 
+    async def settle(self, max_wait: float) -> None:
+        """Wait until the last action's effect settled (at most max_wait).
+
+        Replaces fixed sleeps: returns once the screen changed against the
+        frame taken before the last action and then stayed stable.
+        """
+        if self.dry_run:
+            await asyncio.sleep(max_wait)
+            return
+        result = await self.settler.wait_for_settle(
+            max_wait=max_wait,
+            baseline=self._settle_baseline,
+            expect_change=self._settle_baseline is not None,
+        )
+        logger.debug(
+            f"Settle: {result.reason} after {result.elapsed:.2f}s "
+            f"(max {max_wait}s, {result.frames} frames)"
+        )
+
     async def _execute_select_text(self, action: Dict[str, Any]) -> bool:
         """Select text using Shift+arrow keys."""
         chars = action.get("chars", 0)
@@ -215,15 +238,17 @@ class ActionExecutor:
             # Get action from subtask context
             action = subtask.context.get("pyautogui_action")
             if action:
+                if expects_change(action) and not self.dry_run:
+                    self._settle_baseline = await self.settler.snapshot()
                 success = await self.execute_action(action)
                 if not success:
                     logger.error(f"Failed to execute: {subtask.description}")
                     return False
 
-            # Wait after action
+            # Wait after action (until settled, wait_after is the upper bound)
             wait_time = subtask.context.get("wait_after", 0.2)
             if wait_time > 0:
-                await asyncio.sleep(wait_time)
+                await self.settle(wait_time)
 
         logger.info("All subtasks executed successfully!")
         return True
@@ -0,0 +1,267 @@
+"""
+Embedding Service - Cached, micro-batched sentence embeddings.
+
+Wraps a sentence-transformers model so that:
+
+- Every text is encoded at most once: an LRU cache keyed by the SHA-1 of
+  the (truncated) text returns the stored normalized vector. On a stable
+  screen the same OCR and vision texts hit the cache on every call.
+- Concurrent async callers are coalesced: requests arriving within
+  ``batch_window_ms`` are merged into one ``model.encode`` forward pass,
+  run in a worker thread so the event loop stays responsive. The model
+  is resolved in that thread too, so a first async call never loads it
+  on the loop.
+- The model can be warmed up at startup (load + one dummy encode) in a
+  background thread, so the first real request does not pay the load.
+  ``ready`` reports whether that has happened without loading anything.
+
+The model itself is supplied by a loader callable (e.g. the handoff
+server's ``_get_st_model``) and may be ``None`` when sentence-transformers
+is not installed; every method then returns ``None``.
+
+Usage:
+    service = get_embedding_service(loader=_get_st_model)
+    vecs = service.encode(["a", "b"])              # sync, cached
+    vecs = await service.aencode(["a", "b"])       # async, cached + batched
+    sim = service.cosine("a", "b")
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# all-MiniLM caps at ~256 tokens anyway; longer inputs only cost hashing.
+MAX_TEXT_CHARS = 4000
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+class EmbeddingService:
+    """LRU-cached, micro-batching front end for a sentence-transformers model."""
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        cache_size: int = 2048,
+        batch_window_ms: float = 5.0,
+        max_batch_size: int = 64,
+    ):
+        self._loader = loader
+        self.cache_size = cache_size
+        self.batch_window_ms = batch_window_ms
+        self.max_batch_size = max_batch_size
+
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ready = False
+
+        # Async micro-batch state (bound to the loop that created it).
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "forward_passes": 0,
+            "batched_requests": 0,
+        }
+
+    # ─── Model ──────────────────────────────────────────────────────────────
+
+    @property
+    def model(self) -> Any:
+        return self._loader()
+
+    @property
+    def ready(self) -> bool:
+        """True once the model is loaded (by warmup or a worker-thread encode).
+
+        Unlike ``model`` this never calls the loader, so sync callers on the
+        event loop can check it without risking a model load.
+        """
+        return self._ready
+
+    def warmup(self, background: bool = True) -> None:
+        """Load the model and run one dummy encode (optionally in a thread)."""
+
+        def _run():
+            t0 = time.perf_counter()
+            try:
+                if self.model is None:
+                    return
+                self.model.encode(
+                    ["warmup"], convert_to_numpy=True, normalize_embeddings=True
+                )
+                self._ready = True
+                logger.info(
+                    f"Embedding model warm in {(time.perf_counter() - t0) * 1000:.0f}ms"
+                )
+            except Exception as e:
+                logger.warning(f"Embedding warmup failed: {e}")
+
+        if background:
+            threading.Thread(target=_run, name="embedding-warmup", daemon=True).start()
+        else:
+            _run()
+
+    # ─── Cache ──────────────────────────────────────────────────────────────
+
+    def _cache_get(self, key: str) -> Any:
+        with self._lock:
+            vec = self._cache.get(key)
+            if vec is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+            return vec
+
+    def _cache_put(self, key: str, vec: Any) -> None:
+        with self._lock:
+            self._cache[key] = vec
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _encode_misses(self, texts: List[str]) -> Optional[Dict[str, Any]]:
+        """Encode unique uncached texts in one forward pass; returns key → vec.
+
+        Resolves (and on first use loads) the model, so async callers must
+        run this in a worker thread. None if no model is available.
+        """
+        if not texts:
+            return {}
+        model = self.model
+        if model is None:
+            return None
+        self._ready = True
+        unique: Dict[str, str] = {}
+        for t in texts:
+            unique.setdefault(_text_key(t), t)
+        keys = list(unique)
+        vecs = model.encode(
+            [unique[k] for k in keys],
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            batch_size=self.max_batch_size,
+        )
+        with self._lock:
+            self.stats["forward_passes"] += 1
+            self.stats["misses"] += len(keys)
+        out = dict(zip(keys, vecs))
+        for k, v in out.items():
+            self._cache_put(k, v)
+        return out
+
+    # ─── Sync API ───────────────────────────────────────────────────────────
+
+    def encode(self, texts: List[str]) -> Optional[List[Any]]:
+        """Normalized vectors for ``texts`` (None if no model is available)."""
+        if self.model is None:
+            return None
+        texts = [(t or "")[:MAX_TEXT_CHARS] for t in texts]
+        keys = [_text_key(t) for t in texts]
+        found = {k: self._cache_get(k) for k in keys}
+        missing = [t for t, k in zip(texts, keys) if found[k] is None]
+        vecs = self._encode_misses(missing)
+        if vecs is None:
+            return None
+        found.update(vecs)
+        return [found[k] for k in keys]
+
+    def cosine(self, a: str, b: str) -> Optional[float]:
+        """Raw cosine similarity of two texts in [-1, 1]."""
+        vecs = self.encode([a, b])
+        if vecs is None:
+            return None
+        return float((vecs[0] * vecs[1]).sum())
+
+    # ─── Async API (micro-batched) ──────────────────────────────────────────
+
+    async def aencode(self, texts: List[str]) -> Optional[List[Any]]:
+        """Like encode(), but coalesces concurrent callers into one batch.
+
+        The model is only touched inside the worker thread of ``_flush``;
+        loading it here would block the event loop (or wait on the loader's
+        lock while a warmup thread loads it).
+        """
+        texts = [(t or "")[:MAX_TEXT_CHARS] for t in texts]
+        keys = [_text_key(t) for t in texts]
+        found = {k: self._cache_get(k) for k in keys}
+        missing = [t for t, k in zip(texts, keys) if found[k] is None]
+        if missing:
+            loop = asyncio.get_running_loop()
+            fut: asyncio.Future = loop.create_future()
+            self._pending.append((missing, fut))
+            pending_texts = sum(len(m) for m, _ in self._pending)
+            if pending_texts >= self.max_batch_size:
+                self._schedule_flush(loop, delay=0.0)
+            elif self._flush_handle is None:
+                self._schedule_flush(loop, delay=self.batch_window_ms / 1000.0)
+            vecs = await fut
+            if vecs is None:
+                return None
+            found.update(vecs)
+        return [found[k] for k in keys]
+
+    async def acosine(self, a: str, b: str) -> Optional[float]:
+        vecs = await self.aencode([a, b])
+        if vecs is None:
+            return None
+        return float((vecs[0] * vecs[1]).sum())
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = loop.call_later(
+            delay, lambda: loop.create_task(self._flush())
+        )
+
+    async def _flush(self) -> None:
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.stats["batched_requests"] += len(batch)
+        all_texts = [t for texts, _ in batch for t in texts]
+        try:
+            vecs = await asyncio.to_thread(self._encode_misses, all_texts)
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for _, fut in batch:
+            if not fut.done():
+                fut.set_result(vecs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "cached": len(self._cache),
+                "hit_rate": round(self.stats["hits"] / total, 3) if total else 0.0,
+            }
+
+
+# Singleton
+_embedding_service: Optional[EmbeddingService] = None
+
+
+def get_embedding_service(
+    loader: Optional[Callable[[], Any]] = None,
+) -> Optional[EmbeddingService]:
+    """Get the process-wide embedding service (created with the first loader)."""
+    global _embedding_service
+    if _embedding_service is None:
+        if loader is None:
+            return None
+        _embedding_service = EmbeddingService(loader)
+    return _embedding_service
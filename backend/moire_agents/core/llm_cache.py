@@ -0,0 +1,326 @@
+"""
+LLM Response Cache - Content-addressed cache for deterministic LLM calls.
+
+Many LLM calls repeat with identical input (icon classification on the same
+crop, decomposition of a recurring goal, the same voice phrase, compaction
+of an unchanged history). This cache answers them without touching the
+network:
+
+- Key: SHA-256 over the model, the normalized messages (whitespace
+  collapsed, inline images replaced by the hash of their data) and the
+  sampling parameters (temperature, max_tokens, tools, response_format).
+- In-memory LRU in front of an on-disk SQLite store
+  (``data/llm_cache.db``, override with ``LLM_CACHE_DB``).
+- Opt-in per call site: only sites with a TTL are cached. Defaults live in
+  ``DEFAULT_SITE_TTLS``; override with ``LLM_CACHE_TTL_<SITE>=<seconds>``
+  (0 disables a site) or switch everything off with ``LLM_CACHE=0``.
+- Hit / miss counters per call site (``get_stats()``).
+
+Usage:
+    cache = get_llm_cache()
+    key = cache.make_key(payload)
+    data = cache.get("classification", key)
+    if data is None:
+        data = await transport.chat_completions(payload)
+        cache.put("classification", key, data)
+
+The shared LLM transport does this automatically for
+``chat_completions(..., cache_site="...")``.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "llm_cache.db"
+
+# Opt-in call sites and their TTL in seconds
+DEFAULT_SITE_TTLS: Dict[str, float] = {
+    "classification": 7 * 24 * 3600,
+    "task_decompose": 24 * 3600,
+    "voice_intent": 24 * 3600,
+    "compaction": 3600,
+}
+
+# Payload fields that change the answer (besides model + messages)
+_KEY_PARAMS = (
+    "temperature",
+    "max_tokens",
+    "top_p",
+    "tools",
+    "response_format",
+    "system",
+)
+
+_WS_RE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    model TEXT,
+    value_json TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
+"""
+
+
+def _image_hash(data: str) -> str:
+    if data.startswith("data:") and "," in data:
+        data = data.split(",", 1)[1]
+    return "img:" + hashlib.sha256(data.encode("ascii", errors="ignore")).hexdigest()
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize message content: collapse whitespace, hash inline images."""
+    if isinstance(value, str):
+        return _WS_RE.sub(" ", value).strip()
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            if k == "image_url" and isinstance(v, dict) and "url" in v:
+                out[k] = {**v, "url": _image_hash(str(v["url"]))}
+            elif k == "source" and isinstance(v, dict) and v.get("type") == "base64":
+                out[k] = {**v, "data": _image_hash(str(v.get("data", "")))}
+            else:
+                out[k] = _normalize(v)
+        return out
+    return value
+
+
+class LLMResponseCache:
+    """Two-level (LRU + SQLite) cache for LLM responses, per call site."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        memory_size: int = 512,
+        site_ttls: Optional[Dict[str, float]] = None,
+        enabled: Optional[bool] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if enabled is None:
+            enabled = os.environ.get("LLM_CACHE", "1") not in ("0", "false", "no")
+        self.enabled = enabled
+        self.memory_size = memory_size
+        self._clock = clock
+
+        self.site_ttls: Dict[str, float] = dict(
+            DEFAULT_SITE_TTLS if site_ttls is None else site_ttls
+        )
+        for site in list(self.site_ttls):
+            env = os.environ.get(f"LLM_CACHE_TTL_{site.upper()}")
+            if env is not None:
+                try:
+                    self.site_ttls[site] = float(env)
+                except ValueError:
+                    pass
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if self.enabled:
+            path = Path(db_path or os.environ.get("LLM_CACHE_DB") or _DEFAULT_DB_PATH)
+            try:
+                if str(path) != ":memory:":
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(path), check_same_thread=False)
+                self._db.executescript(_SCHEMA)
+            except Exception as e:
+                logger.warning(
+                    f"LLM cache: SQLite store unavailable ({e}), memory only"
+                )
+                self._db = None
+
+    # ─── Policy ─────────────────────────────────────────────────────────────
+
+    def register_site(self, site: str, ttl_s: float) -> None:
+        """Opt a call site in (ttl_s <= 0 opts it out)."""
+        self.site_ttls[site] = ttl_s
+
+    def ttl_for(self, site: str) -> float:
+        return self.site_ttls.get(site, 0.0)
+
+    def is_enabled(self, site: Optional[str]) -> bool:
+        return bool(self.enabled and site and self.ttl_for(site) > 0)
+
+    # ─── Keys ───────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """Content address of a chat/completions payload."""
+        material = {
+            "model": payload.get("model"),
+            "messages": _normalize(payload.get("messages", [])),
+        }
+        for name in _KEY_PARAMS:
+            if payload.get(name) is not None:
+                material[name] = _normalize(payload[name])
+        blob = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    # ─── Lookup ─────────────────────────────────────────────────────────────
+
+    def _site_stats(self, site: str) -> Dict[str, int]:
+        stats = self._stats.get(site)
+        if stats is None:
+            stats = {
+                "hits": 0,
+                "misses": 0,
+                "memory_hits": 0,
+                "disk_hits": 0,
+                "stores": 0,
+            }
+            self._stats[site] = stats
+        return stats
+
+    def get(self, site: str, key: str) -> Any:
+        """Cached value (deep copy) or None. Counts a hit/miss for ``site``."""
+        if not self.is_enabled(site):
+            return None
+        now = self._clock()
+        with self._lock:
+            stats = self._site_stats(site)
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    stats["hits"] += 1
+                    stats["memory_hits"] += 1
+                    return copy.deepcopy(value)
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value_json, expires_at FROM llm_cache WHERE key=?",
+                        (key,),
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.debug(f"LLM cache read failed: {e}")
+                    row = None
+                if row is not None and row[1] > now:
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    stats["hits"] += 1
+                    stats["disk_hits"] += 1
+                    return copy.deepcopy(value)
+
+            stats["misses"] += 1
+            return None
+
+    def put(
+        self, site: str, key: str, value: Any, ttl_s: Optional[float] = None
+    ) -> None:
+        """Store a JSON-serializable value for ``site``."""
+        if not self.is_enabled(site):
+            return
+        ttl = self.ttl_for(site) if ttl_s is None else ttl_s
+        if ttl <= 0:
+            return
+        now = self._clock()
+        expires_at = now + ttl
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._site_stats(site)["stores"] += 1
+            if self._db is not None:
+                model = value.get("model") if isinstance(value, dict) else None
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO llm_cache "
+                        "(key, site, model, value_json, created_at, expires_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            key,
+                            site,
+                            model,
+                            json.dumps(value, ensure_ascii=False),
+                            now,
+                            expires_at,
+                        ),
+                    )
+                    self._db.commit()
+                except (sqlite3.Error, TypeError, ValueError) as e:
+                    logger.debug(f"LLM cache write failed: {e}")
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # ─── Maintenance ────────────────────────────────────────────────────────
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the SQLite store; returns the count."""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM llm_cache WHERE expires_at <= ?", (self._clock(),)
+            )
+            self._db.commit()
+            return cur.rowcount
+
+    def clear(self, site: Optional[str] = None) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                if site is None:
+                    self._db.execute("DELETE FROM llm_cache")
+                else:
+                    self._db.execute("DELETE FROM llm_cache WHERE site=?", (site,))
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sites = {}
+            for site, s in self._stats.items():
+                total = s["hits"] + s["misses"]
+                sites[site] = {
+                    **s,
+                    "hit_rate": round(s["hits"] / total, 3) if total else 0.0,
+                }
+            return {
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "persistent": self._db is not None,
+                "sites": sites,
+            }
+
+
+# Singleton
+_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache."""
+    global _cache
+    if _cache is None:
+        _cache = LLMResponseCache()
+    return _cache
+
+
+def reset_llm_cache() -> None:
+    """Drop the process-wide cache (tests, config changes)."""
+    global _cache
+    _cache = None
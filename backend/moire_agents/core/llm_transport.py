@@ -0,0 +1,405 @@
+"""
+LLM Transport - Shared, pooled HTTP transport for OpenAI-compatible LLM APIs.
+
+Every LLM call site (llm_intent agentic loop, OpenRouterClient, the voice
+intent parser, the classification worker via OpenRouterClient, the video
+agent, the Discord listener and the e2e test runner) posts its
+chat/completions payload through one process-wide transport:
+
+- One keep-alive connection pool per event loop instead of a fresh
+  ``ClientSession`` per request (no DNS/TCP/TLS setup per turn).
+  Uses ``httpx`` with HTTP/2 when ``h2`` is installed, otherwise ``aiohttp``.
+- Bounded concurrency per model (``LLM_MAX_CONCURRENCY_PER_MODEL``).
+- Retry with full-jitter exponential backoff on 429/5xx and connection
+  errors; ``Retry-After`` is honoured. Timeouts are not retried, and
+  ``timeout`` bounds the whole call, retries and backoff included.
+- Request / latency / token metrics per model (``get_stats()``).
+- Optional response cache for deterministic call sites
+  (``cache_site=...``, see core/llm_cache.py): a hit skips the network.
+
+Usage:
+    transport = get_llm_transport()
+    data = await transport.chat_completions(payload, api_key=key)
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Status codes worth retrying (rate limit + transient upstream errors)
+RETRYABLE_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+DEFAULT_MAX_CONCURRENCY_PER_MODEL = int(
+    os.environ.get("LLM_MAX_CONCURRENCY_PER_MODEL", "4")
+)
+DEFAULT_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
+
+# (status, headers, body) of one HTTP round trip
+SendResult = Tuple[int, Dict[str, str], str]
+Sender = Callable[[str, Dict[str, str], Dict[str, Any], float], Awaitable[SendResult]]
+
+
+def _try_httpx_http2():
+    """httpx module if HTTP/2 support (h2) is installed, else None."""
+    if importlib.util.find_spec("h2") is None:
+        return None
+    try:
+        import httpx
+
+        return httpx
+    except ImportError:
+        return None
+
+
+def _is_timeout(error: BaseException) -> bool:
+    """asyncio/aiohttp timeouts and httpx.TimeoutException (by name)."""
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError)) or (
+        "Timeout" in type(error).__name__
+    )
+
+
+def _try_aiohttp():
+    try:
+        import aiohttp
+
+        return aiohttp
+    except ImportError:
+        return None
+
+
+class LLMTransportError(Exception):
+    """Non-retryable (or finally failed) LLM HTTP response."""
+
+    def __init__(self, status: int, body: str, model: str = ""):
+        self.status = status
+        self.body = body
+        self.model = model
+        super().__init__(f"LLM API error {status}: {body[:200]}")
+
+
+class _ModelStats:
+    """Counters + latency window for one model."""
+
+    def __init__(self, window: int = 200):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=window)
+
+    def as_dict(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies_ms)
+
+        def pct(p: float) -> float:
+            if not lat:
+                return 0.0
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))], 1)
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "latency_p50_ms": pct(0.5),
+            "latency_p95_ms": pct(0.95),
+        }
+
+
+class LLMTransport:
+    """Pooled, retrying, per-model bounded transport for chat/completions."""
+
+    def __init__(
+        self,
+        base_url: str = OPENROUTER_BASE_URL,
+        max_concurrency_per_model: int = DEFAULT_MAX_CONCURRENCY_PER_MODEL,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 20.0,
+        pool_size: int = 32,
+        sender: Optional[Sender] = None,
+        cache: Any = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency_per_model = max(1, max_concurrency_per_model)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.pool_size = pool_size
+        self._sender = sender
+        self._cache = cache
+
+        # Pool + semaphores are bound to the event loop that created them.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Any = None
+        self._backend = "custom" if sender else None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, _ModelStats] = {}
+
+    # ─── Connection pool ────────────────────────────────────────────────────
+
+    async def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # New loop (e.g. a second asyncio.run): the old pool cannot be reused.
+        self._loop = loop
+        self._semaphores = {}
+        await self.close()
+
+    def _ensure_client(self) -> None:
+        if self._client is not None or self._sender is not None:
+            return
+        httpx = _try_httpx_http2()
+        if httpx is not None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+            )
+            self._backend = "httpx-h2"
+            return
+        aiohttp = _try_aiohttp()
+        if aiohttp is None:
+            raise RuntimeError("Neither httpx[http2] nor aiohttp is installed")
+        self._client = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.pool_size, ttl_dns_cache=300, keepalive_timeout=60
+            )
+        )
+        self._backend = "aiohttp"
+
+    async def _send(
+        self, url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float
+    ) -> SendResult:
+        if self._sender is not None:
+            return await self._sender(url, headers, payload, timeout)
+        self._ensure_client()
+        if self._backend == "httpx-h2":
+            resp = await self._client.post(
+                url, headers=headers, json=payload, timeout=timeout
+            )
+            return resp.status_code, dict(resp.headers), resp.text
+
+        import aiohttp
+
+        async with self._client.post(
+            url,
+            headers=headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            return resp.status, dict(resp.headers), await resp.text()
+
+    async def close(self) -> None:
+        """Close the connection pool.
+
+        A pool left over from a finished loop is closed best-effort: its
+        sockets may already be gone with that loop.
+        """
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            if self._backend == "httpx-h2":
+                await client.aclose()
+            else:
+                await client.close()
+        except Exception as e:
+            logger.debug(f"LLM transport close failed: {e}")
+
+    # ─── Requests ───────────────────────────────────────────────────────────
+
+    @property
+    def cache(self):
+        """Response cache (process-wide LLMResponseCache unless injected)."""
+        if self._cache is None:
+            try:
+                from core.llm_cache import get_llm_cache
+            except ImportError:
+                from llm_cache import get_llm_cache
+            self._cache = get_llm_cache()
+        return self._cache
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(model)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_concurrency_per_model)
+            self._semaphores[model] = sem
+        return sem
+
+    def _model_stats(self, model: str) -> _ModelStats:
+        stats = self._stats.get(model)
+        if stats is None:
+            stats = _ModelStats()
+            self._stats[model] = stats
+        return stats
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(self.backoff_max_s, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        cap = min(self.backoff_max_s, self.backoff_base_s * (2**attempt))
+        return random.uniform(0, cap)
+
+    async def chat_completions(
+        self,
+        payload: Dict[str, Any],
+        api_key: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 120.0,
+        base_url: Optional[str] = None,
+        cache_site: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """POST ``payload`` to ``{base_url}/chat/completions`` and return the JSON.
+
+        Args:
+            timeout: Deadline in seconds for the whole call. Each attempt
+                gets what is left of it; a timed-out attempt is not retried.
+            cache_site: Opt-in call site name for the response cache; a
+                cache hit is returned without any network round trip.
+
+        Raises:
+            LLMTransportError: on a non-retryable status or after the last retry
+            asyncio.TimeoutError (or the HTTP client's timeout): deadline hit
+        """
+        cache_key = None
+        if cache_site and self.cache.is_enabled(cache_site):
+            cache_key = self.cache.make_key(payload)
+            cached = self.cache.get(cache_site, cache_key)
+            if cached is not None:
+                return cached
+
+        data = await self._request(payload, api_key, headers, timeout, base_url)
+        if cache_key is not None:
+            self.cache.put(cache_site, cache_key, data)
+        return data
+
+    async def _request(
+        self,
+        payload: Dict[str, Any],
+        api_key: Optional[str],
+        headers: Optional[Dict[str, str]],
+        timeout: float,
+        base_url: Optional[str],
+    ) -> Dict[str, Any]:
+        await self._bind_loop()
+        model = str(payload.get("model", "unknown"))
+        url = f"{(base_url or self.base_url).rstrip('/')}/chat/completions"
+        req_headers = {"Content-Type": "application/json"}
+        if api_key:
+            req_headers["Authorization"] = f"Bearer {api_key}"
+        if headers:
+            req_headers.update(headers)
+
+        stats = self._model_stats(model)
+        async with self._semaphore(model):
+            deadline = time.monotonic() + timeout
+            attempt = 0
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # A zero timeout would mean "no timeout" to aiohttp
+                    raise asyncio.TimeoutError()
+                stats.requests += 1
+                t0 = time.perf_counter()
+                retry_after = None
+                try:
+                    status, resp_headers, body = await self._send(
+                        url, req_headers, payload, remaining
+                    )
+                    error: Optional[BaseException] = None
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    status, resp_headers, body = 0, {}, str(e)
+                    error = e
+                stats.latencies_ms.append((time.perf_counter() - t0) * 1000)
+
+                if status == 200:
+                    data = json.loads(body)
+                    usage = data.get("usage") or {}
+                    stats.prompt_tokens += usage.get("prompt_tokens", 0) or 0
+                    stats.completion_tokens += usage.get("completion_tokens", 0) or 0
+                    stats.total_tokens += usage.get("total_tokens", 0) or 0
+                    return data
+
+                stats.errors += 1
+                retry_after = {k.lower(): v for k, v in resp_headers.items()}.get(
+                    "retry-after"
+                )
+                delay = self._backoff(attempt, retry_after)
+                # A timed-out attempt used up the remaining deadline.
+                retryable = (
+                    status in RETRYABLE_STATUS
+                    if error is None
+                    else not _is_timeout(error)
+                )
+                if (
+                    not retryable
+                    or attempt >= self.max_retries
+                    or time.monotonic() + delay >= deadline
+                ):
+                    if error is not None:
+                        raise error
+                    logger.error(f"LLM error {status} ({model}): {body[:500]}")
+                    raise LLMTransportError(status, body, model)
+
+                attempt += 1
+                stats.retries += 1
+                logger.warning(
+                    f"LLM request to {model} failed ({status or error}), "
+                    f"retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    # ─── Metrics ────────────────────────────────────────────────────────────
+
+    def get_stats(self) -> Dict[str, Any]:
+        models = {m: s.as_dict() for m, s in self._stats.items()}
+        return {
+            "backend": self._backend,
+            "requests": sum(s["requests"] for s in models.values()),
+            "errors": sum(s["errors"] for s in models.values()),
+            "retries": sum(s["retries"] for s in models.values()),
+            "total_tokens": sum(s["total_tokens"] for s in models.values()),
+            "models": models,
+            "cache": self._cache.get_stats() if self._cache is not None else None,
+        }
+
+
+# Singleton
+_transport: Optional[LLMTransport] = None
+
+
+def get_llm_transport() -> LLMTransport:
+    """Get the process-wide LLM transport."""
+    global _transport
+    if _transport is None:
+        _transport = LLMTransport()
+    return _transport
+
+
+async def close_llm_transport() -> None:
+    """Close and drop the process-wide transport."""
+    global _transport
+    if _transport is not None:
+        await _transport.close()
+        _transport = None
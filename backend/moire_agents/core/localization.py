@@ -60,6 +60,33 @@ Wenn das Element NICHT gefunden wird:
     "element_type": "unknown",
     "description": "Element nicht gefunden: <Grund>"
 }}""",
+            # Vision Agent - Multi-Target Element Finding
+            "vision_find_elements": """Analysiere diesen Screenshot und finde ALLE folgenden UI-Elemente:
+
+GESUCHTE ELEMENTE:
+{targets}
+{context}
+
+WICHTIG: Gib für jedes Element die EXAKTEN Pixel-Koordinaten zurück, wo ein Benutzer klicken sollte.
+
+Das Bild hat die Dimensionen: {w}x{h} Pixel
+
+Antworte NUR im folgenden JSON-Format, mit genau einem Eintrag pro gesuchtem Element (gleicher index):
+{{
+    "elements": [
+        {{
+            "index": <Nummer des gesuchten Elements>,
+            "found": true/false,
+            "x": <X-Koordinate des Klickpunkts>,
+            "y": <Y-Koordinate des Klickpunkts>,
+            "confidence": <Konfidenz 0.0-1.0>,
+            "element_type": "<button/link/textfield/icon/menu/checkbox/other>",
+            "description": "<kurze Beschreibung was gefunden wurde>"
+        }}
+    ]
+}}
+
+Nicht gefundene Elemente: "found": false, "x": 0, "y": 0, "confidence": 0.""",
             # Vision Agent - Action Suggestion
             "vision_suggest_action": """Analysiere diesen Screenshot und bestimme die beste Aktion für folgende Aufgabe:
 
@@ -221,6 +248,33 @@ If the element is NOT found:
     "element_type": "unknown",
     "description": "Element not found: <reason>"
 }}""",
+            # Vision Agent - Multi-Target Element Finding
+            "vision_find_elements": """Analyze this screenshot and find ALL of the following UI elements:
+
+TARGET ELEMENTS:
+{targets}
+{context}
+
+IMPORTANT: For each element return the EXACT pixel coordinates where a user should click.
+
+Image dimensions: {w}x{h} pixels
+
+Respond ONLY in the following JSON format, with exactly one entry per target element (same index):
+{{
+    "elements": [
+        {{
+            "index": <number of the target element>,
+            "found": true/false,
+            "x": <X coordinate of click point>,
+            "y": <Y coordinate of click point>,
+            "confidence": <confidence 0.0-1.0>,
+            "element_type": "<button/link/textfield/icon/menu/checkbox/other>",
+            "description": "<brief description of what was found>"
+        }}
+    ]
+}}
+
+Elements that are not found: "found": false, "x": 0, "y": 0, "confidence": 0.""",
             # Vision Agent - Action Suggestion
             "vision_suggest_action": """Analyze this screenshot and determine the best action for the following task:
 
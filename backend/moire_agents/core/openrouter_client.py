@@ -19,6 +19,13 @@ from typing import Any, Dict, List, Optional, Union
 
 import aiohttp
 
+try:
+    from core.llm_transport import (OPENROUTER_BASE_URL, LLMTransportError,
+                                    get_llm_transport)
+except ImportError:
+    from llm_transport import (OPENROUTER_BASE_URL, LLMTransportError,
+                               get_llm_transport)
+
 try:
     from dotenv import load_dotenv
 
@@ -104,32 +111,35 @@ class OpenRouterClient:
     - Claude 3.5 Sonnet für schnelle Aktionen
     """
 
-    BASE_URL = "https://openrouter.ai/api/v1"
+    BASE_URL = OPENROUTER_BASE_URL
+    HEADERS = {
+        "HTTP-Referer": "https://moiretracker.local",
+        "X-Title": "MoireTracker Agent System",
+    }
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
         if not self.api_key:
             logger.warning("No OPENROUTER_API_KEY found - LLM calls will fail")
 
-        self.session: Optional[aiohttp.ClientSession] = None
+        self._transport = get_llm_transport()
         self._request_count = 0
         self._total_tokens = 0
 
-    async def _ensure_session(self):
-        """Erstellt Session wenn nötig."""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "HTTP-Referer": "https://moiretracker.local",
-                    "X-Title": "MoireTracker Agent System",
-                }
-            )
-
     async def close(self):
-        """Schließt die Session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Gibt die Referenz auf den geteilten LLM-Transport frei.
+
+        Der Transport gehört dem Prozess (close_llm_transport()); andere
+        Clients und Call-Sites nutzen denselben Connection-Pool weiter.
+        """
+        self._transport = None
+
+    @property
+    def transport(self):
+        """Geteilter LLM-Transport (nach close() neu bezogen)."""
+        if self._transport is None:
+            self._transport = get_llm_transport()
+        return self._transport
 
     async def chat(
         self,
@@ -138,6 +148,7 @@ class OpenRouterClient:
         temperature: float = 0.3,
         max_tokens: int = 4096,
         json_mode: bool = False,
+        cache_site: Optional[str] = None,
     ) -> LLMResponse:
         """
         Sendet Chat-Anfrage an OpenRouter.
@@ -148,6 +159,7 @@ class OpenRouterClient:
             temperature: Kreativität (0-1)
             max_tokens: Maximale Antwortlänge
             json_mode: Ob JSON-Antwort erzwungen werden soll
+            cache_site: Opt-in Call-Site für den Response-Cache (core/llm_cache.py)
 
         Returns:
             LLMResponse mit Inhalt und Metadaten
@@ -155,8 +167,6 @@ class OpenRouterClient:
         if not self.api_key:
             raise ValueError("No API key configured")
 
-        await self._ensure_session()
-
         model_name = model.model_id if isinstance(model, ModelType) else model
 
         payload = {
@@ -170,32 +180,30 @@ class OpenRouterClient:
             payload["response_format"] = {"type": "json_object"}
 
         try:
-            async with self.session.post(
-                f"{self.BASE_URL}/chat/completions", json=payload
-            ) as response:
-                self._request_count += 1
-
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"OpenRouter error {response.status}: {error_text}")
-                    raise Exception(
-                        f"OpenRouter API error: {response.status} - {error_text}"
-                    )
-
-                data = await response.json()
-
-                content = data["choices"][0]["message"]["content"] or ""
-                usage = data.get("usage", {})
-                self._total_tokens += usage.get("total_tokens", 0)
-
-                return LLMResponse(
-                    content=content, model=model_name, usage=usage, raw_response=data
-                )
-
+            # Shared transport: pooled connections, retry on 429/5xx
+            data = await self.transport.chat_completions(
+                payload,
+                api_key=self.api_key,
+                headers=self.HEADERS,
+                timeout=300.0,
+                base_url=self.BASE_URL,
+                cache_site=cache_site,
+            )
+        except LLMTransportError as e:
+            raise Exception(f"OpenRouter API error: {e.status} - {e.body}") from e
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error: {e}")
             raise
 
+        self._request_count += 1
+        content = data["choices"][0]["message"]["content"] or ""
+        usage = data.get("usage", {})
+        self._total_tokens += usage.get("total_tokens", 0)
+
+        return LLMResponse(
+            content=content, model=model_name, usage=usage, raw_response=data
+        )
+
     async def chat_with_vision(
         self,
         prompt: str,
@@ -476,6 +484,7 @@ Respond as JSON:
         return {
             "request_count": self._request_count,
             "total_tokens": self._total_tokens,
+            "transport": self.transport.get_stats(),
         }
 
 
@@ -463,17 +463,16 @@ Return JSON array:
 """
 
         try:
-            response = await self.llm_client.chat_completion(
+            response = await self.llm_client.chat(
                 messages=[{"role": "user", "content": prompt}],
                 model="anthropic/claude-sonnet-4-20250514",
                 temperature=0.3,
                 max_tokens=2000,
+                cache_site="task_decompose",
             )
 
             # Parse JSON from response
-            content = (
-                response.get("choices", [{}])[0].get("message", {}).get("content", "")
-            )
+            content = response.content if response else ""
 
             # Extract JSON array from response
             json_match = re.search(r"\[[\s\S]*\]", content)
@@ -4,6 +4,7 @@ Validated Executor - Executes LLM-generated actions with visual validation.
 This module integrates:
 - MoireWebSocketClient for screenshot capture
 - ActionExecutor for PyAutoGUI execution
+- TieredValidator for cheap pixel-diff / ROI-OCR validation
 - StateComparator for before/after comparison
 - VisionAnalystAgent for analysis and reflection
 
@@ -33,8 +34,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from bridge.websocket_client import CaptureResult, MoireWebSocketClient
 from core.action_executor import ActionExecutor
+from validation.screen_settle import get_screen_settler
 from validation.state_comparator import (ChangeType, ScreenState,
                                          StateComparator)
+from validation.tiered_validator import (Outcome, TieredValidator,
+                                         TierPolicy, TierVerdict,
+                                         ValidationTier)
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +55,7 @@ class ValidationResult:
     message: str = ""
     before_screenshot: Optional[str] = None
     after_screenshot: Optional[str] = None
+    tier: Optional[ValidationTier] = None  # tier that decided
 
 
 @dataclass
@@ -72,11 +78,11 @@ class ValidatedExecutor:
     Executes LLM-generated actions with visual validation.
 
     For each action:
-    1. Capture BEFORE screenshot via MoireServer
+    1. Grab a cheap BEFORE frame (plus a full MoireServer capture only if
+       the action's policy may escalate to the full tier)
     2. Execute PyAutoGUI action
-    3. Capture AFTER screenshot
-    4. Compare states using StateComparator
-    5. Validate that expected change occurred
+    3. Validate with the cheapest tier that can decide:
+       pixel diff → ROI OCR → full capture + StateComparator
     """
 
     def __init__(
@@ -85,6 +91,8 @@ class ValidatedExecutor:
         moire_port: int = 8765,
         validation_threshold: float = 0.1,  # Lowered for text changes
         dry_run: bool = False,
+        tiered: bool = True,
+        policies: Optional[Dict[str, TierPolicy]] = None,
     ):
         """
         Initialize the ValidatedExecutor.
@@ -94,12 +102,16 @@ class ValidatedExecutor:
             moire_port: MoireServer port
             validation_threshold: Minimum confidence for action success (0.0-1.0)
             dry_run: If True, skip PyAutoGUI execution
+            tiered: Validate cheap-first (False: full capture for every action)
+            policies: Per action type overrides of the tier policies
         """
         self.moire_client = MoireWebSocketClient(host=moire_host, port=moire_port)
         self.action_executor = ActionExecutor(dry_run=dry_run)
         self.state_comparator = StateComparator()
         self.validation_threshold = validation_threshold
         self.dry_run = dry_run
+        self.tiered_validator = TieredValidator(policies) if tiered else None
+        self.settler = get_screen_settler()
         self._connected = False
 
     async def connect(self) -> bool:
@@ -267,6 +279,72 @@ class ValidatedExecutor:
                 message=f"Validation error: {e}",
             )
 
+    def _verdict_to_result(self, verdict: TierVerdict) -> ValidationResult:
+        """ValidationResult of a decision from the cheap tiers."""
+        return ValidationResult(
+            success=verdict.outcome == Outcome.CONFIRMED
+            and verdict.confidence >= self.validation_threshold,
+            change_detected=verdict.outcome == Outcome.CONFIRMED
+            and verdict.tier != ValidationTier.NONE,
+            change_type=(
+                ChangeType.TEXT_CHANGED
+                if verdict.tier == ValidationTier.ROI_OCR
+                and verdict.outcome == Outcome.CONFIRMED
+                else None
+            ),
+            confidence=verdict.confidence,
+            message=f"[tier {verdict.tier.name.lower()}] {verdict.message}",
+            tier=verdict.tier,
+        )
+
+    async def _run_validated_action(
+        self, action: Dict[str, Any], description: str, wait_time: float
+    ) -> Optional[ValidationResult]:
+        """Execute one action and validate it cheap-first.
+
+        Returns None if the action itself failed to execute.
+        """
+        validator = self.tiered_validator
+        policy = validator.policy_for(action)
+
+        before_frame = None
+        before_state = None
+        if policy.max_tier != ValidationTier.NONE:
+            try:
+                before_frame = await validator.grab()
+            except Exception as e:
+                logger.debug(f"Frame grab failed: {e}")
+        if policy.max_tier >= ValidationTier.FULL:
+            before_state = await self.capture_screen_state()
+
+        if not await self.action_executor.execute_action(action):
+            return None
+        # Wait until the screen settled (wait_after is only the upper bound)
+        settled = await self.settler.wait_for_settle(
+            max_wait=wait_time,
+            baseline=before_frame.full if before_frame else None,
+            expect_change=policy.max_tier != ValidationTier.NONE,
+        )
+        after_frame = validator.wrap(settled.frame) if settled.frame is not None else None
+
+        verdict = await validator.validate(action, policy, before_frame, after_frame)
+        if verdict.outcome != Outcome.ESCALATE:
+            return self._verdict_to_result(verdict)
+
+        # Tier 2: full capture + StateComparator
+        after_state = await self.capture_screen_state()
+        if before_state and after_state:
+            validation = await self.validate_action(
+                before_state, after_state, description
+            )
+            validation.tier = ValidationTier.FULL
+            return validation
+        return ValidationResult(
+            success=True,
+            change_detected=True,
+            message="Executed (no validation)",
+        )
+
     async def execute_with_validation(
         self,
         subtasks: List,
@@ -330,6 +408,37 @@ class ValidatedExecutor:
 
             # Retry loop
             for attempt in range(max_retries + 1):
+                if self.tiered_validator is not None:
+                    validation = await self._run_validated_action(
+                        action, description, subtask.context.get("wait_after", 0.3)
+                    )
+                    if validation is None:
+                        logger.error(f"Action execution failed: {description}")
+                        actions_failed += 1
+                        validation_results.append(
+                            ValidationResult(
+                                success=False,
+                                change_detected=False,
+                                message="Action execution failed",
+                            )
+                        )
+                        break
+
+                    status = "[OK]" if validation.success else "[??]"
+                    print(f"    {status} {validation.message}")
+
+                    if validation.success or attempt >= max_retries:
+                        validation_results.append(validation)
+                        if validation.success:
+                            actions_validated += 1
+                        else:
+                            actions_failed += 1
+                        break
+                    logger.info(
+                        f"Retrying action (attempt {attempt + 2}/{max_retries + 1})"
+                    )
+                    continue
+
                 # 1. Capture BEFORE state
                 before_state = await self.capture_screen_state()
                 if not before_state:
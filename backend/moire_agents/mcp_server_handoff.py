@@ -24,9 +24,13 @@ Production Deployment:
 import asyncio
 import json
 import logging
+import math
 import os
+import re
 import signal
 import sys
+import threading
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -1888,6 +1892,8 @@ _AGREEMENT_STOPWORDS = {
 # ~200ms load cost, every call after is ~15ms per embedding.
 _ST_MODEL: Any = None
 _ST_MODEL_LOAD_FAILED: bool = False
+# Startup warmup threads may race the first request for the model.
+_ST_MODEL_LOCK = threading.Lock()
 
 
 def _get_st_model():
@@ -1897,43 +1903,80 @@ def _get_st_model():
         return _ST_MODEL
     if _ST_MODEL_LOAD_FAILED:
         return None
+    with _ST_MODEL_LOCK:
+        if _ST_MODEL is not None:
+            return _ST_MODEL
+        if _ST_MODEL_LOAD_FAILED:
+            return None
+        try:
+            from sentence_transformers import SentenceTransformer  # type: ignore
+
+            # all-MiniLM-L6-v2 is 80MB, 384-dim, fast, multilingual-ok. Already
+            # used by la-fungus-search, so the weights are likely cached.
+            _ST_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+            logger.info("Sentence-transformer model loaded: all-MiniLM-L6-v2")
+            return _ST_MODEL
+        except Exception as e:
+            logger.warning(
+                f"Sentence-transformer unavailable ({e}); falling back to token overlap"
+            )
+            _ST_MODEL_LOAD_FAILED = True
+            return None
+
+
+def _get_embedding_service():
+    """Cached + micro-batched encoder over `_get_st_model` (None if unusable)."""
     try:
-        from sentence_transformers import SentenceTransformer  # type: ignore
+        from core.embedding_service import get_embedding_service
 
-        # all-MiniLM-L6-v2 is 80MB, 384-dim, fast, multilingual-ok. Already
-        # used by la-fungus-search, so the weights are likely cached.
-        _ST_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
-        logger.info("Sentence-transformer model loaded: all-MiniLM-L6-v2")
-        return _ST_MODEL
+        return get_embedding_service(loader=_get_st_model)
     except Exception as e:
-        logger.warning(
-            f"Sentence-transformer unavailable ({e}); falling back to token overlap"
-        )
-        _ST_MODEL_LOAD_FAILED = True
+        logger.debug(f"embedding service unavailable: {e}")
         return None
 
 
+def _cosine_to_unit(sim: float) -> float:
+    # Cosine of normalized vectors is in [-1, 1]; clamp to [0, 1] for display.
+    return round(max(0.0, min(1.0, (sim + 1) / 2)), 3)
+
+
 def _semantic_score(a: str, b: str) -> Optional[float]:
-    """Cosine similarity between two texts in [0, 1]. None if model unavailable."""
-    model = _get_st_model()
-    if model is None or not a or not b:
+    """Cosine similarity between two texts in [0, 1]. None if model unavailable.
+
+    Embeddings are cached by text hash, so re-scoring the same OCR/vision
+    texts on a stable screen does not re-run the model.
+    """
+    service = _get_embedding_service()
+    if service is None or not a or not b:
         return None
     try:
-        # Truncate extreme inputs — all-MiniLM caps at ~256 tokens anyway.
-        a_in = a[:4000]
-        b_in = b[:4000]
-        emb = model.encode(
-            [a_in, b_in], convert_to_numpy=True, normalize_embeddings=True
-        )
-        # Normalized embeddings -> cosine = dot product.
-        sim = float((emb[0] * emb[1]).sum())
-        # Cosine of normalized vectors is in [-1, 1]; clamp to [0, 1] for display.
-        return round(max(0.0, min(1.0, (sim + 1) / 2)), 3)
+        sim = service.cosine(a, b)
+        return None if sim is None else _cosine_to_unit(sim)
     except Exception as e:
         logger.debug(f"_semantic_score failed: {e}")
         return None
 
 
+async def _semantic_score_async(a: str, b: str) -> Optional[float]:
+    """Async `_semantic_score`: off the event loop, batched with concurrent calls."""
+    service = _get_embedding_service()
+    if service is None or not a or not b:
+        return None
+    try:
+        sim = await service.acosine(a, b)
+        return None if sim is None else _cosine_to_unit(sim)
+    except Exception as e:
+        logger.debug(f"_semantic_score_async failed: {e}")
+        return None
+
+
+def _warm_embeddings() -> None:
+    """Load + warm the sentence-transformer in the background at startup."""
+    service = _get_embedding_service()
+    if service is not None:
+        service.warmup(background=True)
+
+
 def _agreement_score(ocr_text: str, vision_text: str) -> float:
     """Content-overlap score in [0, 1] tolerant to OCR noise.
 
@@ -2284,7 +2327,9 @@ async def handle_read_screen(
                             # Both scores: token overlap (cheap, old) +
                             # semantic cosine (authoritative, new).
                             token_score = _agreement_score(text_content, vision_text)
-                            sem_score = _semantic_score(text_content, vision_text)
+                            sem_score = await _semantic_score_async(
+                                text_content, vision_text
+                            )
                             vision_payload["token_overlap_score"] = token_score
                             if sem_score is not None:
                                 vision_payload["semantic_score"] = sem_score
@@ -3768,6 +3813,10 @@ async def main():
     # Record start time
     start_time = datetime.now()
 
+    # Load the embedding model and build the skill index off the request path.
+    _warm_embeddings()
+    _warm_skill_index()
+
     try:
         async with stdio_server() as (read_stream, write_stream):
             logger.info("MCP stdio server started, ready for connections")
@@ -3963,25 +4012,33 @@ def _iter_skill_files():
 
 
 def _read_skill_meta(path: str) -> dict:
-    """Pull a one-line description (frontmatter or first prose line) + raw body."""
+    """Pull a one-line description (frontmatter or first prose line) + raw body.
+
+    Also returns the parsed ``frontmatter`` as a flat ``{key: str}`` dict.
+    """
     try:
         with open(path, "r", encoding="utf-8", errors="replace") as f:
             text = f.read()
     except Exception:
-        return {"description": "", "body": ""}
+        return {"description": "", "body": "", "frontmatter": {}}
 
     description = ""
     body = text
-    # Minimal YAML-frontmatter parse (no external dep): grab `description:` / `name:`.
+    frontmatter: Dict[str, str] = {}
+    # Minimal YAML-frontmatter parse (no external dep): top-level `key: value`.
     if text.startswith("---"):
         end = text.find("\n---", 3)
         if end != -1:
             fm = text[3:end]
             body = text[end + 4 :]
             for line in fm.splitlines():
-                ls = line.strip()
-                if ls.lower().startswith("description:"):
-                    description = ls.split(":", 1)[1].strip().strip("\"'")
+                if not line or line[0].isspace() or ":" not in line:
+                    continue
+                key, value = line.split(":", 1)
+                frontmatter[key.strip()] = value.strip().strip("\"'")
+            for key, value in frontmatter.items():
+                if key.lower() == "description":
+                    description = value
                     break
     if not description:
         for line in body.splitlines():
@@ -3989,62 +4046,420 @@ def _read_skill_meta(path: str) -> dict:
             if ls:
                 description = ls[:200]
                 break
-    return {"description": description, "body": body}
+    return {"description": description, "body": body, "frontmatter": frontmatter}
 
 
-def _skill_search(query: str, agent=None, limit: int = 5) -> dict:
-    """Search the adaptive-skill library for SKILL.md files matching ``query``.
+# ─── Skill index ─────────────────────────────────────────────────────────────
+# In-memory index over the SKILL.md tree, so skill_search does not re-read and
+# re-tokenize the whole library on every query. Files are re-parsed only when
+# their mtime changes (checked at most every _SKILL_INDEX_RESCAN_S seconds);
+# skill_save_and_index updates the index for the written file directly.
+# Ranking = BM25 over name/description/body (name and description boosted)
+# + the legacy substring bonuses + optional sentence-embedding similarity
+# when `_get_st_model()` is available.
+#
+# The skill handlers run synchronously on the MCP event loop, so the index
+# never scans or embeds on the request path: rescans and embedding run in a
+# background thread, queries read whatever is indexed, and until the first
+# scan has finished they are answered by a direct lexical scan instead.
+
+_SKILL_INDEX_RESCAN_S = 5.0
+_SKILL_BM25_K1 = 1.5
+_SKILL_BM25_B = 0.75
+# Field boosts: tokens of the name/description are counted this many times.
+_SKILL_NAME_BOOST = 3
+_SKILL_DESC_BOOST = 2
+# Embedding similarity below this cosine contributes nothing.
+_SKILL_SEMANTIC_MIN_COS = 0.35
+_SKILL_SEMANTIC_WEIGHT = 6.0
+
+
+def _skill_tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", (text or "").lower())
+
+
+class _SkillIndex:
+    """Parsed SKILL.md entries + BM25 postings + optional embedding vectors."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Dict[str, Any]] = {}  # path -> entry
+        self._postings: Dict[str, Dict[str, int]] = {}  # token -> {path: tf}
+        self._total_len = 0
+        self._last_scan = 0.0
+        self._matrix: Any = None  # stacked embeddings, rebuilt lazily
+        self._matrix_paths: List[str] = []
+        self.use_embeddings = os.environ.get("SKILL_INDEX_EMBEDDINGS", "1") != "0"
+        # Set once the first full scan has been applied.
+        self.ready = False
+        self._refreshing = False
+        self._refresh_guard = threading.Lock()
+
+    # ── maintenance ──
+
+    def refresh(self, force: bool = False) -> None:
+        """mtime scan: (re)index new or changed files, drop deleted ones.
+
+        Blocking (file IO + embedding); call it from a worker thread. Files
+        are parsed outside the index lock, so queries are never held up by
+        the scan, only by the final swap.
+        """
+        now = time.time()
+        if not force and now - self._last_scan < _SKILL_INDEX_RESCAN_S:
+            return
+        self._last_scan = now
+        with self._lock:
+            known = {p: d["mtime"] for p, d in self._docs.items()}
+        seen = set()
+        parsed: List[Dict[str, Any]] = []
+        for app, skill_name, path in _iter_skill_files():
+            seen.add(path)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if known.get(path) == mtime:
+                continue
+            parsed.append(self._parse_file(app, skill_name, path, mtime))
+        with self._lock:
+            for doc in parsed:
+                self._apply(doc)
+            for path in [p for p in self._docs if p not in seen]:
+                self._remove(path)
+            self.ready = True
+        if parsed:
+            logger.info(
+                f"Skill index: {len(parsed)} (re)indexed, {len(self._docs)} total"
+            )
+            self._embed([d["path"] for d in parsed])
+
+    def refresh_in_background(self, force: bool = False) -> None:
+        """Start a background refresh if one is due and none is running."""
+        if not force and time.time() - self._last_scan < _SKILL_INDEX_RESCAN_S:
+            return
+        with self._refresh_guard:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh(force=force)
+            except Exception as e:
+                logger.warning(f"Skill index refresh failed: {e}")
+            finally:
+                self._refreshing = False
 
-    Dependency-light ranking: case-insensitive substring hits (weighted by field)
-    plus token-overlap. No vector DB. ``agent`` optionally scopes to a subdir.
-    """
-    try:
+        threading.Thread(target=_run, name="skill-index-refresh", daemon=True).start()
+
+    def upsert(self, app: str, skill_name: str, path: str) -> None:
+        """Index a single file right after it was written (embedding deferred)."""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return
+        doc = self._parse_file(app, skill_name, path, mtime)
+        with self._lock:
+            self._apply(doc)
+        if self.use_embeddings:
+            threading.Thread(
+                target=self._embed, args=([path],), name="skill-index-embed", daemon=True
+            ).start()
+
+    def _parse_file(
+        self, app: str, skill_name: str, path: str, mtime: float
+    ) -> Dict[str, Any]:
+        meta = _read_skill_meta(path)
+        name_l = skill_name.lower()
+        desc_l = meta["description"].lower()
+        body_l = meta["body"].lower()
+        tf: Dict[str, int] = {}
+        for tokens, boost in (
+            (_skill_tokens(name_l.replace("-", " ").replace("_", " ")), _SKILL_NAME_BOOST),
+            (_skill_tokens(desc_l), _SKILL_DESC_BOOST),
+            (_skill_tokens(body_l), 1),
+        ):
+            for t in tokens:
+                tf[t] = tf.get(t, 0) + boost
+        return {
+            "app": app,
+            "skill_name": skill_name,
+            "path": path,
+            "mtime": mtime,
+            "description": meta["description"],
+            "frontmatter": meta["frontmatter"],
+            "name_l": name_l,
+            "desc_l": desc_l,
+            "body_l": body_l,
+            "tf": tf,
+            "terms": list(tf),
+            "length": sum(tf.values()),
+            "vector": None,
+        }
+
+    def _apply(self, doc: Dict[str, Any]) -> None:
+        """Insert a parsed doc into the postings (caller holds the lock)."""
+        path = doc["path"]
+        self._remove(path)
+        for t, n in doc.pop("tf").items():
+            self._postings.setdefault(t, {})[path] = n
+        self._total_len += doc["length"]
+        self._docs[path] = doc
+
+    def _remove(self, path: str) -> None:
+        doc = self._docs.pop(path, None)
+        if doc is None:
+            return
+        self._total_len -= doc["length"]
+        for t in doc["terms"]:
+            plist = self._postings.get(t)
+            if plist is not None:
+                plist.pop(path, None)
+                if not plist:
+                    del self._postings[t]
+        if doc["vector"] is not None:
+            self._matrix = None
+
+    def _embed(self, paths: List[str]) -> None:
+        """Embed docs (worker thread only: may load the model)."""
+        if not self.use_embeddings:
+            return
+        service = _get_embedding_service()
+        if service is None:
+            return
+        with self._lock:
+            docs = [self._docs[p] for p in paths if p in self._docs]
+        if not docs:
+            return
+        texts = [
+            f"{d['skill_name']}. {d['description']}. {d['body_l'][:1000]}" for d in docs
+        ]
+        try:
+            vecs = service.encode(texts)
+            if vecs is None:
+                return
+        except Exception as e:
+            logger.debug(f"Skill index embedding failed: {e}")
+            return
+        with self._lock:
+            for d, v in zip(docs, vecs):
+                # Skip docs re-parsed or removed while we were encoding.
+                if self._docs.get(d["path"]) is d:
+                    d["vector"] = v
+            self._matrix = None
+
+    # ── queries ──
+
+    def entries(self) -> List[Dict[str, Any]]:
+        self.refresh_in_background()
+        if not self.ready:
+            return _scan_skill_docs()
+        with self._lock:
+            return list(self._docs.values())
+
+    def _embedding_matrix(self):
+        """Stacked doc vectors + their paths (caller holds the lock)."""
+        if self._matrix is None:
+            import numpy as np  # sentence_transformers implies numpy
+
+            self._matrix_paths = [
+                p for p, d in self._docs.items() if d["vector"] is not None
+            ]
+            self._matrix = (
+                np.stack([self._docs[p]["vector"] for p in self._matrix_paths])
+                if self._matrix_paths
+                else None
+            )
+        return self._matrix, self._matrix_paths
+
+    def _semantic_scores(self, query: str, matrix, paths) -> Dict[str, float]:
+        """Cosine scores per doc; empty until the embedding model is warm.
+
+        Runs on the request path, so it only uses an already loaded model
+        (`service.ready`) and never triggers the load itself. Called without
+        the index lock held, so encoding the query never blocks a refresh.
+        """
+        if matrix is None:
+            return {}
+        service = _get_embedding_service()
+        if service is None or not service.ready:
+            return {}
+        try:
+            q = service.encode([query[:1000]])[0]
+        except Exception as e:
+            logger.debug(f"Skill query embedding failed: {e}")
+            return {}
+        sims = matrix @ q
+        return {
+            p: float(c) for p, c in zip(paths, sims) if c >= _SKILL_SEMANTIC_MIN_COS
+        }
+
+    def search(self, query: str, agent=None, limit: int = 5) -> List[Dict[str, Any]]:
+        self.refresh_in_background()
         q = (query or "").strip().lower()
         if not q:
-            return {"success": True, "results": []}
-        q_tokens = set(t for t in q.replace("/", " ").replace("-", " ").split() if t)
+            return []
+        if not self.ready:
+            return _lexical_skill_search(q, agent=agent, limit=limit)
+        q_terms = set(_skill_tokens(q))
+        flt = str(agent).strip().lower() if agent else None
+
+        # Snapshot under the lock, score without it: refresh/upsert only
+        # ever replace doc dicts and posting entries, never mutate them.
+        with self._lock:
+            docs = dict(self._docs)
+            if not docs:
+                return []
+            avgdl = self._total_len / len(docs)
+            postings = {
+                t: dict(self._postings[t]) for t in q_terms if t in self._postings
+            }
+            matrix, matrix_paths = (
+                self._embedding_matrix() if self.use_embeddings else (None, [])
+            )
+
+        n_docs = len(docs)
+        scores: Dict[str, float] = {}
+
+        # BM25 over the inverted index.
+        for plist in postings.values():
+            df = len(plist)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for path, tf in plist.items():
+                dl = docs[path]["length"]
+                denom = tf + _SKILL_BM25_K1 * (
+                    1 - _SKILL_BM25_B + _SKILL_BM25_B * dl / max(avgdl, 1e-9)
+                )
+                scores[path] = scores.get(path, 0.0) + idf * tf * (
+                    _SKILL_BM25_K1 + 1
+                ) / denom
+
+        for path, cos in self._semantic_scores(q, matrix, matrix_paths).items():
+            scores[path] = scores.get(path, 0.0) + _SKILL_SEMANTIC_WEIGHT * cos
 
+        # Whole-query substring bonuses (the pre-index ranking), applied
+        # to every doc so phrase hits without token overlap still match.
         results = []
-        for app, skill_name, path in _iter_skill_files():
-            if agent and str(agent).strip().lower() not in (app.lower(), skill_name.lower()):
+        for path, doc in docs.items():
+            if flt and flt not in (doc["app"].lower(), doc["name_l"]):
                 continue
-            meta = _read_skill_meta(path)
-            name_l = skill_name.lower()
-            desc_l = meta["description"].lower()
-            body_l = meta["body"].lower()
-
-            score = 0.0
-            if q in name_l:
+            score = scores.get(path, 0.0)
+            if q in doc["name_l"]:
                 score += 10.0
-            if q in desc_l:
+            if q in doc["desc_l"]:
                 score += 5.0
-            if q in body_l:
+            if q in doc["body_l"]:
                 score += 2.0
-            # Token overlap across name + description + body.
-            field_tokens = set(
-                t for t in (name_l + " " + desc_l + " " + body_l)
-                .replace("/", " ").replace("-", " ").split()
-                if t
-            )
-            score += 1.0 * len(q_tokens & field_tokens)
-
             if score > 0:
                 results.append(
                     {
-                        "app": app,
-                        "skill_name": skill_name,
+                        "app": doc["app"],
+                        "skill_name": doc["skill_name"],
                         "path": path,
                         "score": round(score, 3),
-                        "description": meta["description"],
+                        "description": doc["description"],
                     }
                 )
 
         results.sort(key=lambda r: r["score"], reverse=True)
+        return results[: max(0, limit)]
+
+
+_skill_index: Optional[_SkillIndex] = None
+_skill_index_init_lock = threading.Lock()
+
+
+def _scan_skill_docs() -> List[Dict[str, Any]]:
+    """Read every SKILL.md directly (used until the index has been built)."""
+    docs = []
+    for app, skill_name, path in _iter_skill_files():
+        meta = _read_skill_meta(path)
+        docs.append(
+            {
+                "app": app,
+                "skill_name": skill_name,
+                "path": path,
+                "description": meta["description"],
+                "name_l": skill_name.lower(),
+                "desc_l": meta["description"].lower(),
+                "body_l": meta["body"].lower(),
+            }
+        )
+    return docs
+
+
+def _lexical_skill_search(q: str, agent=None, limit: int = 5) -> List[Dict[str, Any]]:
+    """Pre-index ranking: substring hits by field plus token overlap."""
+    q_tokens = set(t for t in q.replace("/", " ").replace("-", " ").split() if t)
+    flt = str(agent).strip().lower() if agent else None
+    results = []
+    for doc in _scan_skill_docs():
+        if flt and flt not in (doc["app"].lower(), doc["name_l"]):
+            continue
+        score = 0.0
+        if q in doc["name_l"]:
+            score += 10.0
+        if q in doc["desc_l"]:
+            score += 5.0
+        if q in doc["body_l"]:
+            score += 2.0
+        field_tokens = set(
+            t
+            for t in (doc["name_l"] + " " + doc["desc_l"] + " " + doc["body_l"])
+            .replace("/", " ")
+            .replace("-", " ")
+            .split()
+            if t
+        )
+        score += 1.0 * len(q_tokens & field_tokens)
+        if score > 0:
+            results.append(
+                {
+                    "app": doc["app"],
+                    "skill_name": doc["skill_name"],
+                    "path": doc["path"],
+                    "score": round(score, 3),
+                    "description": doc["description"],
+                }
+            )
+    results.sort(key=lambda r: r["score"], reverse=True)
+    return results[: max(0, limit)]
+
+
+def _get_skill_index() -> _SkillIndex:
+    """Process-wide skill index; the first call starts the background build."""
+    global _skill_index
+    with _skill_index_init_lock:
+        if _skill_index is None:
+            _skill_index = _SkillIndex(_SKILL_LIB_ROOT)
+            _skill_index.refresh_in_background(force=True)
+    return _skill_index
+
+
+def _warm_skill_index() -> None:
+    """Start building the skill index in the background at startup."""
+    try:
+        _get_skill_index()
+    except Exception as e:
+        logger.warning(f"Skill index warmup failed: {e}")
+
+
+def _skill_search(query: str, agent=None, limit: int = 5) -> dict:
+    """Search the adaptive-skill library for SKILL.md files matching ``query``.
+
+    Served from the in-memory skill index: BM25 over name/description/body,
+    whole-query substring bonuses (weighted by field) and, when the
+    sentence-transformer model is available, embedding similarity.
+    ``agent`` optionally scopes to a subdir.
+    """
+    try:
         try:
             lim = int(limit)
         except (TypeError, ValueError):
             lim = 5
-        return {"success": True, "results": results[: max(0, lim)]}
+        results = _get_skill_index().search(query, agent=agent, limit=lim)
+        return {"success": True, "results": results}
     except Exception as e:
         logger.error(f"_skill_search failed: {e}")
         return {"success": False, "results": [], "error": str(e)}
@@ -4055,16 +4470,15 @@ def _skill_list(app=None) -> dict:
     try:
         skills = []
         flt = str(app).strip().lower() if app and str(app).strip() else None
-        for skill_app, skill_name, path in _iter_skill_files():
-            if flt and flt not in (skill_app.lower(), skill_name.lower()):
+        for doc in _get_skill_index().entries():
+            if flt and flt not in (doc["app"].lower(), doc["name_l"]):
                 continue
-            meta = _read_skill_meta(path)
             skills.append(
                 {
-                    "app": skill_app,
-                    "skill_name": skill_name,
-                    "path": path,
-                    "description": meta["description"],
+                    "app": doc["app"],
+                    "skill_name": doc["skill_name"],
+                    "path": doc["path"],
+                    "description": doc["description"],
                 }
             )
         skills.sort(key=lambda s: (s["app"], s["skill_name"]))
@@ -4108,6 +4522,11 @@ def _skill_save_and_index(app: str, skill_name: str, frontmatter: dict, body: st
         with open(path, "w", encoding="utf-8") as f:
             f.write(content)
 
+        try:
+            _get_skill_index().upsert(str(app).strip(), str(skill_name).strip(), path)
+        except Exception as e:
+            logger.warning(f"Skill index update failed for {path}: {e}")
+
         return {"success": True, "path": path}
     except Exception as e:
         logger.error(f"_skill_save_and_index failed: {e}")
@@ -109,6 +109,8 @@ async def call_tool(name: str, arguments: dict):
 
 
 async def main():
+    H._warm_embeddings()
+    H._warm_skill_index()
     async with stdio_server() as (read, write):
         await server.run(read, write, server.create_initialization_options())
 
@@ -0,0 +1,100 @@
+"""
+Benchmark - ChangeDetector on 4K frames.
+
+Compares the previous detection path with the current one on synthetic
+3840x2160 RGB frames (already decoded, as they come from a screen grab):
+
+  legacy:  int16 abs diff + connected components on the full mask
+  full:    uint8 diff + connected components on the full mask
+  pyramid: 1/4 or 1/8 coarse pass, full resolution only around changes
+
+Scenarios: no change, typed text (small), dialog opened (medium).
+
+Usage:
+    python scripts/bench_change_detector.py
+    python scripts/bench_change_detector.py --runs 20 --width 1920 --height 1080
+
+Options:
+    --runs: Timed runs per scenario (default: 10)
+    --fps: Frame rate the detection has to keep up with (default: 30)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validation.change_detector import ChangeDetector
+
+
+class LegacyDetector(ChangeDetector):
+    """The int16 full-frame path as it was before the pyramid mode."""
+
+    def detect_changes_arrays(self, before, after, return_diff_image=False, roi=None):
+        diff = np.abs(after.astype(np.int16) - before.astype(np.int16))
+        max_diff = np.max(diff, axis=2)
+        binary_mask = (max_diff > self.threshold).astype(np.uint8)
+        if np.sum(binary_mask) < self.min_region_size:
+            return []
+        return self._find_regions(binary_mask, max_diff)
+
+
+def _scenarios(width: int, height: int):
+    rng = np.random.default_rng(0)
+    # Desktop-like frame: flat background with noisy "content" blocks
+    base = np.full((height, width, 3), 235, dtype=np.uint8)
+    for _ in range(40):
+        y, x = rng.integers(0, height - 200), rng.integers(0, width - 300)
+        base[y : y + 200, x : x + 300] = rng.integers(0, 255, (200, 300, 3))
+
+    typed = base.copy()
+    typed[height // 2 : height // 2 + 24, 400:900] = 20
+    dialog = base.copy()
+    dialog[600:1400, 1200:2600] = 250
+    dialog[600:640, 1200:2600] = 60
+
+    return {"no change": base.copy(), "typed text": typed, "dialog": dialog}, base
+
+
+def _time(detector, before, after, runs: int) -> float:
+    detector.detect_changes_arrays(before, after)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        detector.detect_changes_arrays(before, after)
+    return (time.perf_counter() - t0) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChangeDetector benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    scenarios, before = _scenarios(args.width, args.height)
+    detectors = {
+        "legacy": LegacyDetector(),
+        "full": ChangeDetector(),
+        "pyramid/4": ChangeDetector(pyramid_scale=4),
+        "pyramid/8": ChangeDetector(pyramid_scale=8),
+    }
+    budget = 1000 / args.fps
+
+    print("=" * 64)
+    print(f"ChangeDetector benchmark {args.width}x{args.height}, runs={args.runs}")
+    print(f"  frame interval at {args.fps:.0f} fps: {budget:.1f}ms")
+    print("=" * 64)
+    print(f"  {'scenario':<12}" + "".join(f"{name:>12}" for name in detectors))
+    for scenario, after in scenarios.items():
+        times = [_time(d, before, after, args.runs) for d in detectors.values()]
+        print(f"  {scenario:<12}" + "".join(f"{t:>10.1f}ms" for t in times))
+
+
+if __name__ == "__main__":
+    main()
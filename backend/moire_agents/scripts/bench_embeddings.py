@@ -0,0 +1,124 @@
+"""
+Benchmark - sentence embeddings with and without the EmbeddingService.
+
+Simulates the handle_read_screen(with_vision=True) pattern on a stable
+screen: the same handful of OCR / vision texts are scored again and again,
+from several concurrent callers.
+
+  before: model.encode([a, b]) per score (what _semantic_score used to do)
+  after:  EmbeddingService.acosine (LRU cache + micro-batching)
+
+Usage:
+    python scripts/bench_embeddings.py            # real all-MiniLM-L6-v2
+    python scripts/bench_embeddings.py --fake     # simulated model, no download
+
+Options:
+    --calls: Number of score calls (default: 200)
+    --concurrency: Concurrent callers for the async run (default: 8)
+    --distinct: Distinct text pairs cycled through (default: 4)
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.embedding_service import EmbeddingService
+
+
+class FakeModel:
+    """Stands in for SentenceTransformer: fixed per-call + per-text cost."""
+
+    def __init__(self, call_ms: float = 8.0, text_ms: float = 2.0, dim: int = 384):
+        self.call_ms = call_ms
+        self.text_ms = text_ms
+        self.dim = dim
+
+    def encode(self, texts, **kwargs):
+        import numpy as np
+
+        time.sleep((self.call_ms + self.text_ms * len(texts)) / 1000.0)
+        out = np.zeros((len(texts), self.dim), dtype="float32")
+        for i, t in enumerate(texts):
+            rng = np.random.default_rng(abs(hash(t)) % (2**32))
+            v = rng.standard_normal(self.dim).astype("float32")
+            out[i] = v / np.linalg.norm(v)
+        return out
+
+
+def _load_model(fake: bool):
+    if fake:
+        return FakeModel()
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+
+def _pairs(distinct: int):
+    return [
+        (
+            f"Datei Bearbeiten Ansicht Fenster {i} Editor untitled.txt Zeile {i}",
+            f"The screen shows a text editor (window {i}) with an empty document.",
+        )
+        for i in range(distinct)
+    ]
+
+
+def bench_before(model, pairs, calls: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(calls):
+        a, b = pairs[i % len(pairs)]
+        emb = model.encode([a, b], convert_to_numpy=True, normalize_embeddings=True)
+        float((emb[0] * emb[1]).sum())
+    return time.perf_counter() - t0
+
+
+async def bench_after(model, pairs, calls: int, concurrency: int):
+    service = EmbeddingService(loader=lambda: model)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        a, b = pairs[i % len(pairs)]
+        async with sem:
+            await service.acosine(a, b)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return time.perf_counter() - t0, service.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding service benchmark")
+    parser.add_argument("--fake", action="store_true", help="Use a simulated model")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--distinct", type=int, default=4)
+    args = parser.parse_args()
+
+    model = _load_model(args.fake)
+    model.encode(["warmup"], convert_to_numpy=True, normalize_embeddings=True)
+    pairs = _pairs(args.distinct)
+    encodes = args.calls * 2
+
+    before = bench_before(model, pairs, args.calls)
+    after, stats = asyncio.run(bench_after(model, pairs, args.calls, args.concurrency))
+
+    print("=" * 60)
+    print(f"Embedding benchmark ({'fake' if args.fake else 'all-MiniLM-L6-v2'})")
+    print(
+        f"  calls={args.calls} distinct_pairs={args.distinct} "
+        f"concurrency={args.concurrency}"
+    )
+    print("=" * 60)
+    print(f"  before: {encodes / before:10.1f} encodes/s  ({before * 1000:.0f}ms)")
+    print(f"  after:  {encodes / after:10.1f} encodes/s  ({after * 1000:.0f}ms)")
+    print(f"  speedup: {before / after:.1f}x")
+    print(f"  service stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
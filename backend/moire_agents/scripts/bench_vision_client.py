@@ -0,0 +1,175 @@
+"""
+Benchmark - VisionAnalystAgent request path against a local mock endpoint.
+
+Starts a tiny OpenAI-compatible HTTP server (``/chat/completions``) that
+answers every vision request after a fixed latency, points the agent's
+OpenRouter client at it and asks several questions about ONE screenshot,
+the way a planning step does (find_element for a few targets plus a
+reflection prompt).
+
+  before: decode + LANCZOS resize + PNG/base64 per question, one request
+          after the other (what the agent used to do)
+  after:  VisionAnalystAgent with the per-frame payload cache and
+          concurrent requests bounded by max_concurrency
+
+Usage:
+    python scripts/bench_vision_client.py
+    python scripts/bench_vision_client.py --questions 8 --latency-ms 300
+
+Options:
+    --questions: Vision questions per frame (default: 6)
+    --latency-ms: Simulated model latency per request (default: 200)
+    --concurrency: max_concurrency for the agent (default: 4)
+    --size: Screenshot size WxH (default: 2560x1440)
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+# Add parent to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "bench")
+
+from agents.vision_agent import VISION_MAX_SIZE, VisionAnalystAgent
+from core.openrouter_client import OpenRouterClient
+from PIL import Image
+
+
+def _make_handler(latency_s: float):
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse counts
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            time.sleep(latency_s)
+            content = json.dumps(
+                {
+                    "found": True,
+                    "x": 100,
+                    "y": 100,
+                    "confidence": 0.9,
+                    "element_type": "button",
+                    "description": "mock",
+                }
+            )
+            body = json.dumps(
+                {"choices": [{"message": {"content": content}}], "usage": {}}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return MockHandler
+
+
+def _screenshot_bytes(size):
+    image = Image.effect_noise(size, 64).convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _legacy_encode(screenshot: bytes) -> str:
+    image = Image.open(BytesIO(screenshot))
+    if max(image.size) > VISION_MAX_SIZE:
+        ratio = VISION_MAX_SIZE / max(image.size)
+        image = image.resize(
+            (int(image.size[0] * ratio), int(image.size[1] * ratio)),
+            Image.Resampling.LANCZOS,
+        )
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+async def bench_before(
+    client: OpenRouterClient, screenshot: bytes, questions: int
+) -> float:
+    t0 = time.perf_counter()
+    for i in range(questions):
+        b64 = _legacy_encode(screenshot)
+        await client.chat_with_vision(
+            prompt=f"find target {i}", image_data=b64, json_mode=True
+        )
+    return time.perf_counter() - t0
+
+
+async def bench_after(
+    agent: VisionAnalystAgent, screenshot: bytes, questions: int
+) -> float:
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *(
+            agent.find_element_from_screenshot(screenshot, f"target {i}")
+            for i in range(questions)
+        )
+    )
+    return time.perf_counter() - t0
+
+
+async def run(args, base_url: str):
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+    screenshot = _screenshot_bytes(size)
+
+    client = OpenRouterClient(api_key="bench")
+    client.BASE_URL = base_url
+    agent = VisionAnalystAgent(max_concurrency=args.concurrency)
+    agent.openrouter_client = client
+
+    try:
+        before = await bench_before(client, screenshot, args.questions)
+        after = await bench_after(agent, screenshot, args.questions)
+    finally:
+        await client.close()
+
+    print("=" * 60)
+    print(
+        f"Vision client benchmark ({size[0]}x{size[1]}, "
+        f"latency={args.latency_ms}ms, questions={args.questions})"
+    )
+    print("=" * 60)
+    print(
+        f"  before: {before * 1000:8.0f}ms  ({before * 1000 / args.questions:.0f}ms/question)"
+    )
+    print(
+        f"  after:  {after * 1000:8.0f}ms  ({after * 1000 / args.questions:.0f}ms/question)"
+    )
+    print(f"  speedup: {before / after:.1f}x")
+    print(f"  payload cache: {agent.payload_cache.stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vision client benchmark")
+    parser.add_argument("--questions", type=int, default=6)
+    parser.add_argument("--latency-ms", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--size", default="2560x1440")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), _make_handler(args.latency_ms / 1000.0)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(run(args, f"http://127.0.0.1:{server.server_port}"))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
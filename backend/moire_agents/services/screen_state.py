@@ -0,0 +1,708 @@
+"""
+Screen State Service - Inkrementell gepflegter Bildschirmzustand pro Monitor
+
+Bisher baute jede Komponente ihr eigenes Bild davon, was auf dem Screen ist
+(MonitorAgent: Capture + 0.5s Sleep, screen_description: UIA-Poll,
+DataAnalystAgent: Capture + OCR, ContextTracker: Clipboard-Roundtrip).
+Dieser Service hält den Zustand einmal pro Monitor und aktualisiert ihn
+inkrementell aus dem Frame-Stream:
+
+- Letzter Frame (RGB-Array) und Zeitstempel
+- Dirty Regions: geänderte Bereiche seit der letzten Version
+  (ChangeDetector im Pyramiden-Modus)
+- OCR-Tokens pro Region: nur Dirty Regions werden neu gelesen, und erst
+  wenn jemand die Tokens abfragt
+- UIA-Snapshot des Vordergrundfensters (über den UIASnapshotCache)
+- Abgeleiteter AgentDataFrame (pro Version einmal gebaut)
+- Versionszähler + Change-Events (Callbacks und awaitbar)
+
+Agents fragen den Service statt neu zu capturen: solange sich die Version
+nicht ändert, ist die letzte Wahrnehmung noch gültig.
+
+Usage:
+    from services.screen_state import get_screen_state_service
+
+    service = get_screen_state_service(monitor_id=0)
+    await service.refresh(max_age=0.2)   # teilt sich Grabs mit anderen Agents
+    if service.version != last_version:
+        tokens = await service.ocr_tokens(roi={"x": 0, "y": 0, "width": 800, "height": 200})
+        df = await service.dataframe()
+
+    # Hintergrund-Betrieb am Frame-Stream
+    await service.start()
+    event = await service.wait_for_change(timeout=5.0)
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from validation.change_detector import ChangeDetector, ChangeRegion
+from validation.screen_settle import (FrameSource, Roi, local_source,
+                                      stream_source)
+
+# AgentDataFrame import (benötigt pandas)
+try:
+    from services.agent_dataframe import AgentDataFrame
+
+    HAS_AGENT_DF = True
+except ImportError:
+    HAS_AGENT_DF = False
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]  # x, y, width, height (Frame-Koordinaten)
+OCRFunc = Callable[[np.ndarray], Awaitable[List[Dict[str, Any]]]]
+
+# Kleinste Änderung (Pixel pro Region), die eine neue Version auslöst: ein
+# getipptes Zeichen liegt deutlich unter dem ChangeDetector-Default von 100
+VERSION_MIN_REGION_SIZE = 8
+
+
+def _try_pytesseract():
+    try:
+        import pytesseract
+        from PIL import Image
+
+        return pytesseract, Image
+    except ImportError:
+        return None
+
+
+def _try_uia_snapshot_cache():
+    try:
+        from agents.handoff.uia_snapshot import get_uia_snapshot_cache
+
+        return get_uia_snapshot_cache()
+    except Exception as e:
+        logger.debug(f"UIA snapshot cache unavailable: {e}")
+        return None
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return (
+        a[0] < b[0] + b[2]
+        and b[0] < a[0] + a[2]
+        and a[1] < b[1] + b[3]
+        and b[1] < a[1] + a[3]
+    )
+
+
+def _union(a: Box, b: Box) -> Box:
+    x0, y0 = min(a[0], b[0]), min(a[1], b[1])
+    x1 = max(a[0] + a[2], b[0] + b[2])
+    y1 = max(a[1] + a[3], b[1] + b[3])
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def _merge_boxes(boxes: List[Box]) -> List[Box]:
+    """Vereinigt überlappende Boxen, bis keine mehr überlappen."""
+    merged: List[Box] = []
+    for box in boxes:
+        while True:
+            hit = next((m for m in merged if _intersects(m, box)), None)
+            if hit is None:
+                break
+            merged.remove(hit)
+            box = _union(hit, box)
+        merged.append(box)
+    return merged
+
+
+def _roi_box(roi: Optional[Roi]) -> Optional[Box]:
+    if roi is None:
+        return None
+    return (int(roi["x"]), int(roi["y"]), int(roi["width"]), int(roi["height"]))
+
+
+async def tesseract_tokens(crop: np.ndarray) -> List[Dict[str, Any]]:
+    """OCR-Tokens eines Ausschnitts via pytesseract (Koordinaten relativ zum Crop)."""
+    tesseract = _try_pytesseract()
+    if tesseract is None:
+        return []
+    pytesseract, image_cls = tesseract
+    data = await asyncio.to_thread(
+        pytesseract.image_to_data,
+        image_cls.fromarray(crop),
+        output_type=pytesseract.Output.DICT,
+    )
+    tokens = []
+    for i, text in enumerate(data.get("text", [])):
+        text = (text or "").strip()
+        if not text:
+            continue
+        tokens.append(
+            {
+                "text": text,
+                "x": int(data["left"][i]),
+                "y": int(data["top"][i]),
+                "width": int(data["width"][i]),
+                "height": int(data["height"][i]),
+                "confidence": max(0.0, float(data["conf"][i])) / 100,
+            }
+        )
+    return tokens
+
+
+def default_source(monitor_id: int = 0, max_age_ms: float = 1000) -> FrameSource:
+    """
+    Frame-Quelle: Stream-Frames des Desktop-Clients, sonst lokaler Grab.
+
+    Auf den lokalen Screen wird nur für Monitor 0 ausgewichen, und nur
+    solange noch nie ein Stream-Frame für den Monitor ankam (Remote-Modus
+    soll nicht den Server-Bildschirm lesen).
+    """
+    stream = stream_source(monitor_id, max_age_ms)
+
+    def source(roi: Optional[Roi]) -> Optional[Tuple[float, np.ndarray]]:
+        try:
+            from stream_frame_cache import StreamFrameCache
+        except ImportError:
+            StreamFrameCache = None
+        if StreamFrameCache is not None and (
+            StreamFrameCache.get_latest_frame(monitor_id) is not None
+        ):
+            return stream(roi)
+        if monitor_id != 0:
+            return None
+        return local_source(roi)
+
+    return source
+
+
+@dataclass
+class OCRToken:
+    """Ein OCR-Wort in Frame-Koordinaten."""
+
+    text: str
+    x: int
+    y: int
+    width: int
+    height: int
+    confidence: float = 0.0
+    version: int = 0  # Version, in der das Token gelesen wurde
+
+    @property
+    def box(self) -> Box:
+        return (self.x, self.y, self.width, self.height)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "confidence": self.confidence,
+        }
+
+
+@dataclass
+class ScreenStateEvent:
+    """Change-Event: der Screen hat eine neue Version."""
+
+    monitor_id: int
+    version: int
+    timestamp: float
+    regions: List[ChangeRegion] = field(default_factory=list)
+    change_percentage: float = 0.0  # 0-100
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "monitor_id": self.monitor_id,
+            "version": self.version,
+            "timestamp": self.timestamp,
+            "regions": [r.to_dict() for r in self.regions],
+            "change_percentage": self.change_percentage,
+        }
+
+
+class ScreenStateService:
+    """
+    Bildschirmzustand eines Monitors, inkrementell aus Frames gepflegt.
+
+    Versionierung:
+    - ``version`` steigt nur, wenn sich Pixel sichtbar geändert haben
+    - Verglichen wird mit dem Frame der letzten Version, nicht mit dem
+      vorigen Frame: langsame Änderungen (Tippen, Fortschrittsbalken)
+      summieren sich, bis sie eine neue Version auslösen
+    - OCR-Tokens, UIA-Snapshot und AgentDataFrame sind an Versionen gebunden
+      und werden erst bei Abfrage nachgezogen
+    """
+
+    def __init__(
+        self,
+        monitor_id: int = 0,
+        source: Optional[FrameSource] = None,
+        detector: Optional[ChangeDetector] = None,
+        ocr: Optional[OCRFunc] = None,
+        uia: Optional[Callable[[], Any]] = None,
+        interval: float = 0.25,
+        ocr_padding: int = 8,
+    ):
+        """
+        Args:
+            monitor_id: Monitor-Index
+            source: Frame-Quelle (default: Stream, sonst lokaler Grab)
+            detector: Change-Detector (default: Pyramiden-Modus 1/4,
+                      min_region_size=VERSION_MIN_REGION_SIZE)
+            ocr: Async OCR eines (H, W, 3)-Crops -> Token-Dicts relativ zum Crop
+                 (default: pytesseract)
+            uia: Liefert den UIA-Snapshot des Vordergrundfensters
+                 (default: UIASnapshotCache.get_foreground)
+            interval: Poll-Intervall des Hintergrund-Betriebs in Sekunden
+            ocr_padding: Pixel um Dirty Regions, die mit-gelesen werden
+        """
+        self.monitor_id = monitor_id
+        self.source = source or default_source(monitor_id)
+        self.detector = detector or ChangeDetector(
+            pyramid_scale=4, min_region_size=VERSION_MIN_REGION_SIZE
+        )
+        self._ocr = ocr or tesseract_tokens
+        self._uia = uia
+        self.interval = interval
+        self.ocr_padding = ocr_padding
+
+        # Zustand
+        self.version = 0
+        self.frame: Optional[np.ndarray] = None
+        self._version_frame: Optional[np.ndarray] = None  # Frame der letzten Version
+        self.timestamp: Optional[float] = None
+        self.dirty_regions: List[ChangeRegion] = []  # der letzten Änderung
+        self.last_event: Optional[ScreenStateEvent] = None
+        self._refreshed_at = 0.0
+
+        # Abgeleitete Daten
+        self._tokens: List[OCRToken] = []
+        self._pending_ocr: List[Box] = []  # noch nicht gelesene Dirty Regions
+        self._uia_snapshot: Any = None
+        self._uia_version = -1
+        self._dataframe: Any = None
+        self._dataframe_version = -1
+
+        # Events
+        self._subscribers: Dict[str, Callable[[ScreenStateEvent], None]] = {}
+        self._changed: Optional[asyncio.Event] = None
+
+        # Hintergrund-Betrieb
+        self._task: Optional[asyncio.Task] = None
+        self._frame_event: Optional[asyncio.Event] = None
+        self._listener_id: Optional[str] = None
+
+        self.stats: Dict[str, int] = {
+            "refreshes": 0,
+            "refreshes_reused": 0,
+            "frames": 0,
+            "changes": 0,
+            "ocr_calls": 0,
+            "ocr_pixels": 0,
+            "ocr_tokens_reused": 0,
+            "uia_walks": 0,
+            "uia_reused": 0,
+            "dataframe_builds": 0,
+        }
+
+    # ==================== Frames ====================
+
+    @property
+    def available(self) -> bool:
+        """True sobald ein Frame vorliegt."""
+        return self.frame is not None
+
+    async def refresh(self, max_age: float = 0.0) -> bool:
+        """
+        Holt einen Frame von der Quelle und übernimmt ihn.
+
+        Args:
+            max_age: Ein Refresh, der jünger ist, wird wiederverwendet
+                     (mehrere Agents im selben Schritt grabben nur einmal)
+
+        Returns:
+            True wenn der Zustand aktuell ist (Frame vorhanden)
+        """
+        now = time.time()
+        if self.frame is not None and now - self._refreshed_at < max_age:
+            self.stats["refreshes_reused"] += 1
+            return True
+        self.stats["refreshes"] += 1
+        try:
+            grabbed = await asyncio.to_thread(self.source, None)
+        except Exception as e:
+            logger.debug(f"Screen state source failed: {e}")
+            return False
+        if grabbed is None:
+            return False
+        self._refreshed_at = now
+        timestamp, frame = grabbed
+        if timestamp != self.timestamp or self.frame is None:
+            self.ingest(frame, timestamp)
+        return True
+
+    def ingest(
+        self, frame: np.ndarray, timestamp: Optional[float] = None
+    ) -> Optional[ScreenStateEvent]:
+        """
+        Übernimmt einen neuen Frame und aktualisiert Dirty Regions.
+
+        Returns:
+            ScreenStateEvent wenn sich der Screen geändert hat, sonst None
+        """
+        previous = self._version_frame
+        self.frame = frame
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.stats["frames"] += 1
+
+        h, w = frame.shape[:2]
+        if previous is None or previous.shape != frame.shape:
+            # Erster Frame / Auflösungswechsel: alles ist dirty
+            regions: List[ChangeRegion] = []
+            boxes = [(0, 0, w, h)]
+            change_pct = 100.0
+            self._tokens = []
+            self._pending_ocr = []
+        else:
+            result = self.detector.detect_changes_arrays(previous, frame)
+            if not result.changed:
+                self.dirty_regions = []
+                return None
+            regions = result.regions
+            boxes = [(r.x, r.y, r.width, r.height) for r in regions]
+            change_pct = result.total_change_percentage
+
+        self._mark_dirty(boxes, w, h)
+        self.dirty_regions = regions
+        self._version_frame = frame
+        self.version += 1
+        self.stats["changes"] += 1
+
+        event = ScreenStateEvent(
+            monitor_id=self.monitor_id,
+            version=self.version,
+            timestamp=self.timestamp,
+            regions=regions,
+            change_percentage=change_pct,
+        )
+        self.last_event = event
+        self._notify(event)
+        return event
+
+    def _mark_dirty(self, boxes: List[Box], w: int, h: int) -> None:
+        """Verwirft OCR-Tokens in geänderten Bereichen und merkt sie zum Lesen vor."""
+        pad = self.ocr_padding
+        dirty = []
+        for x, y, bw, bh in boxes:
+            x0, y0 = max(0, x - pad), max(0, y - pad)
+            x1, y1 = min(w, x + bw + pad), min(h, y + bh + pad)
+            dirty.append((x0, y0, x1 - x0, y1 - y0))
+
+        kept = []
+        for token in self._tokens:
+            hit = next(
+                (i for i, d in enumerate(dirty) if _intersects(d, token.box)), None
+            )
+            if hit is None:
+                kept.append(token)
+            else:
+                # Angeschnittene Wörter komplett neu lesen
+                dirty[hit] = _union(dirty[hit], token.box)
+        self._tokens = kept
+        self._pending_ocr = _merge_boxes(self._pending_ocr + dirty)
+
+    # ==================== OCR ====================
+
+    @property
+    def pending_ocr(self) -> List[Box]:
+        """Dirty Regions, deren Text noch nicht gelesen wurde."""
+        return list(self._pending_ocr)
+
+    async def ocr_tokens(self, roi: Optional[Roi] = None) -> List[OCRToken]:
+        """
+        OCR-Tokens des aktuellen Frames (optional nur in einer ROI).
+
+        Gelesen werden nur Dirty Regions, die die ROI berühren; alle anderen
+        Tokens stammen aus früheren Versionen.
+        """
+        if self.frame is None:
+            return []
+        roi_box = _roi_box(roi)
+        todo = [
+            box
+            for box in self._pending_ocr
+            if roi_box is None or _intersects(box, roi_box)
+        ]
+        for box in todo:
+            version, frame = self.version, self.frame
+            x, y, bw, bh = box
+            crop = np.ascontiguousarray(frame[y : y + bh, x : x + bw])
+            try:
+                raw = await self._ocr(crop)
+            except Exception as e:
+                logger.warning(f"Screen state OCR failed: {e}")
+                break
+            self.stats["ocr_calls"] += 1
+            self.stats["ocr_pixels"] += bw * bh
+            if self.version != version:
+                # Frame hat sich während der OCR geändert: Box bleibt offen
+                break
+            if box in self._pending_ocr:
+                self._pending_ocr.remove(box)
+            for t in raw:
+                self._tokens.append(
+                    OCRToken(
+                        text=t["text"],
+                        x=int(t["x"]) + x,
+                        y=int(t["y"]) + y,
+                        width=int(t["width"]),
+                        height=int(t["height"]),
+                        confidence=float(t.get("confidence", 0.0)),
+                        version=version,
+                    )
+                )
+
+        tokens = [
+            t for t in self._tokens if roi_box is None or _intersects(t.box, roi_box)
+        ]
+        self.stats["ocr_tokens_reused"] += sum(
+            1 for t in tokens if t.version < self.version
+        )
+        return tokens
+
+    async def text(self, roi: Optional[Roi] = None) -> str:
+        """Gelesener Text (Zeilenweise sortiert) des Frames oder einer ROI."""
+        tokens = sorted(await self.ocr_tokens(roi), key=lambda t: (t.y // 10, t.x))
+        return " ".join(t.text for t in tokens)
+
+    # ==================== UIA ====================
+
+    def uia_snapshot(self) -> Any:
+        """
+        UIA-Snapshot des Vordergrundfensters.
+
+        Innerhalb einer Version wird der Snapshot ohne UIA-Aufruf
+        wiederverwendet; danach entscheidet der UIASnapshotCache (Signatur,
+        Fokus, TTL), ob das Fenster neu gewalkt werden muss.
+        """
+        if self._uia_version == self.version and self._uia_snapshot is not None:
+            self.stats["uia_reused"] += 1
+            return self._uia_snapshot
+        snapshot = None
+        try:
+            if self._uia is not None:
+                snapshot = self._uia()
+            else:
+                cache = _try_uia_snapshot_cache()
+                snapshot = cache.get_foreground() if cache is not None else None
+        except Exception as e:
+            logger.debug(f"Screen state UIA snapshot failed: {e}")
+        self.stats["uia_walks"] += 1
+        self._uia_snapshot = snapshot
+        self._uia_version = self.version
+        return snapshot
+
+    def window_title(self) -> Optional[str]:
+        """Titel des Vordergrundfensters (Name des UIA-Wurzelknotens)."""
+        snapshot = self.uia_snapshot()
+        for entry in getattr(snapshot, "text_entries", None) or []:
+            if entry.get("depth") == 0:
+                return entry.get("text")
+        return None
+
+    # ==================== AgentDataFrame ====================
+
+    async def elements(self) -> List[Dict[str, Any]]:
+        """Element-Zeilen (OCR-Tokens + UIA-Controls) im AgentDataFrame-Format."""
+        rows: List[Dict[str, Any]] = []
+        for i, token in enumerate(await self.ocr_tokens()):
+            rows.append(
+                {
+                    "element_id": f"ocr_{i}",
+                    "name": token.text,
+                    "category": "text",
+                    "ocr_text": token.text,
+                    "x": token.x,
+                    "y": token.y,
+                    "width": token.width,
+                    "height": token.height,
+                    "center_x": token.x + token.width // 2,
+                    "center_y": token.y + token.height // 2,
+                    "confidence": token.confidence,
+                }
+            )
+
+        snapshot = self.uia_snapshot()
+        for i, control in enumerate(getattr(snapshot, "actionable", None) or []):
+            bounds = control.get("bounds") or {}
+            x, y = bounds.get("left", 0), bounds.get("top", 0)
+            width, height = bounds.get("width", 0), bounds.get("height", 0)
+            control_type = control.get("control_type", "")
+            rows.append(
+                {
+                    "element_id": f"uia_{i}",
+                    "name": control.get("name", ""),
+                    "category": control_type.replace("Control", "").lower()
+                    or "unknown",
+                    "ocr_text": control.get("name", ""),
+                    "x": x,
+                    "y": y,
+                    "width": width,
+                    "height": height,
+                    "center_x": x + width // 2,
+                    "center_y": y + height // 2,
+                    "confidence": 1.0,
+                }
+            )
+        return rows
+
+    async def dataframe(self) -> Optional["AgentDataFrame"]:
+        """AgentDataFrame der aktuellen Version (None ohne pandas)."""
+        if not HAS_AGENT_DF:
+            return None
+        if self._dataframe_version == self.version and self._dataframe is not None:
+            return self._dataframe
+        version = self.version
+        self._dataframe = AgentDataFrame.from_elements(await self.elements())
+        self._dataframe_version = version
+        self.stats["dataframe_builds"] += 1
+        return self._dataframe
+
+    # ==================== Events ====================
+
+    def subscribe(self, callback: Callable[[ScreenStateEvent], None]) -> str:
+        """Registriert einen Callback für Change-Events."""
+        subscription_id = f"state_{uuid.uuid4().hex[:10]}"
+        self._subscribers[subscription_id] = callback
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: str) -> None:
+        self._subscribers.pop(subscription_id, None)
+
+    def _notify(self, event: ScreenStateEvent) -> None:
+        for subscription_id, callback in list(self._subscribers.items()):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"Screen state subscriber {subscription_id} error: {e}")
+        if self._changed is not None:
+            # Alle Wartenden wecken, neue warten auf das nächste Event
+            self._changed.set()
+            self._changed = None
+
+    async def wait_for_change(
+        self, since_version: Optional[int] = None, timeout: Optional[float] = None
+    ) -> Optional[ScreenStateEvent]:
+        """
+        Wartet auf die nächste Version (oder eine neuere als ``since_version``).
+
+        Returns:
+            Das Event, oder None bei Timeout
+        """
+        if since_version is not None and self.version > since_version:
+            return self.last_event
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.last_event
+
+    # ==================== Hintergrund-Betrieb ====================
+
+    async def start(self) -> None:
+        """Startet die Pflege im Hintergrund (Stream-Listener + Poll-Fallback)."""
+        if self._task is not None and not self._task.done():
+            return
+        loop = asyncio.get_running_loop()
+        self._frame_event = asyncio.Event()
+        try:
+            from stream_frame_cache import StreamFrameCache
+
+            frame_event = self._frame_event
+
+            def on_frame(monitor_id: int, frame) -> None:
+                # Aufruf aus dem Thread des WebSocket-Handlers
+                if monitor_id == self.monitor_id:
+                    loop.call_soon_threadsafe(frame_event.set)
+
+            self._listener_id = f"screen_state_{self.monitor_id}"
+            StreamFrameCache.add_listener(self._listener_id, on_frame)
+        except ImportError:
+            self._listener_id = None
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Screen state service started (monitor {self.monitor_id})")
+
+    async def stop(self) -> None:
+        if self._listener_id is not None:
+            try:
+                from stream_frame_cache import StreamFrameCache
+
+                StreamFrameCache.remove_listener(self._listener_id)
+            except ImportError:
+                pass
+            self._listener_id = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Neue Stream-Frames wecken sofort, sonst im Intervall pollen
+                await asyncio.wait_for(self._frame_event.wait(), timeout=self.interval)
+                self._frame_event.clear()
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Screen state refresh error: {e}")
+
+    # ==================== Utilities ====================
+
+    def get_state(self) -> Dict[str, Any]:
+        """Kompakte Zusammenfassung (ohne Pixel) für Logging / Tools."""
+        return {
+            "monitor_id": self.monitor_id,
+            "version": self.version,
+            "timestamp": self.timestamp,
+            "dimensions": (
+                (self.frame.shape[1], self.frame.shape[0])
+                if self.frame is not None
+                else None
+            ),
+            "dirty_regions": [r.to_dict() for r in self.dirty_regions],
+            "pending_ocr": self.pending_ocr,
+            "token_count": len(self._tokens),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["version"] = self.version
+        return stats
+
+
+# Singletons pro Monitor
+_services: Dict[int, ScreenStateService] = {}
+
+
+def get_screen_state_service(monitor_id: int = 0) -> ScreenStateService:
+    """Gibt den Screen State Service eines Monitors zurück."""
+    if monitor_id not in _services:
+        _services[monitor_id] = ScreenStateService(monitor_id=monitor_id)
+    return _services[monitor_id]
+
+
+def reset_screen_state_services() -> None:
+    """Verwirft alle Services (Tests, Monitor-Wechsel)."""
+    _services.clear()
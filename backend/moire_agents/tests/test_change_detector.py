@@ -0,0 +1,92 @@
+"""
+Tests für den ChangeDetector (validation/change_detector.py)
+
+Tests:
+1. uint8-Differenz ist in beide Richtungen korrekt (kein Überlauf)
+2. Pyramiden-Modus findet dieselben Regionen wie der Vollbild-Vergleich
+3. ROI begrenzt den Vergleich, Koordinaten bleiben Frame-Koordinaten
+4. Vektorisierte Block-Suche
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from validation.change_detector import ChangeDetector, _abs_diff
+
+
+def _frame(h=540, w=960):
+    return np.full((h, w, 3), 200, dtype=np.uint8)
+
+
+def _boxes(result):
+    return sorted((r.x, r.y, r.width, r.height) for r in result.regions)
+
+
+class TestChangeDetector(unittest.TestCase):
+    def test_abs_diff_uint8_both_directions(self):
+        a = np.array([[[10, 250, 0]]], dtype=np.uint8)
+        b = np.array([[[250, 10, 0]]], dtype=np.uint8)
+        self.assertEqual(_abs_diff(a, b)[0, 0], 240)
+        self.assertEqual(_abs_diff(b, a)[0, 0], 240)
+        self.assertEqual(_abs_diff(a, b).dtype, np.uint8)
+
+    def test_pyramid_matches_full_resolution(self):
+        before, after = _frame(), _frame()
+        after[100:180, 300:500] = 0  # dialog
+        after[400:420, 37:90] = 255  # typed text, not tile aligned
+
+        full = ChangeDetector().detect_changes_arrays(before, after)
+        for scale in (4, 8):
+            pyramid = ChangeDetector(pyramid_scale=scale).detect_changes_arrays(
+                before, after
+            )
+            self.assertEqual(_boxes(pyramid), _boxes(full))
+            self.assertAlmostEqual(
+                pyramid.total_change_percentage, full.total_change_percentage
+            )
+        self.assertEqual(_boxes(full), [(37, 400, 53, 20), (300, 100, 200, 80)])
+
+    def test_pyramid_no_change(self):
+        detector = ChangeDetector(pyramid_scale=4)
+        result = detector.detect_changes_arrays(_frame(), _frame())
+        self.assertFalse(result.changed)
+        self.assertEqual(result.total_change_percentage, 0)
+
+    def test_roi_limits_comparison(self):
+        before, after = _frame(), _frame()
+        after[10:30, 10:30] = 0  # outside the ROI
+        after[300:340, 600:660] = 0
+        roi = {"x": 500, "y": 250, "width": 300, "height": 200}
+        for scale in (1, 4):
+            result = ChangeDetector(pyramid_scale=scale).detect_changes_arrays(
+                before, after, roi=roi
+            )
+            self.assertEqual(len(result.regions), 1)
+            region = result.regions[0]
+            self.assertEqual((region.x, region.y), (600, 300))
+            self.assertEqual((region.width, region.height), (60, 40))
+
+    def test_diff_image_in_pyramid_mode(self):
+        before, after = _frame(), _frame()
+        after[100:180, 300:500] = 0
+        result = ChangeDetector(pyramid_scale=4).detect_changes_arrays(
+            before, after, return_diff_image=True
+        )
+        self.assertTrue(result.diff_image.startswith(b"\x89PNG"))
+
+    def test_contiguous_blocks(self):
+        detector = ChangeDetector()
+        arr = np.array([1, 1, 0, 0, 1, 0, 1, 1, 1], dtype=bool)
+        self.assertEqual(
+            detector._find_contiguous_blocks(arr), [(0, 2), (4, 5), (6, 9)]
+        )
+        self.assertEqual(detector._find_contiguous_blocks(np.zeros(4, bool)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests für den Perceptual Crop Index (worker_bridge/crop_index.py)
+
+Tests:
+1. Lookup innerhalb des Hamming-Radius, nicht außerhalb
+2. OCR-Text und Seitenverhältnis gehören zum Schlüssel
+3. LRU-Verdrängung hält die Band-Buckets konsistent
+4. classify_batch: Index-Treffer + Batch-Dedup, nur neue Crops ans Modell
+"""
+
+import asyncio
+import base64
+import os
+import sys
+import unittest
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from worker_bridge.crop_index import (HAS_PIL, CropSignature,
+                                      PerceptualCropIndex, rebind_result)
+
+
+def _sig(phash, text="", aspect=1.0):
+    return CropSignature(phash=phash, text_key=text, aspect=aspect)
+
+
+@dataclass
+class FakeIcon:
+    box_id: str
+    crop_base64: str
+    ocr_text: Optional[str] = None
+    request_id: Optional[str] = None
+
+
+@dataclass
+class FakeResult:
+    box_id: str
+    category: str
+    request_id: Optional[str] = None
+    processing_time_ms: float = 12.0
+    reasoning: Optional[str] = None
+
+
+class TestPerceptualCropIndex(unittest.TestCase):
+    def test_radius(self):
+        index = PerceptualCropIndex(radius=4)
+        index.add(_sig(0b1111), "button")
+        self.assertEqual(index.lookup(_sig(0b1110)), ("button", 1))
+        self.assertEqual(index.lookup(_sig(0b1111 | (0b111 << 40))), ("button", 3))
+        self.assertIsNone(index.lookup(_sig(0b0000 | (0b11111 << 40))))
+
+    def test_text_and_aspect_are_part_of_key(self):
+        index = PerceptualCropIndex()
+        index.add(_sig(42, text="ok"), "ok-button")
+        self.assertIsNone(index.lookup(_sig(42, text="abbrechen")))
+        self.assertIsNone(index.lookup(_sig(42, text="ok", aspect=3.0)))
+        self.assertEqual(
+            index.lookup(_sig(42, text="ok", aspect=1.05)), ("ok-button", 0)
+        )
+
+    def test_eviction_cleans_bands(self):
+        index = PerceptualCropIndex(max_entries=2)
+        far_apart = (0, (1 << 64) - 1, 0xFFFFFFFF)
+        for value in far_apart:
+            index.add(_sig(value), value)
+        self.assertEqual(len(index), 2)
+        self.assertIsNone(index.lookup(_sig(0)))
+        self.assertEqual(index.lookup(_sig(0xFFFFFFFF)), (0xFFFFFFFF, 0))
+        total = sum(len(bucket) for band in index._bands for bucket in band.values())
+        self.assertEqual(total, 2 * 8)
+
+    def test_rebind_result(self):
+        cached = FakeResult("a", "icon", request_id="r1", reasoning="LLM")
+        clone = rebind_result(cached, FakeIcon("b", "", request_id="r2"), 2)
+        self.assertEqual(
+            (clone.box_id, clone.request_id, clone.processing_time_ms), ("b", "r2", 0.0)
+        )
+        self.assertEqual(clone.reasoning, "[phash d=2] LLM")
+        self.assertEqual(cached.box_id, "a")
+
+
+@unittest.skipUnless(HAS_PIL, "PIL not installed")
+class TestClassifyBatch(unittest.TestCase):
+    def _crop(self, color, size=(24, 24), dot=None):
+        from PIL import Image
+
+        image = Image.new("RGB", size, color)
+        image.paste((0, 0, 0), (4, 4, 12, 12))
+        if dot:
+            image.putpixel(dot, (255, 255, 255))
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        return base64.b64encode(buffer.getvalue()).decode()
+
+    def test_only_novel_crops_reach_the_model(self):
+        index = PerceptualCropIndex()
+        sent = []
+
+        async def classify(icons):
+            sent.extend(i.box_id for i in icons)
+            return [FakeResult(i.box_id, "icon") for i in icons]
+
+        def run(icons):
+            return asyncio.run(
+                index.classify_batch(
+                    icons,
+                    classify=classify,
+                    rebind=rebind_result,
+                    cacheable=lambda r: True,
+                    key=lambda i: (i.crop_base64, i.ocr_text),
+                )
+            )
+
+        save = self._crop((200, 200, 200))
+        near_save = self._crop((200, 200, 200), dot=(20, 20))
+        scan1 = [
+            FakeIcon("s1", save),
+            FakeIcon("s2", near_save),
+            FakeIcon("t1", save, ocr_text="Datei"),
+        ]
+        results = run(scan1)
+        self.assertEqual(sent, ["s1", "t1"])
+        self.assertEqual([r.box_id for r in results], ["s1", "s2", "t1"])
+
+        sent.clear()
+        results = run(
+            [FakeIcon("x1", near_save), FakeIcon("x2", save, ocr_text="Datei")]
+        )
+        self.assertEqual(sent, [])
+        self.assertEqual([r.box_id for r in results], ["x1", "x2"])
+        self.assertEqual(index.get_stats()["index_hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,193 @@
+"""
+Tests für den EmbeddingService (core/embedding_service.py)
+
+Läuft ohne sentence-transformers: ein Fake-Modell liefert deterministische
+normalisierte Vektoren und zählt die Forward-Passes.
+
+Tests:
+1. Wiederholte Texte kommen aus dem Cache, Duplikate nur einmal encodiert
+2. LRU verdrängt den am längsten unbenutzten Eintrag
+3. Gleichzeitige aencode()-Aufrufe → ein Forward-Pass
+4. max_batch_size erzwingt einen sofortigen Flush
+5. Fehler im Modell erreichen alle wartenden Aufrufer
+6. warmup() setzt ready, ready selbst lädt kein Modell
+7. Ohne Modell liefert jede Methode None
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+import threading
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.embedding_service import EmbeddingService
+
+
+class FakeModel:
+    """Deterministic unit vectors derived from the text hash."""
+
+    def __init__(self, dim: int = 16):
+        self.dim = dim
+        self.calls = []
+        self.fail = False
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=True, **kw):
+        if self.fail:
+            raise RuntimeError("model exploded")
+        self.calls.append(list(texts))
+        out = []
+        for t in texts:
+            seed = int(hashlib.sha1(t.encode()).hexdigest()[:8], 16)
+            v = np.random.default_rng(seed).standard_normal(self.dim)
+            out.append(v / np.linalg.norm(v))
+        return np.stack(out)
+
+
+class CountingLoader:
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.model
+
+
+def _service(model=None, **kw):
+    model = model if model is not None else FakeModel()
+    loader = CountingLoader(model)
+    return EmbeddingService(loader, **kw), model, loader
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def test_cache_hits_and_dedup(self):
+        service, model, _ = _service()
+        first = service.encode(["a", "b", "a"])
+        self.assertEqual(model.calls, [["a", "b"]])
+        np.testing.assert_allclose(first[0], first[2])
+
+        again = service.encode(["b", "a"])
+        self.assertEqual(len(model.calls), 1)
+        np.testing.assert_allclose(again[1], first[0])
+        self.assertEqual(service.get_stats()["hits"], 2)
+
+    def test_lru_evicts_least_recently_used(self):
+        service, model, _ = _service(cache_size=2)
+        service.encode(["a"])
+        service.encode(["b"])
+        service.encode(["a"])  # touch a → b is now the oldest
+        service.encode(["c"])
+        self.assertEqual(service.get_stats()["cached"], 2)
+        service.encode(["a"])
+        self.assertEqual(len(model.calls), 3)
+        service.encode(["b"])
+        self.assertEqual(model.calls[-1], ["b"])
+
+    def test_cosine_of_identical_texts(self):
+        service, _, _ = _service()
+        self.assertAlmostEqual(service.cosine("same", "same"), 1.0, places=5)
+
+
+class TestEmbeddingBatching(unittest.TestCase):
+    def test_concurrent_callers_share_one_forward_pass(self):
+        service, model, _ = _service(batch_window_ms=20)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(service.aencode([f"text {i}", "shared"]) for i in range(5))
+            )
+
+        results = asyncio.run(scenario())
+        self.assertEqual(len(model.calls), 1)
+        self.assertEqual(
+            sorted(model.calls[0]), sorted([f"text {i}" for i in range(5)] + ["shared"])
+        )
+        for vecs in results:
+            np.testing.assert_allclose(vecs[1], results[0][1])
+        self.assertEqual(service.stats["batched_requests"], 5)
+
+    def test_full_batch_flushes_without_waiting(self):
+        service, model, _ = _service(batch_window_ms=10_000, max_batch_size=4)
+
+        async def scenario():
+            return await asyncio.wait_for(
+                asyncio.gather(
+                    service.aencode(["a", "b"]), service.aencode(["c", "d"])
+                ),
+                timeout=2.0,
+            )
+
+        asyncio.run(scenario())
+        self.assertEqual(len(model.calls), 1)
+
+    def test_cached_texts_skip_the_batch(self):
+        service, model, _ = _service()
+        service.encode(["warm"])
+
+        async def scenario():
+            return await service.aencode(["warm"])
+
+        asyncio.run(scenario())
+        self.assertEqual(len(model.calls), 1)
+
+    def test_model_error_reaches_every_waiter(self):
+        service, model, _ = _service(batch_window_ms=10)
+        model.fail = True
+
+        async def scenario():
+            return await asyncio.gather(
+                service.aencode(["x"]), service.aencode(["y"]), return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    def test_model_resolved_off_the_loop(self):
+        threads = []
+
+        def loader():
+            threads.append(threading.current_thread())
+            return FakeModel()
+
+        service = EmbeddingService(loader, batch_window_ms=1)
+        asyncio.run(service.aencode(["x"]))
+        self.assertTrue(threads)
+        self.assertNotIn(threading.main_thread(), threads)
+
+
+class TestEmbeddingWarmup(unittest.TestCase):
+    def test_ready_does_not_load(self):
+        service, _, loader = _service()
+        self.assertFalse(service.ready)
+        self.assertEqual(loader.calls, 0)
+
+    def test_warmup_marks_ready(self):
+        service, model, _ = _service()
+        service.warmup(background=False)
+        self.assertTrue(service.ready)
+        self.assertEqual(model.calls, [["warmup"]])
+
+    def test_background_warmup(self):
+        service, _, _ = _service()
+        service.warmup(background=True)
+        for t in threading.enumerate():
+            if t.name == "embedding-warmup":
+                t.join(timeout=2.0)
+        self.assertTrue(service.ready)
+
+    def test_no_model(self):
+        service = EmbeddingService(lambda: None)
+        service.warmup(background=False)
+        self.assertFalse(service.ready)
+        self.assertIsNone(service.encode(["a"]))
+        self.assertIsNone(service.cosine("a", "b"))
+        self.assertIsNone(asyncio.run(service.aencode(["a"])))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,132 @@
+"""
+Tests für den LLM Response-Cache (core/llm_cache.py)
+
+Tests:
+1. Schlüssel: Whitespace-normalisiert, Bilder über ihren Hash
+2. Nur registrierte Call-Sites werden gecacht (opt-in)
+3. TTL pro Call-Site
+4. SQLite-Store überlebt eine neue Cache-Instanz
+5. Transport: Cache-Treffer überspringt das Netzwerk, Hit-Rate pro Site
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.llm_cache import LLMResponseCache
+from core.llm_transport import LLMTransport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _payload(text="Hallo  Welt", image="AAAA", model="m1"):
+    return {
+        "model": model,
+        "temperature": 0.0,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": f"data:image/png;base64,{image}"},
+                    },
+                    {"type": "text", "text": text},
+                ],
+            }
+        ],
+    }
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "cache.db")
+        self.clock = FakeClock()
+        self.cache = LLMResponseCache(
+            db_path=self.db,
+            site_ttls={"classification": 60},
+            enabled=True,
+            clock=self.clock,
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_normalization(self):
+        key = LLMResponseCache.make_key
+        self.assertEqual(key(_payload("Hallo  Welt ")), key(_payload("Hallo Welt")))
+        self.assertNotEqual(key(_payload(image="AAAA")), key(_payload(image="BBBB")))
+        self.assertNotEqual(key(_payload(model="m1")), key(_payload(model="m2")))
+
+    def test_opt_in_sites_only(self):
+        key = self.cache.make_key(_payload())
+        self.cache.put("unregistered", key, {"x": 1})
+        self.assertIsNone(self.cache.get("unregistered", key))
+        self.assertNotIn("unregistered", self.cache.get_stats()["sites"])
+
+    def test_ttl_expiry(self):
+        key = self.cache.make_key(_payload())
+        self.cache.put("classification", key, {"x": 1})
+        self.clock.now += 30
+        self.assertEqual(self.cache.get("classification", key), {"x": 1})
+        self.clock.now += 31
+        self.assertIsNone(self.cache.get("classification", key))
+
+    def test_sqlite_survives_new_instance(self):
+        key = self.cache.make_key(_payload())
+        self.cache.put("classification", key, {"choices": [1]})
+        fresh = LLMResponseCache(
+            db_path=self.db,
+            site_ttls={"classification": 60},
+            enabled=True,
+            clock=self.clock,
+        )
+        self.assertEqual(fresh.get("classification", key), {"choices": [1]})
+        self.assertEqual(fresh.get_stats()["sites"]["classification"]["disk_hits"], 1)
+
+    def test_transport_hit_skips_network(self):
+        calls = []
+
+        async def sender(url, headers, payload, timeout):
+            calls.append(payload)
+            return (
+                200,
+                {},
+                json.dumps({"choices": [{"message": {"content": "button"}}]}),
+            )
+
+        transport = LLMTransport(sender=sender, cache=self.cache)
+
+        async def run():
+            first = await transport.chat_completions(
+                _payload(), cache_site="classification"
+            )
+            second = await transport.chat_completions(
+                _payload(), cache_site="classification"
+            )
+            third = await transport.chat_completions(_payload())  # no site → no cache
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 2)
+        stats = transport.get_stats()["cache"]["sites"]["classification"]
+        self.assertEqual(
+            (stats["hits"], stats["misses"], stats["hit_rate"]), (1, 1, 0.5)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,227 @@
+"""
+Tests für den geteilten LLM-Transport (core/llm_transport.py)
+
+Läuft ohne Netzwerk: ein Fake-Sender ersetzt den HTTP-Roundtrip.
+
+Tests:
+1. Erfolgreicher Call liefert JSON und zählt Tokens
+2. Retry bei 429/5xx, danach Erfolg
+3. Kein Retry bei 4xx (außer 429) → LLMTransportError
+4. Retries erschöpft → LLMTransportError mit letztem Status
+5. Parallelität pro Modell begrenzt
+6. Neuer Event-Loop schließt den alten Connection-Pool
+7. OpenRouterClient.close() lässt den geteilten Transport offen
+8. Kein Retry nach Timeout
+9. timeout begrenzt den ganzen Call inkl. Retries; ist er abgelaufen,
+   wird nicht mehr gesendet (0 hieße bei aiohttp "kein Timeout")
+"""
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.llm_transport import LLMTransport, LLMTransportError
+
+
+def _ok(tokens=10):
+    return (
+        200,
+        {},
+        json.dumps(
+            {
+                "choices": [{"message": {"content": "hi"}}],
+                "usage": {
+                    "prompt_tokens": tokens,
+                    "completion_tokens": 1,
+                    "total_tokens": tokens + 1,
+                },
+            }
+        ),
+    )
+
+
+class FakeSender:
+    def __init__(self, responses, delay=0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, url, headers, payload, timeout):
+        self.calls.append((url, headers, payload))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return self.responses.pop(0) if self.responses else _ok()
+
+
+def _transport(sender, **kwargs):
+    kwargs.setdefault("backoff_base_s", 0.001)
+    return LLMTransport(base_url="http://mock/api", sender=sender, **kwargs)
+
+
+class TestLLMTransport(unittest.TestCase):
+    def test_success_and_token_metrics(self):
+        sender = FakeSender([_ok(tokens=40)])
+        transport = _transport(sender)
+        data = asyncio.run(
+            transport.chat_completions(
+                {"model": "m1", "messages": []}, api_key="k", headers={"X-Title": "t"}
+            )
+        )
+        self.assertEqual(data["choices"][0]["message"]["content"], "hi")
+        url, headers, _ = sender.calls[0]
+        self.assertEqual(url, "http://mock/api/chat/completions")
+        self.assertEqual(headers["Authorization"], "Bearer k")
+        self.assertEqual(headers["X-Title"], "t")
+        stats = transport.get_stats()
+        self.assertEqual(stats["models"]["m1"]["prompt_tokens"], 40)
+        self.assertEqual(stats["total_tokens"], 41)
+
+    def test_retry_on_429_and_5xx(self):
+        sender = FakeSender(
+            [(429, {"Retry-After": "0"}, "slow down"), (503, {}, "busy"), _ok()]
+        )
+        transport = _transport(sender)
+        asyncio.run(transport.chat_completions({"model": "m1"}))
+        self.assertEqual(len(sender.calls), 3)
+        stats = transport.get_stats()["models"]["m1"]
+        self.assertEqual(
+            (stats["requests"], stats["errors"], stats["retries"]), (3, 2, 2)
+        )
+
+    def test_no_retry_on_client_error(self):
+        sender = FakeSender([(400, {}, "bad request"), _ok()])
+        transport = _transport(sender)
+        with self.assertRaises(LLMTransportError) as ctx:
+            asyncio.run(transport.chat_completions({"model": "m1"}))
+        self.assertEqual(ctx.exception.status, 400)
+        self.assertEqual(len(sender.calls), 1)
+
+    def test_retries_exhausted(self):
+        sender = FakeSender([(502, {}, "bad gateway")] * 5)
+        transport = _transport(sender, max_retries=2)
+        with self.assertRaises(LLMTransportError) as ctx:
+            asyncio.run(transport.chat_completions({"model": "m1"}))
+        self.assertEqual(ctx.exception.status, 502)
+        self.assertEqual(len(sender.calls), 3)
+
+    def test_concurrency_limited_per_model(self):
+        sender = FakeSender([], delay=0.01)
+        transport = _transport(sender, max_concurrency_per_model=2)
+
+        async def run():
+            await asyncio.gather(
+                *(transport.chat_completions({"model": "m1"}) for _ in range(6)),
+                *(transport.chat_completions({"model": "m2"}) for _ in range(2)),
+            )
+
+        asyncio.run(run())
+        self.assertEqual(len(sender.calls), 8)
+        # 2 für m1 + 2 für m2 gleichzeitig
+        self.assertEqual(sender.max_active, 4)
+
+    def test_no_retry_on_timeout(self):
+        calls = []
+
+        async def sender(url, headers, payload, timeout):
+            calls.append(timeout)
+            raise asyncio.TimeoutError()
+
+        transport = _transport(sender, max_retries=3)
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(transport.chat_completions({"model": "m1"}, timeout=5.0))
+        self.assertEqual(len(calls), 1)
+        self.assertLessEqual(calls[0], 5.0)
+
+    def test_connection_error_still_retried(self):
+        calls = []
+
+        async def sender(url, headers, payload, timeout):
+            calls.append(timeout)
+            if len(calls) == 1:
+                raise ConnectionResetError("reset")
+            return _ok()
+
+        asyncio.run(_transport(sender).chat_completions({"model": "m1"}))
+        self.assertEqual(len(calls), 2)
+
+    def test_deadline_caps_retries(self):
+        timeouts = []
+
+        async def sender(url, headers, payload, timeout):
+            timeouts.append(timeout)
+            await asyncio.wait_for(asyncio.sleep(0.05), timeout)
+            return (503, {}, "busy")
+
+        transport = _transport(sender, max_retries=10, backoff_base_s=0.05)
+        loop_time = []
+
+        async def run():
+            t0 = asyncio.get_running_loop().time()
+            try:
+                await transport.chat_completions({"model": "m1"}, timeout=0.3)
+            finally:
+                loop_time.append(asyncio.get_running_loop().time() - t0)
+
+        with self.assertRaises((LLMTransportError, asyncio.TimeoutError)):
+            asyncio.run(run())
+        # The sender honors its timeout: the call ends at the deadline
+        self.assertLess(loop_time[0], 0.3 + 0.05)
+        self.assertLess(len(timeouts), 11)
+        # Each attempt only gets what is left of the deadline.
+        self.assertTrue(all(0 < b < a for a, b in zip(timeouts, timeouts[1:])))
+
+    def test_expired_deadline_is_not_sent(self):
+        sender = FakeSender([])
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(
+                _transport(sender).chat_completions({"model": "m1"}, timeout=0.0)
+            )
+        self.assertEqual(sender.calls, [])
+
+    def test_new_loop_closes_old_pool(self):
+        class FakePool:
+            closed = False
+
+            async def close(self):
+                self.closed = True
+
+        transport = _transport(FakeSender([]))
+        asyncio.run(transport.chat_completions({"model": "m1"}))
+        old = FakePool()
+        transport._client = old
+        transport._backend = "aiohttp"
+        asyncio.run(transport.chat_completions({"model": "m1"}))
+        self.assertTrue(old.closed)
+        self.assertIsNone(transport._client)
+
+    def test_client_close_keeps_shared_transport(self):
+        from core import llm_transport
+        from core.openrouter_client import OpenRouterClient
+
+        shared = _transport(FakeSender([]))
+        original, llm_transport._transport = llm_transport._transport, shared
+        try:
+            closed = []
+
+            async def close():
+                closed.append(True)
+
+            shared.close = close
+            client = OpenRouterClient(api_key="k")
+            asyncio.run(client.close())
+            self.assertEqual(closed, [])
+            self.assertIs(client.transport, shared)
+        finally:
+            llm_transport._transport = original
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
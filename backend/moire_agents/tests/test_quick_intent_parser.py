@@ -0,0 +1,87 @@
+"""
+Tests für QuickIntentParser / PatternAutomaton (voice/intent_parser.py)
+
+Tests:
+1. Längstes passendes Pattern gewinnt
+2. Exact-Only Patterns matchen nur den ganzen Befehl
+3. App-Öffnen Patterns: max. 5 Wörter, keine komplexen Sätze
+4. Sonstige Patterns: max. 6 Wörter
+5. add_pattern() baut den Automaten neu
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from voice.intent_parser import (Action, ActionType, PatternAutomaton,
+                                 QuickIntentParser)
+
+
+def _wait(tag):
+    return [Action(ActionType.WAIT, {"tag": tag})]
+
+
+class TestPatternAutomaton(unittest.TestCase):
+    def setUp(self):
+        self.automaton = PatternAutomaton(
+            {
+                "scroll": _wait("scroll"),
+                "scroll down": _wait("scroll down"),
+                "save": _wait("save"),
+                "öffne chrome": _wait("chrome"),
+                "chrome": _wait("chrome-short"),
+            }
+        )
+
+    def _match(self, text):
+        text = text.lower().strip()
+        words = text.split()
+        is_complex = len(words) > 4 and any(
+            w in {"in", "nach", "und", "dann"} for w in words
+        )
+        entry = self.automaton.match(text, len(words), is_complex)
+        return entry.pattern if entry else None
+
+    def test_longest_pattern_wins(self):
+        self.assertEqual(self._match("bitte scroll down"), "scroll down")
+        self.assertEqual(self._match("bitte scroll"), "scroll")
+
+    def test_exact_only(self):
+        self.assertEqual(self._match("save"), "save")
+        self.assertIsNone(self._match("save the file"))
+
+    def test_open_app_word_limit_and_complexity(self):
+        self.assertEqual(self._match("öffne chrome"), "öffne chrome")
+        # Complex sentence: the open-app pattern is rejected, the plain
+        # pattern (6-word limit) still applies.
+        self.assertEqual(self._match("öffne chrome und geh dann weiter"), "chrome")
+
+    def test_default_word_limit(self):
+        self.assertEqual(self._match("one two three four five scroll"), "scroll")
+        self.assertIsNone(self._match("one two three four five six scroll"))
+
+    def test_overlapping_patterns(self):
+        automaton = PatternAutomaton(
+            {"he": _wait("he"), "she": _wait("she"), "hers": _wait("hers")}
+        )
+        entry = automaton.match("ushers", 1, False)
+        self.assertEqual(entry.pattern, "hers")
+
+
+class TestQuickIntentParser(unittest.TestCase):
+    def test_add_pattern_recompiles(self):
+        parser = QuickIntentParser()
+        result = asyncio.run(parser.parse("starte meinen editor"))
+        self.assertEqual(result.actions, [])
+
+        parser.add_pattern("Starte meinen Editor", _wait("editor"))
+        result = asyncio.run(parser.parse("Starte meinen Editor"))
+        self.assertEqual(result.context, "Quick pattern: starte meinen editor")
+        self.assertEqual(result.actions[0].params["tag"], "editor")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,183 @@
+"""
+Tests für AudioRingBuffer und RealtimeSpeechToText (voice/speech_to_text.py)
+
+Läuft ohne Mikrofon und ohne Whisper: Audio wird über feed() eingespeist,
+ein Fake-STT zählt die Aufrufe.
+
+Tests:
+1. Ring-Buffer: Wrap-around, Lesen über die Grenze, Überlauf
+2. VAD: Sprache + Stille → ein Utterance inkl. Pre-Roll
+3. VAD: zu kurze Geräusche werden verworfen
+4. VAD: max_utterance_seconds beendet lange Utterances
+5. VAD: Frames werden über mehrere Ticks inkrementell klassifiziert
+6. Partials laufen nie parallel zum finalen Whisper-Aufruf
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from voice.speech_to_text import (AudioRingBuffer, RealtimeSpeechToText,
+                                  TranscriptionResult)
+
+RATE = 16000
+
+
+def _tone(seconds, amplitude=0.2):
+    t = np.arange(int(seconds * RATE), dtype=np.float32) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+class FakeSTT:
+    """Records calls and the peak number of overlapping transcriptions."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def transcribe_array(self, audio, sample_rate=16000):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            self.calls.append(len(audio))
+            return TranscriptionResult(text=f"text{len(self.calls)}")
+        finally:
+            self.active -= 1
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    def test_read_back_without_wrap(self):
+        ring = AudioRingBuffer(10)
+        ring.append(np.arange(4, dtype=np.float32))
+        np.testing.assert_array_equal(ring.read(0), [0, 1, 2, 3])
+        np.testing.assert_array_equal(ring.read(1, 3), [1, 2])
+        self.assertEqual(ring.oldest, 0)
+
+    def test_wraparound_read_across_boundary(self):
+        ring = AudioRingBuffer(5)
+        ring.append(np.arange(4, dtype=np.float32))
+        ring.append(np.arange(4, 7, dtype=np.float32))
+        self.assertEqual(ring.total_written, 7)
+        self.assertEqual(ring.oldest, 2)
+        np.testing.assert_array_equal(ring.read(0), [2, 3, 4, 5, 6])
+        np.testing.assert_array_equal(ring.read(3, 6), [3, 4, 5])
+
+    def test_append_larger_than_capacity_keeps_tail(self):
+        ring = AudioRingBuffer(4)
+        ring.append(np.arange(10, dtype=np.float32))
+        self.assertEqual(ring.total_written, 10)
+        np.testing.assert_array_equal(ring.read(0), [6, 7, 8, 9])
+
+    def test_empty_and_future_ranges(self):
+        ring = AudioRingBuffer(4)
+        ring.append(np.ones(2, dtype=np.float32))
+        self.assertEqual(len(ring.read(2)), 0)
+        self.assertEqual(len(ring.read(5, 9)), 0)
+
+
+class TestVAD(unittest.TestCase):
+    def _rt(self, **kw):
+        kw.setdefault("partial_interval", None)
+        rt = RealtimeSpeechToText(FakeSTT(), **kw)
+        return rt
+
+    def _run(self, rt, audio):
+        rt.feed(audio)
+        rt._drain_chunks()
+        return rt._run_vad()
+
+    def test_speech_then_silence_endpoints_with_pre_roll(self):
+        rt = self._rt(silence_threshold=0.3, pre_roll=0.2)
+        audio = np.concatenate([_silence(0.6), _tone(0.5), _silence(0.5)])
+        utterance = self._run(rt, audio)
+        self.assertIsNotNone(utterance)
+        # pre-roll + speech + trailing silence up to the endpoint
+        self.assertAlmostEqual(len(utterance) / RATE, 0.2 + 0.5 + 0.3, delta=0.07)
+        self.assertGreater(np.abs(utterance).max(), 0.1)
+
+    def test_short_noise_is_dropped(self):
+        rt = self._rt(silence_threshold=0.2, min_speech_duration=0.3)
+        audio = np.concatenate([_tone(0.1), _silence(0.5)])
+        self.assertIsNone(self._run(rt, audio))
+        self.assertIsNone(rt._speech_start)
+
+    def test_max_utterance_cap(self):
+        rt = self._rt(max_utterance_seconds=1.0, pre_roll=0.0)
+        utterance = self._run(rt, _tone(1.5))
+        self.assertIsNotNone(utterance)
+        self.assertAlmostEqual(len(utterance) / RATE, 1.0, delta=0.05)
+
+    def test_incremental_ticks(self):
+        rt = self._rt(silence_threshold=0.3)
+        audio = np.concatenate([_tone(0.5), _silence(0.6)])
+        results = [self._run(rt, chunk) for chunk in np.array_split(audio, 20)]
+        found = [r for r in results if r is not None]
+        self.assertEqual(len(found), 1)
+        self.assertIsNone(results[-1])
+        # Every complete frame was classified exactly once.
+        self.assertEqual(rt._vad_pos % rt.frame_size, 0)
+        self.assertLess(len(audio) - rt._vad_pos, rt.frame_size)
+
+
+class TestPartials(unittest.TestCase):
+    def test_partial_and_final_never_overlap(self):
+        stt = FakeSTT(delay=0.15)
+        partials, finals = [], []
+        rt = RealtimeSpeechToText(
+            stt,
+            on_transcription=finals.append,
+            on_partial=partials.append,
+            silence_threshold=0.3,
+            partial_interval=0.2,
+        )
+
+        async def scenario():
+            rt._is_listening = True
+            task = asyncio.create_task(rt._process_audio_loop())
+            for chunk in np.array_split(
+                np.concatenate([_tone(1.0), _silence(0.6)]), 40
+            ):
+                rt.feed(chunk)
+                await asyncio.sleep(0.01)
+            for _ in range(100):
+                if finals:
+                    break
+                await asyncio.sleep(0.02)
+            rt._is_listening = False
+            await asyncio.wait_for(task, timeout=2.0)
+
+        asyncio.run(scenario())
+        self.assertEqual(len(finals), 1)
+        self.assertGreaterEqual(len(stt.calls), 2)  # at least one partial ran
+        self.assertEqual(stt.max_active, 1)
+
+    def test_no_partial_while_transcribing(self):
+        rt = RealtimeSpeechToText(
+            FakeSTT(), on_partial=lambda t: None, partial_interval=0.1
+        )
+
+        async def scenario():
+            rt.feed(_tone(0.5))
+            rt._drain_chunks()
+            rt._run_vad()
+            async with rt._transcribe_lock:
+                rt._maybe_partial()
+                return rt._partial_task
+
+        self.assertIsNone(asyncio.run(scenario()))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
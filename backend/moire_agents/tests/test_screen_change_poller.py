@@ -0,0 +1,171 @@
+"""
+Tests für den geteilten Screen-Change-Poller (agents/handoff/screen_description.py)
+
+Läuft ohne Windows: handle_describe_screen wird durch einen Fake ersetzt.
+
+Tests:
+1. Eine Änderung → ein Event pro Subscriber, aber nur ein Redis-Publish
+2. Späte Subscriber bekommen die aktuelle Signatur ohne erneuten Publish
+3. Idle-Screen → Poll-Intervall wächst bis zum Cap
+4. Letzter Unsubscribe beendet den Poller
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import types
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Load the module directly: agents.handoff.__init__ pulls in pyautogui,
+# which cannot be imported on a headless machine.
+_spec = importlib.util.spec_from_file_location(
+    "screen_description",
+    os.path.join(
+        os.path.dirname(__file__), "..", "agents", "handoff", "screen_description.py"
+    ),
+)
+screen_description = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = screen_description
+_spec.loader.exec_module(screen_description)
+
+
+class FakeRuntime:
+    def __init__(self):
+        self.published = []
+
+    async def publish_step_event(self, kind, payload):
+        self.published.append((kind, payload))
+
+
+class FakeScreen:
+    """Stand-in for handle_describe_screen; records when it was polled."""
+
+    def __init__(self, title="Editor"):
+        self.title = title
+        self.calls = []
+
+    async def __call__(self, detail="summary"):
+        self.calls.append(asyncio.get_running_loop().time())
+        return {"active_window": {"title": self.title, "hwnd": 1}, "window_count": 1}
+
+
+class TestSharedPoller(unittest.TestCase):
+    def setUp(self):
+        self.runtime = FakeRuntime()
+        self.screen = FakeScreen()
+        self._saved_module = sys.modules.get("mcp_server_handoff")
+        sys.modules["mcp_server_handoff"] = types.SimpleNamespace(_runtime=self.runtime)
+        self._saved = {
+            name: getattr(screen_description, name)
+            for name in (
+                "handle_describe_screen",
+                "_try_screen_state_service",
+                "_IDLE_BACKOFF_MAX_S",
+            )
+        }
+        screen_description.handle_describe_screen = self.screen
+        screen_description._try_screen_state_service = lambda: None
+        screen_description._subscription_meta.clear()
+        screen_description._poller_task = None
+        screen_description._poller_wakeup = None
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(screen_description, name, value)
+        screen_description._subscription_meta.clear()
+        screen_description._poller_task = None
+        screen_description._poller_wakeup = None
+        if self._saved_module is None:
+            sys.modules.pop("mcp_server_handoff", None)
+        else:
+            sys.modules["mcp_server_handoff"] = self._saved_module
+
+    def test_one_publish_per_change_for_many_subscribers(self):
+        async def scenario():
+            subs = [
+                (await screen_description.handle_subscribe_screen_changes(50))[
+                    "subscription_id"
+                ]
+                for _ in range(3)
+            ]
+            for sub in subs:
+                self.assertIsNotNone(
+                    await screen_description.wait_for_screen_change(sub, timeout=1.0)
+                )
+            self.screen.title = "Dialog"
+            for sub in subs:
+                event = await screen_description.wait_for_screen_change(
+                    sub, timeout=1.0
+                )
+                self.assertEqual(event["active_window_title"], "Dialog")
+                self.assertEqual(event["subscription_id"], sub)
+            for sub in subs:
+                await screen_description.handle_unsubscribe_screen_changes(sub)
+            return subs
+
+        subs = asyncio.run(scenario())
+        self.assertEqual(len(self.runtime.published), 2)
+        kind, payload = self.runtime.published[-1]
+        self.assertEqual(kind, "screen_change")
+        self.assertEqual(payload["active_window_title"], "Dialog")
+        self.assertEqual(sorted(payload["subscription_ids"]), sorted(subs))
+
+    def test_late_subscriber_is_not_a_change(self):
+        async def scenario():
+            first = (await screen_description.handle_subscribe_screen_changes(50))[
+                "subscription_id"
+            ]
+            await screen_description.wait_for_screen_change(first, timeout=1.0)
+            late = (await screen_description.handle_subscribe_screen_changes(50))[
+                "subscription_id"
+            ]
+            event = await screen_description.wait_for_screen_change(late, timeout=1.0)
+            await screen_description.handle_unsubscribe_screen_changes(first)
+            await screen_description.handle_unsubscribe_screen_changes(late)
+            return event
+
+        event = asyncio.run(scenario())
+        self.assertEqual(event["active_window_title"], "Editor")
+        self.assertEqual(len(self.runtime.published), 1)
+
+    def test_idle_screen_backs_off_to_cap(self):
+        screen_description._IDLE_BACKOFF_MAX_S = 0.2
+
+        async def scenario():
+            sub = (await screen_description.handle_subscribe_screen_changes(50))[
+                "subscription_id"
+            ]
+            await asyncio.sleep(1.2)
+            await screen_description.handle_unsubscribe_screen_changes(sub)
+
+        asyncio.run(scenario())
+        gaps = [b - a for a, b in zip(self.screen.calls, self.screen.calls[1:])]
+        self.assertGreater(len(gaps), 3)
+        # 50 ms base, growing by 1.5x per idle tick, capped at 200 ms
+        self.assertGreater(gaps[-1], gaps[0] * 2)
+        self.assertLess(max(gaps), 0.2 + 0.1)
+
+    def test_last_unsubscribe_stops_poller(self):
+        async def scenario():
+            sub = (await screen_description.handle_subscribe_screen_changes(50))[
+                "subscription_id"
+            ]
+            task = screen_description._poller_task
+            self.assertIsNotNone(task)
+            result = await screen_description.handle_unsubscribe_screen_changes(sub)
+            self.assertTrue(result["success"])
+            calls = len(self.screen.calls)
+            await asyncio.sleep(0.2)
+            return task, calls
+
+        task, calls = asyncio.run(scenario())
+        self.assertTrue(task.done())
+        self.assertIsNone(screen_description._poller_task)
+        self.assertEqual(len(self.screen.calls), calls)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+"""
+Tests für wait_for_settle (validation/screen_settle.py)
+
+Tests:
+1. Stabiler Screen → settled nach stable_frames Frames statt max_wait
+2. expect_change wartet auf die Änderung gegenüber der Baseline
+3. return_on_change kehrt bei der ersten Änderung zurück
+4. Ohne Änderung / ohne Frame-Quelle wird max_wait ausgeschöpft
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from validation.screen_settle import ScreenSettler, expects_change
+
+WHITE = np.full((40, 60, 3), 255, dtype=np.uint8)
+DIALOG = WHITE.copy()
+DIALOG[10:30, 10:50] = 0
+
+
+class ScriptedSource:
+    """Returns the scripted frames in order, then repeats the last one."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.calls = 0
+
+    def __call__(self, roi):
+        frame = self.frames[min(self.calls, len(self.frames) - 1)]
+        self.calls += 1
+        return float(self.calls), frame
+
+
+def _settler(source, **kwargs):
+    return ScreenSettler(source=source, interval=0.001, **kwargs)
+
+
+class TestScreenSettle(unittest.TestCase):
+    def test_stable_screen_returns_early(self):
+        settler = _settler(ScriptedSource([WHITE]))
+        result = asyncio.run(settler.wait_for_settle(max_wait=5.0))
+        self.assertTrue(result.settled)
+        self.assertEqual(result.reason, "stable")
+        self.assertEqual(result.frames, 3)
+        self.assertLess(result.elapsed, 1.0)
+
+    def test_expect_change_waits_for_slow_app(self):
+        # App reacts only on the 6th frame
+        source = ScriptedSource([WHITE] * 5 + [DIALOG])
+        settler = _settler(source)
+        result = asyncio.run(
+            settler.wait_for_settle(max_wait=5.0, baseline=WHITE, expect_change=True)
+        )
+        self.assertTrue(result.settled)
+        self.assertTrue(result.changed)
+        self.assertEqual(result.frames, 8)  # 5 unchanged + 3 stable dialog frames
+        self.assertTrue(np.array_equal(result.frame, DIALOG))
+
+    def test_return_on_change(self):
+        source = ScriptedSource([WHITE, WHITE, DIALOG])
+        result = asyncio.run(
+            _settler(source).wait_for_settle(max_wait=5.0, return_on_change=True)
+        )
+        self.assertEqual(result.reason, "changed")
+        self.assertTrue(result.changed)
+        self.assertEqual(result.frames, 3)
+
+    def test_tolerates_caret_blink(self):
+        caret = WHITE.copy()
+        caret[5, 5] = 0  # 1 of 600 compared pixels at step 2
+        source = ScriptedSource([WHITE, caret, WHITE, caret])
+        result = asyncio.run(
+            _settler(source, tolerance=0.01).wait_for_settle(max_wait=5.0)
+        )
+        self.assertTrue(result.settled)
+
+    def test_no_change_times_out(self):
+        settler = _settler(ScriptedSource([WHITE]))
+        start = time.monotonic()
+        result = asyncio.run(
+            settler.wait_for_settle(max_wait=0.1, baseline=WHITE, expect_change=True)
+        )
+        self.assertFalse(result.settled)
+        self.assertEqual(result.reason, "timeout")
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_missing_frame_source_sleeps_max_wait(self):
+        def broken(roi):
+            raise ImportError("no mss")
+
+        start = time.monotonic()
+        result = asyncio.run(_settler(broken).wait_for_settle(max_wait=0.1))
+        self.assertEqual(result.reason, "no_frames")
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_expects_change(self):
+        self.assertTrue(expects_change({"type": "click", "x": 1, "y": 1}))
+        self.assertFalse(expects_change({"type": "moveTo", "x": 1, "y": 1}))
+        self.assertFalse(expects_change({"type": "sleep", "seconds": 1}))
+        self.assertFalse(expects_change(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,264 @@
+"""
+Tests für den Screen State Service (services/screen_state.py)
+
+Tests:
+1. Erster Frame = Version 1, unveränderte Frames erhöhen die Version nicht
+2. Änderung → neue Version, Change-Event, nur die Dirty Region wird neu gelesen
+3. OCR mit ROI liest nur Dirty Regions, die die ROI berühren
+4. refresh(max_age) teilt sich Grabs zwischen Agents
+5. wait_for_change wird durch neue Frames geweckt
+6. UIA-Snapshot wird innerhalb einer Version wiederverwendet
+7. Langsame Änderungen (Tippen) summieren sich zu einer neuen Version
+8. MonitorAgent überspringt Capture bei unverändertem Screen
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.screen_state import ScreenStateService
+
+
+def _screen():
+    return np.full((300, 400, 3), 240, dtype=np.uint8)
+
+
+class FakeOCR:
+    """Returns one word at the crop origin and records the crop sizes."""
+
+    def __init__(self):
+        self.crops = []
+
+    async def __call__(self, crop):
+        self.crops.append(crop.shape[:2])
+        h, w = crop.shape[:2]
+        return [
+            {
+                "text": f"word{len(self.crops)}",
+                "x": 0,
+                "y": 0,
+                "width": min(w, 60),
+                "height": min(h, 20),
+            }
+        ]
+
+
+class ScriptedSource:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.calls = 0
+
+    def __call__(self, roi):
+        frame = self.frames[min(self.calls, len(self.frames) - 1)]
+        self.calls += 1
+        return float(self.calls), frame
+
+
+class FakeSnapshot:
+    def __init__(self):
+        self.text_entries = [{"depth": 0, "kind": "WindowControl", "text": "Editor"}]
+        self.actionable = [
+            {
+                "name": "Save",
+                "control_type": "ButtonControl",
+                "bounds": {"left": 10, "top": 20, "width": 60, "height": 24},
+            }
+        ]
+
+
+class TestScreenStateService(unittest.TestCase):
+    def setUp(self):
+        self.ocr = FakeOCR()
+
+    def _service(self, **kwargs):
+        return ScreenStateService(source=lambda roi: None, ocr=self.ocr, **kwargs)
+
+    def test_version_only_changes_with_pixels(self):
+        service = self._service()
+        event = service.ingest(_screen())
+        self.assertEqual(service.version, 1)
+        self.assertEqual(event.change_percentage, 100.0)
+        self.assertEqual(service.pending_ocr, [(0, 0, 400, 300)])
+
+        self.assertIsNone(service.ingest(_screen()))
+        self.assertEqual(service.version, 1)
+
+    def test_change_rereads_only_dirty_region(self):
+        events = []
+        service = self._service(ocr_padding=0)
+        service.subscribe(events.append)
+        service.ingest(_screen())
+        tokens = asyncio.run(service.ocr_tokens())
+        self.assertEqual(len(tokens), 1)
+        self.assertEqual(self.ocr.crops, [(300, 400)])
+
+        changed = _screen()
+        changed[100:140, 50:250] = 0  # typed line
+        event = service.ingest(changed)
+        self.assertEqual(service.version, 2)
+        self.assertEqual([e.version for e in events], [1, 2])
+        self.assertIs(events[-1], event)
+        self.assertEqual(len(service.dirty_regions), 1)
+        self.assertEqual(service.pending_ocr, [(50, 100, 200, 40)])
+
+        tokens = asyncio.run(service.ocr_tokens())
+        self.assertEqual(self.ocr.crops[-1], (40, 200))
+        self.assertEqual([(t.x, t.y) for t in tokens], [(0, 0), (50, 100)])
+        self.assertEqual(tokens[0].version, 1)  # kept from the first read
+
+        # A change touching a token drops it and re-reads the whole word
+        touched = changed.copy()
+        touched[0:20, 0:20] = 0
+        service.ingest(touched)
+        self.assertEqual(service.pending_ocr, [(0, 0, 60, 20)])
+        self.assertEqual(len(service._tokens), 1)
+
+    def test_roi_reads_only_touching_regions(self):
+        service = self._service(ocr_padding=0)
+        service.ingest(_screen())
+        service._pending_ocr = [(0, 0, 100, 50), (300, 200, 80, 40)]
+        tokens = asyncio.run(
+            service.ocr_tokens(roi={"x": 290, "y": 190, "width": 100, "height": 100})
+        )
+        self.assertEqual(self.ocr.crops, [(40, 80)])
+        self.assertEqual(len(tokens), 1)
+        self.assertEqual(service.pending_ocr, [(0, 0, 100, 50)])
+
+    def test_change_during_ocr_keeps_region_pending(self):
+        service = self._service()
+
+        async def slow_ocr(crop):
+            changed = _screen()
+            changed[0:50, 0:50] = 0
+            service.ingest(changed)
+            return [{"text": "stale", "x": 0, "y": 0, "width": 10, "height": 10}]
+
+        service._ocr = slow_ocr
+        service.ingest(_screen())
+        self.assertEqual(asyncio.run(service.ocr_tokens()), [])
+        self.assertEqual(service.pending_ocr, [(0, 0, 400, 300)])
+
+    def test_typing_bumps_version(self):
+        service = self._service(ocr_padding=0)
+        frame = _screen()
+        service.ingest(frame)
+        for i in range(3):
+            frame = frame.copy()
+            frame[100:107, 50 + i * 8 : 55 + i * 8] = 0  # one 5x7 glyph
+            self.assertIsNotNone(service.ingest(frame))
+        self.assertEqual(service.version, 4)
+
+    def test_slow_changes_accumulate_against_last_version(self):
+        service = self._service(ocr_padding=0)
+        frame = _screen()
+        service.ingest(frame)
+        events = []
+        for i in range(4):
+            # 2x2 px per frame: below the region minimum on its own
+            frame = frame.copy()
+            frame[100:102, 100 + i * 2 : 102 + i * 2] = 0
+            event = service.ingest(frame)
+            if event is not None:
+                events.append((i, event))
+        self.assertEqual([i for i, _ in events], [1, 3])
+        self.assertEqual(service.version, 3)
+        # The bump covers everything changed since the previous version
+        first = events[0][1].regions[0]
+        self.assertEqual(
+            (first.x, first.y, first.width, first.height), (100, 100, 4, 2)
+        )
+        last = events[1][1].regions[0]
+        self.assertEqual((last.x, last.width), (104, 4))
+
+    def test_refresh_shares_grabs(self):
+        source = ScriptedSource([_screen()])
+        service = ScreenStateService(source=source, ocr=self.ocr)
+        self.assertTrue(asyncio.run(service.refresh()))
+        self.assertTrue(asyncio.run(service.refresh(max_age=60)))
+        self.assertEqual(source.calls, 1)
+        self.assertTrue(asyncio.run(service.refresh()))
+        self.assertEqual(source.calls, 2)
+        self.assertEqual(service.version, 1)
+
+        def broken(roi):
+            raise ImportError("no mss")
+
+        self.assertFalse(asyncio.run(ScreenStateService(source=broken).refresh()))
+
+    def test_wait_for_change(self):
+        service = self._service()
+        service.ingest(_screen())
+
+        async def scenario():
+            waiter = asyncio.create_task(service.wait_for_change(timeout=2.0))
+            await asyncio.sleep(0)
+            changed = _screen()
+            changed[0:50, 0:50] = 0
+            service.ingest(changed)
+            return await waiter
+
+        event = asyncio.run(scenario())
+        self.assertEqual(event.version, 2)
+        self.assertIs(asyncio.run(service.wait_for_change(since_version=1)), event)
+        self.assertIsNone(asyncio.run(service.wait_for_change(timeout=0.01)))
+
+    def test_uia_snapshot_reused_within_version(self):
+        calls = []
+
+        def uia():
+            calls.append(1)
+            return FakeSnapshot()
+
+        service = self._service(uia=uia)
+        service.ingest(_screen())
+        self.assertEqual(service.window_title(), "Editor")
+        service.uia_snapshot()
+        self.assertEqual(len(calls), 1)
+
+        rows = asyncio.run(service.elements())
+        button = [r for r in rows if r["element_id"] == "uia_0"][0]
+        self.assertEqual(button["category"], "button")
+        self.assertEqual((button["center_x"], button["center_y"]), (40, 32))
+
+        changed = _screen()
+        changed[0:50, 0:50] = 0
+        service.ingest(changed)
+        service.uia_snapshot()
+        self.assertEqual(len(calls), 2)
+
+
+class FakeMoireClient:
+    def __init__(self):
+        self.captures = 0
+
+    async def capture_desktop(self):
+        self.captures += 1
+
+    def get_current_context(self):
+        return type("Ctx", (), {"elements": [], "version": 1})()
+
+
+class TestMonitorAgentUsesScreenState(unittest.TestCase):
+    def test_unchanged_screen_skips_capture(self):
+        from agents.monitor import MonitorAgent
+
+        source = ScriptedSource([_screen()])
+        service = ScreenStateService(source=source, ocr=FakeOCR())
+        client = FakeMoireClient()
+        agent = MonitorAgent(
+            moire_client=client, check_interval=0, screen_state=service
+        )
+
+        asyncio.run(agent.check_for_changes())
+        asyncio.run(agent.check_for_changes())
+        self.assertEqual(client.captures, 1)
+        self.assertEqual(agent.stats["captures_skipped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests für den Skill-Index (mcp_server_handoff._SkillIndex)
+
+Tests:
+1. BM25: Treffer im Namen schlagen Treffer im Body, seltene Terme zählen mehr
+2. mtime-Rescan: geänderte Dateien neu indexiert, gelöschte entfernt
+3. upsert: gespeicherter Skill sofort auffindbar, ohne Rescan
+4. Vor dem ersten Scan: lexikalischer Fallback statt Index
+5. Query-Embedding läuft ohne gehaltenen Index-Lock
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    import mcp_server_handoff as H
+
+    HAS_HANDOFF = True
+except ImportError:
+    HAS_HANDOFF = False
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def _write_skill(root, app, name, text, mtime=None):
+    path = os.path.join(root, app, name, "SKILL.md")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+@unittest.skipUnless(HAS_HANDOFF, "mcp_server_handoff dependencies not installed")
+class TestSkillIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self._root_patch = mock.patch.object(H, "_SKILL_LIB_ROOT", self.root)
+        self._root_patch.start()
+        self.index = H._SkillIndex(self.root)
+        self.index.use_embeddings = False
+        # Refreshes are driven explicitly by the tests.
+        self.index.refresh_in_background = lambda force=False: None
+
+    def tearDown(self):
+        self._root_patch.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _names(self, query, **kwargs):
+        return [r["skill_name"] for r in self.index.search(query, **kwargs)]
+
+    def test_bm25_ranking(self):
+        _write_skill(self.root, "excel", "pivot-table", "Build a report.")
+        _write_skill(self.root, "excel", "charts", "Insert a pivot chart.")
+        _write_skill(self.root, "word", "letters", "Write a report letter.")
+        self.index.refresh(force=True)
+
+        self.assertEqual(self._names("pivot"), ["pivot-table", "charts"])
+        # "report" is in two skills, "letter" only in one: the rarer term
+        # outweighs the boosted name hit on "pivot-table".
+        self.assertEqual(self._names("report letter"), ["letters", "pivot-table"])
+        self.assertEqual(self._names("pivot", agent="word"), [])
+        self.assertEqual(self._names("nothing-matches"), [])
+
+    def test_mtime_rescan(self):
+        path = _write_skill(self.root, "app", "old", "alpha steps", mtime=1000)
+        gone = _write_skill(self.root, "app", "gone", "beta steps", mtime=1000)
+        self.index.refresh(force=True)
+        self.assertEqual(self._names("alpha"), ["old"])
+
+        _write_skill(self.root, "app", "old", "gamma steps", mtime=2000)
+        os.remove(gone)
+        # Within the rescan interval nothing is re-read...
+        self.index.refresh()
+        self.assertEqual(self._names("alpha"), ["old"])
+        # ...a due rescan picks up the change and the deletion.
+        self.index.refresh(force=True)
+        self.assertEqual(self._names("alpha"), [])
+        self.assertEqual(self._names("gamma"), ["old"])
+        self.assertEqual(self._names("beta"), [])
+        self.assertEqual([d["path"] for d in self.index.entries()], [path])
+
+    def test_upsert(self):
+        _write_skill(self.root, "app", "first", "open the menu")
+        self.index.refresh(force=True)
+        path = _write_skill(self.root, "app", "saved", "export as pdf")
+        self.assertEqual(self._names("pdf"), [])
+
+        self.index.upsert("app", "saved", path)
+        self.assertEqual(self._names("pdf"), ["saved"])
+        _write_skill(self.root, "app", "saved", "export as csv")
+        self.index.upsert("app", "saved", path)
+        self.assertEqual(self._names("pdf"), [])
+        self.assertEqual(self._names("csv"), ["saved"])
+
+    def test_lexical_fallback_until_ready(self):
+        _write_skill(self.root, "app", "save-file", "press ctrl s")
+        self.assertFalse(self.index.ready)
+        with mock.patch.object(
+            H, "_lexical_skill_search", wraps=H._lexical_skill_search
+        ) as lexical:
+            self.assertEqual(self._names("save"), ["save-file"])
+            lexical.assert_called_once()
+        self.assertEqual([d["skill_name"] for d in self.index.entries()], ["save-file"])
+
+        self.index.refresh(force=True)
+        with mock.patch.object(H, "_lexical_skill_search") as lexical:
+            self.assertEqual(self._names("save"), ["save-file"])
+            lexical.assert_not_called()
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_query_is_encoded_without_the_lock(self):
+        index = self.index
+        lock_free = []
+
+        def probe():
+            acquired = index._lock.acquire(timeout=1)
+            lock_free.append(acquired)
+            if acquired:
+                index._lock.release()
+
+        class FakeEmbeddings:
+            ready = True
+
+            def encode(self, texts):
+                thread = threading.Thread(target=probe)
+                thread.start()
+                thread.join()
+                return np.array([[1.0, 0.0] for _ in texts])
+
+        path = _write_skill(self.root, "app", "unrelated", "zzz")
+        index.use_embeddings = True
+        with mock.patch.object(H, "_get_embedding_service", FakeEmbeddings):
+            index.refresh(force=True)
+            lock_free.clear()
+            results = index.search("close the window")
+
+        self.assertEqual(lock_free, [True])
+        self.assertEqual([r["path"] for r in results], [path])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,167 @@
+"""
+Tests für den StateComparator (validation/state_comparator.py)
+
+Tests:
+1. from_screenshot liest die Größe aus dem Header, ohne zu dekodieren
+2. Jeder Screenshot wird höchstens einmal dekodiert (Thumbnail-Cache)
+3. Wiederholte Vergleiche gleicher Hash-Paare dekodieren nicht erneut
+4. Historie hält nur kompakte Zustände (Thumbnail + Hashes)
+5. ROI-Vergleich mit wiederverwendetem Referenz-Zustand
+"""
+
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from validation import state_comparator as sc
+from validation.state_comparator import (ChangeType, ScreenState,
+                                         StateComparator, hamming_distance)
+
+
+def _png(arr):
+    buffer = io.BytesIO()
+    Image.fromarray(arr).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _screen():
+    arr = np.full((360, 640, 3), 240, dtype=np.uint8)
+    arr[0:30] = 40  # title bar
+    return arr
+
+
+class CountingOpen:
+    """Counts Image.open calls that actually decode pixels."""
+
+    def __init__(self):
+        self.decodes = 0
+        self._open = Image.open
+
+    def __call__(self, fp, *args, **kwargs):
+        img = self._open(fp, *args, **kwargs)
+        original_convert = img.convert
+
+        def convert(*a, **kw):
+            self.decodes += 1
+            return original_convert(*a, **kw)
+
+        img.convert = convert
+        return img
+
+
+class TestStateComparator(unittest.TestCase):
+    def setUp(self):
+        self.before_arr = _screen()
+        self.after_arr = _screen()
+        self.after_arr[200:240, 100:260] = 0  # typed line
+        self.before = _png(self.before_arr)
+        self.after = _png(self.after_arr)
+        self.counter = CountingOpen()
+        patcher = mock.patch.object(sc.Image, "open", self.counter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dimensions_without_decoding(self):
+        state = ScreenState.from_screenshot(self.before)
+        self.assertEqual(state.dimensions, (640, 360))
+        self.assertEqual(self.counter.decodes, 0)
+
+    def test_small_change_detected_and_decoded_once(self):
+        comparator = StateComparator()
+        before = ScreenState.from_screenshot(self.before)
+        after = ScreenState.from_screenshot(self.after)
+
+        result = comparator.compare(before, after)
+        self.assertTrue(result.changed)
+        self.assertEqual(result.change_type, ChangeType.MINOR_CHANGE)
+        self.assertAlmostEqual(result.change_percentage, 6400 / 230400, places=3)
+        self.assertIsNotNone(result.perceptual_distance)
+
+        comparator.compare(before, after)
+        self.assertEqual(self.counter.decodes, 2)
+
+    def test_same_hash_pair_is_cached(self):
+        comparator = StateComparator()
+        comparator.compare(
+            ScreenState.from_screenshot(self.before),
+            ScreenState.from_screenshot(self.after),
+        )
+        decodes = self.counter.decodes
+        # New states of the same bytes (e.g. the next poll): no decoding
+        result = comparator.compare(
+            ScreenState.from_screenshot(self.before),
+            ScreenState.from_screenshot(self.after),
+        )
+        self.assertTrue(result.changed)
+        self.assertEqual(self.counter.decodes, decodes)
+
+    def test_history_is_compact(self):
+        comparator = StateComparator()
+        state = ScreenState.from_screenshot(self.before)
+        comparator.add_to_history(state)
+        stored = comparator.get_last_state()
+        self.assertIsNone(stored.screenshot_data)
+        self.assertIsNotNone(stored.thumbnail)
+        self.assertEqual(stored.phash, state.phash)
+        self.assertIs(
+            comparator.find_in_history(ScreenState.from_screenshot(self.before)), stored
+        )
+
+        comparator.add_to_history(state, keep_bytes=True)
+        self.assertEqual(comparator.get_last_state().screenshot_data, self.before)
+
+        # Compact states still compare against fresh ones
+        result = comparator.compare(stored, ScreenState.from_screenshot(self.after))
+        self.assertTrue(result.changed)
+
+    def test_from_array_matches_png_path(self):
+        comparator = StateComparator()
+        from_png = comparator.compare(
+            ScreenState.from_screenshot(self.before),
+            ScreenState.from_screenshot(self.after),
+        )
+        from_arrays = comparator.compare(
+            ScreenState.from_array(self.before_arr),
+            ScreenState.from_array(self.after_arr),
+        )
+        self.assertAlmostEqual(
+            from_arrays.change_percentage, from_png.change_percentage, places=3
+        )
+        self.assertEqual(
+            ScreenState.from_array(self.before_arr).phash,
+            ScreenState.from_screenshot(self.before).phash,
+        )
+
+    def test_roi_reference_decoded_once(self):
+        comparator = StateComparator()
+        reference = ScreenState.from_screenshot(self.before)
+        roi = {"origin_x": 140, "origin_y": 208, "base_width": 100, "base_height": 40}
+        for _ in range(3):
+            result = comparator.compare_with_roi(reference, self.after, roi)
+            self.assertTrue(result.changed)
+        # reference once + three after screenshots
+        self.assertEqual(self.counter.decodes, 4)
+
+        outside = {
+            "origin_x": 500,
+            "origin_y": 300,
+            "base_width": 60,
+            "base_height": 30,
+        }
+        self.assertFalse(
+            comparator.compare_with_roi(reference, self.after, outside).changed
+        )
+
+    def test_hamming_distance(self):
+        self.assertEqual(hamming_distance(0b1011, 0b0001), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
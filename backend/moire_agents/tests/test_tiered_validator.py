@@ -0,0 +1,106 @@
+"""
+Tests für den Tiered Validator (validation/tiered_validator.py)
+
+Tests:
+1. Pixel-identische Frames → FAILED ohne Eskalation
+2. Änderung am Klickziel bestätigt Tier 0, kleine Änderung woanders eskaliert
+3. write: Tier 1 (ROI-OCR) prüft den getippten Text
+4. Actions ohne erwartete Änderung werden nicht validiert
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from validation.tiered_validator import (Frame, Outcome, TieredValidator,
+                                         ValidationTier, text_visible)
+
+
+def _frame(arr, scale=4):
+    return Frame(full=arr, small=arr[::scale, ::scale], scale=scale)
+
+
+def _blank():
+    return np.full((400, 600, 3), 255, dtype=np.uint8)
+
+
+class TestTieredValidator(unittest.TestCase):
+    def setUp(self):
+        self.ocr_calls = []
+        self.ocr_text = ""
+
+        async def ocr(crop):
+            self.ocr_calls.append(crop.shape)
+            return self.ocr_text
+
+        self.validator = TieredValidator(ocr=ocr)
+
+    def _validate(self, action, before, after):
+        policy = self.validator.policy_for(action)
+        return asyncio.run(
+            self.validator.validate(action, policy, _frame(before), _frame(after))
+        )
+
+    def test_identical_frames_fail_without_escalation(self):
+        verdict = self._validate(
+            {"type": "click", "x": 10, "y": 10}, _blank(), _blank()
+        )
+        self.assertEqual(verdict.outcome, Outcome.FAILED)
+        self.assertEqual(verdict.tier, ValidationTier.PIXEL)
+
+    def test_change_at_click_target_is_confirmed(self):
+        after = _blank()
+        after[100:140, 200:260] = 0
+        verdict = self._validate({"type": "click", "x": 230, "y": 120}, _blank(), after)
+        self.assertEqual(verdict.outcome, Outcome.CONFIRMED)
+        self.assertEqual(verdict.tier, ValidationTier.PIXEL)
+
+    def test_small_remote_change_escalates_click(self):
+        after = _blank()
+        after[0:24, 0:24] = 0  # 0.24% of the screen, far from the target
+        verdict = self._validate({"type": "click", "x": 500, "y": 350}, _blank(), after)
+        self.assertEqual(verdict.outcome, Outcome.ESCALATE)
+
+    def test_write_checks_typed_text_in_changed_region(self):
+        after = _blank()
+        after[200:220, 50:300] = 0
+        self.ocr_text = "Hello World!"
+        verdict = self._validate(
+            {"type": "write", "text": "Hello World!"}, _blank(), after
+        )
+        self.assertEqual(verdict.outcome, Outcome.CONFIRMED)
+        self.assertEqual(verdict.tier, ValidationTier.ROI_OCR)
+        # Only the changed region (plus padding) is read, not the screen
+        h, w = self.ocr_calls[0][:2]
+        self.assertLess(h * w, 400 * 600 / 10)
+
+        self.ocr_text = "something else"
+        verdict = self._validate(
+            {"type": "write", "text": "Hello World!"}, _blank(), after
+        )
+        self.assertEqual(verdict.outcome, Outcome.FAILED)
+
+    def test_move_is_not_validated(self):
+        verdict = asyncio.run(
+            self.validator.validate(
+                {"type": "moveTo", "x": 1, "y": 1},
+                self.validator.policy_for({"type": "moveTo"}),
+                None,
+            )
+        )
+        self.assertEqual(verdict.outcome, Outcome.CONFIRMED)
+        self.assertEqual(verdict.tier, ValidationTier.NONE)
+
+    def test_text_visible_tolerates_ocr_noise(self):
+        self.assertTrue(text_visible("Hello World!", "untitled - hello  world! |"))
+        self.assertTrue(text_visible("Hello World", "He1lo World"))
+        self.assertFalse(text_visible("Hello World", "Goodbye"))
+
+
+if __name__ == "__main__":
+    unittest.main()
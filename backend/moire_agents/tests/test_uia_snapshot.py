@@ -0,0 +1,250 @@
+"""
+Tests für den UIA Snapshot Cache (agents/handoff/uia_snapshot.py)
+
+Läuft ohne Windows: ein Fake-UIA-Provider liefert Fake-Controls.
+
+Tests:
+1. Ein Walk liefert Text-Einträge und actionable Controls
+2. Cache-Hit innerhalb der TTL, Re-Walk nach Ablauf
+3. Invalidierung bei Strukturänderung (Signatur)
+4. Invalidierung bei Fokuswechsel, Cache-Hit bei unverändertem Fokus
+5. retain() entfernt geschlossene Fenster
+6. Actionable Controls unterhalb von max_depth werden trotzdem gelistet
+7. handle_list_actionable ohne Snapshot-Cache (Import fehlgeschlagen)
+"""
+
+import asyncio
+import copy
+import importlib.util
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Load the module directly: agents.handoff.__init__ pulls in pyautogui,
+# which cannot be imported on a headless machine.
+_spec = importlib.util.spec_from_file_location(
+    "uia_snapshot",
+    os.path.join(
+        os.path.dirname(__file__), "..", "agents", "handoff", "uia_snapshot.py"
+    ),
+)
+uia_snapshot = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = uia_snapshot
+_spec.loader.exec_module(uia_snapshot)
+UIASnapshotCache = uia_snapshot.UIASnapshotCache
+
+_spec = importlib.util.spec_from_file_location(
+    "screen_description",
+    os.path.join(
+        os.path.dirname(__file__), "..", "agents", "handoff", "screen_description.py"
+    ),
+)
+screen_description = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = screen_description
+_spec.loader.exec_module(screen_description)
+
+
+class FakeRect:
+    def __init__(self, left=0, top=0, right=800, bottom=600):
+        self.left, self.top, self.right, self.bottom = left, top, right, bottom
+
+
+class FakeControl:
+    _next_id = 1
+
+    def __init__(self, name, control_type, children=None, hwnd=0):
+        self.Name = name
+        self.ControlTypeName = control_type
+        self.ClassName = ""
+        self.AutomationId = ""
+        self.BoundingRectangle = FakeRect()
+        self.IsEnabled = True
+        self.IsKeyboardFocusable = True
+        self.NativeWindowHandle = hwnd
+        self.children = children or []
+        self._runtime_id = [42, FakeControl._next_id]
+        FakeControl._next_id += 1
+
+    def GetRuntimeId(self):
+        return list(self._runtime_id)
+
+    def GetChildren(self):
+        return list(self.children)
+
+    def GetValuePattern(self):
+        return None
+
+    def GetTextPattern(self):
+        return None
+
+
+class FakeUIA:
+    """Minimal stand-in for the `uiautomation` module.
+
+    Like uiautomation, every lookup returns a fresh wrapper object; only
+    the runtime id identifies the underlying element.
+    """
+
+    def __init__(self, windows):
+        self.windows = windows
+        self.walks = 0
+        self.focused = None
+        self.foreground = None
+
+    def ControlFromHandle(self, hwnd):
+        return copy.copy(self.windows.get(hwnd))
+
+    def GetFocusedControl(self):
+        return copy.copy(self.focused)
+
+    def GetForegroundControl(self):
+        return copy.copy(self.foreground)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make_window(hwnd, title="Editor"):
+    return FakeControl(
+        title,
+        "WindowControl",
+        hwnd=hwnd,
+        children=[
+            FakeControl("Save", "ButtonControl"),
+            FakeControl(
+                "Body",
+                "PaneControl",
+                children=[
+                    FakeControl("Name", "EditControl"),
+                    FakeControl("Hint", "TextControl"),
+                ],
+            ),
+        ],
+    )
+
+
+def _count_walks(cache):
+    return cache.stats["misses"]
+
+
+class TestUIASnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.win = _make_window(100)
+        self.uia = FakeUIA({100: self.win})
+        self.uia.foreground = self.win
+        self.clock = FakeClock()
+        self.cache = UIASnapshotCache(
+            self.uia,
+            describe=lambda c: {"name": c.Name, "control_type": c.ControlTypeName},
+            node_text=lambda c, d: (
+                [{"depth": d, "kind": c.ControlTypeName, "text": c.Name}]
+                if c.Name
+                else []
+            ),
+            default_ttl=2.0,
+            clock=self.clock,
+        )
+
+    def test_single_walk_collects_text_and_actionable(self):
+        snap = self.cache.get(100)
+        texts = [e["text"] for e in snap.text_entries]
+        self.assertEqual(texts, ["Editor", "Save", "Body", "Name", "Hint"])
+        names = [e["name"] for e in snap.actionable]
+        self.assertEqual(names, ["Save", "Name"])
+        self.assertEqual(snap.visited, 5)
+
+    def test_hit_within_ttl_and_rewalk_after_expiry(self):
+        first = self.cache.get(100)
+        self.clock.now += 1.0
+        self.assertIs(self.cache.get(100), first)
+        self.assertIs(self.cache.get_foreground(), first)
+        self.assertEqual(_count_walks(self.cache), 1)
+
+        self.clock.now += 5.0
+        self.assertIsNot(self.cache.get(100), first)
+        self.assertEqual(_count_walks(self.cache), 2)
+        self.assertEqual(self.cache.stats["ttl_expired"], 1)
+
+    def test_per_window_ttl(self):
+        self.cache.set_ttl(100, 10.0)
+        first = self.cache.get(100)
+        self.clock.now += 5.0
+        self.assertIs(self.cache.get(100), first)
+
+    def test_structure_change_invalidates(self):
+        self.cache.get(100)
+        self.win.children.append(FakeControl("Cancel", "ButtonControl"))
+        snap = self.cache.get(100)
+        self.assertEqual(self.cache.stats["signature_changed"], 1)
+        self.assertIn("Cancel", [e["name"] for e in snap.actionable])
+
+    def test_focus_change_invalidates(self):
+        self.uia.focused = self.win.children[0]
+        self.cache.get(100)
+        self.uia.focused = self.win.children[1].children[0]
+        self.cache.get(100)
+        self.assertEqual(self.cache.stats["focus_invalidations"], 1)
+        self.assertEqual(_count_walks(self.cache), 2)
+
+    def test_unchanged_focus_keeps_cache(self):
+        self.uia.focused = self.win.children[0]
+        first = self.cache.get(100)
+        for _ in range(3):
+            self.assertIs(self.cache.get(100), first)
+        self.assertEqual(self.cache.stats["focus_invalidations"], 0)
+        self.assertEqual(_count_walks(self.cache), 1)
+
+    def test_retain_evicts_closed_windows(self):
+        self.uia.windows[200] = _make_window(200, "Other")
+        self.cache.get(100)
+        self.cache.get(200)
+        self.cache.retain([200])
+        self.cache.get(200)
+        self.assertEqual(_count_walks(self.cache), 2)
+        self.cache.get(100)
+        self.assertEqual(_count_walks(self.cache), 3)
+
+    def test_deep_actionable_beyond_max_depth(self):
+        node = FakeControl("Submit", "ButtonControl")
+        for i in range(20):
+            node = FakeControl(f"group{i}", "GroupControl", children=[node])
+        self.win.children.append(node)
+        snap = self.cache.get(100)
+        self.assertIn("Submit", [e["name"] for e in snap.actionable])
+        # Text collection stays bounded by max_depth
+        self.assertTrue(
+            all(e["depth"] <= self.cache.max_depth for e in snap.text_entries)
+        )
+        self.assertNotIn("Submit", [e["text"] for e in snap.text_entries])
+
+    def test_missing_window_returns_none(self):
+        self.assertIsNone(self.cache.get(999))
+
+
+class TestListActionableFallback(unittest.TestCase):
+    def test_walks_tree_when_snapshot_module_is_unavailable(self):
+        win = _make_window(100)
+        uia = FakeUIA({100: win})
+        uia.foreground = win
+        with (
+            mock.patch.dict(sys.modules, {"agents.handoff.uia_snapshot": None}),
+            mock.patch.object(screen_description, "_try_uia", return_value=uia),
+        ):
+            self.assertIsNone(screen_description._try_uia_snapshot_cache())
+            result = asyncio.run(screen_description.handle_list_actionable())
+        self.assertTrue(result["success"])
+        self.assertEqual(
+            sorted(e["name"] for e in result["elements"]), ["Name", "Save"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,130 @@
+"""
+Tests für den ValidatedExecutor mit Tiered Validation (core/validated_executor.py)
+
+Läuft ohne Desktop und ohne MoireServer: Aktionen führt ein Fake aus,
+Screenshots kommen aus Arrays, der Screen-Settler ist ein Fake.
+
+Tests:
+1. FAILED-Verdict (Pixel-Diff: nichts passiert) zählt nie als Erfolg
+2. Ein FAILED-Verdict löst den Retry aus, nach max_retries gilt die
+   Aktion als fehlgeschlagen
+3. Ändert sich der Screen beim Retry, ist die Aktion validiert
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.validated_executor import ValidatedExecutor
+from validation.screen_settle import SettleResult
+from validation.tiered_validator import Outcome, TierVerdict, ValidationTier
+
+
+def _blank():
+    return np.full((400, 600, 3), 255, dtype=np.uint8)
+
+
+class FakeActions:
+    """Executes nothing; ``on_execute`` may change the fake screen."""
+
+    def __init__(self, on_execute=None):
+        self.actions = []
+        self.on_execute = on_execute
+
+    async def execute_action(self, action):
+        self.actions.append(action)
+        if self.on_execute is not None:
+            self.on_execute(len(self.actions))
+        return True
+
+
+class FakeSettler:
+    def __init__(self, screen):
+        self.screen = screen
+
+    async def wait_for_settle(
+        self, max_wait=2.0, baseline=None, expect_change=True, **kw
+    ):
+        return SettleResult(
+            settled=True,
+            changed=False,
+            reason="stable",
+            elapsed=0.0,
+            frames=1,
+            frame=self.screen["frame"].copy(),
+        )
+
+
+def _subtask(action):
+    return SimpleNamespace(
+        description=f"{action['type']} test",
+        context={"pyautogui_action": action, "wait_after": 0.0},
+    )
+
+
+class TestValidatedExecutor(unittest.TestCase):
+    def setUp(self):
+        self.screen = {"frame": _blank()}
+        self.executor = ValidatedExecutor(dry_run=True)
+        self.executor._connected = True
+        self.executor.settler = FakeSettler(self.screen)
+        self.executor.tiered_validator._grab = lambda: self.screen["frame"].copy()
+        self.actions = FakeActions()
+        self.executor.action_executor = self.actions
+
+    def _execute(self, action, max_retries=2):
+        return asyncio.run(
+            self.executor.execute_with_validation(
+                [_subtask(action)], goal="test", max_retries=max_retries
+            )
+        )
+
+    def test_failed_verdict_is_never_success(self):
+        for confidence in (0.1, 0.3, 1.0):
+            result = self.executor._verdict_to_result(
+                TierVerdict(
+                    Outcome.FAILED, ValidationTier.PIXEL, confidence, "no change"
+                )
+            )
+            self.assertFalse(result.success)
+            self.assertFalse(result.change_detected)
+
+        result = self.executor._verdict_to_result(
+            TierVerdict(Outcome.CONFIRMED, ValidationTier.PIXEL, 0.9, "changed")
+        )
+        self.assertTrue(result.success)
+        self.assertTrue(result.change_detected)
+
+    def test_unchanged_screen_is_retried_then_failed(self):
+        result = self._execute({"type": "click", "x": 230, "y": 120}, max_retries=2)
+
+        self.assertEqual(len(self.actions.actions), 3)
+        self.assertEqual(result.actions_validated, 0)
+        self.assertEqual(result.actions_failed, 1)
+        self.assertFalse(result.success)
+        validation = result.validation_results[-1]
+        self.assertFalse(validation.success)
+        self.assertEqual(validation.tier, ValidationTier.PIXEL)
+
+    def test_change_on_retry_validates(self):
+        def change_on_second_attempt(attempt):
+            if attempt == 2:
+                self.screen["frame"][100:140, 200:260] = 0
+
+        self.actions.on_execute = change_on_second_attempt
+        result = self._execute({"type": "click", "x": 230, "y": 120}, max_retries=2)
+
+        self.assertEqual(len(self.actions.actions), 2)
+        self.assertEqual(result.actions_validated, 1)
+        self.assertEqual(result.actions_failed, 0)
+        self.assertTrue(result.validation_results[-1].success)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,156 @@
+"""
+Tests für Payload-Cache und Request-Limiter des VisionAnalystAgent
+(agents/vision_agent.py)
+
+Läuft ohne API-Keys: ein Fake-OpenRouter-Client beantwortet die Calls.
+
+Tests:
+1. VisionPayloadCache: LRU-Verdrängung und Hit/Miss-Statistik
+2. Mehrere Fragen zum selben Screenshot teilen ein Encoding
+3. Parallele Vision-Calls werden auf max_concurrency begrenzt
+4. Koordinaten werden auf die Originalgröße zurückskaliert
+"""
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agents.vision_agent import (HAS_PIL, VisionAnalystAgent, VisionPayload,
+                                 VisionPayloadCache)
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeOpenRouter:
+    """Zählt Calls und die maximale Parallelität."""
+
+    def __init__(self, content, delay=0.01):
+        self.content = content
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def chat_with_vision(self, prompt, image_data, json_mode=False, **kwargs):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return FakeResponse(self.content)
+
+
+def _make_agent(content, max_concurrency=2):
+    agent = VisionAnalystAgent.__new__(VisionAnalystAgent)
+    agent.model = "fake"
+    agent.max_tokens = 100
+    agent.client = None
+    agent.async_client = None
+    agent.openrouter_client = FakeOpenRouter(content)
+    agent.max_concurrency = max_concurrency
+    agent._semaphore = None
+    agent._semaphore_loop = None
+    agent.payload_cache = VisionPayloadCache()
+    agent.is_available = lambda: True
+    return agent
+
+
+class TestVisionPayloadCache(unittest.TestCase):
+    def test_lru_eviction_and_stats(self):
+        cache = VisionPayloadCache(max_entries=2)
+        payload = VisionPayload("x", (10, 10), (10, 10))
+        keys = [VisionPayloadCache.key_for_bytes(bytes([i])) for i in range(3)]
+        cache.put(keys[0], payload)
+        cache.put(keys[1], payload)
+        self.assertIs(cache.get(keys[0]), payload)
+        cache.put(keys[2], payload)  # verdrängt keys[1]
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1})
+
+    def test_scale_to_original(self):
+        payload = VisionPayload("x", (1568, 882), (3136, 1764))
+        self.assertEqual(payload.scale_to_original(100, 50), (200, 100))
+        same = VisionPayload("x", (800, 600), (800, 600))
+        self.assertEqual(same.scale_to_original(12.7, 3.2), (12, 3))
+
+
+class TestVisionAgentClient(unittest.TestCase):
+    @unittest.skipUnless(HAS_PIL, "PIL not installed")
+    def test_questions_share_one_encoding(self):
+        from io import BytesIO
+
+        from PIL import Image
+
+        agent = _make_agent(
+            json.dumps({"found": True, "x": 10, "y": 20, "confidence": 0.9})
+        )
+        buffer = BytesIO()
+        Image.new("RGB", (800, 600), color="white").save(buffer, format="PNG")
+        frame = buffer.getvalue()
+
+        encodes = []
+        real_encode = agent._encode_for_vision
+
+        def counting_encode(image):
+            encodes.append(image.size)
+            return real_encode(image)
+
+        agent._encode_for_vision = counting_encode
+
+        async def run():
+            first = await agent.find_element_from_screenshot(frame, "target 0")
+            rest = await asyncio.gather(
+                *(
+                    agent.find_element_from_screenshot(frame, f"target {i}")
+                    for i in range(1, 4)
+                )
+            )
+            reflection = await agent.analyze_with_prompt(frame, "Was ist zu sehen?")
+            return [first, *rest], reflection
+
+        results, reflection = asyncio.run(run())
+        self.assertTrue(all(r.found for r in results))
+        self.assertTrue(reflection)
+        self.assertEqual(encodes, [(800, 600)])
+        self.assertEqual(agent.payload_cache.stats, {"hits": 4, "misses": 1})
+
+    def test_concurrency_is_limited(self):
+        agent = _make_agent("ok", max_concurrency=2)
+
+        async def run():
+            return await asyncio.gather(
+                *(agent._vision_completion(f"q{i}", "b64") for i in range(6))
+            )
+
+        self.assertEqual(asyncio.run(run()), ["ok"] * 6)
+        self.assertEqual(agent.openrouter_client.calls, 6)
+        self.assertEqual(agent.openrouter_client.max_active, 2)
+
+    @unittest.skipUnless(HAS_PIL, "PIL not installed")
+    def test_find_element_rescales_large_frames(self):
+        from PIL import Image
+
+        agent = _make_agent(
+            json.dumps({"found": True, "x": 100, "y": 50, "confidence": 0.9})
+        )
+        image = Image.new("RGB", (3136, 1000), color="white")
+
+        async def run():
+            first = await agent.find_element(image, "Save")
+            second = await agent.find_element(image, "Cancel")
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual((first.x, first.y), (200, 100))
+        self.assertEqual(agent.payload_cache.stats, {"hits": 1, "misses": 1})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -172,8 +172,9 @@ class ActionValidator:
 
             if roi and screenshot_before:
                 # ROI-basierter Vergleich für fokussierte Validierung
+                # (reference_state: Vorher-Screenshot wird nur einmal dekodiert)
                 last_comparison = self.comparator.compare_with_roi(
-                    screenshot_before, screenshot_after, roi
+                    reference_state, screenshot_after, roi
                 )
                 logger.info(
                     f"ROI-Validierung: zoom={roi.get('zoom', 1.5)} um ({roi.get('origin_x', 0)}, {roi.get('origin_y', 0)})"
@@ -4,6 +4,11 @@ Change Detector - Precise bounding box detection for screen changes.
 Uses connected component analysis to detect WHERE changes occurred,
 replacing quadrant-based detection with pixel-accurate bounding boxes.
 
+Pyramid mode (``pyramid_scale`` 4 or 8) compares a 1/scale subsample
+first and only diffs the tiles around coarse changes at full resolution.
+Changes thinner than ``pyramid_scale`` pixels can slip through the coarse
+pass.
+
 Usage:
     from validation.change_detector import ChangeDetector, ChangeRegion
 
@@ -12,6 +17,10 @@ Usage:
 
     for region in regions:
         print(f"Change at {region.bounds}: {region.intensity}")
+
+    # Pre-decoded frames (no PNG round trip), 4K-capable
+    fast = ChangeDetector(pyramid_scale=4)
+    result = fast.detect_changes_arrays(before_rgb, after_rgb, roi=roi)
 """
 
 import io
@@ -100,6 +109,28 @@ class ChangeDetectionResult:
         return sum(1 for r in self.regions if r.intensity == ChangeIntensity.HIGH)
 
 
+def _abs_diff(before: np.ndarray, after: np.ndarray) -> np.ndarray:
+    """Per-pixel max channel difference, computed in uint8 (no int16 copies)."""
+    diff = np.maximum(before, after)
+    diff -= np.minimum(before, after)  # max >= min: cannot wrap around
+    if diff.ndim == 2:
+        return diff
+    # Channel-wise maximum: much faster than a reduction over the last axis
+    result = diff[..., 0].copy()
+    for channel in range(1, diff.shape[2]):
+        np.maximum(result, diff[..., channel], out=result)
+    return result
+
+
+def _shift_region(region: ChangeRegion, dx: int, dy: int) -> None:
+    """Move a region found in a sub-box into frame coordinates."""
+    if dx or dy:
+        region.bounds["x"] += dx
+        region.bounds["y"] += dy
+        region.centroid["x"] += dx
+        region.centroid["y"] += dy
+
+
 class ChangeDetector:
     """
     Detects precise change regions using connected components.
@@ -110,7 +141,12 @@ class ChangeDetector:
     """
 
     def __init__(
-        self, threshold: int = 30, min_region_size: int = 100, merge_distance: int = 20
+        self,
+        threshold: int = 30,
+        min_region_size: int = 100,
+        merge_distance: int = 20,
+        pyramid_scale: int = 1,
+        pyramid_tile: int = 64,
     ):
         """
         Initialize the ChangeDetector.
@@ -119,10 +155,14 @@ class ChangeDetector:
             threshold: Pixel difference threshold (0-255) to consider as changed
             min_region_size: Minimum pixels for a region to be included
             merge_distance: Merge regions closer than this distance
+            pyramid_scale: Coarse pass subsample factor (1 = off, 4 or 8)
+            pyramid_tile: Tile size (full resolution) refined around coarse changes
         """
         self.threshold = threshold
         self.min_region_size = min_region_size
         self.merge_distance = merge_distance
+        self.pyramid_scale = max(1, pyramid_scale)
+        self.pyramid_tile = max(self.pyramid_scale, pyramid_tile)
 
         # Try to import scipy for connected components
         try:
@@ -168,23 +208,70 @@ class ChangeDetector:
                 before_img = before_img.resize(min_size)
                 after_img = after_img.resize(min_size)
 
-            # Convert to numpy arrays
-            before_arr = np.array(before_img, dtype=np.int16)
-            after_arr = np.array(after_img, dtype=np.int16)
+            return self.detect_changes_arrays(
+                np.array(before_img), np.array(after_img), return_diff_image
+            )
+
+        except Exception as e:
+            logger.error(f"Error detecting changes: {e}")
+            return ChangeDetectionResult(
+                changed=False, total_change_percentage=0, regions=[]
+            )
+
+    def detect_changes_arrays(
+        self,
+        before: np.ndarray,
+        after: np.ndarray,
+        return_diff_image: bool = False,
+        roi: Optional[Dict[str, int]] = None,
+    ) -> ChangeDetectionResult:
+        """
+        Detect change regions between two already decoded frames.
+
+        Args:
+            before: Frame before action, (H, W, C) or (H, W) uint8 array
+            after: Frame after action, same shape as ``before``
+            return_diff_image: If True, include binary diff image in result
+            roi: Only compare this region {x, y, width, height}; region
+                 bounds stay in frame coordinates
 
-            # Compute absolute difference per channel
-            diff = np.abs(after_arr - before_arr)
+        Returns:
+            ChangeDetectionResult with list of ChangeRegion objects
+        """
+        try:
+            if before.shape != after.shape:
+                h = min(before.shape[0], after.shape[0])
+                w = min(before.shape[1], after.shape[1])
+                before, after = before[:h, :w], after[:h, :w]
+
+            offset_x = offset_y = 0
+            if roi is not None:
+                offset_x, offset_y = max(0, int(roi["x"])), max(0, int(roi["y"]))
+                y1 = offset_y + int(roi["height"])
+                x1 = offset_x + int(roi["width"])
+                before = before[offset_y:y1, offset_x:x1]
+                after = after[offset_y:y1, offset_x:x1]
+
+            if self.pyramid_scale > 1:
+                boxes = self._candidate_boxes(before, after)
+            else:
+                boxes = [(0, before.shape[0], 0, before.shape[1])]
 
-            # Max difference across channels
-            max_diff = np.max(diff, axis=2)
+            total_pixels = before.shape[0] * before.shape[1]
+            changed_pixels = 0
+            refined = []
+            for y0, y1, x0, x1 in boxes:
+                # Max difference across channels
+                max_diff = _abs_diff(before[y0:y1, x0:x1], after[y0:y1, x0:x1])
 
-            # Create binary mask (changed = 1, unchanged = 0)
-            binary_mask = (max_diff > self.threshold).astype(np.uint8)
+                # Create binary mask (changed = 1, unchanged = 0)
+                binary_mask = (max_diff > self.threshold).view(np.uint8)
+                count = int(np.count_nonzero(binary_mask))
+                changed_pixels += count
+                refined.append((y0, x0, binary_mask, max_diff, count))
 
             # Calculate total change percentage
-            total_pixels = binary_mask.size
-            changed_pixels = np.sum(binary_mask)
-            total_change_pct = (changed_pixels / total_pixels) * 100
+            total_change_pct = (changed_pixels / max(1, total_pixels)) * 100
 
             # If no significant change, return early
             if changed_pixels < self.min_region_size:
@@ -192,13 +279,28 @@ class ChangeDetector:
                     changed=False, total_change_percentage=total_change_pct, regions=[]
                 )
 
-            # Find connected components
-            regions = self._find_regions(binary_mask, max_diff)
+            # Find connected components (per refined box)
+            regions = []
+            for y0, x0, binary_mask, max_diff, count in refined:
+                if count < self.min_region_size:
+                    continue
+                for region in self._find_regions(binary_mask, max_diff):
+                    _shift_region(region, x0 + offset_x, y0 + offset_y)
+                    regions.append(region)
+            if len(refined) > 1:
+                regions.sort(key=lambda r: r.area, reverse=True)
+                for i, region in enumerate(regions):
+                    region.id = i + 1
 
             # Create diff image if requested
             diff_image = None
             if return_diff_image:
-                diff_image = self._create_diff_image(binary_mask)
+                full_mask = np.zeros(before.shape[:2], dtype=np.uint8)
+                for y0, x0, binary_mask, _, _ in refined:
+                    full_mask[
+                        y0 : y0 + binary_mask.shape[0], x0 : x0 + binary_mask.shape[1]
+                    ] = binary_mask
+                diff_image = self._create_diff_image(full_mask)
 
             return ChangeDetectionResult(
                 changed=len(regions) > 0,
@@ -213,6 +315,56 @@ class ChangeDetector:
                 changed=False, total_change_percentage=0, regions=[]
             )
 
+    def _candidate_boxes(
+        self, before: np.ndarray, after: np.ndarray
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Coarse pyramid pass: boxes (y0, y1, x0, x1) worth a full-resolution diff.
+
+        Compares every ``pyramid_scale``-th pixel, marks tiles with changes,
+        grows them by one tile (changes crossing a tile border) and groups
+        them into rectangles.
+        """
+        s = self.pyramid_scale
+        tile = self.pyramid_tile
+        coarse_tile = max(1, tile // s)
+        height, width = before.shape[:2]
+
+        coarse = _abs_diff(before[::s, ::s], after[::s, ::s]) > self.threshold
+        if not coarse.any():
+            return []
+
+        # Tile grid: any coarse change inside the tile
+        ch, cw = coarse.shape
+        th, tw = -(-ch // coarse_tile), -(-cw // coarse_tile)
+        padded = np.zeros((th * coarse_tile, tw * coarse_tile), dtype=bool)
+        padded[:ch, :cw] = coarse
+        tiles = padded.reshape(th, coarse_tile, tw, coarse_tile).any(axis=(1, 3))
+
+        # Grow by one tile in every direction
+        grown = tiles.copy()
+        grown[1:] |= tiles[:-1]
+        grown[:-1] |= tiles[1:]
+        grown_rows = grown.copy()
+        grown[:, 1:] |= grown_rows[:, :-1]
+        grown[:, :-1] |= grown_rows[:, 1:]
+
+        step = coarse_tile * s
+        boxes = []
+        for r0, r1 in self._find_contiguous_blocks(grown.any(axis=1)):
+            for c0, c1 in self._find_contiguous_blocks(grown[r0:r1].any(axis=0)):
+                if not tiles[r0:r1, c0:c1].any():
+                    continue
+                boxes.append(
+                    (
+                        r0 * step,
+                        min(height, r1 * step),
+                        c0 * step,
+                        min(width, c1 * step),
+                    )
+                )
+        return boxes
+
     def _find_regions(
         self, binary_mask: np.ndarray, intensity_map: np.ndarray
     ) -> List[ChangeRegion]:
@@ -371,25 +523,10 @@ class ChangeDetector:
 
     def _find_contiguous_blocks(self, arr: np.ndarray) -> List[Tuple[int, int]]:
         """Find contiguous blocks of True values in a 1D array."""
-        blocks = []
-        in_block = False
-        start = 0
-
-        for i, val in enumerate(arr):
-            if val and not in_block:
-                # Start of new block
-                start = i
-                in_block = True
-            elif not val and in_block:
-                # End of block
-                blocks.append((start, i))
-                in_block = False
-
-        # Handle block at end
-        if in_block:
-            blocks.append((start, len(arr)))
-
-        return blocks
+        padded = np.concatenate(([False], np.asarray(arr, dtype=bool), [False]))
+        # Rising edges start a block, falling edges end it
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        return [(int(a), int(b)) for a, b in zip(edges[::2], edges[1::2])]
 
     def _create_diff_image(self, binary_mask: np.ndarray) -> bytes:
         """Create a binary difference image."""
@@ -474,14 +611,10 @@ class ChangeDetector:
             before_img = Image.open(io.BytesIO(before)).convert("RGB")
 
             # Create difference heatmap
-            before_arr = np.array(before_img, dtype=np.int16)
-            after_arr = np.array(
-                Image.open(io.BytesIO(after)).convert("RGB"), dtype=np.int16
+            max_diff = _abs_diff(
+                np.array(before_img), np.array(after_img.convert("RGB"))
             )
 
-            diff = np.abs(after_arr - before_arr)
-            max_diff = np.max(diff, axis=2)
-
             # Create heatmap overlay
             heatmap = np.zeros(
                 (max_diff.shape[0], max_diff.shape[1], 4), dtype=np.uint8
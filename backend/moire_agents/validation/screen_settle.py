@@ -0,0 +1,285 @@
+"""
+Screen Settle - wait for the screen instead of sleeping a fixed time.
+
+Action paths used fixed sleeps after clicks and keystrokes (``wait_after``,
+``sleep`` actions, the LLM ``wait`` tool): too long for fast apps, too short
+for slow ones. ``wait_for_settle()`` watches the frame stream instead and
+returns
+
+  - as soon as ``stable_frames`` consecutive frames in the ROI are equal, or
+  - as soon as the ROI changes (``return_on_change=True``),
+
+bounded by ``max_wait``. With ``expect_change=True`` stability only counts
+once the ROI differs from ``baseline`` (a frame taken before the action),
+so an app that has not reacted yet is still waited for.
+
+Frame sources:
+  - local screen grab (mss, pyautogui fallback) - the default
+  - StreamFrameCache (frames pushed by a remote desktop client)
+
+Without frames the call degrades to sleeping ``max_wait``.
+
+Usage:
+    from validation.screen_settle import get_screen_settler
+
+    settler = get_screen_settler()
+    baseline = await settler.snapshot()
+    pyautogui.hotkey("win", "r")
+    result = await settler.wait_for_settle(
+        max_wait=2.0, baseline=baseline, expect_change=True
+    )
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Roi = Dict[str, int]  # {x, y, width, height} in screen pixels
+FrameSource = Callable[[Optional[Roi]], Optional[Tuple[float, np.ndarray]]]
+
+# Action types that are not expected to change the screen
+_NO_CHANGE_ACTIONS = {"moveTo", "move", "sleep", "wait"}
+
+
+def expects_change(action: Optional[Dict[str, Any]]) -> bool:
+    """True if the action should visibly change the screen."""
+    return bool(action) and action.get("type") not in _NO_CHANGE_ACTIONS
+
+
+def _crop(arr: np.ndarray, roi: Optional[Roi]) -> np.ndarray:
+    if roi is None:
+        return arr
+    x, y = max(0, int(roi["x"])), max(0, int(roi["y"]))
+    return arr[y : y + int(roi["height"]), x : x + int(roi["width"])]
+
+
+def grab_screen(roi: Optional[Roi] = None) -> np.ndarray:
+    """RGB grab of the primary monitor or a region of it (mss, pyautogui fallback)."""
+    try:
+        import mss
+
+        with mss.mss() as sct:
+            monitor = sct.monitors[1]
+            if roi is not None:
+                monitor = {
+                    "left": monitor["left"] + int(roi["x"]),
+                    "top": monitor["top"] + int(roi["y"]),
+                    "width": int(roi["width"]),
+                    "height": int(roi["height"]),
+                }
+            raw = sct.grab(monitor)
+            bgra = np.frombuffer(raw.bgra, dtype=np.uint8).reshape(
+                raw.height, raw.width, 4
+            )
+            return bgra[:, :, 2::-1]
+    except ImportError:
+        import pyautogui
+
+        region = (
+            None
+            if roi is None
+            else (int(roi["x"]), int(roi["y"]), int(roi["width"]), int(roi["height"]))
+        )
+        return np.asarray(pyautogui.screenshot(region=region).convert("RGB"))
+
+
+def local_source(roi: Optional[Roi]) -> Tuple[float, np.ndarray]:
+    """Frame source grabbing the local screen on every call."""
+    return time.time(), grab_screen(roi)
+
+
+def stream_source(monitor_id: int = 0, max_age_ms: float = 1000) -> FrameSource:
+    """Frame source reading the frames a desktop client streams in.
+
+    Each stream frame is decoded once; repeated calls return the same
+    timestamp until the client sends a new frame.
+    """
+    decoded: Dict[str, Any] = {"timestamp": None, "array": None}
+
+    def source(roi: Optional[Roi]) -> Optional[Tuple[float, np.ndarray]]:
+        from stream_frame_cache import StreamFrameCache
+
+        frame = StreamFrameCache.get_fresh_frame(monitor_id, max_age_ms)
+        if frame is None:
+            return None
+        if frame.timestamp != decoded["timestamp"]:
+            image = frame.to_pil_image()
+            if image is None:
+                return None
+            decoded["timestamp"] = frame.timestamp
+            decoded["array"] = np.asarray(image.convert("RGB"))
+        return decoded["timestamp"], _crop(decoded["array"], roi)
+
+    return source
+
+
+@dataclass
+class SettleResult:
+    """Outcome of one wait."""
+
+    settled: bool  # stable_frames equal frames seen
+    changed: bool  # ROI differed from the baseline / first frame
+    reason: str  # stable | changed | timeout | no_frames
+    elapsed: float
+    frames: int
+    frame: Optional[np.ndarray] = None  # last frame (ROI, full resolution)
+
+
+class ScreenSettler:
+    """Waits on a frame source until the screen (or an ROI) settles."""
+
+    def __init__(
+        self,
+        source: Optional[FrameSource] = None,
+        interval: float = 0.05,
+        stable_frames: int = 3,
+        threshold: int = 24,
+        tolerance: float = 0.001,
+        step: int = 2,
+    ):
+        """
+        Args:
+            source: Frame source (default: local screen grab)
+            interval: Poll interval in seconds
+            stable_frames: Consecutive equal frames that count as settled
+            threshold: Per-pixel channel difference that counts as changed
+            tolerance: Fraction of changed pixels still considered equal
+                       (caret blink, clock)
+            step: Pixel step of the comparison (2 = quarter of the pixels)
+        """
+        self.source = source or local_source
+        self.interval = interval
+        self.stable_frames = max(1, stable_frames)
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.step = max(1, step)
+        self.stats: Dict[str, Any] = {
+            "waits": 0,
+            "stable": 0,
+            "changed": 0,
+            "timeouts": 0,
+            "no_frames": 0,
+            "seconds_saved": 0.0,
+        }
+
+    def _prepare(self, arr: np.ndarray) -> np.ndarray:
+        return arr[:: self.step, :: self.step].astype(np.int16)
+
+    def differs(self, a: np.ndarray, b: np.ndarray) -> bool:
+        """True if two prepared frames differ beyond the tolerance."""
+        if a.shape != b.shape:
+            return True
+        diff = np.abs(a - b)
+        if diff.ndim == 3:
+            diff = diff.max(axis=2)
+        changed = np.count_nonzero(diff > self.threshold)
+        return changed > self.tolerance * diff.size
+
+    async def snapshot(self, roi: Optional[Roi] = None) -> Optional[np.ndarray]:
+        """Current frame of the ROI (e.g. as baseline before an action)."""
+        try:
+            grabbed = await asyncio.to_thread(self.source, roi)
+        except Exception as e:
+            logger.debug(f"Settle snapshot failed: {e}")
+            return None
+        return grabbed[1] if grabbed else None
+
+    async def wait_for_settle(
+        self,
+        roi: Optional[Roi] = None,
+        max_wait: float = 2.0,
+        stable_frames: Optional[int] = None,
+        baseline: Optional[np.ndarray] = None,
+        expect_change: bool = False,
+        return_on_change: bool = False,
+    ) -> SettleResult:
+        """Wait until the ROI is stable (or changed), at most ``max_wait``.
+
+        Args:
+            roi: Screen region to watch (None = whole screen)
+            max_wait: Upper bound in seconds (the former fixed sleep)
+            stable_frames: Override of the settled criterion
+            baseline: Frame of the same ROI taken before the action
+            expect_change: Only settle after the ROI differed from baseline
+            return_on_change: Return on the first change
+        """
+        needed = stable_frames or self.stable_frames
+        start = time.monotonic()
+        deadline = start + max(0.0, max_wait)
+        reference = self._prepare(baseline) if baseline is not None else None
+        expect_change = expect_change and reference is not None
+        previous = None
+        last_timestamp = None
+        last_frame = None
+        changed = False
+        stable = 0
+        frames = 0
+        self.stats["waits"] += 1
+
+        def finish(settled: bool, reason: str) -> SettleResult:
+            elapsed = time.monotonic() - start
+            self.stats[reason if reason != "timeout" else "timeouts"] += 1
+            self.stats["seconds_saved"] += max(0.0, max_wait - elapsed)
+            return SettleResult(settled, changed, reason, elapsed, frames, last_frame)
+
+        while True:
+            try:
+                grabbed = await asyncio.to_thread(self.source, roi)
+            except Exception as e:
+                # No usable frame source: behave like the old fixed sleep
+                logger.debug(f"Settle frame source failed: {e}")
+                await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+                return finish(False, "no_frames")
+
+            if grabbed is not None and grabbed[0] != last_timestamp:
+                last_timestamp, last_frame = grabbed
+                current = self._prepare(last_frame)
+                frames += 1
+                if reference is None:
+                    reference = current
+                elif not changed and self.differs(reference, current):
+                    changed = True
+                    if return_on_change:
+                        return finish(False, "changed")
+                if previous is not None and not self.differs(previous, current):
+                    stable += 1
+                else:
+                    stable = 1
+                previous = current
+                if stable >= needed and (changed or not expect_change):
+                    return finish(True, "stable")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return finish(False, "timeout" if frames else "no_frames")
+            await asyncio.sleep(min(self.interval, remaining))
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["seconds_saved"] = round(stats["seconds_saved"], 2)
+        return stats
+
+
+# Singleton
+_settler_instance: Optional[ScreenSettler] = None
+
+
+def get_screen_settler() -> ScreenSettler:
+    """Singleton settler on the local screen."""
+    global _settler_instance
+    if _settler_instance is None:
+        _settler_instance = ScreenSettler()
+    return _settler_instance
+
+
+async def wait_for_settle(
+    roi: Optional[Roi] = None, max_wait: float = 2.0, **kwargs
+) -> SettleResult:
+    """Shortcut for get_screen_settler().wait_for_settle()."""
+    return await get_screen_settler().wait_for_settle(roi, max_wait, **kwargs)
@@ -8,12 +8,15 @@ Verwendet:
 """
 
 import asyncio
+import dataclasses
 import hashlib
 import logging
+import struct
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -52,9 +55,69 @@ class ChangeType(Enum):
     ELEMENT_DISAPPEARED = "element_disappeared"
 
 
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Bildgröße aus dem Header (PNG direkt, sonst PIL ohne Pixel-Dekodierung)."""
+    if data[:8] == _PNG_SIGNATURE and len(data) >= 24:
+        return struct.unpack(">II", data[16:24])
+    if PIL_AVAILABLE:
+        try:
+            # Image.open liest nur den Header, dekodiert erst bei Bedarf
+            return Image.open(io.BytesIO(data)).size
+        except Exception:
+            pass
+    return None
+
+
+def _to_gray(frame: "np.ndarray") -> "np.ndarray":
+    """RGB(A)- oder Graustufen-Frame als uint8 Luminanz."""
+    if frame.ndim == 2:
+        return frame.astype(np.uint8, copy=False)
+    rgb = frame[..., :3].astype(np.uint16)
+    return ((rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8).astype(
+        np.uint8
+    )
+
+
+def _box_downscale(gray: "np.ndarray", scale: int) -> "np.ndarray":
+    """Mittelwert über scale x scale Blöcke (wie PIL BOX-Resize)."""
+    if scale <= 1:
+        return gray
+    h, w = gray.shape[0] // scale, gray.shape[1] // scale
+    blocks = gray[: h * scale, : w * scale].reshape(h, scale, w, scale)
+    return blocks.mean(axis=(1, 3)).astype(np.uint8)
+
+
+def perceptual_hash(gray: "np.ndarray") -> int:
+    """64-bit pHash: DCT des 32x32-Bildes, 8x8 Tieffrequenzen gegen den Median."""
+    h, w = gray.shape
+    rows = (np.arange(32) * h) // 32
+    cols = (np.arange(32) * w) // 32
+    small = gray[rows][:, cols].astype(np.float32)
+    n = np.arange(32)
+    dct = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / 64).astype(np.float32)
+    low = (dct @ small @ dct.T)[:8, :8].flatten()
+    bits = low > np.median(low[1:])
+    return int("".join("1" if b else "0" for b in bits), 2)
+
+
+def hamming_distance(hash1: int, hash2: int) -> int:
+    """Anzahl unterschiedlicher Bits zweier Perceptual Hashes."""
+    return bin(hash1 ^ hash2).count("1")
+
+
 @dataclass
 class ScreenState:
-    """Repräsentation eines Bildschirmzustands."""
+    """
+    Repräsentation eines Bildschirmzustands.
+
+    Pixel-Vergleiche nutzen ein verkleinertes Graustufen-Array (``thumbnail``,
+    1/thumbnail_scale) und einen 64-bit Perceptual Hash (``phash``). Beide
+    werden beim ersten Zugriff aus ``screenshot_data`` berechnet und
+    gecacht - jeder Screenshot wird höchstens einmal dekodiert.
+    """
 
     timestamp: float
     screenshot_hash: str
@@ -63,6 +126,10 @@ class ScreenState:
     ocr_text: List[str] = field(default_factory=list)
     window_title: Optional[str] = None
     dimensions: Tuple[int, int] = (1920, 1080)
+    thumbnail_scale: int = 4
+    # Lazy Caches: Graustufen-Arrays je Skalierung, Perceptual Hash
+    _gray: Dict[int, Any] = field(default_factory=dict, repr=False, compare=False)
+    _phash: Optional[int] = field(default=None, repr=False, compare=False)
 
     @classmethod
     def from_screenshot(
@@ -72,17 +139,9 @@ class ScreenState:
         ocr_text: Optional[List[str]] = None,
         window_title: Optional[str] = None,
     ) -> "ScreenState":
-        """Erstellt ScreenState aus Screenshot-Bytes."""
+        """Erstellt ScreenState aus Screenshot-Bytes (ohne zu dekodieren)."""
         screenshot_hash = hashlib.md5(screenshot_data).hexdigest()
 
-        dimensions = (1920, 1080)
-        if PIL_AVAILABLE:
-            try:
-                img = Image.open(io.BytesIO(screenshot_data))
-                dimensions = img.size
-            except:
-                pass
-
         return cls(
             timestamp=time.time(),
             screenshot_hash=screenshot_hash,
@@ -90,7 +149,75 @@ class ScreenState:
             elements=elements or [],
             ocr_text=ocr_text or [],
             window_title=window_title,
-            dimensions=dimensions,
+            dimensions=_image_size(screenshot_data) or (1920, 1080),
+        )
+
+    @classmethod
+    def from_array(
+        cls,
+        frame: "np.ndarray",
+        elements: Optional[List[Dict[str, Any]]] = None,
+        ocr_text: Optional[List[str]] = None,
+        window_title: Optional[str] = None,
+        thumbnail_scale: int = 4,
+    ) -> "ScreenState":
+        """Erstellt ScreenState aus einem bereits dekodierten Frame (kein PNG)."""
+        gray = _to_gray(frame)
+        thumbnail = _box_downscale(gray, thumbnail_scale)
+        return cls(
+            timestamp=time.time(),
+            screenshot_hash=hashlib.md5(thumbnail.tobytes()).hexdigest(),
+            elements=elements or [],
+            ocr_text=ocr_text or [],
+            window_title=window_title,
+            dimensions=(gray.shape[1], gray.shape[0]),
+            thumbnail_scale=thumbnail_scale,
+            _gray={thumbnail_scale: thumbnail},
+        )
+
+    def gray(self, scale: Optional[int] = None) -> Optional["np.ndarray"]:
+        """Graustufen-Array in 1/scale Auflösung (einmal dekodiert, gecacht)."""
+        scale = scale or self.thumbnail_scale
+        cached = self._gray.get(scale)
+        if cached is not None:
+            return cached
+        if not (self.screenshot_data and PIL_AVAILABLE and NUMPY_AVAILABLE):
+            return None
+        try:
+            img = Image.open(io.BytesIO(self.screenshot_data))
+            size = (max(1, img.width // scale), max(1, img.height // scale))
+            img.draft("L", size)  # JPEG: direkt verkleinert dekodieren
+            img = img.convert("L")
+            if img.size != size:
+                img = img.resize(size, Image.BOX)
+            self._gray[scale] = np.asarray(img)
+        except Exception as e:
+            logger.debug(f"Screenshot decode failed: {e}")
+            return None
+        return self._gray[scale]
+
+    @property
+    def thumbnail(self) -> Optional["np.ndarray"]:
+        """Verkleinertes Graustufen-Array für Pixel-Vergleiche."""
+        return self.gray(self.thumbnail_scale)
+
+    @property
+    def phash(self) -> Optional[int]:
+        """64-bit Perceptual Hash des Thumbnails."""
+        if self._phash is None:
+            thumbnail = self.thumbnail
+            if thumbnail is not None and NUMPY_AVAILABLE:
+                self._phash = perceptual_hash(thumbnail)
+        return self._phash
+
+    def compact(self, keep_bytes: bool = False) -> "ScreenState":
+        """Kopie für die Historie: nur Thumbnail + Hashes, Bytes nur auf Wunsch."""
+        self.phash  # berechnen, solange die Bytes noch da sind
+        thumbnail = self.thumbnail
+        return dataclasses.replace(
+            self,
+            screenshot_data=self.screenshot_data if keep_bytes else None,
+            _gray={self.thumbnail_scale: thumbnail} if thumbnail is not None else {},
         )
 
 
@@ -106,6 +233,7 @@ class ComparisonResult:
     new_elements: List[Dict[str, Any]] = field(default_factory=list)
     removed_elements: List[Dict[str, Any]] = field(default_factory=list)
     text_changes: List[Tuple[str, str]] = field(default_factory=list)
+    perceptual_distance: Optional[int] = None  # Hamming-Distanz der pHashes
 
 
 class StateComparator:
@@ -128,10 +256,15 @@ class StateComparator:
         self.significant_threshold = significant_threshold
         self.use_gpu = use_gpu
 
-        # State History
+        # State History (kompakt: Thumbnail + Hashes)
         self.state_history: List[ScreenState] = []
         self.max_history = 50
 
+        # Pixel-Ergebnisse je (hash1, hash2): wiederholte Polls ohne
+        # Bildschirmänderung liefern dieselben Screenshot-Hashes
+        self._pixel_cache: OrderedDict = OrderedDict()
+        self.max_pixel_cache = 64
+
     def compare(self, state1: ScreenState, state2: ScreenState) -> ComparisonResult:
         """
         Vergleicht zwei Bildschirmzustände.
@@ -152,19 +285,31 @@ class StateComparator:
                 description="Keine Änderung erkannt (identische Screenshots)",
             )
 
-        # Pixel-basierter Vergleich
+        # Pixel-basierter Vergleich (Thumbnails, Ergebnis je Hash-Paar gecacht)
         change_percentage = 0.0
         changed_regions = []
-
-        if (
-            state1.screenshot_data
-            and state2.screenshot_data
-            and PIL_AVAILABLE
-            and NUMPY_AVAILABLE
-        ):
-            change_percentage, changed_regions = self._compare_pixels(
-                state1.screenshot_data, state2.screenshot_data
-            )
+        perceptual_distance = None
+
+        cache_key = (state1.screenshot_hash, state2.screenshot_hash)
+        cached = self._pixel_cache.get(cache_key) if all(cache_key) else None
+        if cached is not None:
+            self._pixel_cache.move_to_end(cache_key)
+            change_percentage, changed_regions, perceptual_distance = cached
+        elif NUMPY_AVAILABLE:
+            thumb1, thumb2 = state1.thumbnail, state2.thumbnail
+            if thumb1 is not None and thumb2 is not None:
+                change_percentage, changed_regions = self._compare_pixels(
+                    thumb1, thumb2, state1.thumbnail_scale
+                )
+                perceptual_distance = hamming_distance(state1.phash, state2.phash)
+                if all(cache_key):
+                    self._pixel_cache[cache_key] = (
+                        change_percentage,
+                        changed_regions,
+                        perceptual_distance,
+                    )
+                    if len(self._pixel_cache) > self.max_pixel_cache:
+                        self._pixel_cache.popitem(last=False)
 
         # Element-Vergleich
         new_elements, removed_elements = self._compare_elements(
@@ -198,29 +343,24 @@ class StateComparator:
             new_elements=new_elements,
             removed_elements=removed_elements,
             text_changes=text_changes,
+            perceptual_distance=perceptual_distance,
         )
 
     def _compare_pixels(
-        self, data1: bytes, data2: bytes
+        self, arr1: "np.ndarray", arr2: "np.ndarray", scale: int = 1
     ) -> Tuple[float, List[Dict[str, Any]]]:
-        """Pixel-basierter Vergleich."""
+        """Pixel-basierter Vergleich zweier Graustufen-Arrays (1/scale)."""
         try:
-            img1 = Image.open(io.BytesIO(data1)).convert("RGB")
-            img2 = Image.open(io.BytesIO(data2)).convert("RGB")
-
             # Gleiche Größe sicherstellen
-            if img1.size != img2.size:
-                img2 = img2.resize(img1.size)
-
-            # Zu NumPy Arrays
-            arr1 = np.array(img1)
-            arr2 = np.array(img2)
-
-            # Differenz berechnen
-            diff = np.abs(arr1.astype(np.int16) - arr2.astype(np.int16))
-
-            # Threshold für signifikante Änderung (> 30 pro Kanal)
-            significant_diff = (diff > 30).any(axis=2)
+            if arr1.shape != arr2.shape:
+                h = min(arr1.shape[0], arr2.shape[0])
+                w = min(arr1.shape[1], arr2.shape[1])
+                arr1, arr2 = arr1[:h, :w], arr2[:h, :w]
+
+            # Threshold für signifikante Änderung (> 30 Helligkeit)
+            significant_diff = (
+                np.abs(arr1.astype(np.int16) - arr2.astype(np.int16)) > 30
+            )
 
             # Prozent der geänderten Pixel
             change_percentage = significant_diff.mean()
@@ -245,10 +385,10 @@ class StateComparator:
                                 "region": name,
                                 "change_percentage": float(quadrant_change),
                                 "bounds": {
-                                    "x": x1,
-                                    "y": y1,
-                                    "width": x2 - x1,
-                                    "height": y2 - y1,
+                                    "x": x1 * scale,
+                                    "y": y1 * scale,
+                                    "width": (x2 - x1) * scale,
+                                    "height": (y2 - y1) * scale,
                                 },
                             }
                         )
@@ -259,76 +399,71 @@ class StateComparator:
             logger.error(f"Pixel comparison failed: {e}")
             return 0.5, []  # Assume change on error
 
-    def _crop_to_roi(self, screenshot_data: bytes, roi: Dict[str, Any]) -> bytes:
+    def _crop_to_roi(
+        self, state: ScreenState, roi: Dict[str, Any]
+    ) -> Optional[ScreenState]:
         """
-        Croppt Screenshot auf ROI-Bereich.
+        Croppt einen Zustand auf den ROI-Bereich (volle Auflösung, Graustufen).
 
         Args:
-            screenshot_data: Screenshot als bytes
+            state: Bildschirmzustand (wird höchstens einmal dekodiert)
             roi: ROI dict mit origin_x, origin_y, base_width, base_height, zoom
 
         Returns:
-            Gecroppter Screenshot als bytes
+            ScreenState des Ausschnitts oder None
         """
-        if not PIL_AVAILABLE:
-            logger.warning("PIL not available for ROI cropping")
-            return screenshot_data
-
-        try:
-            # Berechne Bounds mit Zoom
-            zoom = roi.get("zoom", 1.5)
-            base_w = roi.get("base_width", 150)
-            base_h = roi.get("base_height", 60)
-            origin_x = roi.get("origin_x", 0)
-            origin_y = roi.get("origin_y", 0)
-
-            scaled_w = int(base_w * zoom)
-            scaled_h = int(base_h * zoom)
-
-            x1 = max(0, origin_x - scaled_w // 2)
-            y1 = max(0, origin_y - scaled_h // 2)
-            x2 = x1 + scaled_w
-            y2 = y1 + scaled_h
+        gray = state.gray(1) if NUMPY_AVAILABLE else None
+        if gray is None:
+            logger.warning("ROI cropping not possible (no decodable screenshot)")
+            return None
 
-            # Bild öffnen und croppen
-            img = Image.open(io.BytesIO(screenshot_data))
+        # Berechne Bounds mit Zoom
+        zoom = roi.get("zoom", 1.5)
+        base_w = roi.get("base_width", 150)
+        base_h = roi.get("base_height", 60)
+        origin_x = roi.get("origin_x", 0)
+        origin_y = roi.get("origin_y", 0)
 
-            # Bounds an Bildgröße anpassen
-            x2 = min(x2, img.width)
-            y2 = min(y2, img.height)
+        scaled_w = int(base_w * zoom)
+        scaled_h = int(base_h * zoom)
 
-            cropped = img.crop((x1, y1, x2, y2))
+        x1 = max(0, origin_x - scaled_w // 2)
+        y1 = max(0, origin_y - scaled_h // 2)
 
-            # Als bytes zurückgeben
-            buffer = io.BytesIO()
-            cropped.save(buffer, format="PNG")
-            return buffer.getvalue()
+        # Bounds an Bildgröße anpassen
+        x2 = min(x1 + scaled_w, gray.shape[1])
+        y2 = min(y1 + scaled_h, gray.shape[0])
 
-        except Exception as e:
-            logger.error(f"ROI cropping failed: {e}")
-            return screenshot_data
+        return ScreenState.from_array(gray[y1:y2, x1:x2], thumbnail_scale=1)
 
     def compare_with_roi(
-        self, before_data: bytes, after_data: bytes, roi: Dict[str, Any]
+        self,
+        before: Union[bytes, ScreenState],
+        after: Union[bytes, ScreenState],
+        roi: Dict[str, Any],
     ) -> ComparisonResult:
         """
         Vergleicht nur ROI-Bereiche zweier Screenshots.
 
         Args:
-            before_data: Screenshot vor der Aktion
-            after_data: Screenshot nach der Aktion
+            before: Screenshot (oder ScreenState) vor der Aktion - ein
+                    wiederverwendeter ScreenState wird nur einmal dekodiert
+            after: Screenshot (oder ScreenState) nach der Aktion
             roi: ROI dict mit origin_x, origin_y, base_width, base_height, zoom
 
         Returns:
             ComparisonResult
         """
-        # Croppe beide Screenshots auf ROI
-        before_roi = self._crop_to_roi(before_data, roi)
-        after_roi = self._crop_to_roi(after_data, roi)
+        if not isinstance(before, ScreenState):
+            before = ScreenState.from_screenshot(before)
+        if not isinstance(after, ScreenState):
+            after = ScreenState.from_screenshot(after)
 
-        # Erstelle States für Vergleich
-        before_state = ScreenState.from_screenshot(before_roi)
-        after_state = ScreenState.from_screenshot(after_roi)
+        # Croppe beide Screenshots auf ROI
+        before_state = self._crop_to_roi(before, roi)
+        after_state = self._crop_to_roi(after, roi)
+        if before_state is None or after_state is None:
+            before_state, after_state = before, after
 
         # Nutze bestehende compare() Methode mit angepassten Thresholds
         # Speichere alte Thresholds
@@ -466,9 +601,9 @@ class StateComparator:
 
         return "; ".join(parts)
 
-    def add_to_history(self, state: ScreenState):
-        """Fügt Zustand zur Historie hinzu."""
-        self.state_history.append(state)
+    def add_to_history(self, state: ScreenState, keep_bytes: bool = False):
+        """Fügt Zustand kompakt (ohne Screenshot-Bytes) zur Historie hinzu."""
+        self.state_history.append(state.compact(keep_bytes))
         if len(self.state_history) > self.max_history:
             self.state_history = self.state_history[-self.max_history :]
 
@@ -476,6 +611,20 @@ class StateComparator:
         """Gibt letzten Zustand zurück."""
         return self.state_history[-1] if self.state_history else None
 
+    def find_in_history(
+        self, state: ScreenState, max_distance: int = 0
+    ) -> Optional[ScreenState]:
+        """Letzter Historien-Zustand mit (fast) gleichem Perceptual Hash."""
+        if state.phash is None:
+            return None
+        for past in reversed(self.state_history):
+            if (
+                past.phash is not None
+                and hamming_distance(past.phash, state.phash) <= max_distance
+            ):
+                return past
+        return None
+
     def has_state_changed_since(
         self,
         reference_state: ScreenState,
@@ -0,0 +1,330 @@
+"""
+Tiered Validator - cheap-first validation of executed actions.
+
+A full MoireServer capture (detection + OCR) before and after every action
+costs seconds. Most keyboard steps can be proven with far less:
+
+  Tier 0 (PIXEL):   downscaled frame diff + change regions (ChangeDetector),
+                    optionally checked against an ROI around the action
+  Tier 1 (ROI_OCR): OCR of the changed region only (typed text visible?)
+  Tier 2 (FULL):    full capture + StateComparator (caller-provided)
+
+A per-action-type TierPolicy decides how far a step may escalate. Tiers
+only escalate when the cheaper one cannot decide.
+
+Usage:
+    from validation.tiered_validator import TieredValidator
+
+    validator = TieredValidator()
+    policy = validator.policy_for(action)
+    before = await validator.grab()
+    await execute(action)
+    verdict = await validator.validate(action, policy, before)
+    if verdict.outcome == Outcome.ESCALATE:
+        ...  # full capture
+"""
+
+import asyncio
+import difflib
+import logging
+import re
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+from validation.change_detector import ChangeDetector, ChangeRegion
+from validation.screen_settle import grab_screen
+
+logger = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+
+
+class ValidationTier(IntEnum):
+    """How expensive a validation step is (ordered)."""
+
+    NONE = -1  # action is not expected to change the screen
+    PIXEL = 0
+    ROI_OCR = 1
+    FULL = 2
+
+
+class Outcome(Enum):
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+    ESCALATE = "escalate"  # caller must run the full tier
+
+
+@dataclass
+class TierPolicy:
+    """How far validation of one action type may escalate."""
+
+    max_tier: ValidationTier = ValidationTier.FULL
+    roi_radius: int = 0  # > 0: changes near the action's x/y count as proof
+    verify_text: bool = False  # Tier 1 must find the typed text
+    accept_change_pct: float = 0.05  # Tier 0 change (in %) that proves the action
+
+
+DEFAULT_POLICIES: Dict[str, TierPolicy] = {
+    "write": TierPolicy(ValidationTier.ROI_OCR, verify_text=True),
+    "press": TierPolicy(ValidationTier.PIXEL),
+    "select_text": TierPolicy(ValidationTier.PIXEL),
+    "scroll": TierPolicy(ValidationTier.PIXEL),
+    "hotkey": TierPolicy(ValidationTier.FULL, accept_change_pct=0.5),
+    "click": TierPolicy(ValidationTier.FULL, roi_radius=150, accept_change_pct=1.0),
+    "moveTo": TierPolicy(ValidationTier.NONE),
+    "sleep": TierPolicy(ValidationTier.NONE),
+}
+
+
+@dataclass
+class Frame:
+    """A raw screen grab plus its downscaled copy for diffing."""
+
+    full: np.ndarray  # (H, W, 3) uint8, screen resolution
+    small: np.ndarray  # every ``scale``-th pixel
+    scale: int
+
+
+@dataclass
+class TierVerdict:
+    """Result of the cheap tiers."""
+
+    outcome: Outcome
+    tier: ValidationTier
+    confidence: float
+    message: str
+    change_percentage: float = 0.0
+    regions: List[ChangeRegion] = field(default_factory=list)
+    ocr_text: Optional[str] = None
+
+
+def _normalize(text: str) -> str:
+    return _WS_RE.sub(" ", text).strip().lower()
+
+
+def text_visible(expected: str, ocr_text: str, min_ratio: float = 0.8) -> bool:
+    """True if ``expected`` (or its last 30 chars) is readable in ``ocr_text``."""
+    needle = _normalize(expected)[-30:]
+    hay = _normalize(ocr_text)
+    if not needle:
+        return True
+    if needle in hay:
+        return True
+    # Best-matching window of the same length (OCR swaps single characters)
+    n = len(needle)
+    matcher = difflib.SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(needle)
+    for start in range(max(1, len(hay) - n + 1)):
+        matcher.set_seq1(hay[start : start + n])
+        if matcher.ratio() >= min_ratio:
+            return True
+    return False
+
+
+def _try_pytesseract():
+    try:
+        import pytesseract
+        from PIL import Image
+
+        return pytesseract, Image
+    except ImportError:
+        return None
+
+
+class TieredValidator:
+    """Validates actions with the cheapest tier that can decide."""
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, TierPolicy]] = None,
+        scale: int = 4,
+        grab: Optional[Callable[[], np.ndarray]] = None,
+        ocr: Optional[Callable[[np.ndarray], Awaitable[str]]] = None,
+        roi_padding: int = 12,
+    ):
+        """
+        Args:
+            policies: Per action type policies (merged over DEFAULT_POLICIES)
+            scale: Downscale factor for the Tier 0 diff
+            grab: Screen grab returning an (H, W, 3) array (default: mss)
+            ocr: Async OCR of an (H, W, 3) crop (default: pytesseract)
+            roi_padding: Pixels added around changed regions for Tier 1
+        """
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.default_policy = TierPolicy()
+        self.scale = max(1, scale)
+        self.roi_padding = roi_padding
+        self._grab = grab or grab_screen
+        self._ocr = ocr
+        # Thresholds refer to the downscaled frame
+        self.detector = ChangeDetector(
+            threshold=25, min_region_size=max(4, 100 // (self.scale * self.scale))
+        )
+        self.stats: Dict[str, int] = {
+            "validations": 0,
+            "skipped": 0,
+            "tier0_decided": 0,
+            "tier1_decided": 0,
+            "escalated": 0,
+        }
+
+    def policy_for(self, action: Dict[str, Any]) -> TierPolicy:
+        return self.policies.get(action.get("type", ""), self.default_policy)
+
+    async def grab(self) -> Frame:
+        """Grab the screen (in a thread) and prepare the downscaled copy."""
+        return self.wrap(await asyncio.to_thread(self._grab))
+
+    def wrap(self, full: np.ndarray) -> Frame:
+        """Frame of an already grabbed full-resolution screen."""
+        return Frame(
+            full=full, small=full[:: self.scale, :: self.scale], scale=self.scale
+        )
+
+    # ─── Tiers ──────────────────────────────────────────────────────────────
+
+    def _roi_hit(self, action: Dict[str, Any], policy: TierPolicy, regions) -> bool:
+        x, y = action.get("x"), action.get("y")
+        if not policy.roi_radius or x is None or y is None:
+            return False
+        r = policy.roi_radius
+        for region in regions:
+            rx, ry = region.x * self.scale, region.y * self.scale
+            rw, rh = region.width * self.scale, region.height * self.scale
+            if rx - r <= x <= rx + rw + r and ry - r <= y <= ry + rh + r:
+                return True
+        return False
+
+    async def _read_regions(
+        self, frame: Frame, regions: List[ChangeRegion]
+    ) -> Optional[str]:
+        """OCR the union of the changed regions (full resolution)."""
+        if not regions:
+            return None
+        s, pad = self.scale, self.roi_padding
+        h, w = frame.full.shape[:2]
+        x0 = max(0, min(r.x for r in regions) * s - pad)
+        y0 = max(0, min(r.y for r in regions) * s - pad)
+        x1 = min(w, max(r.x + r.width for r in regions) * s + pad)
+        y1 = min(h, max(r.y + r.height for r in regions) * s + pad)
+        crop = np.ascontiguousarray(frame.full[y0:y1, x0:x1])
+
+        if self._ocr is not None:
+            return await self._ocr(crop)
+        tesseract = _try_pytesseract()
+        if tesseract is None:
+            return None
+        pytesseract, image_cls = tesseract
+        return await asyncio.to_thread(
+            pytesseract.image_to_string, image_cls.fromarray(crop)
+        )
+
+    async def validate(
+        self,
+        action: Dict[str, Any],
+        policy: TierPolicy,
+        before: Optional[Frame],
+        after: Optional[Frame] = None,
+    ) -> TierVerdict:
+        """Run Tier 0 (and Tier 1 if the policy asks for it).
+
+        Returns ESCALATE when only a full capture can decide and the
+        policy allows it.
+        """
+        self.stats["validations"] += 1
+        if policy.max_tier == ValidationTier.NONE:
+            self.stats["skipped"] += 1
+            return TierVerdict(
+                Outcome.CONFIRMED, ValidationTier.NONE, 1.0, "not validated"
+            )
+        if before is None:
+            return self._escalate_or_fail(policy, "no before frame", 0.0, [])
+
+        after = after or await self.grab()
+        result = self.detector.detect_changes_arrays(before.small, after.small)
+        pct = result.total_change_percentage
+        regions = result.regions
+
+        if not result.changed:
+            # Pixel-identical (below threshold): a full capture of the same
+            # pixels cannot find a change either.
+            self.stats["tier0_decided"] += 1
+            return TierVerdict(
+                Outcome.FAILED,
+                ValidationTier.PIXEL,
+                0.1,
+                f"no_change: {pct:.2f}% pixels",
+                change_percentage=pct,
+            )
+
+        if policy.verify_text and action.get("text"):
+            if policy.max_tier >= ValidationTier.ROI_OCR:
+                ocr_text = await self._read_regions(after, regions)
+                if ocr_text is not None:
+                    self.stats["tier1_decided"] += 1
+                    if text_visible(action["text"], ocr_text):
+                        return TierVerdict(
+                            Outcome.CONFIRMED,
+                            ValidationTier.ROI_OCR,
+                            0.9,
+                            f"text_changed: typed text visible ({len(regions)} region(s))",
+                            change_percentage=pct,
+                            regions=regions,
+                            ocr_text=ocr_text,
+                        )
+                    return self._escalate_or_fail(
+                        policy,
+                        "typed text not found in changed region",
+                        pct,
+                        regions,
+                        ValidationTier.ROI_OCR,
+                        ocr_text,
+                    )
+            # No OCR available: the pixel change is the best evidence we have
+
+        near_target = self._roi_hit(action, policy, regions)
+        if near_target or pct >= policy.accept_change_pct:
+            self.stats["tier0_decided"] += 1
+            where = "at target" if near_target else f"{len(regions)} region(s)"
+            return TierVerdict(
+                Outcome.CONFIRMED,
+                ValidationTier.PIXEL,
+                0.85 if near_target else 0.7,
+                f"pixel_change: {pct:.2f}% ({where})",
+                change_percentage=pct,
+                regions=regions,
+            )
+
+        return self._escalate_or_fail(policy, f"minor change {pct:.2f}%", pct, regions)
+
+    def _escalate_or_fail(
+        self,
+        policy: TierPolicy,
+        reason: str,
+        pct: float,
+        regions: List[ChangeRegion],
+        tier: ValidationTier = ValidationTier.PIXEL,
+        ocr_text: Optional[str] = None,
+    ) -> TierVerdict:
+        if policy.max_tier >= ValidationTier.FULL:
+            self.stats["escalated"] += 1
+            return TierVerdict(
+                Outcome.ESCALATE, tier, 0.0, reason, pct, regions, ocr_text
+            )
+        # Below the policy ceiling a weak change still counts (e.g. a key
+        # press that only moved the caret), an unreadable text does not.
+        outcome = Outcome.FAILED if ocr_text is not None else Outcome.CONFIRMED
+        return TierVerdict(
+            outcome,
+            tier,
+            0.3 if outcome == Outcome.FAILED else 0.5,
+            reason,
+            pct,
+            regions,
+            ocr_text,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
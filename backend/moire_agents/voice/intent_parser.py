@@ -173,7 +173,7 @@ Wichtig:
             self.model = model
 
         self._client = None
-        self._openrouter_url = "https://openrouter.ai/api/v1/chat/completions"
+        self._openrouter_url = "https://openrouter.ai/api/v1"
 
     def _get_client(self):
         """Get or create Anthropic client."""
@@ -221,16 +221,15 @@ Wichtig:
             logger.error("OPENROUTER_API_KEY not set")
             return None
 
+        # Lazy: core pulls in aiohttp, which the quick pattern path
+        # (QuickIntentParser) does not need.
         try:
-            import aiohttp
-
-            headers = {
-                "Authorization": f"Bearer {self.openrouter_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://moire-automation.local",
-                "X-Title": "Moire Voice Automation",
-            }
+            from core.llm_transport import LLMTransportError, get_llm_transport
+        except ImportError as e:
+            logger.error(f"LLM transport unavailable: {e}")
+            return None
 
+        try:
             payload = {
                 "model": self.model,
                 "max_tokens": self.max_tokens,
@@ -241,25 +240,20 @@ Wichtig:
                 ],
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self._openrouter_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30),
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(
-                            f"OpenRouter API error: {response.status} - {error_text}"
-                        )
-                        return None
-
-                    data = await response.json()
-                    return data["choices"][0]["message"]["content"]
-
-        except ImportError:
-            logger.error("aiohttp not installed. Run: pip install aiohttp")
+            data = await get_llm_transport().chat_completions(
+                payload,
+                api_key=self.openrouter_key,
+                headers={
+                    "HTTP-Referer": "https://moire-automation.local",
+                    "X-Title": "Moire Voice Automation",
+                },
+                timeout=30.0,
+                base_url=self._openrouter_url,
+            )
+            return data["choices"][0]["message"]["content"]
+
+        except LLMTransportError as e:
+            logger.error(f"OpenRouter API error: {e.status} - {e.body}")
             return None
         except Exception as e:
             logger.error(f"OpenRouter API call failed: {e}")
@@ -281,10 +275,30 @@ Wichtig:
             user_prompt = f"Kontext: {context}\n\nBefehl: {text}"
 
         try:
-            if self.backend == LLMBackend.OPENROUTER:
-                response_text = await self._call_openrouter(user_prompt)
-            else:
-                response_text = await self._call_anthropic(user_prompt)
+            # Wiederholte Sprachbefehle aus dem Response-Cache bedienen
+            # (lazy, wie der Transport in _call_openrouter)
+            from core.llm_cache import get_llm_cache
+
+            cache = get_llm_cache()
+            cache_key = cache.make_key(
+                {
+                    "model": f"{self.backend.value}:{self.model}",
+                    "messages": [
+                        {"role": "system", "content": self.SYSTEM_PROMPT},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    "temperature": self.temperature,
+                    "max_tokens": self.max_tokens,
+                }
+            )
+            response_text = cache.get("voice_intent", cache_key)
+            from_cache = response_text is not None
+
+            if response_text is None:
+                if self.backend == LLMBackend.OPENROUTER:
+                    response_text = await self._call_openrouter(user_prompt)
+                else:
+                    response_text = await self._call_anthropic(user_prompt)
 
             if response_text is None:
                 return ParsedIntent(
@@ -298,6 +312,8 @@ Wichtig:
                     original_text=text,
                     error=f"Could not parse JSON from response: {response_text[:200]}",
                 )
+            if not from_cache:
+                cache.put("voice_intent", cache_key, response_text)
 
             # Convert to Action objects
             actions = []
@@ -753,6 +769,134 @@ QUICK_PATTERNS = {
 }
 
 
+# Short patterns that should only match as EXACT commands (not within sentences)
+# These are single-word commands that could easily match within longer sentences
+EXACT_MATCH_ONLY = {
+    "suche",
+    "copy",
+    "paste",
+    "undo",
+    "save",
+    "kopieren",
+    "einfügen",
+    "rückgängig",
+    "speichern",
+    "screenshot",
+}
+
+# If the command has more than 4 words and contains context words,
+# it's likely a complex command that should go to LLM
+COMPLEX_INDICATORS = {
+    "in",
+    "nach",
+    "für",
+    "an",
+    "bei",
+    "auf",
+    "und",
+    "dann",
+    "dort",
+    "hier",
+}
+
+OPEN_APP_PREFIXES = ("öffne ", "oeffne ", "open ")
+
+# Match rules encoded per pattern in the automaton
+_RULE_EXACT = 0  # whole utterance must equal the pattern
+_RULE_OPEN_APP = 1  # not complex, at most 5 words
+_RULE_DEFAULT = 2  # at most 6 words
+
+
+@dataclass
+class _PatternEntry:
+    """Match metadata for one compiled quick pattern."""
+
+    pattern: str
+    actions: List[Action]
+    rank: int  # lower wins: longest pattern first, then insertion order
+    rule: int
+
+
+class PatternAutomaton:
+    """Aho-Corasick automaton over the quick patterns.
+
+    One left-to-right pass over the utterance finds every pattern that
+    occurs as a substring; each hit is filtered by its rule and the
+    lowest-ranked survivor wins. This matches the previous "sort by length,
+    then substring-test each pattern" loop, in time linear in the
+    utterance length instead of in the number of patterns.
+    """
+
+    def __init__(self, patterns: Dict[str, List[Action]]):
+        # Python's sort is stable, so equal-length patterns keep dict order.
+        ordered = sorted(patterns.items(), key=lambda x: len(x[0]), reverse=True)
+        self.entries: List[_PatternEntry] = []
+        for rank, (pattern, actions) in enumerate(ordered):
+            if pattern in EXACT_MATCH_ONLY:
+                rule = _RULE_EXACT
+            elif pattern.startswith(OPEN_APP_PREFIXES):
+                rule = _RULE_OPEN_APP
+            else:
+                rule = _RULE_DEFAULT
+            self.entries.append(_PatternEntry(pattern, actions, rank, rule))
+
+        # Trie: goto transitions, failure links and output entry ids per state.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for idx, entry in enumerate(self.entries):
+            state = 0
+            for ch in entry.pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(idx)
+
+        # BFS to build failure links; merge outputs along them.
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                fallback = self._goto[f].get(ch, 0)
+                self._fail[nxt] = fallback if fallback != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def match(self, text_lower: str, word_count: int, is_complex: bool):
+        """Best pattern entry for an utterance, or None."""
+        best: Optional[_PatternEntry] = None
+        goto, fail, out, entries = self._goto, self._fail, self._out, self.entries
+        text_len = len(text_lower)
+        state = 0
+        for ch in text_lower:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                entry = entries[idx]
+                if best is not None and entry.rank >= best.rank:
+                    continue
+                if entry.rule == _RULE_EXACT:
+                    ok = len(entry.pattern) == text_len
+                elif entry.rule == _RULE_OPEN_APP:
+                    ok = not is_complex and word_count <= 5
+                else:
+                    ok = word_count <= 6
+                if ok:
+                    best = entry
+        return best
+
+
 class QuickIntentParser:
     """Fast intent parser using pattern matching for common commands."""
 
@@ -764,15 +908,20 @@ class QuickIntentParser:
         """
         self.fallback_parser = fallback_parser
         self.patterns = QUICK_PATTERNS.copy()
+        self._automaton: Optional[PatternAutomaton] = PatternAutomaton(self.patterns)
 
     def add_pattern(self, pattern: str, actions: List[Action]):
         """Add a custom pattern.
 
+        The automaton is rebuilt lazily on the next parse, so bulk
+        registration of many patterns costs a single compile.
+
         Args:
             pattern: Pattern text (lowercase)
             actions: Actions to execute for this pattern
         """
         self.patterns[pattern.lower()] = actions
+        self._automaton = None
 
     async def parse(self, text: str) -> ParsedIntent:
         """Parse text using quick patterns or fallback.
@@ -783,85 +932,20 @@ class QuickIntentParser:
         Returns:
             ParsedIntent with actions
         """
-        import re
-
         text_lower = text.lower().strip()
         words = text_lower.split()
+        is_complex = len(words) > 4 and any(w in COMPLEX_INDICATORS for w in words)
 
-        # Sort patterns by length (longest first) to prefer more specific matches
-        sorted_patterns = sorted(
-            self.patterns.items(), key=lambda x: len(x[0]), reverse=True
-        )
-
-        # Short patterns that should only match as EXACT commands (not within sentences)
-        # These are single-word commands that could easily match within longer sentences
-        exact_match_only = {
-            "suche",
-            "copy",
-            "paste",
-            "undo",
-            "save",
-            "kopieren",
-            "einfügen",
-            "rückgängig",
-            "speichern",
-            "screenshot",
-        }
-
-        # If the command has more than 4 words and contains context words,
-        # it's likely a complex command that should go to LLM
-        complex_indicators = [
-            "in",
-            "nach",
-            "für",
-            "an",
-            "bei",
-            "auf",
-            "und",
-            "dann",
-            "dort",
-            "hier",
-        ]
-        is_complex = len(words) > 4 and any(w in complex_indicators for w in words)
-
-        for pattern, actions in sorted_patterns:
-            pattern_words = pattern.split()
-
-            # For exact match patterns, only match if text is exactly the pattern
-            if pattern in exact_match_only:
-                if text_lower == pattern:
-                    return ParsedIntent(
-                        original_text=text,
-                        actions=actions,
-                        context=f"Quick pattern: {pattern}",
-                        confidence=1.0,
-                    )
-            # For app-opening patterns, allow if the text is short enough or matches closely
-            elif (
-                pattern.startswith("öffne ")
-                or pattern.startswith("oeffne ")
-                or pattern.startswith("open ")
-            ):
-                # Extract app name from pattern
-                # Only match if it's a simple "open X" command, not a complex instruction
-                if not is_complex and pattern in text_lower:
-                    # Make sure it's not embedded in a longer complex sentence
-                    if len(words) <= 5:  # "öffne chrome und geh auf google" = 5 words
-                        return ParsedIntent(
-                            original_text=text,
-                            actions=actions,
-                            context=f"Quick pattern: {pattern}",
-                            confidence=1.0,
-                        )
-            else:
-                # For other patterns (keyboard shortcuts, scroll, etc.)
-                if pattern in text_lower and len(words) <= 6:
-                    return ParsedIntent(
-                        original_text=text,
-                        actions=actions,
-                        context=f"Quick pattern: {pattern}",
-                        confidence=1.0,
-                    )
+        if self._automaton is None:
+            self._automaton = PatternAutomaton(self.patterns)
+        entry = self._automaton.match(text_lower, len(words), is_complex)
+        if entry is not None:
+            return ParsedIntent(
+                original_text=text,
+                actions=entry.actions,
+                context=f"Quick pattern: {entry.pattern}",
+                confidence=1.0,
+            )
 
         # Fallback to Claude parser for complex commands
         if self.fallback_parser:
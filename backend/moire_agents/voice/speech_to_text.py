@@ -11,6 +11,7 @@ Sources:
 """
 
 import asyncio
+import collections
 import io
 import logging
 import os
@@ -267,6 +268,24 @@ class SpeechToText:
             logger.error(f"Groq transcription failed: {e}")
             return TranscriptionResult(text="", backend="groq_whisper")
 
+    async def transcribe_array(
+        self, audio: Any, sample_rate: int = 16000
+    ) -> TranscriptionResult:
+        """Transcribe a mono float32 numpy array in [-1, 1].
+
+        Local Whisper consumes the array directly (no temp file, no WAV
+        round-trip); API backends get an in-memory 16-bit WAV.
+        """
+        if self.backend == STTBackend.LOCAL_WHISPER and sample_rate == 16000:
+            return await self._transcribe_local_array(audio)
+
+        import numpy as np
+
+        audio_bytes = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        return await self.transcribe_audio(
+            audio_bytes, sample_rate=sample_rate, channels=1
+        )
+
     async def _transcribe_local(
         self, audio_data: bytes, sample_rate: int, channels: int
     ) -> TranscriptionResult:
@@ -274,39 +293,43 @@ class SpeechToText:
         if not self.whisper_model:
             return TranscriptionResult(text="", backend="local_whisper")
 
-        import tempfile
-
         import numpy as np
 
-        # Convert bytes to numpy array
+        # Whisper accepts 16 kHz mono float32 arrays directly.
         audio_np = (
             np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
         )
+        if channels > 1:
+            audio_np = audio_np.reshape(-1, channels).mean(axis=1)
+        if sample_rate != 16000:
+            # Linear resample — good enough for speech commands.
+            n_out = int(len(audio_np) * 16000 / sample_rate)
+            audio_np = np.interp(
+                np.linspace(0, len(audio_np) - 1, n_out),
+                np.arange(len(audio_np)),
+                audio_np,
+            ).astype(np.float32)
+        return await self._transcribe_local_array(audio_np)
+
+    async def _transcribe_local_array(self, audio_np: Any) -> TranscriptionResult:
+        """Run local Whisper on a 16 kHz mono float32 array."""
+        if not self.whisper_model:
+            return TranscriptionResult(text="", backend="local_whisper")
 
-        # Save to temp file (Whisper requires file input)
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            temp_path = f.name
-            wav_buffer = self._create_wav(audio_data, sample_rate, channels)
-            f.write(wav_buffer.read())
-
-        try:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.whisper_model.transcribe(
-                    temp_path, language=self.language, fp16=False
-                ),
-            )
+        loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(
+            None,
+            lambda: self.whisper_model.transcribe(
+                audio_np, language=self.language, fp16=False
+            ),
+        )
 
-            return TranscriptionResult(
-                text=result["text"].strip(),
-                language=result.get("language"),
-                backend="local_whisper",
-            )
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        return TranscriptionResult(
+            text=result["text"].strip(),
+            language=result.get("language"),
+            duration_seconds=len(audio_np) / 16000.0,
+            backend="local_whisper",
+        )
 
     def _create_wav(
         self, audio_data: bytes, sample_rate: int, channels: int
@@ -375,8 +398,65 @@ class SpeechToText:
         return TranscriptionResult(text="", backend="unknown")
 
 
+class AudioRingBuffer:
+    """Fixed-capacity float32 ring buffer for mono audio samples.
+
+    Appends are O(chunk) and never reallocate; ``read(start)`` returns the
+    samples from an absolute sample index up to the write head.
+    """
+
+    def __init__(self, capacity: int):
+        import numpy as np
+
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.total_written = 0  # absolute index of the write head
+
+    def append(self, samples: Any) -> None:
+        n = len(samples)
+        if n >= self.capacity:
+            samples = samples[-self.capacity :]
+            self.total_written += n - self.capacity
+            n = self.capacity
+        pos = self.total_written % self.capacity
+        first = min(n, self.capacity - pos)
+        self._data[pos : pos + first] = samples[:first]
+        if first < n:
+            self._data[: n - first] = samples[first:]
+        self.total_written += n
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest sample still held."""
+        return max(0, self.total_written - self.capacity)
+
+    def read(self, start: int, end: Optional[int] = None) -> Any:
+        import numpy as np
+
+        end = self.total_written if end is None else min(end, self.total_written)
+        start = max(start, self.oldest)
+        n = end - start
+        if n <= 0:
+            return np.zeros(0, dtype=np.float32)
+        pos = start % self.capacity
+        first = min(n, self.capacity - pos)
+        if first == n:
+            return self._data[pos : pos + n].copy()
+        return np.concatenate([self._data[pos:], self._data[: n - first]])
+
+
 class RealtimeSpeechToText:
-    """Real-time speech recognition with microphone input."""
+    """Real-time speech recognition with microphone input.
+
+    The audio callback only queues chunks. The processing loop drains new
+    chunks into a ring buffer and runs an energy VAD on fixed-size frames of
+    the *new* samples only, so per-tick work is constant in utterance
+    length. An utterance ends after ``silence_threshold`` seconds of
+    trailing silence (or at ``max_utterance_seconds``), and the utterance
+    is handed to Whisper as an in-memory array. While speech continues,
+    partial transcripts are streamed to ``on_partial`` every
+    ``partial_interval`` seconds; partial and final calls never overlap.
+    """
 
     def __init__(
         self,
@@ -385,6 +465,11 @@ class RealtimeSpeechToText:
         on_partial: Optional[Callable[[str], None]] = None,
         silence_threshold: float = 0.5,  # seconds
         min_speech_duration: float = 0.3,  # seconds
+        energy_threshold: float = 0.01,  # RMS of a speech frame
+        frame_ms: int = 30,
+        pre_roll: float = 0.3,  # seconds kept before speech onset
+        partial_interval: Optional[float] = 1.0,  # seconds, None disables
+        max_utterance_seconds: float = 30.0,
     ):
         """Initialize real-time STT.
 
@@ -394,28 +479,55 @@ class RealtimeSpeechToText:
             on_partial: Callback for partial results
             silence_threshold: Seconds of silence before processing
             min_speech_duration: Minimum speech duration to process
+            energy_threshold: Frame RMS above which a frame counts as speech
+            frame_ms: VAD frame length in milliseconds
+            pre_roll: Audio kept before the detected speech onset
+            partial_interval: Seconds of new speech between partial results
+            max_utterance_seconds: Hard cap; the utterance is endpointed here
         """
         self.stt = stt
         self.on_transcription = on_transcription
         self.on_partial = on_partial
         self.silence_threshold = silence_threshold
         self.min_speech_duration = min_speech_duration
+        self.energy_threshold = energy_threshold
+        self.pre_roll = pre_roll
+        self.partial_interval = partial_interval
+        self.max_utterance_seconds = max_utterance_seconds
 
         self._is_listening = False
-        self._audio_buffer = []
+        self._chunks: "collections.deque" = collections.deque()
         self._stream = None
+        self._process_task: Optional[asyncio.Task] = None
+        self._partial_task: Optional[asyncio.Task] = None
+        # One transcription at a time: partial and final calls share the
+        # same Whisper model, which is not safe to run concurrently.
+        self._transcribe_lock = asyncio.Lock()
 
         # Audio settings
         self.sample_rate = 16000
         self.channels = 1
         self.chunk_size = 1024
+        self.frame_size = int(self.sample_rate * frame_ms / 1000)
+
+        self._reset_vad()
+
+    def _reset_vad(self):
+        self._ring: Optional[AudioRingBuffer] = None
+        self._vad_pos = 0  # absolute index of the next sample to classify
+        self._speech_start: Optional[int] = None
+        self._last_speech_end = 0
+        self._speech_samples = 0
+        self._last_partial_at = 0
+        self._utterance_id = 0
 
     def _audio_callback(self, indata, frames, time, status):
-        """Callback for audio stream."""
+        """Callback for audio stream (runs on the audio thread)."""
         if status:
             logger.warning(f"Audio status: {status}")
         if self._is_listening:
-            self._audio_buffer.append(indata.copy())
+            # deque.append is thread-safe; the loop does all the work.
+            self._chunks.append(indata[:, 0].copy())
 
     async def start_listening(self, wake_word: Optional[str] = None):
         """Start listening for speech.
@@ -430,7 +542,11 @@ class RealtimeSpeechToText:
             return
 
         self._is_listening = True
-        self._audio_buffer = []
+        self._chunks.clear()
+        self._reset_vad()
+        self._ring = AudioRingBuffer(
+            int((self.max_utterance_seconds + self.pre_roll + 1.0) * self.sample_rate)
+        )
 
         logger.info(f"Starting microphone listening (wake_word={wake_word})")
 
@@ -444,59 +560,148 @@ class RealtimeSpeechToText:
         self._stream.start()
 
         # Process audio in background
-        asyncio.create_task(self._process_audio_loop(wake_word))
+        self._process_task = asyncio.create_task(self._process_audio_loop(wake_word))
+
+    def feed(self, samples: Any) -> None:
+        """Queue mono float32 samples (alternative to the microphone callback)."""
+        if self._ring is None:
+            self._ring = AudioRingBuffer(
+                int(
+                    (self.max_utterance_seconds + self.pre_roll + 1.0)
+                    * self.sample_rate
+                )
+            )
+        self._chunks.append(samples)
 
-    async def _process_audio_loop(self, wake_word: Optional[str] = None):
-        """Process audio buffer and detect speech."""
-        import numpy as np
+    def _drain_chunks(self) -> None:
+        while self._chunks:
+            self._ring.append(self._chunks.popleft())
 
-        while self._is_listening:
-            await asyncio.sleep(0.1)
+    def _run_vad(self) -> Optional[Any]:
+        """Classify new frames; return the utterance array at an endpoint."""
+        import numpy as np
 
-            if len(self._audio_buffer) < 10:  # Wait for enough audio
+        head = self._ring.total_written
+        # Audio older than the ring capacity is gone; resume at the oldest.
+        self._vad_pos = max(self._vad_pos, self._ring.oldest)
+        silence_samples = int(self.silence_threshold * self.sample_rate)
+        max_samples = int(self.max_utterance_seconds * self.sample_rate)
+
+        n_frames = (head - self._vad_pos) // self.frame_size
+        if n_frames <= 0:
+            return None
+        # RMS of every new complete frame in one vectorized pass.
+        block = self._ring.read(
+            self._vad_pos, self._vad_pos + n_frames * self.frame_size
+        )
+        frames = block.reshape(n_frames, self.frame_size)
+        energies = np.sqrt(np.mean(frames * frames, axis=1))
+
+        for energy in energies:
+            frame_end = self._vad_pos + self.frame_size
+            self._vad_pos = frame_end
+
+            if energy > self.energy_threshold:
+                if self._speech_start is None:
+                    self._speech_start = max(
+                        self._ring.oldest,
+                        frame_end
+                        - self.frame_size
+                        - int(self.pre_roll * self.sample_rate),
+                    )
+                    self._last_partial_at = frame_end
+                self._speech_samples += self.frame_size
+                self._last_speech_end = frame_end
+            elif self._speech_start is None:
                 continue
 
-            # Combine audio chunks
-            audio_data = np.concatenate(self._audio_buffer)
+            trailing = frame_end - self._last_speech_end
+            too_long = frame_end - self._speech_start >= max_samples
+            if trailing >= silence_samples or too_long:
+                return self._end_utterance(frame_end)
+        return None
+
+    def _end_utterance(self, end: int) -> Optional[Any]:
+        start = self._speech_start
+        speech = self._speech_samples
+        self._speech_start = None
+        self._speech_samples = 0
+        self._utterance_id += 1
+        if speech < self.min_speech_duration * self.sample_rate:
+            return None
+        return self._ring.read(start, end)
+
+    def _maybe_partial(self) -> None:
+        """Kick off a partial transcription of the utterance so far."""
+        if (
+            self.on_partial is None
+            or self.partial_interval is None
+            or self._speech_start is None
+            or (self._partial_task is not None and not self._partial_task.done())
+            or self._transcribe_lock.locked()
+        ):
+            return
+        if (
+            self._vad_pos - self._last_partial_at
+            < self.partial_interval * self.sample_rate
+        ):
+            return
+        self._last_partial_at = self._vad_pos
+        audio = self._ring.read(self._speech_start, self._vad_pos)
+        self._partial_task = asyncio.create_task(
+            self._transcribe_partial(audio, self._utterance_id)
+        )
 
-            # Simple voice activity detection (energy-based)
-            energy = np.sqrt(np.mean(audio_data**2))
+    async def _transcribe_partial(self, audio: Any, utterance_id: int):
+        try:
+            async with self._transcribe_lock:
+                if utterance_id != self._utterance_id:
+                    return  # finalized while we were queued
+                result = await self.stt.transcribe_array(
+                    audio, sample_rate=self.sample_rate
+                )
+        except Exception as e:
+            logger.debug(f"Partial transcription failed: {e}")
+            return
+        # Drop partials that arrive after their utterance was finalized.
+        if result.text and utterance_id == self._utterance_id and self.on_partial:
+            self.on_partial(result.text)
+
+    def _emit_final(self, text: str, wake_word: Optional[str]) -> None:
+        if wake_word:
+            if wake_word.lower() in text.lower():
+                # Remove wake word and process command
+                command = text.lower().replace(wake_word.lower(), "").strip()
+                if self.on_transcription and command:
+                    self.on_transcription(command)
+        elif self.on_transcription:
+            self.on_transcription(text)
 
-            if energy > 0.01:  # Speech detected
-                # Accumulate more audio
+    async def _process_audio_loop(self, wake_word: Optional[str] = None):
+        """Drain new audio, run frame-level VAD and transcribe at endpoints."""
+        tick = self.frame_size / self.sample_rate
+        while self._is_listening:
+            await asyncio.sleep(tick)
+            if self._ring is None:
+                continue
+            self._drain_chunks()
+
+            utterance = self._run_vad()
+            if utterance is None:
+                self._maybe_partial()
                 continue
-            else:
-                # Silence detected - process if we have speech
-                if len(self._audio_buffer) > int(
-                    self.min_speech_duration * self.sample_rate / self.chunk_size
-                ):
-                    # Convert to bytes and transcribe
-                    audio_bytes = (audio_data * 32767).astype(np.int16).tobytes()
-
-                    result = await self.stt.transcribe_audio(
-                        audio_bytes,
-                        sample_rate=self.sample_rate,
-                        channels=self.channels,
-                    )
 
-                    if result.text:
-                        # Check for wake word if specified
-                        if wake_word:
-                            if wake_word.lower() in result.text.lower():
-                                # Remove wake word and process command
-                                command = (
-                                    result.text.lower()
-                                    .replace(wake_word.lower(), "")
-                                    .strip()
-                                )
-                                if self.on_transcription and command:
-                                    self.on_transcription(command)
-                        else:
-                            if self.on_transcription:
-                                self.on_transcription(result.text)
-
-                # Clear buffer
-                self._audio_buffer = []
+            try:
+                # Waits for an in-flight partial to release the model.
+                async with self._transcribe_lock:
+                    result = await self.stt.transcribe_array(
+                        utterance, sample_rate=self.sample_rate
+                    )
+            except Exception as e:
+                logger.error(f"Transcription failed: {e}")
+                continue
+            if result.text:
+                self._emit_final(result.text, wake_word)
 
     async def stop_listening(self):
         """Stop listening for speech."""
@@ -505,6 +710,11 @@ class RealtimeSpeechToText:
             self._stream.stop()
             self._stream.close()
             self._stream = None
+        for task in (self._process_task, self._partial_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._process_task = None
+        self._partial_task = None
         logger.info("Stopped microphone listening")
 
     @staticmethod
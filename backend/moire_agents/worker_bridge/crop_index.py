@@ -0,0 +1,306 @@
+"""
+Perceptual Crop Index - Dedup von Icon-Crops vor der LLM-Klassifizierung.
+
+Desktop-Scans liefern immer wieder dieselben Toolbar-Icons und
+Taskbar-Buttons. Statt jeden ``ClassifyIconMessage.crop_base64`` an das
+LLM zu schicken, merkt sich der Index das Ergebnis pro Crop unter einem
+perceptual Hash (dHash, 64 Bit):
+
+- Crops innerhalb eines Hamming-Radius (Default 6 Bit) zu einem bereits
+  klassifizierten Crop werden aus dem Index beantwortet.
+- Near-Duplicates innerhalb desselben Batches werden nur einmal
+  klassifiziert und das Ergebnis auf alle Kopien verteilt.
+- Nur neue Crops gehen an das Modell.
+
+Damit Buttons gleicher Form mit anderem Text ("OK" / "Abbrechen") nicht
+verwechselt werden, zählen zusätzlich OCR-Text und Seitenverhältnis zum
+Schlüssel.
+
+Lookup via Multi-Index-Hashing: der 64-Bit-Hash wird in 8 Bänder à 8 Bit
+geteilt. Bei Radius < 8 stimmt mindestens ein Band exakt überein
+(Schubfachprinzip), also reicht es, die Buckets der 8 Bänder zu prüfen.
+
+Ohne PIL ist der Index deaktiviert (alle Crops gelten als neu).
+"""
+
+import base64
+import copy
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import (Any, Awaitable, Callable, Dict, List, Optional, Sequence,
+                    Set, Tuple)
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image as PILImage
+
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+HASH_BITS = 64
+_BANDS = 8
+_BAND_BITS = HASH_BITS // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+_WS_RE = re.compile(r"\s+")
+
+
+def dhash_image(image: "PILImage.Image", hash_size: int = 8) -> int:
+    """Difference-Hash: Graustufen auf (size+1)x size, Nachbarpixel vergleichen."""
+    small = image.convert("L").resize(
+        (hash_size + 1, hash_size), PILImage.Resampling.LANCZOS
+    )
+    pixels = list(small.getdata())
+    value = 0
+    width = hash_size + 1
+    for row in range(hash_size):
+        base = row * width
+        for col in range(hash_size):
+            value = (value << 1) | (
+                1 if pixels[base + col] > pixels[base + col + 1] else 0
+            )
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class CropSignature:
+    """Perceptual Hash + Zusatzschlüssel eines Crops."""
+
+    phash: int
+    text_key: str
+    aspect: float
+
+
+@dataclass
+class _IndexEntry:
+    signature: CropSignature
+    result: Any
+
+
+def _text_key(ocr_text: Optional[str]) -> str:
+    return _WS_RE.sub(" ", (ocr_text or "").lower()).strip()
+
+
+def crop_signature(
+    crop_base64: str, ocr_text: Optional[str] = None
+) -> Optional[CropSignature]:
+    """Signatur eines Base64-PNG-Crops (None wenn nicht dekodierbar / kein PIL)."""
+    if not HAS_PIL or not crop_base64:
+        return None
+    try:
+        data = (
+            crop_base64.split(",", 1)[1]
+            if crop_base64.startswith("data:")
+            else crop_base64
+        )
+        image = PILImage.open(BytesIO(base64.b64decode(data)))
+        w, h = image.size
+        if not w or not h:
+            return None
+        return CropSignature(
+            phash=dhash_image(image), text_key=_text_key(ocr_text), aspect=w / h
+        )
+    except Exception as e:
+        logger.debug(f"crop_signature failed: {e}")
+        return None
+
+
+class PerceptualCropIndex:
+    """Index bereits klassifizierter Crops, Lookup per Hamming-Radius."""
+
+    def __init__(
+        self,
+        radius: int = 6,
+        max_entries: int = 5000,
+        aspect_tolerance: float = 0.15,
+    ):
+        if radius >= _BANDS:
+            raise ValueError(f"radius must be < {_BANDS} for band lookup")
+        self.radius = radius
+        self.max_entries = max_entries
+        self.aspect_tolerance = aspect_tolerance
+
+        self._entries: "OrderedDict[int, _IndexEntry]" = OrderedDict()
+        self._bands: List[Dict[int, Set[int]]] = [dict() for _ in range(_BANDS)]
+        self._next_id = 0
+        self.stats: Dict[str, int] = {
+            "lookups": 0,
+            "index_hits": 0,
+            "batch_dedup": 0,
+            "novel": 0,
+            "unhashable": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ─── Matching ───────────────────────────────────────────────────────────
+
+    def _compatible(self, a: CropSignature, b: CropSignature) -> bool:
+        if a.text_key != b.text_key:
+            return False
+        return abs(a.aspect - b.aspect) <= self.aspect_tolerance * max(
+            a.aspect, b.aspect
+        )
+
+    @staticmethod
+    def _band_values(phash: int) -> List[int]:
+        return [(phash >> (i * _BAND_BITS)) & _BAND_MASK for i in range(_BANDS)]
+
+    def lookup(self, signature: CropSignature) -> Optional[Tuple[Any, int]]:
+        """Nächster kompatibler Eintrag innerhalb des Radius → (result, distance)."""
+        candidates: Set[int] = set()
+        for band, value in zip(self._bands, self._band_values(signature.phash)):
+            candidates |= band.get(value, set())
+
+        best: Optional[Tuple[int, int]] = None
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            dist = hamming(signature.phash, entry.signature.phash)
+            if dist <= self.radius and self._compatible(signature, entry.signature):
+                if best is None or dist < best[1]:
+                    best = (entry_id, dist)
+        if best is None:
+            return None
+        self._entries.move_to_end(best[0])
+        return self._entries[best[0]].result, best[1]
+
+    def add(self, signature: CropSignature, result: Any) -> None:
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _IndexEntry(signature, result)
+        for band, value in zip(self._bands, self._band_values(signature.phash)):
+            band.setdefault(value, set()).add(entry_id)
+        while len(self._entries) > self.max_entries:
+            old_id, old = self._entries.popitem(last=False)
+            for band, value in zip(self._bands, self._band_values(old.signature.phash)):
+                bucket = band.get(value)
+                if bucket is not None:
+                    bucket.discard(old_id)
+                    if not bucket:
+                        del band[value]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bands = [dict() for _ in range(_BANDS)]
+
+    # ─── Batch-Pipeline ─────────────────────────────────────────────────────
+
+    async def classify_batch(
+        self,
+        items: Sequence[Any],
+        classify: Callable[[List[Any]], Awaitable[List[Any]]],
+        rebind: Callable[[Any, Any, int], Any],
+        cacheable: Callable[[Any], bool],
+        key: Callable[[Any], Tuple[str, Optional[str]]],
+    ) -> List[Any]:
+        """
+        Klassifiziert ``items`` und schickt nur neue Crops an ``classify``.
+
+        Args:
+            items: Eingaben (z.B. ClassifyIconMessage)
+            classify: Async-Funktion für die neuen Items → Ergebnisse (gleiche Reihenfolge)
+            rebind: (result, item, distance) → Kopie des Ergebnisses für ``item``
+            cacheable: Ob ein Ergebnis in den Index darf (keine Fehler etc.)
+            key: item → (crop_base64, ocr_text)
+
+        Returns:
+            Ergebnisse in der Reihenfolge von ``items``
+        """
+        results: List[Any] = [None] * len(items)
+        signatures: List[Optional[CropSignature]] = []
+        novel: List[int] = []  # indices sent to the model
+        followers: Dict[int, List[Tuple[int, int]]] = {}  # leader → [(idx, dist)]
+
+        for i, item in enumerate(items):
+            crop_b64, ocr_text = key(item)
+            sig = crop_signature(crop_b64, ocr_text)
+            signatures.append(sig)
+            if sig is None:
+                self.stats["unhashable"] += 1
+                novel.append(i)
+                continue
+
+            self.stats["lookups"] += 1
+            hit = self.lookup(sig)
+            if hit is not None:
+                cached, dist = hit
+                results[i] = rebind(cached, item, dist)
+                self.stats["index_hits"] += 1
+                continue
+
+            # Near-duplicate of a crop already queued in this batch?
+            leader = None
+            for j in novel:
+                other = signatures[j]
+                if other is None:
+                    continue
+                dist = hamming(sig.phash, other.phash)
+                if dist <= self.radius and self._compatible(sig, other):
+                    leader = (j, dist)
+                    break
+            if leader is not None:
+                followers.setdefault(leader[0], []).append((i, leader[1]))
+                self.stats["batch_dedup"] += 1
+            else:
+                novel.append(i)
+
+        self.stats["novel"] += len(novel)
+        if novel:
+            fresh = await classify([items[i] for i in novel])
+            for i, result in zip(novel, fresh):
+                results[i] = result
+                sig = signatures[i]
+                ok = sig is not None and cacheable(result)
+                if ok:
+                    self.add(sig, result)
+                for j, dist in followers.get(i, []):
+                    # Follower teilen nur erfolgreiche Ergebnisse
+                    results[j] = rebind(result, items[j], dist) if ok else None
+
+            # Follower eines fehlgeschlagenen Leaders einzeln nachklassifizieren
+            retry = [j for j, r in enumerate(results) if r is None]
+            if retry:
+                for j, result in zip(retry, await classify([items[j] for j in retry])):
+                    results[j] = result
+                    if signatures[j] is not None and cacheable(result):
+                        self.add(signatures[j], result)
+
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = (
+            self.stats["index_hits"] + self.stats["batch_dedup"] + self.stats["novel"]
+        )
+        saved = self.stats["index_hits"] + self.stats["batch_dedup"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "radius": self.radius,
+            "saved_ratio": round(saved / total, 3) if total else 0.0,
+        }
+
+
+def rebind_result(result: Any, item: Any, distance: int) -> Any:
+    """Kopie eines gecachten Ergebnisses für ein anderes Icon (box_id/request_id)."""
+    clone = copy.copy(result)
+    clone.box_id = getattr(item, "box_id", getattr(clone, "box_id", ""))
+    clone.request_id = getattr(item, "request_id", None)
+    if hasattr(clone, "processing_time_ms"):
+        clone.processing_time_ms = 0.0
+    note = f"[phash d={distance}]"
+    for attr in ("validation_reasoning", "reasoning"):
+        if hasattr(clone, attr):
+            prev = getattr(clone, attr)
+            setattr(clone, attr, f"{note} {prev}" if prev else note)
+            break
+    return clone
@@ -42,6 +42,7 @@ except ImportError:
     HAS_AIOHTTP = False
     logging.warning("aiohttp not installed. Run: pip install aiohttp")
 
+from .crop_index import PerceptualCropIndex, rebind_result
 from .host import GrpcWorkerHost, get_grpc_host
 from .messages import ActionStep  # NEW: Tool-Using Agent Messages
 from .messages import (BatchClassifyResult, ClassifyIconMessage,
@@ -110,6 +111,9 @@ class HttpBridgeServer:
         # Active Learning Queue
         self._active_learning_queue: List[Dict[str, Any]] = []
 
+        # Perceptual-Hash-Index: bekannte Crops nicht erneut klassifizieren
+        self._crop_index = PerceptualCropIndex()
+
         # NEW: Task Tracking
         self._active_tasks: Dict[str, TaskExecutionRequest] = {}
         self._task_results: Dict[str, TaskExecutionResult] = {}
@@ -436,6 +440,7 @@ class HttpBridgeServer:
                 "execution_worker": exec_stats,
                 "planner_worker": planner_stats,
                 "active_learning_queue_size": len(self._active_learning_queue),
+                "crop_index": self._crop_index.get_stats(),
                 "active_tasks": len(self._active_tasks),
                 "completed_tasks": len(self._task_results),
             }
@@ -868,6 +873,22 @@ class HttpBridgeServer:
 
     async def _classify_icons(
         self, icons: List[ClassifyIconMessage]
+    ) -> List[ValidationResult]:
+        """Klassifiziert Icons; bekannte Crops kommen aus dem Perceptual-Hash-Index."""
+        return await self._crop_index.classify_batch(
+            icons,
+            classify=self._classify_icons_uncached,
+            rebind=rebind_result,
+            cacheable=lambda r: (
+                r.final_category not in ("error", "unknown")
+                and not r.error
+                and not r.needs_human_review
+            ),
+            key=lambda icon: (icon.crop_base64, icon.ocr_text),
+        )
+
+    async def _classify_icons_uncached(
+        self, icons: List[ClassifyIconMessage]
     ) -> List[ValidationResult]:
         """Klassifiziert Icons mit Classification + Validation Workers."""
         from .workers.validation_worker import classify_and_validate
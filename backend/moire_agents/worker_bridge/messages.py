@@ -269,6 +269,12 @@ class ValidationResult:
     processing_time_ms: float = 0.0
     request_id: Optional[str] = None
     error: Optional[str] = None
+    # Set by VisionValidationWorker / classify_and_validate
+    cnn_category: Optional[str] = None
+    llm_category: Optional[str] = None
+    add_to_training: bool = False
+    training_label: Optional[str] = None
+    semantic_name: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
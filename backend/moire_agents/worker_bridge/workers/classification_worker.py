@@ -49,6 +49,7 @@ except ImportError:
         pass
 
 
+from ..crop_index import PerceptualCropIndex, rebind_result
 from ..messages import (ClassificationResult, ClassifyIconMessage, UICategory,
                         WorkerType)
 
@@ -129,6 +130,9 @@ class ClassificationWorker:
         # Semaphore für Rate Limiting
         self._semaphore = asyncio.Semaphore(self.config.max_concurrent)
 
+        # Perceptual-Hash-Index für wiederkehrende Icons (classify_batch)
+        self._crop_index = PerceptualCropIndex()
+
         logger.info(f"ClassificationWorker initialisiert: {self.config.worker_id}")
         logger.info(f"  Dynamic Categories: {self.config.use_dynamic_categories}")
 
@@ -294,6 +298,7 @@ class ClassificationWorker:
                     {"role": "user", "content": user_content},
                 ],
                 model=self.config.model,
+                cache_site="classification",
             )
 
             # Parse JSON response
@@ -466,12 +471,38 @@ class ClassificationWorker:
         """
         Klassifiziert mehrere Icons parallel.
 
-        Nutzt asyncio.gather mit Semaphore für Rate Limiting.
+        Bereits bekannte Crops (und Near-Duplicates im Batch) werden aus dem
+        Perceptual-Hash-Index beantwortet; nur neue Crops gehen an das LLM.
         """
         logger.info(
             f"[{self.config.worker_id}] Batch-Klassifizierung: {len(messages)} Icons"
         )
 
+        final_results = await self._crop_index.classify_batch(
+            messages,
+            classify=self._classify_batch_uncached,
+            rebind=rebind_result,
+            cacheable=lambda r: (
+                r.error is None
+                and r.llm_category != "unknown"
+                and not r.new_category_suggested
+            ),
+            key=lambda msg: (msg.crop_base64, msg.ocr_text),
+        )
+
+        successful = sum(1 for r in final_results if r.error is None)
+        logger.info(
+            f"[{self.config.worker_id}] Batch fertig: {successful}/{len(messages)} erfolgreich "
+            f"(Index: {self._crop_index.stats['index_hits']} Treffer gesamt)"
+        )
+
+        return final_results
+
+    async def _classify_batch_uncached(
+        self, messages: list[ClassifyIconMessage]
+    ) -> list[ClassificationResult]:
+        """Nutzt asyncio.gather mit Semaphore für Rate Limiting."""
+
         results = await asyncio.gather(
             *[self.classify(msg) for msg in messages], return_exceptions=True
         )
@@ -492,11 +523,6 @@ class ClassificationWorker:
             else:
                 final_results.append(result)
 
-        successful = sum(1 for r in final_results if r.error is None)
-        logger.info(
-            f"[{self.config.worker_id}] Batch fertig: {successful}/{len(messages)} erfolgreich"
-        )
-
         return final_results
 
     # ==================== Stats ====================
@@ -522,6 +548,7 @@ class ClassificationWorker:
             ),
             "new_categories_suggested": self._new_categories_suggested,
             "use_dynamic_categories": self.config.use_dynamic_categories,
+            "crop_index": self._crop_index.get_stats(),
         }
 
         # Add registry stats
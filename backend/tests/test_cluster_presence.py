@@ -0,0 +1,163 @@
+"""
+Tests für die Cluster-Presence in der Desktop-Client-Liste
+(app/services/cluster_relay.py, app/routers/websocket.py)
+
+Läuft ohne Redis: ein In-Memory-Stand-in bildet die benutzten Befehle
+(HASH, SET mit TTL, EXISTS) nach.
+
+Tests:
+1. claim() veröffentlicht Hostname und Monitore des Handshakes
+2. Desktops anderer lebender Worker erscheinen in get_desktop_clients
+3. Einträge toter Worker, Viewer und eigene Clients werden übersprungen
+4. find_desktop_client mit bytes- und str-Keys (decode_responses)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.routers import websocket as ws_router
+from app.services.cluster_relay import ALIVE_PREFIX, PRESENCE_KEY, ClusterRelay
+
+
+class InMemoryRedis:
+    """Stand-in for redis.asyncio.Redis (bytes keys/values, no expiry)."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.keys = {}
+
+    @staticmethod
+    def _b(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    async def hset(self, name, key, value):
+        self.hashes.setdefault(self._b(name), {})[self._b(key)] = self._b(value)
+
+    async def hget(self, name, key):
+        return self.hashes.get(self._b(name), {}).get(self._b(key))
+
+    async def hgetall(self, name):
+        return dict(self.hashes.get(self._b(name), {}))
+
+    async def hdel(self, name, key):
+        self.hashes.get(self._b(name), {}).pop(self._b(key), None)
+
+    async def set(self, name, value, ex=None):
+        self.keys[self._b(name)] = self._b(value)
+
+    async def exists(self, name):
+        return int(self._b(name) in self.keys)
+
+    async def delete(self, name):
+        self.keys.pop(self._b(name), None)
+
+
+class DecodedRedis(InMemoryRedis):
+    """Like a client created with decode_responses=True: str keys/values."""
+
+    async def hgetall(self, name):
+        entries = await super().hgetall(name)
+        return {k.decode(): v.decode() for k, v in entries.items()}
+
+
+class FakeClientSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+def _presence(worker, client_type, **info):
+    entry = {"worker": worker, "type": client_type}
+    if info:
+        entry["info"] = info
+    return json.dumps(entry)
+
+
+class TestClusterPresence(unittest.TestCase):
+    def setUp(self):
+        self.redis = InMemoryRedis()
+        self.relay = ClusterRelay()
+        self.relay._redis = self.redis
+        self._saved_relay = ws_router.cluster_relay
+        ws_router.cluster_relay = self.relay
+        self._saved_info = dict(ws_router.manager.client_info)
+        ws_router.manager.client_info.clear()
+
+    def tearDown(self):
+        ws_router.cluster_relay = self._saved_relay
+        ws_router.manager.client_info.clear()
+        ws_router.manager.client_info.update(self._saved_info)
+
+    def test_claim_publishes_handshake_info(self):
+        handshake = {
+            "clientId": "desk-1",
+            "clientType": "desktop_capture",
+            "hostname": "pc-1",
+            "monitors": [{"id": 0}],
+            "secret": "not shared",
+        }
+        asyncio.run(self.relay.claim("desk-1", "desktop_capture", handshake))
+        entry = json.loads(asyncio.run(self.redis.hget(PRESENCE_KEY, "desk-1")))
+        self.assertEqual(entry["worker"], self.relay.worker_id)
+        self.assertEqual(entry["info"], {"hostname": "pc-1", "monitors": [{"id": 0}]})
+
+    def test_remote_desktops_are_listed(self):
+        ws_router.manager.client_info["local-desk"] = {
+            "clientType": "desktop",
+            "hostname": "here",
+        }
+
+        async def scenario():
+            await self.redis.set(f"{ALIVE_PREFIX}worker-b", b"1")
+            await self.redis.hset(
+                PRESENCE_KEY,
+                "remote-desk",
+                _presence(
+                    "worker-b", "dual_screen_desktop", hostname="pc-b", monitors=[0, 1]
+                ),
+            )
+            # Dead worker, viewer, and a client this worker holds itself
+            await self.redis.hset(
+                PRESENCE_KEY, "stale-desk", _presence("worker-dead", "desktop")
+            )
+            await self.redis.hset(PRESENCE_KEY, "viewer", _presence("worker-b", "web"))
+            await self.redis.hset(
+                PRESENCE_KEY, "local-desk", _presence(self.relay.worker_id, "desktop")
+            )
+            socket = FakeClientSocket()
+            await ws_router.handle_get_desktop_clients(socket, "viewer-1", {}, None)
+            return socket.sent[-1]
+
+        response = asyncio.run(scenario())
+        self.assertEqual(response["type"], "desktop_clients_list")
+        clients = {c["id"]: c for c in response["clients"]}
+        self.assertEqual(sorted(clients), ["local-desk", "remote-desk"])
+        remote = clients["remote-desk"]
+        self.assertEqual(remote["worker"], "worker-b")
+        self.assertEqual(remote["hostname"], "pc-b")
+        self.assertEqual(remote["monitors"], [0, 1])
+        self.assertTrue(remote["connected"])
+        self.assertNotIn("worker", clients["local-desk"])
+
+    def test_find_desktop_client_handles_bytes_and_str_keys(self):
+        async def scenario(redis):
+            self.relay._redis = redis
+            self.relay._presence_cache.clear()
+            await redis.set(f"{ALIVE_PREFIX}worker-b", b"1")
+            await redis.hset(PRESENCE_KEY, "viewer", _presence("worker-b", "web"))
+            await redis.hset(PRESENCE_KEY, "desk-b", _presence("worker-b", "desktop"))
+            return await self.relay.find_desktop_client()
+
+        for redis in (InMemoryRedis(), DecodedRedis()):
+            self.assertEqual(asyncio.run(scenario(redis)), "desk-b")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
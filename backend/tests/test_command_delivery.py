@@ -0,0 +1,259 @@
+"""
+Tests für CommandDelivery (app/services/command_delivery.py)
+
+Läuft ohne Datenbank: eine In-Memory-CommandQueue ersetzt die Tabelle,
+ein Fake-ConnectionManager protokolliert die gepushten Nachrichten.
+
+Tests:
+1. enqueue: Push an verbundene Clients, sonst bleibt der Command pending
+2. Gleicher Idempotency-Key → derselbe Command, kein zweiter Push
+3. Replay beim Connect: alle unbestätigten Commands in Erstellungsreihenfolge
+4. ACK: processed/failed beenden den Command, kein erneutes Replay;
+   unbekannte oder fremde IDs werden ignoriert
+5. Replay ohne Datenbank blockiert den Socket nicht
+"""
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import command_delivery as delivery_module
+from app.services.command_delivery import CommandDelivery
+
+
+class InMemoryQueue:
+    """The parts of CommandQueue that CommandDelivery uses."""
+
+    def __init__(self):
+        self.commands = []
+        self._clock = datetime(2026, 1, 1)
+
+    async def enqueue_command(
+        self, session, client_id, command_type, command_data, idempotency_key=None
+    ):
+        key = idempotency_key or f"{client_id}_{command_type}_{uuid.uuid4().hex[:8]}"
+        for command in self.commands:
+            if command.idempotency_key == key:
+                return command
+        self._clock += timedelta(seconds=1)
+        command = SimpleNamespace(
+            id=uuid.uuid4(),
+            desktop_client_id=client_id,
+            command_type=command_type,
+            command_data=command_data,
+            status="pending",
+            idempotency_key=key,
+            created_at=self._clock,
+            error_message=None,
+        )
+        self.commands.append(command)
+        return command
+
+    async def get_pending_commands(self, session, client_id, limit=10):
+        pending = [
+            c
+            for c in self.commands
+            if c.desktop_client_id == client_id and c.status == "pending"
+        ]
+        return sorted(pending, key=lambda c: c.created_at)[:limit]
+
+    def _find(self, command_id):
+        return next((c for c in self.commands if c.id == command_id), None)
+
+    async def mark_completed(self, session, command_id, result=None):
+        command = self._find(command_id)
+        if command is None:
+            return False
+        command.status = "completed"
+        if result:
+            command.command_data = {**command.command_data, "result": result}
+        return True
+
+    async def mark_failed(self, session, command_id, error):
+        command = self._find(command_id)
+        if command is None:
+            return False
+        command.status = "failed"
+        command.error_message = error
+        return True
+
+
+class FakeDB:
+    def __init__(self, available=True):
+        self.available = available
+
+    @asynccontextmanager
+    async def session(self):
+        if not self.available:
+            raise RuntimeError("Database not initialized. Call init() first.")
+        yield None
+
+
+class FakeManager:
+    def __init__(self, connected=()):
+        self.active_connections = {client_id: object() for client_id in connected}
+        self.sent = []
+
+    async def send_personal_message(self, message, client_id):
+        if client_id not in self.active_connections:
+            return False
+        self.sent.append((client_id, json.loads(message)))
+        return True
+
+    def pushed_ids(self, client_id):
+        return [
+            [c["id"] for c in message["commands"]]
+            for cid, message in self.sent
+            if cid == client_id
+        ]
+
+
+class DeliveryTestCase(unittest.TestCase):
+    def setUp(self):
+        self._saved_db = delivery_module.db
+        self.db = FakeDB()
+        delivery_module.db = self.db
+        self.queue = InMemoryQueue()
+        self.manager = FakeManager(connected={"desk-1"})
+        self.delivery = CommandDelivery(self.queue)
+        self.delivery.set_ws_manager(self.manager)
+
+    def tearDown(self):
+        delivery_module.db = self._saved_db
+
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+
+class TestEnqueue(DeliveryTestCase):
+    def test_connected_client_gets_push(self):
+        result = self._run(
+            self.delivery.enqueue("desk-1", "start_capture", {"fps": 5}, "key-1")
+        )
+        self.assertTrue(result["delivered"])
+        self.assertEqual(result["status"], "pending")  # until the ACK arrives
+        client_id, message = self.manager.sent[0]
+        self.assertEqual(client_id, "desk-1")
+        self.assertEqual(message["type"], "commands")
+        self.assertEqual(
+            message["commands"][0],
+            {
+                "id": result["id"],
+                "command_type": "start_capture",
+                "command_data": {"fps": 5},
+                "idempotency_key": "key-1",
+                "created_at": result["created_at"],
+            },
+        )
+        self.assertEqual(self.delivery.stats["pushed"], 1)
+
+    def test_offline_client_is_deferred(self):
+        result = self._run(self.delivery.enqueue("desk-2", "start_capture", {}))
+        self.assertFalse(result["delivered"])
+        self.assertEqual(self.manager.sent, [])
+        self.assertEqual(self.delivery.stats["deferred"], 1)
+        self.assertEqual(self.queue.commands[0].status, "pending")
+
+    def test_same_idempotency_key_is_deduplicated(self):
+        async def scenario():
+            first = await self.delivery.enqueue("desk-1", "start_capture", {}, "key-1")
+            again = await self.delivery.enqueue("desk-1", "start_capture", {}, "key-1")
+            await self.delivery.handle_ack("desk-1", {"commandId": first["id"]})
+            after_ack = await self.delivery.enqueue(
+                "desk-1", "start_capture", {}, "key-1"
+            )
+            return first, again, after_ack
+
+        first, again, after_ack = self._run(scenario())
+        self.assertEqual(len(self.queue.commands), 1)
+        self.assertEqual(again["id"], first["id"])
+        self.assertEqual(again["status"], "pending")
+        # A completed command is not pushed a second time
+        self.assertEqual(after_ack["status"], "completed")
+        self.assertFalse(after_ack["delivered"])
+        self.assertEqual(len(self.manager.sent), 2)
+
+
+class TestReplayAndAck(DeliveryTestCase):
+    def test_replay_in_creation_order(self):
+        async def scenario():
+            ids = [
+                (await self.delivery.enqueue("desk-2", f"cmd_{i}", {}))["id"]
+                for i in range(3)
+            ]
+            await self.delivery.enqueue("desk-3", "other", {})
+            self.manager.active_connections["desk-2"] = object()
+            return ids, await self.delivery.replay("desk-2")
+
+        ids, replayed = self._run(scenario())
+        self.assertEqual(replayed, 3)
+        self.assertEqual(self.manager.pushed_ids("desk-2"), [ids])
+        self.assertEqual(self.delivery.stats["replayed"], 3)
+
+    def test_replay_without_socket_or_commands(self):
+        self.assertEqual(self._run(self.delivery.replay("desk-1")), 0)
+        self._run(self.delivery.enqueue("desk-2", "start_capture", {}))
+        self.assertEqual(self._run(self.delivery.replay("desk-2")), 0)
+        self.assertEqual(self.delivery.stats["replayed"], 0)
+
+    def test_ack_stops_replay(self):
+        async def scenario():
+            done = await self.delivery.enqueue("desk-1", "start_capture", {})
+            failed = await self.delivery.enqueue("desk-1", "stop_capture", {})
+            lost = await self.delivery.enqueue("desk-1", "start_capture", {"fps": 1})
+            acked = await self.delivery.handle_ack(
+                "desk-1",
+                {"commandId": done["id"], "status": "processed", "result": {"ok": 1}},
+            )
+            nacked = await self.delivery.handle_ack(
+                "desk-1",
+                {"commandId": failed["id"], "status": "failed", "error": "busy"},
+            )
+            self.manager.sent.clear()
+            replayed = await self.delivery.replay("desk-1")
+            return done, failed, lost, acked, nacked, replayed
+
+        done, failed, lost, acked, nacked, replayed = self._run(scenario())
+        self.assertTrue(acked)
+        self.assertTrue(nacked)
+        # Only the command whose ACK never arrived is sent again
+        self.assertEqual(replayed, 1)
+        self.assertEqual(self.manager.pushed_ids("desk-1"), [[lost["id"]]])
+
+        by_id = {str(c.id): c for c in self.queue.commands}
+        self.assertEqual(by_id[done["id"]].status, "completed")
+        self.assertEqual(by_id[done["id"]].command_data["result"], {"ok": 1})
+        self.assertEqual(by_id[failed["id"]].status, "failed")
+        self.assertEqual(by_id[failed["id"]].error_message, "busy")
+        self.assertEqual(self.delivery.stats["acked"], 1)
+        self.assertEqual(self.delivery.stats["failed"], 1)
+
+    def test_ack_for_unknown_or_legacy_ids(self):
+        async def scenario():
+            legacy = await self.delivery.handle_ack(
+                "desk-1", {"commandId": "start_capture_17.5"}
+            )
+            unknown = await self.delivery.handle_ack(
+                "desk-1", {"commandId": str(uuid.uuid4())}
+            )
+            return legacy, unknown
+
+        self.assertEqual(self._run(scenario()), (False, False))
+        self.assertEqual(self.delivery.stats["acked"], 0)
+
+    def test_replay_without_database(self):
+        self.db.available = False
+        self.assertEqual(self._run(self.delivery.replay("desk-1")), 0)
+        self.assertEqual(self.manager.sent, [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,312 @@
+"""
+Tests für ConversationStore und ConversationCompactor
+(app/services/conversation_store.py)
+
+Läuft gegen eine SQLite-Datei im Temp-Verzeichnis, ohne LLM.
+
+Tests:
+1. append_turn/load, Persistenz über eine neue Instanz, LRU-Hot-Cache
+2. Watermark-Kompaktierung: nur das Fenster wird ersetzt, Turns während
+   der Zusammenfassung bleiben erhalten, veraltete Ergebnisse werden ignoriert
+3. Import alter JSON-Dateien
+4. Compactor: Debounce pro Konversation, drain(), Fehler stoppen den Worker nicht
+5. record_turn/compact_conversation in llm_intent (inkl. Fallback ohne LLM),
+   SQLite-Schreibzugriffe laufen außerhalb des Event-Loop-Threads
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import conversation_store
+from app.services.conversation_store import (ConversationCompactor,
+                                             ConversationStore)
+
+
+def _turn(i):
+    return [
+        {"role": "user", "content": f"frage {i}"},
+        {"role": "assistant", "content": f"antwort {i}"},
+    ]
+
+
+class StoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "conversations.db"
+        self.store = ConversationStore(db_path=self.db_path)
+
+    def tearDown(self):
+        self.store._db.close()
+        self._tmp.cleanup()
+
+    def _reopen(self, **kwargs):
+        self.store._db.close()
+        self.store = ConversationStore(db_path=self.db_path, **kwargs)
+        return self.store
+
+
+class TestConversationStore(StoreTestCase):
+    def test_append_and_load(self):
+        conv = self.store.append_turn("c1", _turn(1))
+        self.assertEqual(conv["turn_count"], 1)
+        self.assertEqual(conv["recent"], _turn(1))
+        self.store.append_turn("c1", _turn(2))
+
+        conv = self._reopen().load("c1")
+        self.assertEqual(conv["turn_count"], 2)
+        self.assertEqual(conv["recent"], _turn(1) + _turn(2))
+        self.assertEqual(conv["summary"], "")
+        self.assertEqual(self.store.stats["db_loads"], 1)
+
+    def test_unknown_conversation_is_empty(self):
+        self.assertEqual(
+            self.store.load("nope"), {"summary": "", "recent": [], "turn_count": 0}
+        )
+
+    def test_hot_cache_is_lru(self):
+        store = self._reopen(hot_size=2)
+        for cid in ("a", "b", "c"):
+            store.append_turn(cid, _turn(0))
+        self.assertEqual(list(store._hot), ["b", "c"])
+        hits = store.stats["hot_hits"]
+        store.load("b")
+        self.assertEqual(store.stats["hot_hits"], hits + 1)
+        # An evicted conversation is reloaded from SQLite unchanged
+        self.assertEqual(store.load("a")["recent"], _turn(0))
+        self.assertEqual(list(store._hot), ["b", "a"])
+
+
+class TestWatermarkCompaction(StoreTestCase):
+    def test_window_keeps_tail(self):
+        for i in range(3):
+            self.store.append_turn("c1", _turn(i))
+        self.assertIsNone(self.store.compaction_window("c1", keep=6))
+
+        window = self.store.compaction_window("c1", keep=2)
+        self.assertEqual(window["entries"], _turn(0) + _turn(1))
+        self.assertEqual(window["upto_seq"], 4)
+        self.assertEqual(window["summary"], "")
+
+    def test_turns_during_compaction_survive(self):
+        for i in range(3):
+            self.store.append_turn("c1", _turn(i))
+        window = self.store.compaction_window("c1", keep=2)
+        # A turn lands while the LLM is still summarizing the window
+        self.store.append_turn("c1", _turn(3))
+        self.store.apply_compaction("c1", window["upto_seq"], "zusammenfassung")
+
+        expected = {
+            "summary": "zusammenfassung",
+            "recent": _turn(2) + _turn(3),
+            "turn_count": 4,
+        }
+        self.assertEqual(self.store.load("c1"), expected)
+        self.assertEqual(self._reopen().load("c1"), expected)
+        self.assertEqual(self.store.get_stats()["messages"], 4)
+        # New messages continue after the watermark
+        self.store.append_turn("c1", _turn(4))
+        self.assertEqual(self.store._state("c1")["recent"][-1]["seq"], 10)
+
+    def test_stale_compaction_is_ignored(self):
+        for i in range(4):
+            self.store.append_turn("c1", _turn(i))
+        older = self.store.compaction_window("c1", keep=4)
+        newer = self.store.compaction_window("c1", keep=2)
+        self.store.apply_compaction("c1", newer["upto_seq"], "neu")
+        self.store.apply_compaction("c1", older["upto_seq"], "alt")
+
+        conv = self.store.load("c1")
+        self.assertEqual(conv["summary"], "neu")
+        self.assertEqual(conv["recent"], _turn(3))
+
+    def test_legacy_json_is_migrated(self):
+        legacy = {"summary": "alt", "recent": _turn(0), "turn_count": 5}
+        (Path(self._tmp.name) / "chat_1.json").write_text(
+            json.dumps(legacy), encoding="utf-8"
+        )
+
+        self.assertEqual(self.store.load("chat/1"), legacy)
+        self.assertEqual(self.store.stats["migrated"], 1)
+        conv = self.store.append_turn("chat/1", _turn(1))
+        self.assertEqual(conv["recent"], _turn(0) + _turn(1))
+        self.assertEqual(conv["turn_count"], 6)
+
+
+class TestConversationCompactor(unittest.TestCase):
+    def test_debounce_per_conversation(self):
+        calls = []
+
+        async def compact(cid):
+            calls.append(cid)
+
+        compactor = ConversationCompactor(compact, debounce_s=0.05)
+
+        async def scenario():
+            for _ in range(5):
+                compactor.schedule("a")
+                await asyncio.sleep(0.01)
+            compactor.schedule("b")
+            self.assertEqual(calls, [])  # the request path never waits
+            await asyncio.sleep(0.15)
+
+        asyncio.run(scenario())
+        self.assertEqual(sorted(calls), ["a", "b"])
+        self.assertEqual(compactor.stats["scheduled"], 6)
+        self.assertEqual(compactor.stats["debounced"], 4)
+        self.assertEqual(compactor.stats["compactions"], 2)
+        self.assertEqual(compactor.get_stats()["pending"], 0)
+
+    def test_drain_runs_pending_now(self):
+        calls = []
+
+        async def compact(cid):
+            await asyncio.sleep(0.01)
+            calls.append(cid)
+
+        compactor = ConversationCompactor(compact, debounce_s=60.0)
+
+        async def scenario():
+            compactor.schedule("a")
+            compactor.schedule("b")
+            self.assertEqual(compactor.get_stats()["pending"], 2)
+            await asyncio.wait_for(compactor.drain(), timeout=1.0)
+
+        asyncio.run(scenario())
+        self.assertEqual(calls, ["a", "b"])
+
+    def test_error_does_not_stop_worker(self):
+        calls = []
+
+        async def compact(cid):
+            calls.append(cid)
+            if cid == "bad":
+                raise RuntimeError("boom")
+
+        compactor = ConversationCompactor(compact, debounce_s=0.0)
+
+        async def scenario():
+            compactor.schedule("bad")
+            await compactor.drain()
+            compactor.schedule("good")
+            await compactor.drain()
+
+        asyncio.run(scenario())
+        self.assertEqual(calls, ["bad", "good"])
+        self.assertEqual(compactor.stats["errors"], 1)
+        self.assertEqual(compactor.stats["compactions"], 1)
+
+    def test_new_event_loop_gets_new_worker(self):
+        calls = []
+
+        async def compact(cid):
+            calls.append(cid)
+
+        compactor = ConversationCompactor(compact, debounce_s=0.0)
+
+        async def scenario(cid):
+            compactor.schedule(cid)
+            await compactor.drain()
+
+        asyncio.run(scenario("a"))
+        asyncio.run(scenario("b"))
+        self.assertEqual(calls, ["a", "b"])
+
+
+class TestRecordTurn(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        from app.routers import llm_intent
+
+        self.llm_intent = llm_intent
+        self._saved_store = conversation_store._conversation_store
+        self._saved_llm = llm_intent.call_openrouter
+        self._saved_compactor = llm_intent._compactor
+        conversation_store._conversation_store = self.store
+        llm_intent._compactor = ConversationCompactor(
+            llm_intent.compact_conversation, debounce_s=60.0
+        )
+
+    def tearDown(self):
+        conversation_store._conversation_store = self._saved_store
+        self.llm_intent.call_openrouter = self._saved_llm
+        self.llm_intent._compactor = self._saved_compactor
+        super().tearDown()
+
+    def _record_turns(self, count):
+        llm_intent = self.llm_intent
+
+        async def scenario():
+            for i in range(count):
+                await llm_intent.record_turn("c1", f"frage {i}", f"antwort {i}")
+            pending = llm_intent._compactor.get_stats()["pending"]
+            await llm_intent._compactor.drain()
+            return pending
+
+        return asyncio.run(scenario())
+
+    def test_compaction_scheduled_above_threshold(self):
+        prompts = []
+
+        async def fake_llm(messages, tools, **kwargs):
+            prompts.append(messages[0]["content"])
+            return {"choices": [{"message": {"content": "kurz"}}]}
+
+        self.llm_intent.call_openrouter = fake_llm
+        turns = self.llm_intent.COMPACT_THRESHOLD // 2 + 1
+        self.assertEqual(self._record_turns(turns), 1)
+
+        conv = self.store.load("c1")
+        self.assertEqual(conv["summary"], "kurz")
+        self.assertEqual(len(conv["recent"]), self.llm_intent.RECENT_KEEP)
+        self.assertEqual(conv["recent"][-1]["content"], f"antwort {turns - 1}")
+        self.assertEqual(len(prompts), 1)
+        self.assertIn("frage 0", prompts[0])
+
+    def test_below_threshold_does_not_schedule(self):
+        turns = self.llm_intent.COMPACT_THRESHOLD // 2
+        self.assertEqual(self._record_turns(turns), 0)
+        self.assertEqual(len(self.store.load("c1")["recent"]), turns * 2)
+
+    def test_fallback_summary_without_llm(self):
+        async def failing_llm(messages, tools, **kwargs):
+            raise RuntimeError("offline")
+
+        self.llm_intent.call_openrouter = failing_llm
+        self._record_turns(self.llm_intent.COMPACT_THRESHOLD // 2 + 1)
+
+        conv = self.store.load("c1")
+        self.assertIn("- user: frage 0", conv["summary"])
+        self.assertEqual(len(conv["recent"]), self.llm_intent.RECENT_KEEP)
+
+    def test_writes_run_off_the_event_loop_thread(self):
+        async def fake_llm(messages, tools, **kwargs):
+            return {"choices": [{"message": {"content": "kurz"}}]}
+
+        self.llm_intent.call_openrouter = fake_llm
+        loop_thread = threading.get_ident()
+        write_threads = []
+        for name in ("append_turn", "apply_compaction"):
+            original = getattr(self.store, name)
+
+            def recording(*args, _original=original):
+                write_threads.append(threading.get_ident())
+                return _original(*args)
+
+            setattr(self.store, name, recording)
+
+        self._record_turns(self.llm_intent.COMPACT_THRESHOLD // 2 + 1)
+        self.assertEqual(len(write_threads), self.llm_intent.COMPACT_THRESHOLD // 2 + 2)
+        self.assertNotIn(loop_thread, write_threads)
+        self.assertEqual(self.store.load("c1")["summary"], "kurz")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
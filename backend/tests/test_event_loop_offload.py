@@ -0,0 +1,224 @@
+"""
+Tests für die Entlastung des Event-Loops (app/services/shell_service.py,
+app/services/desktop_automation_service.py, app/core/loop_monitor.py)
+
+Läuft ohne Desktop: Screenshot + OCR werden durch einen Fake ersetzt,
+Shell-Kommandos starten den aktuellen Python-Interpreter.
+
+Tests:
+1. run_subprocess liefert Exit-Code und Ausgaben, blockiert den Loop nicht
+2. run_subprocess: Timeout → TimeoutExpired, der Prozess wird beendet;
+   Abbruch des Aufrufers beendet ihn ebenso
+   (auch auf Event-Loops ohne Subprocess-Support, z.B. Selector-Loop unter
+   Windows mit uvicorn --reload)
+3. Shell-Router: /bash läuft über run_subprocess
+4. OCR-Queue ist begrenzt und verwirft das älteste Ergebnis
+5. OCR-Loop: Capture läuft im Worker-Thread, Ergebnisse erreichen Clients
+6. EventLoopLagMonitor: Statistik, Stalls werden erkannt
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.loop_monitor import EventLoopLagMonitor
+from app.services.desktop_automation_service import DesktopAutomationService
+from app.services.shell_service import run_subprocess
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+class FakeClientSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+class NoSubprocessEventLoop(asyncio.SelectorEventLoop):
+    """Like the Windows selector loop: subprocesses are not implemented"""
+
+    async def _make_subprocess_transport(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+class TestRunSubprocess(unittest.TestCase):
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.marker = os.path.join(self._tmp.name, "survived")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _late_writer(self, delay=0.6):
+        # Writes the marker only if it is still alive after ``delay``
+        return _python(
+            f"import time; time.sleep({delay}); open({self.marker!r}, 'w').close()"
+        )
+
+    def test_output_and_exit_code(self):
+        returncode, stdout, stderr = self._run(
+            run_subprocess(
+                _python(
+                    "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"
+                ),
+                timeout=10,
+            )
+        )
+        self.assertEqual(returncode, 3)
+        self.assertEqual(stdout.strip(), "out")
+        self.assertEqual(stderr.strip(), "err")
+
+    def test_loop_keeps_running(self):
+        monitor = EventLoopLagMonitor(interval_s=0.02, warn_ms=150)
+
+        async def scenario():
+            monitor.start()
+            await run_subprocess(_python("import time; time.sleep(0.4)"), timeout=10)
+            await monitor.stop()
+
+        self._run(scenario())
+        self.assertGreater(monitor.samples, 5)
+        self.assertEqual(monitor.stalls, 0)
+
+    def test_timeout_kills_process(self):
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self._run(run_subprocess(self._late_writer(), timeout=0.2))
+        time.sleep(0.8)
+        self.assertFalse(os.path.exists(self.marker))
+
+    def test_cancel_kills_process(self):
+        async def scenario():
+            task = asyncio.create_task(run_subprocess(self._late_writer(), timeout=10))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self._run(scenario())
+        time.sleep(0.8)
+        self.assertFalse(os.path.exists(self.marker))
+
+
+class TestRunSubprocessInThread(TestRunSubprocess):
+    def _run(self, coro):
+        loop = NoSubprocessEventLoop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+
+class TestShellRouter(unittest.TestCase):
+    def test_bash_endpoint(self):
+        from app.routers.shell import ShellCommandRequest, execute_bash_command
+
+        response = asyncio.run(
+            execute_bash_command(ShellCommandRequest(command="echo routed"))
+        )
+        body = json.loads(response.body)
+        self.assertTrue(body["success"])
+        self.assertEqual(body["stdout"].strip(), "routed")
+
+
+class TestOCRQueue(unittest.TestCase):
+    def setUp(self):
+        self.service = DesktopAutomationService(
+            {"ocr_queue_size": 2, "ocr_interval": 0.05}
+        )
+
+    def tearDown(self):
+        self.service._ocr_executor.shutdown(wait=True)
+
+    def test_queue_drops_oldest(self):
+        async def scenario():
+            self.service.ocr_queue = asyncio.Queue(maxsize=self.service.ocr_queue_size)
+            for i in range(4):
+                self.service._enqueue_ocr_result({"text": str(i)})
+            queue = self.service.ocr_queue
+            return [queue.get_nowait()["text"] for _ in range(queue.qsize())]
+
+        self.assertEqual(asyncio.run(scenario()), ["2", "3"])
+        self.assertEqual(self.service.ocr_dropped, 2)
+
+    def test_capture_runs_off_loop_and_reaches_clients(self):
+        threads = []
+
+        def slow_capture(bbox=None):
+            threads.append(threading.current_thread().name)
+            time.sleep(0.2)
+            return "screen text"
+
+        self.service._capture_and_ocr = slow_capture
+        client = FakeClientSocket()
+        self.service.websocket_clients.add(client)
+        monitor = EventLoopLagMonitor(interval_s=0.02, warn_ms=150)
+
+        async def scenario():
+            monitor.start()
+            await self.service.start_ocr_processing()
+            for _ in range(100):
+                if client.sent:
+                    break
+                await asyncio.sleep(0.02)
+            await self.service.stop_ocr_processing()
+            await monitor.stop()
+
+        asyncio.run(scenario())
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith("desktop-ocr") for name in threads))
+        self.assertEqual(client.sent[0]["type"], "ocr_result")
+        self.assertEqual(client.sent[0]["data"]["text"], "screen text")
+        self.assertEqual(monitor.stalls, 0)
+        self.assertIsNone(self.service.ocr_task)
+        self.assertIsNone(self.service.ocr_notify_task)
+
+
+class TestEventLoopLagMonitor(unittest.TestCase):
+    def test_record_and_stats(self):
+        monitor = EventLoopLagMonitor(warn_ms=100)
+        for lag in (1.0, 2.0, 3.0, 250.0):
+            monitor.record(lag)
+        stats = monitor.get_stats()
+        self.assertEqual(stats["samples"], 4)
+        self.assertEqual(stats["stalls"], 1)
+        self.assertEqual(stats["max_lag_ms"], 250.0)
+        self.assertEqual(stats["current_lag_ms"], 250.0)
+        self.assertEqual(stats["lag_p50_ms"], 3.0)
+        self.assertEqual(stats["last_stall"]["lag_ms"], 250.0)
+        self.assertFalse(stats["running"])
+
+    def test_detects_blocking_call(self):
+        monitor = EventLoopLagMonitor(interval_s=0.02, warn_ms=100)
+
+        async def scenario():
+            monitor.start()
+            self.assertTrue(monitor.running)
+            await asyncio.sleep(0.05)
+            time.sleep(0.25)  # blocks the loop
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+
+        asyncio.run(scenario())
+        self.assertFalse(monitor.running)
+        self.assertGreaterEqual(monitor.stalls, 1)
+        self.assertGreaterEqual(monitor.max_lag_ms, 150)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,189 @@
+"""
+Tests für das FrameChangeGate (app/services/frame_change_gate.py)
+
+Läuft ohne Stream: Frames sind synthetische Texturen, als JPEG kodiert
+oder direkt als Thumbnail-Array.
+
+Tests:
+1. Thumbnail: JPEG-Rauschen zählt nicht als Änderung, data:-URLs,
+   kaputte Frames
+2. Block-SSIM: Score = Anteil der strukturell geänderten Blöcke
+3. Masken (Taskleisten-Uhr) und Cursor-Umgebung zählen nie
+4. Adaptive Kadenz: idle, cadence, settling, Backoff bis max_interval,
+   Reset bei großer Änderung oder Dialog, max_defer
+"""
+
+import base64
+import os
+import sys
+import unittest
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.frame_change_gate import (FrameChangeGate,
+                                            cursor_from_metadata, parse_masks)
+
+# 24 x 13 blocks of 8 px
+THUMB_H, THUMB_W = 104, 192
+
+
+def _texture(seed, shape=(THUMB_H, THUMB_W)):
+    return np.random.default_rng(seed).uniform(0, 255, shape).astype(np.float32)
+
+
+def _patched(thumb, y, x, h, w, seed=99):
+    out = thumb.copy()
+    out[y : y + h, x : x + w] = _texture(seed, (h, w))
+    return out
+
+
+def _jpeg_base64(pixels, quality):
+    image = Image.fromarray(pixels.astype(np.uint8)).convert("RGB")
+    buf = BytesIO()
+    image.save(buf, format="JPEG", quality=quality)
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+class TestThumbnail(unittest.TestCase):
+    def test_reencoded_frame_is_not_a_change(self):
+        # Smooth content: what JPEG noise looks like on a real screen
+        y, x = np.mgrid[0:432, 0:768]
+        pixels = 127 + 100 * np.sin(x / 40.0) * np.cos(y / 30.0)
+        gate = FrameChangeGate()
+        a = gate.thumbnail(_jpeg_base64(pixels, 95))
+        b = gate.thumbnail("data:image/jpeg;base64," + _jpeg_base64(pixels, 60))
+        self.assertEqual(a.shape, (108, 192))
+        self.assertEqual(gate.change_score(a, b), 0.0)
+
+    def test_broken_frame(self):
+        gate = FrameChangeGate()
+        self.assertIsNone(gate.thumbnail(base64.b64encode(b"not an image").decode()))
+        self.assertEqual(gate.stats["decode_errors"], 1)
+
+
+class TestChangeScore(unittest.TestCase):
+    def test_identical_and_fully_changed(self):
+        gate = FrameChangeGate()
+        base = _texture(1)
+        self.assertEqual(gate.change_score(base, base.copy()), 0.0)
+        self.assertEqual(gate.change_score(base, _texture(2)), 1.0)
+        self.assertEqual(gate.change_score(base, base[:-8]), 1.0)
+
+    def test_score_is_changed_block_fraction(self):
+        gate = FrameChangeGate()
+        base = _texture(1)
+        # Exactly 2 x 3 blocks
+        changed = _patched(base, 16, 40, 16, 24)
+        self.assertAlmostEqual(gate.change_score(base, changed), 6 / (13 * 24))
+
+    def test_masks_never_count(self):
+        masks = parse_masks("0.9,0.94,0.1,0.06; bogus ;0,0,0.5,0.5")
+        self.assertEqual(masks, [(0.9, 0.94, 0.1, 0.06), (0.0, 0.0, 0.5, 0.5)])
+        gate = FrameChangeGate(masks=masks[:1])
+        base = _texture(1)
+        clock = _patched(base, THUMB_H - 8, THUMB_W - 16, 8, 16)
+        self.assertEqual(gate.change_score(base, clock), 0.0)
+        self.assertGreater(FrameChangeGate().change_score(base, clock), 0.0)
+
+    def test_cursor_area_never_counts(self):
+        gate = FrameChangeGate(cursor_radius=8)
+        gate._scale = 0.5  # frame is twice the thumbnail size
+        base = _texture(1)
+        moved = _patched(base, 48, 96, 8, 8)
+        self.assertGreater(gate.change_score(base, moved), 0.0)
+        self.assertEqual(gate.change_score(base, moved, cursor=(200, 100)), 0.0)
+        # Masking is per call, the next frame without a cursor counts again
+        self.assertGreater(gate.change_score(base, moved), 0.0)
+
+    def test_cursor_from_metadata(self):
+        self.assertEqual(cursor_from_metadata({"cursor": {"x": 3, "y": 4}}), (3, 4))
+        self.assertEqual(cursor_from_metadata({"cursorX": 5, "cursorY": 6}), (5, 6))
+        self.assertIsNone(cursor_from_metadata({"cursorX": 5}))
+        self.assertIsNone(cursor_from_metadata(None))
+
+
+class TestCadence(unittest.TestCase):
+    def _gate(self, **kwargs):
+        kwargs.setdefault("min_interval", 2.0)
+        kwargs.setdefault("max_interval", 10.0)
+        kwargs.setdefault("max_defer", 3.0)
+        return FrameChangeGate(**kwargs)
+
+    def _analyzed(self, gate, thumb, now, event_type="normal"):
+        decision = gate.decide(thumb, now=now)
+        gate.mark_analyzed(thumb, event_type, now=now)
+        return decision
+
+    def test_idle_screen_is_not_analyzed(self):
+        gate = self._gate()
+        base = _texture(1)
+        self.assertEqual(self._analyzed(gate, base, 0.0).reason, "first_frame")
+        for t in range(1, 60):
+            decision = gate.decide(base.copy(), now=float(t))
+            self.assertFalse(decision.analyze)
+            self.assertEqual(decision.reason, "idle")
+        self.assertEqual(gate.get_stats()["analyses"], 1)
+
+    def test_change_waits_for_interval_and_settling(self):
+        gate = self._gate()
+        base = _texture(1)
+        self._analyzed(gate, base, 0.0)
+        typed1 = _patched(base, 0, 0, 8, 80, seed=2)
+        typed2 = _patched(typed1, 0, 80, 8, 80, seed=3)
+
+        # One "normal" analysis backed the interval off to 3 s
+        self.assertEqual(gate.interval, 3.0)
+        self.assertEqual(gate.decide(typed1, now=1.0).reason, "cadence")
+        # Interval passed, but the screen is still moving
+        decision = gate.decide(typed2, now=3.5)
+        self.assertEqual(decision.reason, "settling")
+        self.assertGreater(decision.motion, gate.settle_threshold)
+        # Same frame again: settled → analyze
+        decision = gate.decide(typed2.copy(), now=3.7)
+        self.assertTrue(decision.analyze)
+        self.assertEqual(decision.reason, "changed")
+        self.assertEqual(decision.motion, 0.0)
+
+    def test_continuous_motion_analyzed_after_max_defer(self):
+        gate = self._gate()
+        self._analyzed(gate, _texture(1), 0.0)
+        reasons = []
+        for i, t in enumerate(np.arange(3.0, 6.5, 0.5)):
+            frame = _patched(_texture(1), 0, 0, 16, 32, seed=10 + i)
+            reasons.append(gate.decide(frame, now=float(t)).reason)
+        self.assertEqual(reasons[:6], ["settling"] * 6)
+        self.assertEqual(reasons[6], "changed")
+
+    def test_backoff_and_reset(self):
+        gate = self._gate(backoff=2.0)
+        base = _texture(1)
+        now = 0.0
+        self._analyzed(gate, base, now)
+        intervals = [gate.interval]
+        frame = base
+        for i in range(4):
+            frame = _patched(frame, 0, 0, 16, 32, seed=20 + i)
+            now += gate.interval
+            gate.decide(frame, now=now)  # settle on this frame
+            self.assertTrue(self._analyzed(gate, frame, now).analyze)
+            intervals.append(gate.interval)
+        self.assertEqual(intervals, [4.0, 8.0, 10.0, 10.0, 10.0])
+
+        # A major change snaps the cadence back at once
+        decision = gate.decide(_texture(7), now=now + 2.0)
+        self.assertEqual(gate.interval, gate.min_interval)
+        self.assertEqual(decision.reason, "settling")
+        decision = gate.decide(_texture(7), now=now + 2.1)
+        self.assertEqual(decision.reason, "major_change")
+
+        # A dialog analysis keeps the minimum interval
+        gate.mark_analyzed(_texture(7), "dialog", now=now + 2.1)
+        self.assertEqual(gate.interval, gate.min_interval)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
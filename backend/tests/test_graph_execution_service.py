@@ -0,0 +1,536 @@
+"""
+Tests für den GraphExecutionService (app/services/graph_execution_service.py)
+
+Läuft ohne Desktop: die Node-Handler werden durch Fakes ersetzt, Websocket-
+Clients durch ein Objekt, das die gesendeten Nachrichten sammelt.
+
+Tests:
+1. Große Outputs (BlobRef) überstehen den Broadcast an Subscriber
+2. Memo-Key: Typ, Config und Input-Hashes, Zeitstempel zählen nicht
+3. Memo: Hit ohne Handler-Aufruf, Invalidierung bei geänderter Config
+   oder geändertem Upstream-Output, Kopien statt Referenzen; HTTP nur
+   mit config "cache" und nur 2xx-Antworten
+4. rerun_from_node: Upstream wird übernommen, der Knoten und alles
+   Downstream läuft neu
+5. Dataflow-Scheduler: Knoten starten, sobald ihre Inputs fertig sind;
+   Limits pro Knotentyp und global
+6. Fehler, Abbruch und Pause: nichts Neues startet, laufende Knoten
+   werden fertig, Resume setzt fort
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models.workflow import Workflow, WorkflowConnection, WorkflowNode
+from app.routers import websocket as ws_router
+from app.services.graph_execution_service import (DEFAULT_BLOB_THRESHOLD_BYTES,
+                                                  NODE_TYPE_CACHEABLE, BlobRef,
+                                                  GraphExecutionService,
+                                                  GraphExecutionState,
+                                                  GraphExecutionStatus,
+                                                  NodeExecutionStatus,
+                                                  NodeResultMemo)
+
+
+class FakeNodeService:
+    async def get_templates(self):
+        return [{"id": node_type} for node_type in NODE_TYPE_CACHEABLE]
+
+
+class CountingHandler:
+    """Node handler whose output echoes the node config and its input edges"""
+
+    def __init__(self, value="v"):
+        self.value = value
+        self.calls = []
+
+    async def __call__(self, node, state, debug):
+        self.calls.append(node.id)
+        return {
+            "node": node.id,
+            "value": self.value,
+            "config": node.config,
+            "inputs": sorted(e["source"] for e in state.node_inputs.get(node.id, [])),
+            "executed_at": len(self.calls),
+        }
+
+
+class RecordingHandler:
+    """Node handler that sleeps ``config["sleep"]`` and logs start/end order"""
+
+    def __init__(self, log):
+        self.log = log
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, node, state, debug):
+        config = node.config or {}
+        self.log.append(("start", node.id))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(config.get("sleep", 0.0))
+            if config.get("fail"):
+                raise RuntimeError(f"{node.id} failed")
+        finally:
+            self.active -= 1
+        self.log.append(("end", node.id))
+        return {"node": node.id}
+
+
+class FakeRoomManager:
+    def __init__(self):
+        self.updates = []
+
+    async def broadcast_to_room(self, room, message):
+        self.updates.append((room, message))
+
+
+class FakeClientSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+def _node(node_id, node_type="websocket_config", **config):
+    return WorkflowNode(id=node_id, type=node_type, config=config)
+
+
+def _http_node(node_id, **config):
+    # Node-service workflows use "http_request_action", which the workflow
+    # model's NodeType enum does not list
+    return WorkflowNode.model_construct(
+        id=node_id, type="http_request_action", config=config
+    )
+
+
+def _workflow(nodes, edges=(), workflow_id="wf1"):
+    return Workflow(
+        id=workflow_id,
+        name="test",
+        nodes=nodes,
+        connections=[
+            WorkflowConnection(id=f"{s}-{t}", source=s, target=t) for s, t in edges
+        ],
+    )
+
+
+def _state(graph_id="graph_test"):
+    return GraphExecutionState(
+        graph_id=graph_id,
+        status=GraphExecutionStatus.RUNNING,
+        current_nodes=set(),
+        completed_nodes=set(),
+        failed_nodes=set(),
+        node_results={},
+    )
+
+
+class GraphServiceTestCase(unittest.TestCase):
+    def setUp(self):
+        # The service creates ./workflow-data on construction
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.rooms = FakeRoomManager()
+        self.memo = NodeResultMemo()
+        self.service = GraphExecutionService(
+            FakeNodeService(),
+            self.rooms,
+            None,
+            None,
+            None,
+            update_interval_s=0.01,
+            result_memo=self.memo,
+        )
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _handlers(self, **handlers):
+        self.service.node_handlers.update(handlers)
+        return handlers
+
+    def _run(self, workflow, **kwargs):
+        graph_id = asyncio.run(self.service.execute_graph(workflow, **kwargs))
+        return self.service.execution_states[graph_id]
+
+
+class TestBroadcast(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = FakeClientSocket()
+        ws_router.manager.active_connections["test-client"] = self.client
+        ws_router.workflow_execution_subscribers["graph_test"] = {"test-client"}
+
+    def tearDown(self):
+        ws_router.manager.active_connections.pop("test-client", None)
+        ws_router.workflow_execution_subscribers.pop("graph_test", None)
+        super().tearDown()
+
+    def test_large_output_survives_subscribed_broadcast(self):
+        big = "x" * (DEFAULT_BLOB_THRESHOLD_BYTES + 1)
+
+        async def handler(node, state, debug):
+            return {"text": big, "lines": [big, "short"]}
+
+        self.service.node_handlers["ocr_region"] = handler
+        state = _state()
+        result = asyncio.run(
+            self.service._execute_node(_node("ocr", "ocr_region"), state, False)
+        )
+
+        self.assertEqual(result.status, NodeExecutionStatus.COMPLETED)
+        self.assertIsInstance(result.output_data["text"], BlobRef)
+        completed = self.client.sent[-1]["data"]["nodeData"]
+        self.assertEqual(completed["status"], "completed")
+        ref = result.output_data["text"]
+        self.assertEqual(
+            completed["result"]["text"], {"blob": ref.blob_id, "size": len(big)}
+        )
+        self.assertEqual(completed["result"]["lines"][1], "short")
+        self.assertEqual(state.blobs.materialize(result.output_data)["text"], big)
+
+
+class TestResultMemo(GraphServiceTestCase):
+    def _key(self, node, upstream_hash="h1"):
+        state = _state()
+        state.node_inputs[node.id] = [
+            {"source": "up", "source_handle": None, "target_handle": None}
+        ]
+        state.output_hashes["up"] = upstream_hash
+        return self.service._memo_key(node, state)
+
+    def test_memo_key(self):
+        node = _node("a", port=1)
+        self.assertEqual(self._key(node), self._key(_node("a", port=1)))
+        self.assertNotEqual(self._key(node), self._key(_node("a", port=2)))
+        self.assertNotEqual(self._key(node), self._key(node, upstream_hash="h2"))
+        self.assertNotEqual(
+            self._key(node), self._key(_node("a", "if_condition", port=1))
+        )
+
+    def test_content_hash_ignores_timestamps(self):
+        from app.services.graph_execution_service import _content_hash
+
+        self.assertEqual(
+            _content_hash({"v": 1, "executed_at": "10:00"}),
+            _content_hash({"v": 1, "executed_at": "10:01"}),
+        )
+        self.assertNotEqual(_content_hash({"v": 1}), _content_hash({"v": 2}))
+
+    def test_cacheable_types(self):
+        self.assertFalse(self.service._is_cacheable(_node("d", "live_desktop")))
+        self.assertFalse(self.service._is_cacheable(_node("t", "manual_trigger")))
+        self.assertTrue(self.service._is_cacheable(_node("w", "websocket_config")))
+        self.assertFalse(
+            self.service._is_cacheable(_node("w", "websocket_config", cache=False))
+        )
+        self.assertTrue(
+            self.service._is_cacheable(_node("t", "manual_trigger", cache=True))
+        )
+        # HTTP: live responses unless the node opts in, never for POST
+        self.assertFalse(self.service._is_cacheable(_http_node("h", method="GET")))
+        self.assertTrue(
+            self.service._is_cacheable(_http_node("h", method="GET", cache=True))
+        )
+        self.assertFalse(
+            self.service._is_cacheable(_http_node("h", method="POST", cache=True))
+        )
+
+    def test_memo_hit_and_invalidation(self):
+        trigger, config, cond = self._handlers(
+            manual_trigger=CountingHandler(),
+            websocket_config=CountingHandler(),
+            if_condition=CountingHandler(),
+        ).values()
+        nodes = [
+            _node("t", "manual_trigger"),
+            _node("a", port=1),
+            _node("b", "if_condition"),
+        ]
+        edges = [("t", "a"), ("a", "b")]
+
+        first = self._run(_workflow(nodes, edges))
+        self.assertEqual(first.status, GraphExecutionStatus.COMPLETED)
+        second = self._run(_workflow(nodes, edges))
+        # Trigger output only differs in executed_at: both successors hit
+        self.assertEqual((len(config.calls), len(cond.calls)), (1, 1))
+        self.assertEqual(second.node_results["a"].cache_source, "memo")
+        self.assertEqual(second.node_results["b"].cache_source, "memo")
+
+        # Edited config: the node and its successor (new input hash) re-run
+        nodes[1] = _node("a", port=2)
+        self._run(_workflow(nodes, edges))
+        self.assertEqual((len(config.calls), len(cond.calls)), (2, 2))
+
+        # A new trigger value re-runs "a"; its output is the same as before,
+        # so "b" still hits
+        trigger.value = "other"
+        self._run(_workflow(nodes, edges))
+        self.assertEqual((len(config.calls), len(cond.calls)), (3, 2))
+        self.assertEqual(len(trigger.calls), 4)
+
+    def test_http_memo_only_on_opt_in_and_2xx(self):
+        responses = []
+
+        async def http(node, state, debug):
+            responses.append(node.id)
+            status = node.config.get("status", 200)
+            return {"status_code": status, "data": len(responses), "success": True}
+
+        self._handlers(http_request_action=http)
+        polling = _workflow([_http_node("h", method="GET")])
+        self._run(polling)
+        state = self._run(polling)
+        self.assertEqual(len(responses), 2)
+        self.assertEqual(state.node_results["h"].output_data["data"], 2)
+
+        cached = _workflow([_http_node("c", method="GET", cache=True)])
+        self._run(cached)
+        self._run(cached)
+        self.assertEqual(len(responses), 3)
+
+        failing = _workflow([_http_node("e", method="GET", cache=True, status=500)])
+        self._run(failing)
+        self._run(failing)
+        self.assertEqual(len(responses), 5)
+
+    def test_memo_returns_copies(self):
+        memo = NodeResultMemo()
+        output = {"items": [1, 2]}
+        memo.put("k", output)
+        output["items"].append(3)
+        hit = memo.get("k")
+        self.assertEqual(hit, {"items": [1, 2]})
+        hit["items"].append(4)
+        self.assertEqual(memo.get("k"), {"items": [1, 2]})
+
+    def test_live_desktop_always_executes(self):
+        desktop = CountingHandler()
+        self._handlers(live_desktop=desktop)
+        workflow = _workflow([_node("d", "live_desktop")])
+        self._run(workflow)
+        self._run(workflow)
+        self.assertEqual(desktop.calls, ["d", "d"])
+
+
+class TestRerunFromNode(GraphServiceTestCase):
+    def _graph(self):
+        #   t -> a -> b -> c
+        #        a -> d
+        nodes = [
+            _node("t", "manual_trigger"),
+            _node("a", "manual_trigger"),
+            _node("b", "manual_trigger"),
+            _node("c", "manual_trigger"),
+            _node("d", "manual_trigger"),
+        ]
+        return _workflow(nodes, [("t", "a"), ("a", "b"), ("b", "c"), ("a", "d")])
+
+    def test_downstream_nodes(self):
+        workflow = self._graph()
+        self.assertEqual(self.service._downstream_nodes(workflow, "b"), {"b", "c"})
+        self.assertEqual(
+            self.service._downstream_nodes(workflow, "a"), {"a", "b", "c", "d"}
+        )
+        self.assertEqual(self.service._downstream_nodes(workflow, "c"), {"c"})
+
+    def test_rerun_reuses_upstream_and_executes_downstream(self):
+        handler = CountingHandler()
+        self._handlers(manual_trigger=handler)
+        workflow = self._graph()
+        self._run(workflow)
+        self.assertEqual(len(handler.calls), 5)
+
+        handler.calls.clear()
+        graph_id = asyncio.run(self.service.rerun_from_node(workflow, "b"))
+        state = self.service.execution_states[graph_id]
+        self.assertEqual(state.status, GraphExecutionStatus.COMPLETED)
+        self.assertEqual(sorted(handler.calls), ["b", "c"])
+        sources = {nid: r.cache_source for nid, r in state.node_results.items()}
+        self.assertEqual(
+            sources, {"t": "reused", "a": "reused", "d": "reused", "b": None, "c": None}
+        )
+
+    def test_rerun_without_previous_run_executes_everything(self):
+        handler = CountingHandler()
+        self._handlers(manual_trigger=handler)
+        asyncio.run(self.service.rerun_from_node(self._graph(), "b"))
+        self.assertEqual(len(handler.calls), 5)
+
+
+class TestDataflowScheduler(GraphServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.log = []
+
+    def _recording(self, *node_types):
+        handler = RecordingHandler(self.log)
+        self._handlers(**{node_type: handler for node_type in node_types})
+        return handler
+
+    def _index(self, kind, node_id):
+        return self.log.index((kind, node_id))
+
+    def test_node_starts_when_its_inputs_are_done(self):
+        self._recording("manual_trigger")
+        #   t -> slow -> join
+        #   t -> fast -> join
+        #        fast -> after_fast
+        workflow = _workflow(
+            [
+                _node("t", "manual_trigger"),
+                _node("slow", "manual_trigger", sleep=0.2),
+                _node("fast", "manual_trigger", sleep=0.01),
+                _node("join", "manual_trigger"),
+                _node("after_fast", "manual_trigger"),
+            ],
+            [
+                ("t", "slow"),
+                ("t", "fast"),
+                ("slow", "join"),
+                ("fast", "join"),
+                ("fast", "after_fast"),
+            ],
+        )
+        state = self._run(workflow)
+
+        self.assertEqual(state.status, GraphExecutionStatus.COMPLETED)
+        self.assertEqual(len(state.completed_nodes), 5)
+        self.assertLess(self._index("end", "t"), self._index("start", "slow"))
+        self.assertGreater(self._index("start", "join"), self._index("end", "slow"))
+        self.assertGreater(self._index("start", "join"), self._index("end", "fast"))
+        # Not level by level: a fast branch does not wait for the slow one
+        self.assertLess(self._index("end", "after_fast"), self._index("end", "slow"))
+
+    def test_concurrency_limits(self):
+        handler = self._recording("click_action", "manual_trigger")
+        self.service.max_concurrency = 3
+        nodes = [_node("t", "manual_trigger")]
+        edges = []
+        for i in range(3):
+            nodes.append(_node(f"click{i}", "click_action", sleep=0.05))
+            edges.append(("t", f"click{i}"))
+        for i in range(6):
+            nodes.append(_node(f"n{i}", "manual_trigger", sleep=0.05))
+            edges.append(("t", f"n{i}"))
+
+        state = self._run(_workflow(nodes, edges))
+        self.assertEqual(state.status, GraphExecutionStatus.COMPLETED)
+        self.assertEqual(handler.max_active, 3)
+        active_clicks = max_clicks = 0
+        for kind, node_id in self.log:
+            if node_id.startswith("click"):
+                active_clicks += 1 if kind == "start" else -1
+                max_clicks = max(max_clicks, active_clicks)
+        self.assertEqual(max_clicks, 1)  # one physical desktop
+
+    def test_failure_stops_scheduling(self):
+        self._recording("manual_trigger")
+        workflow = _workflow(
+            [
+                _node("t", "manual_trigger"),
+                _node("bad", "manual_trigger", fail=True),
+                _node("sibling", "manual_trigger", sleep=0.1),
+                _node("after_bad", "manual_trigger"),
+                _node("after_sibling", "manual_trigger"),
+            ],
+            [
+                ("t", "bad"),
+                ("t", "sibling"),
+                ("bad", "after_bad"),
+                ("sibling", "after_sibling"),
+            ],
+        )
+        state = self._run(workflow)
+
+        self.assertEqual(state.status, GraphExecutionStatus.FAILED)
+        self.assertEqual(state.failed_nodes, {"bad"})
+        # The running sibling finishes, nothing new starts
+        self.assertIn(("end", "sibling"), self.log)
+        self.assertNotIn(("start", "after_bad"), self.log)
+        self.assertNotIn(("start", "after_sibling"), self.log)
+
+    def _start(self, workflow):
+        """Run ``workflow`` in the background → (task, graph_id) once it is running"""
+
+        async def started():
+            task = asyncio.create_task(self.service.execute_graph(workflow))
+            while not self.service.execution_states:
+                await asyncio.sleep(0.005)
+            return task, next(iter(self.service.execution_states))
+
+        return started()
+
+    def _chain(self):
+        return _workflow(
+            [
+                _node("t", "manual_trigger"),
+                _node("a", "manual_trigger", sleep=0.1),
+                _node("b", "manual_trigger"),
+            ],
+            [("t", "a"), ("a", "b")],
+        )
+
+    def test_cancel_lets_running_node_finish(self):
+        self._recording("manual_trigger")
+
+        async def scenario():
+            task, graph_id = await self._start(self._chain())
+            while ("start", "a") not in self.log:
+                await asyncio.sleep(0.005)
+            self.assertTrue(await self.service.cancel_execution(graph_id))
+            await asyncio.wait_for(task, timeout=2.0)
+            return self.service.execution_states[graph_id]
+
+        state = asyncio.run(scenario())
+        self.assertEqual(state.status, GraphExecutionStatus.CANCELLED)
+        self.assertIn(("end", "a"), self.log)
+        self.assertNotIn(("start", "b"), self.log)
+        self.assertIsNotNone(state.end_time)
+
+    def test_pause_holds_successors_until_resume(self):
+        self._recording("manual_trigger")
+
+        async def scenario():
+            task, graph_id = await self._start(self._chain())
+            while ("start", "a") not in self.log:
+                await asyncio.sleep(0.005)
+            self.assertTrue(await self.service.pause_execution(graph_id))
+            await asyncio.sleep(0.25)
+            paused_log = list(self.log)
+            self.assertTrue(await self.service.resume_execution(graph_id))
+            await asyncio.wait_for(task, timeout=2.0)
+            return paused_log, self.service.execution_states[graph_id]
+
+        paused_log, state = asyncio.run(scenario())
+        # "a" finished while paused, "b" only started after resume
+        self.assertIn(("end", "a"), paused_log)
+        self.assertNotIn(("start", "b"), paused_log)
+        self.assertIn(("end", "b"), self.log)
+        self.assertEqual(state.status, GraphExecutionStatus.COMPLETED)
+
+    def test_full_state_updates_are_coalesced(self):
+        self._recording("manual_trigger")
+        self.service.update_interval_s = 10.0
+        nodes = [_node("t", "manual_trigger")] + [
+            _node(f"n{i}", "manual_trigger") for i in range(20)
+        ]
+        self._run(_workflow(nodes, [("t", f"n{i}") for i in range(20)]))
+        # initial + one coalesced + final, not one per node
+        self.assertLessEqual(len(self.rooms.updates), 4)
+        self.assertEqual(self.rooms.updates[-1][1]["data"]["status"], "completed")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
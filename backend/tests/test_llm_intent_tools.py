@@ -0,0 +1,234 @@
+"""
+Tests für die Tool-Ausführung im Agentic Loop (app/routers/llm_intent.py)
+
+Läuft ohne LLM und ohne Desktop: call_openrouter liefert geskriptete
+Antworten, execute_tool ist ein Fake, der Start/Ende protokolliert.
+
+Tests:
+1. Läufe aufeinanderfolgender Read-only-Calls starten gemeinsam (begrenzt),
+   einzelne Read-only-Calls und mutierende Tools nicht
+2. Ergebnisse, Steps und Tool-Messages behalten die Reihenfolge der Calls;
+   ein mutierender Call wartet auf den ganzen Lauf davor
+3. Abbruch durch den User storniert vorgezogene Calls
+"""
+
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.routers import llm_intent
+
+
+def _turn(*calls):
+    return {
+        "choices": [
+            {
+                "message": {
+                    "role": "assistant",
+                    "content": "",
+                    "tool_calls": [
+                        {
+                            "id": f"call_{i}",
+                            "function": {"name": name, "arguments": json.dumps(args)},
+                        }
+                        for i, (name, args) in enumerate(calls)
+                    ],
+                }
+            }
+        ]
+    }
+
+
+def _final(text="fertig"):
+    return {"choices": [{"message": {"role": "assistant", "content": text}}]}
+
+
+class FakeTools:
+    """execute_tool stand-in: sleeps ``args["sleep"]`` and logs start/end."""
+
+    def __init__(self):
+        self.log = []
+        self.active = 0
+        self.max_active = 0
+        self.on_end = None
+
+    async def __call__(self, name, args):
+        label = args.get("label", name)
+        self.log.append(("start", label))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(args.get("sleep", 0.0))
+        finally:
+            self.active -= 1
+        self.log.append(("end", label))
+        if self.on_end is not None:
+            self.on_end(label)
+        return {"success": True, "label": label}
+
+
+class FakeLLM:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.messages = []
+
+    async def __call__(self, messages, tools):
+        self.messages = list(messages)
+        return self.responses.pop(0)
+
+
+class LoopTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tools = FakeTools()
+        self._saved = {
+            name: getattr(llm_intent, name)
+            for name in ("execute_tool", "call_openrouter", "load_conversation")
+        }
+        llm_intent.execute_tool = self.tools
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(llm_intent, name, value)
+
+    def _index(self, kind, label):
+        return self.tools.log.index((kind, label))
+
+
+class TestPrefetch(LoopTestCase):
+    def test_runs_only_for_two_or_more_read_only_calls(self):
+        calls = llm_intent._parse_tool_calls(
+            _turn(
+                ("screen_read", {}),
+                ("action_click", {}),
+                ("get_focus", {}),
+                ("list_windows", {}),
+                ("unknown_tool", {}),
+            )["choices"][0]["message"]["tool_calls"]
+        )
+
+        async def scenario():
+            single = llm_intent._prefetch_read_only_run(calls, 0)
+            mutating = llm_intent._prefetch_read_only_run(calls, 1)
+            run = llm_intent._prefetch_read_only_run(calls, 2)
+            results = {idx: await task for idx, task in run.items()}
+            return single, mutating, results
+
+        single, mutating, results = asyncio.run(scenario())
+        self.assertEqual(single, {})
+        self.assertEqual(mutating, {})
+        # Stops before the unknown tool (counts as desktop-mutating)
+        self.assertEqual(sorted(results), [2, 3])
+        self.assertEqual(results[3]["label"], "list_windows")
+
+    def test_concurrency_is_bounded(self):
+        saved = llm_intent.READ_ONLY_TOOL_CONCURRENCY
+        llm_intent.READ_ONLY_TOOL_CONCURRENCY = 2
+        try:
+            calls = [
+                ("screen_read", {"label": f"r{i}", "sleep": 0.05}, f"c{i}")
+                for i in range(5)
+            ]
+
+            async def scenario():
+                run = llm_intent._prefetch_read_only_run(calls, 0)
+                return [await run[i] for i in range(5)]
+
+            results = asyncio.run(scenario())
+        finally:
+            llm_intent.READ_ONLY_TOOL_CONCURRENCY = saved
+        self.assertEqual([r["label"] for r in results], [f"r{i}" for i in range(5)])
+        self.assertEqual(self.tools.max_active, 2)
+
+
+class TestAgenticLoopOrder(LoopTestCase):
+    def test_results_keep_call_order(self):
+        llm = FakeLLM(
+            [
+                _turn(
+                    ("screen_read", {"label": "slow_read", "sleep": 0.15}),
+                    ("get_focus", {"label": "fast_read", "sleep": 0.01}),
+                    ("action_click", {"label": "click"}),
+                    ("list_windows", {"label": "after_click"}),
+                ),
+                _final(),
+            ]
+        )
+        llm_intent.call_openrouter = llm
+
+        response = asyncio.run(llm_intent.run_agentic_loop("mach was"))
+
+        self.assertTrue(response.success)
+        self.assertEqual(
+            [s.result["label"] for s in response.steps],
+            ["slow_read", "fast_read", "click", "after_click"],
+        )
+        tool_messages = [m for m in llm.messages if m.get("role") == "tool"]
+        self.assertEqual(
+            [m["tool_call_id"] for m in tool_messages],
+            ["call_0", "call_1", "call_2", "call_3"],
+        )
+        # The two reads overlapped; the fast one finished first
+        self.assertLess(
+            self._index("start", "fast_read"), self._index("end", "slow_read")
+        )
+        self.assertLess(
+            self._index("end", "fast_read"), self._index("end", "slow_read")
+        )
+        # The click waited for the whole read-only run, the next read for the click
+        self.assertGreater(
+            self._index("start", "click"), self._index("end", "slow_read")
+        )
+        self.assertGreater(
+            self._index("start", "after_click"), self._index("end", "click")
+        )
+
+
+class TestCancelPrefetched(LoopTestCase):
+    def test_user_cancel_stops_prefetched_calls(self):
+        conversation_id = "test-cancel-prefetch"
+        llm_intent.call_openrouter = FakeLLM(
+            [
+                _turn(
+                    ("screen_read", {"label": "first", "sleep": 0.01}),
+                    ("get_focus", {"label": "second", "sleep": 0.3}),
+                    ("list_windows", {"label": "third", "sleep": 0.3}),
+                ),
+                _final(),
+            ]
+        )
+        llm_intent.load_conversation = lambda cid: {"summary": "", "recent": []}
+
+        def cancel_after_first(label):
+            if label == "first":
+                llm_intent._pending_interventions[conversation_id] = [
+                    {"action": "cancel"}
+                ]
+
+        self.tools.on_end = cancel_after_first
+
+        async def scenario():
+            events = []
+            async for event in llm_intent.run_agentic_loop_stream(
+                "lies alles", conversation_id=conversation_id
+            ):
+                events.append(json.loads(event[len("data: ") :]))
+            # Give cancelled tasks a chance to run to completion if they were not
+            await asyncio.sleep(0.4)
+            return events
+
+        events = asyncio.run(scenario())
+        done = events[-1]
+        self.assertEqual(done["type"], "done")
+        self.assertEqual(done["reason"], "user_cancelled")
+        self.assertIn(("start", "second"), self.tools.log)
+        self.assertNotIn(("end", "second"), self.tools.log)
+        self.assertNotIn(("end", "third"), self.tools.log)
+        self.assertNotIn(conversation_id, llm_intent._pending_interventions)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -8,6 +8,7 @@ ULTRA-ROBUST VERSION v2.3:
 - Separate Tasks für unabhängige Fehlerbehandlung
 - Auto-Reconnect bei Verbindungsverlust
 - Command-Deduplication (keine doppelten Befehle)
+- Befehle per Server-Push (kein get_commands-Polling), ACK pro Befehl
 - Alle Monitore werden gestreamt
 - HEARTBEAT an Backend senden für Watchdog
 - GRACEFUL SHUTDOWN bei SIGTERM/SIGINT
@@ -33,7 +34,7 @@ import signal
 import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
 
 import mss
 import pyautogui
@@ -152,7 +153,10 @@ class RobustDualScreenCaptureClient:
         self.monitors: List[Dict[str, Any]] = []
         self.total_width = 0
         self.total_height = 0
-        self._processed_command_ids: Set[str] = set()
+        # Idempotency-Keys ausgeführter Befehle (Einfüge-Reihenfolge, begrenzt).
+        # Bleibt über Reconnects erhalten: der Server spielt nicht bestätigte
+        # Befehle beim Connect erneut ab.
+        self._processed_command_ids: Dict[str, None] = {}
         self.frame_counter = 0
         self.stats = {
             "frames_sent": 0,
@@ -708,13 +712,17 @@ class RobustDualScreenCaptureClient:
             or cmd.get("command_id")
             or f"{cmd.get('command_type')}_{time.time()}"
         )
-        if cmd_id in self._processed_command_ids:
+        dedup_key = cmd.get("idempotency_key") or cmd_id
+        cmd_type = cmd.get("command_type")
+        if dedup_key in self._processed_command_ids:
+            # Replay nach Reconnect: nicht erneut ausführen, aber ACK
+            # wiederholen (das erste ging evtl. mit der Verbindung verloren)
             self.stats["commands_deduplicated"] += 1
+            await self._acknowledge_command(cmd_id, cmd_type)
             return
-        self._processed_command_ids.add(cmd_id)
-        if len(self._processed_command_ids) > 1000:
-            self._processed_command_ids = set(list(self._processed_command_ids)[-500:])
-        cmd_type = cmd.get("command_type")
+        self._processed_command_ids[dedup_key] = None
+        while len(self._processed_command_ids) > 1000:
+            del self._processed_command_ids[next(iter(self._processed_command_ids))]
         if cmd_type == "start_capture" and not self.is_capturing:
             logger.info(f"[CMD] start_capture")
             self.is_capturing = True
@@ -962,28 +970,7 @@ class RobustDualScreenCaptureClient:
                     break
         logger.info("[PING] Loop beendet")
 
-    async def poll_commands(self):
-        logger.info("[POLL] Loop gestartet (3s)")
-        while self.should_run and self.is_connected:
-            try:
-                if self.websocket and self.is_connected:
-                    await self.websocket.send(
-                        json.dumps(
-                            {
-                                "type": "get_commands",
-                                "clientId": self.client_id,
-                                "timestamp": time.time(),
-                            }
-                        )
-                    )
-                await asyncio.sleep(3)
-            except Exception:
-                if not self.is_connected:
-                    break
-        logger.info("[POLL] Loop beendet")
-
     async def run_session(self):
-        self._processed_command_ids.clear()
         if not await self.connect():
             return False
         self.is_capturing = True
@@ -994,7 +981,6 @@ class RobustDualScreenCaptureClient:
             asyncio.create_task(self.capture_loop(), name="capture"),
             asyncio.create_task(self.message_handler(), name="message"),
             asyncio.create_task(self.ping_loop(), name="ping"),
-            asyncio.create_task(self.poll_commands(), name="poll"),
             asyncio.create_task(self.heartbeat_loop(), name="heartbeat"),
         ]
         self._tasks = tasks